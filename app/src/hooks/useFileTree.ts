@@ -1,5 +1,5 @@
 import { useState, useRef, useEffect, useCallback } from 'react';
-import { projectsApi } from '../lib/api';
+import { chatApi, projectsApi } from '../lib/api';
 import { fileEvents } from '../utils/fileEvents';
 
 export interface FileTreeEntry {
@@ -12,6 +12,8 @@ export interface FileTreeEntry {
 
 interface UseFileTreeOptions {
   slug: string;
+  /** Project UUID for the file change stream; without it the tree is polled. */
+  projectId?: string;
   containerDir?: string;
   enabled?: boolean;
 }
@@ -25,9 +27,11 @@ interface UseFileTreeReturn {
 }
 
 const FILE_RETRY_MAX = 8;
+const FALLBACK_POLL_MS = 60_000;
 
 export function useFileTree({
   slug,
+  projectId,
   containerDir,
   enabled = true,
 }: UseFileTreeOptions): UseFileTreeReturn {
@@ -124,45 +128,77 @@ export function useFileTree({
     return unsubscribe;
   }, [slug, enabled]);
 
-  // Smart polling: 60s interval, pauses when tab is hidden.
+  // Live updates: the server pushes debounced file change batches over SSE
+  // and the tree is reloaded when one arrives. While the stream is down (or
+  // there is no project id yet) fall back to a 60s poll. Everything pauses
+  // while the tab is hidden.
   useEffect(() => {
     if (!slug || !enabled) return;
 
+    let source: EventSource | null = null;
     let pollInterval: ReturnType<typeof setInterval> | null = null;
-    let isTabVisible = !document.hidden;
 
     const startPolling = () => {
-      pollInterval = setInterval(() => {
-        if (isTabVisible && slug) {
-          loadFileTreeRef.current();
-        }
-      }, 60_000);
+      if (pollInterval) return;
+      pollInterval = setInterval(() => loadFileTreeRef.current(), FALLBACK_POLL_MS);
     };
 
-    const handleVisibilityChange = () => {
-      isTabVisible = !document.hidden;
-
-      if (isTabVisible && !pollInterval) {
-        startPolling();
-      } else if (!isTabVisible && pollInterval) {
+    const stopPolling = () => {
+      if (pollInterval) {
         clearInterval(pollInterval);
         pollInterval = null;
       }
     };
 
+    const connect = () => {
+      if (!projectId) {
+        startPolling();
+        return;
+      }
+      source = chatApi.subscribeToFileChanges(projectId);
+      // Also fires on reconnect: catch up on changes missed while disconnected.
+      source.onopen = () => {
+        stopPolling();
+        loadFileTreeRef.current();
+      };
+      source.onmessage = (event) => {
+        try {
+          if (JSON.parse(event.data).type === 'file_changes') {
+            loadFileTreeRef.current();
+          }
+        } catch {
+          // Ignore malformed frames; the next batch or reconnect catches up.
+        }
+      };
+      // EventSource retries on its own; poll until it is back.
+      source.onerror = startPolling;
+    };
+
+    const disconnect = () => {
+      source?.close();
+      source = null;
+      stopPolling();
+    };
+
+    const handleVisibilityChange = () => {
+      if (document.hidden) {
+        disconnect();
+      } else if (!source && !pollInterval) {
+        connect();
+      }
+    };
+
     document.addEventListener('visibilitychange', handleVisibilityChange);
 
-    if (isTabVisible) {
-      startPolling();
+    if (!document.hidden) {
+      connect();
     }
 
     return () => {
-      if (pollInterval) {
-        clearInterval(pollInterval);
-      }
+      disconnect();
       document.removeEventListener('visibilitychange', handleVisibilityChange);
     };
-  }, [slug, containerDir, enabled]);
+  }, [slug, projectId, containerDir, enabled]);
 
   // Cleanup on unmount
   useEffect(() => {
@@ -1143,6 +1143,13 @@ export const chatApi = {
     return new EventSource(url, { withCredentials: true });
   },
 
+  // Debounced file change batches for a project ("file_changes" messages),
+  // so the file tree refreshes on change instead of on a timer.
+  subscribeToFileChanges: (projectId: string) => {
+    const url = `${API_URL}/api/chat/files/stream?project_id=${encodeURIComponent(projectId)}`;
+    return new EventSource(url, { withCredentials: true });
+  },
+
   // List chat sessions for a project
   getProjectSessions: async (projectId: string) => {
     const response = await api.get(`/api/chat/${projectId}/sessions`);
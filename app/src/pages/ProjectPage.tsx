@@ -351,6 +351,7 @@ function ProjectPageInner() {
     cancelRetry: cancelFileRetry,
   } = useFileTree({
     slug: slug!,
+    projectId: project?.id ? String(project.id) : undefined,
     containerDir,
     enabled: !!slug,
   });
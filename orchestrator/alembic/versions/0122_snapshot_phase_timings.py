@@ -0,0 +1,33 @@
+"""Record per-phase timings on project snapshots.
+
+Revision ID: 0122_snapshot_phase_timings
+Revises: 0121_seed_system_default_agent
+Create Date: 2026-10-18
+
+Adds a nullable ``phase_timings`` JSON column to ``project_snapshots``.
+SnapshotManager fills it with millisecond durations for each phase of the
+hibernate/restore pipeline (``create_ms``, ``ready_ms``, ``restore_ms``)
+so slow hibernations and wakes can be attributed to a phase. Existing
+rows stay ``NULL``.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0122_snapshot_phase_timings"
+down_revision = "0121_seed_system_default_agent"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "project_snapshots",
+        sa.Column("phase_timings", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("project_snapshots") as batch_op:
+        batch_op.drop_column("phase_timings")
@@ -5,15 +5,24 @@ Replaces any substring match of known project secrets in stdout/stderr with
 secrets (< 6 chars) are skipped to avoid noisy false positives.
 
 The secrets dict is loaded lazily per-task and cached on the ``context``
-dict under ``__secret_scrub_map__``.
+dict under ``__secret_scrub_map__``. Decrypted maps are also kept per
+project across tasks, keyed by a fingerprint of the containers' encrypted
+secrets: any write re-encrypts (new Fernet token), so a changed secret set
+is picked up on the next task without explicit invalidation.
+
+Each distinct secret set is compiled once into a single alternation regex
+(:class:`SecretScrubber`), so scrubbing is one pass over the output
+regardless of how many secrets the project has.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import math
 import re
-from collections import Counter
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -31,6 +40,11 @@ _ENTROPY_FLOOR = 3.0
 # boundaries to avoid over-redaction.
 _ENTROPY_CEILING = 4.0
 _NAIVE_LEN = 20
+# Projects whose decrypted secret maps are kept between tasks.
+_MAX_CACHED_PROJECTS = 256
+
+# project_id -> (fingerprint of encrypted secrets, {plaintext: key})
+_project_maps: OrderedDict[str, tuple[str, dict[str, str]]] = OrderedDict()
 
 
 def _entropy(s: str) -> float:
@@ -42,6 +56,16 @@ def _entropy(s: str) -> float:
     return -sum((c / length) * math.log2(c / length) for c in counts.values())
 
 
+def _secrets_fingerprint(rows: list[tuple[Any, dict[str, Any] | None]]) -> str:
+    """Digest of every container's encrypted secrets (ciphertexts, not values)."""
+    digest = hashlib.sha256()
+    for container_id, encrypted in sorted(rows, key=lambda r: str(r[0])):
+        digest.update(str(container_id).encode())
+        for key, enc_val in sorted((encrypted or {}).items()):
+            digest.update(f"\0{key}\0{enc_val}".encode())
+    return digest.hexdigest()
+
+
 async def _load_project_secrets(context: dict[str, Any]) -> dict[str, str]:
     """Load {plaintext_value: env_key_name} for every secret in the project."""
     project_id = context.get("project_id")
@@ -57,19 +81,26 @@ async def _load_project_secrets(context: dict[str, Any]) -> dict[str, str]:
         get_deployment_encryption_service,
     )
 
+    result = await db.execute(
+        select(Container.id, Container.encrypted_secrets).where(Container.project_id == project_id)
+    )
+    rows = [(row[0], row[1]) for row in result.all()]
+    fingerprint = _secrets_fingerprint(rows)
+    scope = str(project_id)
+    cached = _project_maps.get(scope)
+    if cached is not None and cached[0] == fingerprint:
+        _project_maps.move_to_end(scope)
+        return cached[1]
+
     try:
         enc = get_deployment_encryption_service()
     except Exception:
         logger.debug("[secret_scrubber] no encryption service available")
         return {}
 
-    result = await db.execute(
-        select(Container).where(Container.project_id == project_id)
-    )
     mapping: dict[str, str] = {}
-    for container in result.scalars().all():
-        encrypted = container.encrypted_secrets or {}
-        for key, enc_val in encrypted.items():
+    for _container_id, encrypted in rows:
+        for key, enc_val in (encrypted or {}).items():
             if not isinstance(enc_val, str) or not enc_val:
                 continue
             try:
@@ -80,6 +111,11 @@ async def _load_project_secrets(context: dict[str, Any]) -> dict[str, str]:
                 continue
             if plaintext and len(plaintext) >= _MIN_LEN:
                 mapping[plaintext] = key
+
+    _project_maps[scope] = (fingerprint, mapping)
+    _project_maps.move_to_end(scope)
+    while len(_project_maps) > _MAX_CACHED_PROJECTS:
+        _project_maps.popitem(last=False)
     return mapping
 
 
@@ -93,37 +129,65 @@ async def get_scrub_map(context: dict[str, Any]) -> dict[str, str]:
     return mapping
 
 
-def scrub_text(text: str, scrub_map: dict[str, str]) -> str:
-    """Replace every secret substring in *text* with a reference marker.
+class SecretScrubber:
+    """A secret set compiled into one regex, longest values first.
 
     Heuristics to avoid both false positives and false negatives:
       * values shorter than ``_SCRUB_MIN_LEN`` are skipped (likely common words)
       * values with Shannon entropy below ``_ENTROPY_FLOOR`` are skipped
       * mid-length / mid-entropy values use ``\\b`` word boundaries
       * long or high-entropy values use unambiguous substring contains
+
+    At each position the longest secret that matches wins, so a secret
+    nested in a longer one never splits the longer one's marker.
+    """
+
+    def __init__(self, scrub_map: dict[str, str]) -> None:
+        self._markers: dict[str, str] = {}
+        alternatives: list[str] = []
+        for value in sorted(scrub_map, key=len, reverse=True):
+            if not value or len(value) < _SCRUB_MIN_LEN:
+                continue
+            ent = _entropy(value)
+            if ent < _ENTROPY_FLOOR:
+                continue
+            self._markers[value] = f"«secret:{scrub_map[value]}»"
+            if len(value) > _NAIVE_LEN or ent >= _ENTROPY_CEILING:
+                alternatives.append(re.escape(value))
+            else:
+                alternatives.append(rf"\b{re.escape(value)}\b")
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def scrub(self, text: str) -> str:
+        if not text or self._pattern is None:
+            return text
+        return self._pattern.sub(self._marker, text)
+
+    def _marker(self, match: re.Match[str]) -> str:
+        return self._markers[match.group(0)]
+
+
+@lru_cache(maxsize=64)
+def _compile(items: frozenset[tuple[str, str]]) -> SecretScrubber:
+    return SecretScrubber(dict(items))
+
+
+def get_scrubber(scrub_map: dict[str, str]) -> SecretScrubber:
+    """The compiled scrubber for ``scrub_map``, shared across calls and tasks."""
+    return _compile(frozenset(scrub_map.items()))
+
+
+def scrub_text(text: str, scrub_map: dict[str, str]) -> str:
+    """Replace every secret substring in *text* with a reference marker.
+
+    See :class:`SecretScrubber` for which values are matched and how.
     """
     if not text or not scrub_map:
         return text
-    out = text
-    entropy_cache: dict[str, float] = {}
-    # Longest first so nested/overlapping secrets don't corrupt markers.
-    for value in sorted(scrub_map, key=len, reverse=True):
-        if not value or len(value) < _SCRUB_MIN_LEN:
-            continue
-        ent = entropy_cache.get(value)
-        if ent is None:
-            ent = _entropy(value)
-            entropy_cache[value] = ent
-        if ent < _ENTROPY_FLOOR:
-            continue
-        marker = f"«secret:{scrub_map[value]}»"
-        if len(value) > _NAIVE_LEN or ent >= _ENTROPY_CEILING:
-            if value in out:
-                out = out.replace(value, marker)
-        else:
-            pattern = re.compile(rf"\b{re.escape(value)}\b")
-            out = pattern.sub(marker, out)
-    return out
+    return get_scrubber(scrub_map).scrub(text)
 
 
 async def scrub_tool_result(result: Any, context: dict[str, Any]) -> Any:
@@ -133,12 +197,15 @@ async def scrub_tool_result(result: Any, context: dict[str, Any]) -> Any:
     scrub_map = await get_scrub_map(context)
     if not scrub_map:
         return result
-    for key in ("output", "stdout", "stderr", "message"):
+    scrubber = get_scrubber(scrub_map)
+    if not scrubber:
+        return result
+    for key in ("output", "new_output", "stdout", "stderr", "message"):
         if isinstance(result.get(key), str):
-            result[key] = scrub_text(result[key], scrub_map)
+            result[key] = scrubber.scrub(result[key])
     details = result.get("details")
     if isinstance(details, dict):
-        for key in ("output", "stdout", "stderr"):
+        for key in ("output", "new_output", "stdout", "stderr"):
             if isinstance(details.get(key), str):
-                details[key] = scrub_text(details[key], scrub_map)
+                details[key] = scrubber.scrub(details[key])
     return result
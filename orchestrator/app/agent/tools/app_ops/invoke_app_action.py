@@ -217,6 +217,7 @@ def register_invoke_app_action_tool(registry):
             # One-shot dispatch; the action_dispatcher does not retain handles
             # or open streams across the call boundary.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "invoke_app_action", "parameters": {'
                 '"app_instance_id": "00000000-0000-0000-0000-000000000001", '
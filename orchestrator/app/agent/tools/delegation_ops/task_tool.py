@@ -810,6 +810,7 @@ def register_delegation_ops_tools(registry: ToolRegistry) -> None:
             state_serializable=True,
             # Cancels a live child agent task — external runtime state.
             holds_external_state=True,
+            mutates_files=False,
         )
     )
 
@@ -840,6 +841,7 @@ def register_delegation_ops_tools(registry: ToolRegistry) -> None:
             state_serializable=True,
             # Pure inspection of the delegation registry; reads only.
             holds_external_state=False,
+            mutates_files=False,
         )
     )
 
@@ -12,11 +12,14 @@ Strategies (in order):
     2. **Flexible**    -- line-by-line whitespace-normalized sliding
        window. Replaces the ORIGINAL slice so indentation is preserved
        on the replacement lines.
-    3. **Fuzzy (Levenshtein)** -- slides a window of length
-       ``len(old_str)`` (character-based) across the file, computes
-       Levenshtein distance on each window, and replaces when the best
-       window has ``distance / len(old_str) <= 0.10`` AND is uniquely
-       best (no tie). Minimum needle length for fuzzy: 10 characters.
+    3. **Fuzzy (Levenshtein)** -- considers every window of length
+       ``len(old_str)`` (character-based) in the file and replaces when
+       the best window has ``distance / len(old_str) <= 0.10`` AND is
+       uniquely best (no tie). Minimum needle length for fuzzy: 10
+       characters. Windows are prefiltered by exact needle pieces and
+       scored with Myers' bit-parallel edit distance, so the cost is
+       roughly linear in the file size rather than quadratic in the
+       needle length.
 
 If all three strategies fail, :func:`apply_edit` optionally invokes an
 LLM repair pass (see :func:`llm_repair`). The repair model is asked to
@@ -32,6 +35,7 @@ runs.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
@@ -262,9 +266,9 @@ def _levenshtein(a: str, b: str) -> int:
     """
     Compute the Levenshtein distance between ``a`` and ``b``.
 
-    Uses the standard two-row dynamic programming formulation -- adequate
-    for the window sizes fuzzy match targets (bounded by the complexity
-    guard below).
+    Uses the standard two-row dynamic programming formulation. The fuzzy
+    strategy scores windows with :func:`_bounded_distance` instead; this
+    is kept as the reference implementation it is tested against.
     """
     if a == b:
         return 0
@@ -289,6 +293,177 @@ def _levenshtein(a: str, b: str) -> int:
     return prev[len(b)]
 
 
+# Upper bound on bit-parallel steps one fuzzy pass may spend scanning
+# candidate regions -- a couple of seconds of CPU at most. Beyond it the
+# strategy declines instead of stalling the edit.
+_FUZZY_MAX_STEPS = 2_000_000
+
+
+def _char_masks(needle: str) -> dict[str, int]:
+    """Bit ``j`` of ``masks[c]`` is set when ``needle[j] == c``."""
+    masks: dict[str, int] = {}
+    for j, ch in enumerate(needle):
+        masks[ch] = masks.get(ch, 0) | (1 << j)
+    return masks
+
+
+def _substring_distances(masks: dict[str, int], needle_len: int, text: str) -> list[int]:
+    """
+    For each position of ``text``, the smallest Levenshtein distance between
+    the needle and any substring of ``text`` ending there.
+
+    Myers' bit-parallel approximate string matching: one column of the DP
+    matrix is kept as vertical +1/-1 delta bit vectors, so each character
+    of ``text`` costs a handful of integer operations instead of
+    ``needle_len`` cell updates. A window's own distance is never below
+    the value at its last character, which makes this a one-pass lower
+    bound for every window in a region.
+    """
+    full = (1 << needle_len) - 1
+    high = 1 << (needle_len - 1)
+    pv, mv = full, 0
+    score = needle_len
+    out = []
+    for ch in text:
+        eq = masks.get(ch, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & full) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        out.append(score)
+        ph = (ph << 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return out
+
+
+def _bounded_distance(masks: dict[str, int], needle_len: int, window: str, bound: int) -> int:
+    """
+    Levenshtein distance between the needle behind ``masks`` and ``window``.
+
+    Same recurrence as :func:`_substring_distances` with Hyyrö's change for
+    global distance (the whole window is aligned, not a substring of it).
+    Returns early with a value above ``bound`` once the distance can no
+    longer come down to ``bound``: each remaining character lowers the
+    score by at most one.
+    """
+    full = (1 << needle_len) - 1
+    high = 1 << (needle_len - 1)
+    pv, mv = full, 0
+    score = needle_len
+    remaining = len(window)
+    for ch in window:
+        eq = masks.get(ch, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & full) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        remaining -= 1
+        if score - remaining > bound:
+            return bound + 1
+        # Shifting in a 1 encodes the first DP row (0, 1, 2, ...).
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def _distance_limit(needle_len: int) -> int:
+    """Largest distance whose score ``distance / needle_len`` passes the threshold."""
+    limit = int(needle_len * FUZZY_MATCH_THRESHOLD)
+    while (limit + 1) / needle_len <= FUZZY_MATCH_THRESHOLD:
+        limit += 1
+    while limit > 0 and limit / needle_len > FUZZY_MATCH_THRESHOLD:
+        limit -= 1
+    return limit
+
+
+def _candidate_ranges(content: str, needle: str, limit: int) -> list[tuple[int, int]] | None:
+    """
+    Window starts that can be within ``limit`` edits of ``needle``.
+
+    Partition filter: split the needle into ``limit + 1`` pieces. At most
+    ``limit`` edits touch at most ``limit`` pieces, so a window within
+    range contains one piece verbatim, shifted by at most ``limit`` from
+    its offset in the needle. Pieces are located with ``str.find``, so
+    only windows near text the needle actually shares are looked at.
+
+    Returns merged, inclusive ``(first, last)`` start ranges, or ``None``
+    when scanning them would take more than :data:`_FUZZY_MAX_STEPS`.
+    """
+    needle_len = len(needle)
+    last_start = len(content) - needle_len
+    pieces = limit + 1
+    # Every range costs at least needle_len steps to scan.
+    max_ranges = _FUZZY_MAX_STEPS // needle_len
+
+    ranges: list[tuple[int, int]] = []
+    for p in range(pieces):
+        offset = p * needle_len // pieces
+        piece = needle[offset : (p + 1) * needle_len // pieces]
+        pos = content.find(piece)
+        while pos != -1:
+            first = max(0, pos - offset - limit)
+            last = min(last_start, pos - offset + limit)
+            if first <= last:
+                ranges.append((first, last))
+                if len(ranges) > max_ranges:
+                    return None
+            pos = content.find(piece, pos + 1)
+
+    ranges.sort()
+    merged: list[tuple[int, int]] = []
+    for first, last in ranges:
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+
+    steps = sum(last - first + needle_len for first, last in merged)
+    return merged if steps <= _FUZZY_MAX_STEPS else None
+
+
+def _best_window(
+    content: str,
+    masks: dict[str, int],
+    needle_len: int,
+    ranges: list[tuple[int, int]],
+    bound: int,
+) -> tuple[int, int]:
+    """
+    Lowest-distance window start among ``ranges`` with distance <= ``bound``.
+
+    Returns ``(index, ties)``; ``index`` is -1 when no window is in range.
+    """
+    best_dist = bound + 1
+    best_idx = -1
+    ties = 0
+    for first, last in ranges:
+        lower = _substring_distances(masks, needle_len, content[first : last + needle_len])
+        for i in range(first, last + 1):
+            if lower[i - first + needle_len - 1] > best_dist:
+                continue
+            dist = _bounded_distance(masks, needle_len, content[i : i + needle_len], best_dist)
+            if dist < best_dist:
+                best_dist = dist
+                best_idx = i
+                ties = 1
+            elif dist == best_dist and best_idx >= 0:
+                ties += 1
+    return best_idx, ties
+
+
 def _strategy_fuzzy(
     content: str,
     old_str: str,
@@ -297,43 +472,47 @@ def _strategy_fuzzy(
     """
     Character-window Levenshtein fuzzy match.
 
-    Slides a window of exactly ``len(old_str)`` characters across
-    ``content``, scores each window by distance / needle length, and
-    only applies a replacement when:
+    Scores windows of exactly ``len(old_str)`` characters of ``content``
+    by distance / needle length, and only applies a replacement when:
 
         * there is at least one candidate under the 10% threshold, AND
         * the lowest-scoring candidate is strictly better than every
           other candidate (i.e., no ties at the best score).
 
+    The search widens its distance bound in steps (0, 1, 3, 7, ... up to
+    the threshold): small bounds split the needle into few, long pieces
+    that rarely occur, so a typical near-miss is found after looking at a
+    handful of windows. The first bound with any window in it contains
+    the best window and all of its ties, so the outcome is the same as
+    scoring every window.
+
     Returns ``(None, 0)`` when the strategy doesn't apply (needle too
-    short, no candidates, ambiguous best).
+    short, no candidates, too many candidates to score, ambiguous best).
     """
     needle_len = len(old_str)
-    if needle_len < FUZZY_MIN_NEEDLE_LEN:
+    if needle_len < FUZZY_MIN_NEEDLE_LEN or len(content) < needle_len:
         return None, 0
 
-    # Soft complexity guard so a huge file doesn't freeze the worker.
-    if len(content) * (needle_len**2) > 400_000_000:
-        return None, 0
-
-    best_score = float("inf")
-    best_idx = -1
-    ties = 0
+    limit = _distance_limit(needle_len)
+    masks = _char_masks(old_str)
+    bound = 0
+    while True:
+        ranges = _candidate_ranges(content, old_str, bound)
+        if ranges is None:
+            logger.debug(
+                "[FUZZY-EDIT] Skipping fuzzy match: too many candidate windows for a "
+                "%d-char needle in %d chars",
+                needle_len,
+                len(content),
+            )
+            return None, 0
+        best_idx, ties = _best_window(content, masks, needle_len, ranges, bound)
+        if best_idx >= 0:
+            break
+        if bound >= limit:
+            return None, 0
+        bound = min(limit, 2 * bound + 1)
 
-    span = len(content) - needle_len
-    for i in range(span + 1):
-        window = content[i : i + needle_len]
-        dist = _levenshtein(window, old_str)
-        score = dist / needle_len
-        if score < best_score:
-            best_score = score
-            best_idx = i
-            ties = 1
-        elif score == best_score:
-            ties += 1
-
-    if best_idx < 0 or best_score > FUZZY_MATCH_THRESHOLD:
-        return None, 0
     if ties > 1:
         return None, ties
 
@@ -371,6 +550,9 @@ async def apply_edit(
     Run the full strategy pipeline against ``content`` and return a
     successful :class:`EditResult`, or raise :class:`EditError`.
 
+    The strategies are CPU-bound on large files, so they run in a worker
+    thread to keep the event loop (and other agents' streams) responsive.
+
     Args:
         content: Current file content.
         old_str: Text to search for.
@@ -404,7 +586,8 @@ async def apply_edit(
         )
 
     try:
-        return _run_pipeline(
+        return await asyncio.to_thread(
+            _run_pipeline,
             content=content,
             old_str=old_str,
             new_str=new_str,
@@ -441,7 +624,8 @@ async def apply_edit(
             ) from initial_error
 
         try:
-            result = _run_pipeline(
+            result = await asyncio.to_thread(
+                _run_pipeline,
                 content=content,
                 old_str=suggestion.old_str,
                 new_str=suggestion.new_str,
@@ -2,10 +2,13 @@
 Read Many Files Tool
 
 Batch-read multiple files whose paths match one or more glob patterns.
-Uses the orchestrator's ``list_tree`` to enumerate candidate files (honoring
-``.gitignore`` and baseline tree exclusions) and ``read_files_batch`` to
-fetch contents. Applies per-file and global byte budgets so very large
-files or very large match sets cannot blow up the agent context.
+Uses the orchestrator's ``list_tree`` (via the shared file-tree snapshot) to
+enumerate candidate files (honoring ``.gitignore`` and baseline tree
+exclusions) and ``read_files_stream`` to fetch contents. The per-file and
+global byte budgets and the binary-extension filter are enforced by the
+orchestrator where the bytes are read, so very large files or very large
+match sets cannot blow up the agent context — nor move megabytes that would
+be thrown away.
 """
 
 from __future__ import annotations
@@ -16,6 +19,8 @@ from pathlib import PurePosixPath
 from typing import Any
 
 from ....services.orchestration import get_orchestrator
+from ....services.orchestration.file_tree import get_file_tree_service
+from ....services.orchestration.read_budget import ReadBudget
 from ..output_formatter import (
     error_output,
     format_file_size,
@@ -163,15 +168,6 @@ def _matches_any(rel_path: str, patterns: list[str]) -> bool:
     return any(_match_pattern(rel_path, pat) for pat in patterns)
 
 
-def _is_binary_extension(rel_path: str) -> bool:
-    """Return True if the file extension is in the binary deny-list."""
-    lower = rel_path.lower()
-    dot = lower.rfind(".")
-    if dot == -1:
-        return False
-    return lower[dot:] in BINARY_EXTENSIONS
-
-
 async def read_many_files_tool(params: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
     """
     Batch-read files matching a set of glob patterns.
@@ -257,7 +253,8 @@ async def read_many_files_tool(params: dict[str, Any], context: dict[str, Any])
     orchestrator = get_orchestrator()
 
     try:
-        tree = await orchestrator.list_tree(
+        tree = await get_file_tree_service().list_tree(
+            orchestrator,
             user_id=user_id,
             project_id=project_id,
             container_name=container_name,
@@ -285,9 +282,6 @@ async def read_many_files_tool(params: dict[str, Any], context: dict[str, Any])
             continue
         if not _matches_any(normalized, include):
             continue
-        if _is_binary_extension(normalized):
-            skipped.append({"path": normalized, "reason": "binary file extension"})
-            continue
 
         matched_paths.append(normalized)
 
@@ -296,89 +290,53 @@ async def read_many_files_tool(params: dict[str, Any], context: dict[str, Any])
     files_out: list[dict[str, Any]] = []
     total_bytes = 0
     truncated_overall = False
+    visited = 0
 
-    # Batch-read in groups so a single huge batch can't stall us.
-    batch_size = 32
-    for start in range(0, len(matched_paths), batch_size):
-        if total_bytes >= max_total_bytes:
-            truncated_overall = True
-            remaining = matched_paths[start:]
-            for path in remaining:
-                skipped.append(
-                    {
-                        "path": path,
-                        "reason": "max_total_bytes reached before read",
-                    }
-                )
-            break
-
-        batch = matched_paths[start : start + batch_size]
-        try:
-            successes, errors = await orchestrator.read_files_batch(
-                user_id=user_id,
-                project_id=project_id,
-                container_name=container_name,
-                paths=batch,
-                subdir=container_directory,
-            )
-        except Exception as exc:
-            logger.warning("[READ-MANY] read_files_batch failed for batch: %s", exc)
-            for path in batch:
-                skipped.append({"path": path, "reason": f"read batch failed: {exc}"})
-            continue
-
-        for err_path in errors:
-            skipped.append({"path": err_path, "reason": "read failed"})
-
-        by_path = {rec.get("path"): rec for rec in successes}
-        for path in batch:
-            rec = by_path.get(path)
-            if rec is None:
+    budget = ReadBudget(
+        max_bytes_per_file=max_bytes_per_file,
+        max_total_bytes=max_total_bytes,
+        skip_extensions=BINARY_EXTENSIONS,
+    )
+    try:
+        async for rec in orchestrator.read_files_stream(
+            user_id=user_id,
+            project_id=project_id,
+            container_name=container_name,
+            paths=matched_paths,
+            budget=budget,
+            subdir=container_directory,
+        ):
+            visited += 1
+            path = rec["path"]
+            if "error" in rec:
+                skipped.append({"path": path, "reason": rec["error"]})
                 continue
 
-            content = rec.get("content") or ""
-            raw_size = int(rec.get("size") or len(content))
-            file_truncated = False
-
-            if len(content.encode("utf-8", errors="replace")) > max_bytes_per_file:
-                encoded = content.encode("utf-8", errors="replace")[:max_bytes_per_file]
-                content = encoded.decode("utf-8", errors="replace")
-                file_truncated = True
-
-            if total_bytes + len(content.encode("utf-8", errors="replace")) > max_total_bytes:
-                remaining_budget = max(0, max_total_bytes - total_bytes)
-                if remaining_budget == 0:
-                    truncated_overall = True
-                    skipped.append(
-                        {
-                            "path": path,
-                            "reason": "max_total_bytes reached",
-                        }
-                    )
-                    continue
-                encoded = content.encode("utf-8", errors="replace")[:remaining_budget]
-                content = encoded.decode("utf-8", errors="replace")
-                file_truncated = True
-                truncated_overall = True
-
-            byte_len = len(content.encode("utf-8", errors="replace"))
-            total_bytes += byte_len
+            content = rec["content"]
+            total_bytes += len(content.encode("utf-8", errors="replace"))
             lines = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
-            if not content:
-                lines = 0
-
             files_out.append(
                 {
                     "path": path,
                     "content": content,
                     "lines": lines,
-                    "size": raw_size,
-                    "truncated": file_truncated,
+                    "size": rec["size"],
+                    "truncated": rec["truncated"],
                 }
             )
-
-            if total_bytes >= max_total_bytes:
-                truncated_overall = True
+    except Exception as exc:
+        logger.warning("[READ-MANY] read_files_stream failed: %s", exc)
+        for path in matched_paths[visited:]:
+            skipped.append({"path": path, "reason": f"read failed: {exc}"})
+        visited = len(matched_paths)
+
+    # The stream stops once the total budget is spent.
+    if visited < len(matched_paths):
+        truncated_overall = True
+        for path in matched_paths[visited:]:
+            skipped.append({"path": path, "reason": "max_total_bytes reached before read"})
+    elif total_bytes >= max_total_bytes:
+        truncated_overall = True
 
     if not files_out and not skipped:
         return success_output(
@@ -486,6 +444,8 @@ def register_read_many_files_tool(registry) -> None:
             state_serializable=True,
             # Each call is a fresh batch read; no persistent file handles.
             holds_external_state=False,
+            # Batch read with no side effects.
+            read_only=True,
             examples=[
                 '{"tool_name": "read_many_files", "parameters": {"include": ["**/*.py"]}}',
                 '{"tool_name": "read_many_files", "parameters": {"include": ["src/**/*.ts", "src/**/*.tsx"], "exclude": ["**/*.test.ts"]}}',
@@ -225,6 +225,8 @@ def register_read_write_tools(registry):
             state_serializable=True,
             # No persistent handle; each call returns fresh content.
             holds_external_state=False,
+            # Same path, same content until something writes it.
+            read_only=True,
             examples=[
                 '{"tool_name": "read_file", "parameters": {"file_path": "package.json"}}',
                 '{"tool_name": "read_file", "parameters": {"file_path": "src/components/Header.jsx"}}',
@@ -276,6 +276,7 @@ def register_view_image_tool(registry) -> None:
             state_serializable=True,
             # No persistent image session; one-shot read.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "view_image", "parameters": {"path": "design/mockup.png"}}',
                 '{"tool_name": "view_image", "parameters": {"path": "assets/logo.jpg", "detail": "high"}}',
@@ -218,6 +218,8 @@ def register_git_blame_tool(registry) -> None:
             state_serializable=True,
             # Read-only git invocation.
             holds_external_state=False,
+            # Annotates history; writes nothing.
+            read_only=True,
             examples=[
                 '{"tool_name": "git_blame", "parameters": {"file_path": "src/App.jsx"}}',
                 '{"tool_name": "git_blame", "parameters": {"file_path": "README.md", "line_start": 1, "line_end": 10}}',
@@ -267,6 +267,8 @@ def register_git_diff_tool(registry) -> None:
             state_serializable=True,
             # Read-only git invocation.
             holds_external_state=False,
+            # Diff output only; the index and worktree are untouched.
+            read_only=True,
             examples=[
                 '{"tool_name": "git_diff", "parameters": {}}',
                 '{"tool_name": "git_diff", "parameters": {"staged": true}}',
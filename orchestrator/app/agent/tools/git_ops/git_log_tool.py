@@ -228,6 +228,8 @@ def register_git_log_tool(registry) -> None:
             state_serializable=True,
             # Read-only git invocation; no persistent index.
             holds_external_state=False,
+            # History query only.
+            read_only=True,
             examples=[
                 '{"tool_name": "git_log", "parameters": {"max_count": 10}}',
                 '{"tool_name": "git_log", "parameters": {"path": "src/App.jsx", "max_count": 5}}',
@@ -271,6 +271,8 @@ def register_git_status_tool(registry) -> None:
             state_serializable=True,
             # Read-only git invocation; no persistent state.
             holds_external_state=False,
+            # Status query only.
+            read_only=True,
             examples=[
                 '{"tool_name": "git_status", "parameters": {}}',
                 '{"tool_name": "git_status", "parameters": {"include_untracked": false}}',
@@ -451,6 +451,7 @@ CONTAINER_TOOLS: list[Tool] = [
         state_serializable=True,
         # Synchronous orchestrator call; no in-tool handle.
         holds_external_state=False,
+        mutates_files=False,
         examples=[
             '{"tool_name": "graph_start_container", "parameters": {"container_id": "abc-123-def"}}'
         ],
@@ -471,6 +472,7 @@ CONTAINER_TOOLS: list[Tool] = [
         state_serializable=True,
         # Synchronous orchestrator call; no in-tool handle.
         holds_external_state=False,
+        mutates_files=False,
         examples=[
             '{"tool_name": "graph_stop_container", "parameters": {"container_id": "abc-123-def"}}'
         ],
@@ -485,6 +487,7 @@ CONTAINER_TOOLS: list[Tool] = [
         state_serializable=True,
         # Synchronous orchestrator bring-up; no in-tool handle.
         holds_external_state=False,
+        mutates_files=False,
         examples=['{"tool_name": "graph_start_all", "parameters": {}}'],
     ),
     Tool(
@@ -497,6 +500,7 @@ CONTAINER_TOOLS: list[Tool] = [
         state_serializable=True,
         # Synchronous orchestrator teardown; no in-tool handle.
         holds_external_state=False,
+        mutates_files=False,
         examples=['{"tool_name": "graph_stop_all", "parameters": {}}'],
     ),
     Tool(
@@ -509,6 +513,7 @@ CONTAINER_TOOLS: list[Tool] = [
         state_serializable=True,
         # Pure observation; no in-tool state.
         holds_external_state=False,
+        mutates_files=False,
         examples=['{"tool_name": "graph_container_status", "parameters": {}}'],
     ),
 ]
@@ -9,6 +9,7 @@ import logging
 from typing import Any
 from uuid import UUID, uuid4
 
+from ....services.project_context_cache import invalidate_project_context
 from ..output_formatter import error_output, success_output
 from ..registry import Tool, ToolCategory
 
@@ -331,6 +332,7 @@ async def graph_remove_item_executor(
                     message=f"Container {item_id} not found", suggestion="Check the item_id"
                 )
             await db.commit()
+            invalidate_project_context(project_id, "containers")
             return success_output(message=f"Removed container {item_id}")
 
         elif item_type == "connection":
@@ -404,6 +406,7 @@ GRID_TOOLS: list[Tool] = [
         state_serializable=True,
         # Single DB write; no in-tool persistent handle.
         holds_external_state=False,
+        mutates_files=False,
         examples=[
             '{"tool_name": "graph_add_container", "parameters": {"name": "frontend", "container_type": "base", "port": 3000}}',
             '{"tool_name": "graph_add_container", "parameters": {"name": "postgres", "container_type": "service", "service_slug": "postgres"}}',
@@ -430,6 +433,7 @@ GRID_TOOLS: list[Tool] = [
         state_serializable=True,
         # Single DB write; no in-tool state.
         holds_external_state=False,
+        mutates_files=False,
         examples=[
             '{"tool_name": "graph_add_browser_preview", "parameters": {"container_id": "abc-123", "position_x": 400}}'
         ],
@@ -467,6 +471,7 @@ GRID_TOOLS: list[Tool] = [
         state_serializable=True,
         # Single DB write; no in-tool state.
         holds_external_state=False,
+        mutates_files=False,
         examples=[
             '{"tool_name": "graph_add_connection", "parameters": {"source_container_id": "abc", "target_container_id": "def", "connector_type": "database"}}'
         ],
@@ -492,6 +497,7 @@ GRID_TOOLS: list[Tool] = [
         state_serializable=True,
         # Single DB delete; no in-tool state.
         holds_external_state=False,
+        mutates_files=False,
         examples=[
             '{"tool_name": "graph_remove_item", "parameters": {"item_type": "container", "item_id": "abc-123"}}'
         ],
@@ -143,5 +143,6 @@ def register_assign_mcp_tool(registry):
             category=ToolCategory.PROJECT,
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
         )
     )
@@ -133,5 +133,6 @@ def register_assign_skill_tool(registry):
             category=ToolCategory.PROJECT,
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
         )
     )
@@ -317,5 +317,6 @@ def register_attach_schedule_tool(registry):
             category=ToolCategory.PROJECT,
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
         )
     )
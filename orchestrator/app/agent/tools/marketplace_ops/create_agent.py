@@ -206,5 +206,6 @@ def register_create_agent_tool(registry):
             state_serializable=True,
             # Database insert — no socket, MCP stream, or PTY held open.
             holds_external_state=False,
+            mutates_files=False,
         )
     )
@@ -212,6 +212,7 @@ def register_list_user_resources_tool(registry):
             category=ToolCategory.PROJECT,
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
         )
     )
 
@@ -149,5 +149,6 @@ def register_request_grant_tool(registry):
             # The PendingUserInputManager singleton holds the unresolved
             # request; the tool handle out doesn't itself own a socket.
             holds_external_state=False,
+            mutates_files=False,
         )
     )
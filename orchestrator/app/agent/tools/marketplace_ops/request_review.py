@@ -347,5 +347,6 @@ def register_request_review_tool(registry):
             # / pty held open. Outputs are JSON-clean.
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
         )
     )
@@ -166,5 +166,6 @@ def register_update_agent_tool(registry):
             # Patch dict in, ack dict out.
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
         )
     )
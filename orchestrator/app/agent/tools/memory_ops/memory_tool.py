@@ -740,6 +740,7 @@ def register_memory_ops_tools(registry) -> None:
             state_serializable=True,
             # Reads from a markdown file on disk; no in-memory cache.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "memory_read", "parameters": {}}',
                 '{"tool_name": "memory_read", "parameters": {"section": "Conventions"}}',
@@ -2,8 +2,8 @@
 Glob Tool
 
 Fast file pattern matching against the project tree. Uses the orchestrator's
-``list_tree`` to enumerate candidate files (with ``.gitignore`` and baseline
-exclusions already applied), then filters them with ``fnmatch`` /
+``list_tree`` (via the shared file-tree snapshot) to enumerate candidate files
+(with ``.gitignore`` and baseline exclusions already applied), then filters them with ``fnmatch`` /
 ``pathlib.PurePath.match`` and sorts by modification time or name.
 """
 
@@ -15,6 +15,7 @@ from pathlib import PurePosixPath
 from typing import Any
 
 from ....services.orchestration import get_orchestrator
+from ....services.orchestration.file_tree import get_file_tree_service
 from ..output_formatter import (
     error_output,
     pluralize,
@@ -144,7 +145,8 @@ async def glob_tool(params: dict[str, Any], context: dict[str, Any]) -> dict[str
 
     try:
         orchestrator = get_orchestrator()
-        tree = await orchestrator.list_tree(
+        tree = await get_file_tree_service().list_tree(
+            orchestrator,
             user_id=user_id,
             project_id=project_id,
             container_name=container_name,
@@ -275,6 +277,8 @@ def register_glob_tool(registry) -> None:
             state_serializable=True,
             # Stateless directory traversal; no persistent index held.
             holds_external_state=False,
+            # Path listing only.
+            read_only=True,
             examples=[
                 '{"tool_name": "glob", "parameters": {"pattern": "**/*.py"}}',
                 '{"tool_name": "glob", "parameters": {"pattern": "*.ts", "path": "src", "recursive": false}}',
@@ -1,9 +1,12 @@
 """
 Grep Tool
 
-Content search powered by ``ripgrep``. Shells out to ``rg`` via the
-orchestrator's ``execute_command`` interface so the tool works uniformly
-across every deployment backend.
+Content search over the project tree. Answers from the project's trigram
+index (``services/code_search``) once it has been built, which narrows a
+regex to candidate files before verifying it; until then, or for requests
+the index cannot answer, shells out to ``rg`` via the orchestrator's
+``execute_command`` interface so the tool works uniformly across every
+deployment backend.
 
 Supports three output modes:
     - ``files_with_matches`` (default): returns a list of paths containing
@@ -20,6 +23,7 @@ import logging
 import re
 from typing import Any
 
+from ....services.code_search import SearchRequest, get_code_search_service
 from ....services.orchestration import get_orchestrator
 from ..output_formatter import (
     error_output,
@@ -255,6 +259,43 @@ async def grep_tool(params: dict[str, Any], context: dict[str, Any]) -> dict[str
     project_id = str(context["project_id"])
     container_name = context.get("container_name")
 
+    try:
+        orchestrator = get_orchestrator()
+        indexed = await get_code_search_service().search(
+            orchestrator,
+            user_id,
+            project_id,
+            container_name,
+            SearchRequest(
+                pattern=pattern,
+                output_mode=output_mode,
+                path=path_param,
+                glob=include_glob,
+                file_type=file_type,
+                ignore_case=i_flag,
+                multiline=multiline,
+                before=max(context_both or context_before or 0, 0),
+                after=max(context_both or context_after or 0, 0),
+                max_content_bytes=MAX_CONTENT_BYTES,
+            ),
+        )
+    except Exception as exc:
+        logger.warning("[GREP] index search failed, using ripgrep: %s", exc)
+        indexed = None
+
+    if indexed is not None:
+        return _format_result(
+            pattern=pattern,
+            output_mode=output_mode,
+            files=indexed.files,
+            counts=indexed.counts,
+            matches=indexed.matches,
+            truncated=indexed.truncated,
+            head_limit=head_limit,
+            offset=offset,
+            source="index",
+        )
+
     argv = _build_rg_args(
         pattern=pattern,
         path=path_param,
@@ -272,7 +313,6 @@ async def grep_tool(params: dict[str, Any], context: dict[str, Any]) -> dict[str
     logger.info("[GREP] argv=%r", argv)
 
     try:
-        orchestrator = get_orchestrator()
         raw = await orchestrator.execute_command(
             user_id=user_id,
             project_id=project_id,
@@ -300,12 +340,44 @@ async def grep_tool(params: dict[str, Any], context: dict[str, Any]) -> dict[str
         raw = encoded.decode("utf-8", errors="replace") + "\n[truncated]"
         truncated_overall = True
 
-    payload: dict[str, Any]
-
+    files: list[str] = []
+    counts: dict[str, int] = {}
+    matches: list[dict[str, Any]] = []
     if output_mode == "files_with_matches":
         files = _parse_files_with_matches(raw)
+    elif output_mode == "count":
+        counts = _parse_count_output(raw)
+    else:
+        matches = _parse_json_output(raw)
+
+    return _format_result(
+        pattern=pattern,
+        output_mode=output_mode,
+        files=files,
+        counts=counts,
+        matches=matches,
+        truncated=truncated_overall,
+        head_limit=head_limit,
+        offset=offset,
+        source="ripgrep",
+    )
+
+
+def _format_result(
+    *,
+    pattern: str,
+    output_mode: str,
+    files: list[str],
+    counts: dict[str, int],
+    matches: list[dict[str, Any]],
+    truncated: bool,
+    head_limit: int | None,
+    offset: int,
+    source: str,
+) -> dict[str, Any]:
+    """Paginate search results and wrap them in the tool's output envelope."""
+    if output_mode == "files_with_matches":
         sliced = files[offset : offset + head_limit] if head_limit else files[offset:]
-        payload = {"files": sliced}
         msg = f"Found matches in {pluralize(len(files), 'file')}"
         if head_limit and (offset or len(sliced) < len(files)):
             msg += f" (showing {len(sliced)} of {len(files)})"
@@ -316,13 +388,13 @@ async def grep_tool(params: dict[str, Any], context: dict[str, Any]) -> dict[str
                 "output_mode": output_mode,
                 "total": len(files),
                 "returned": len(sliced),
-                "truncated": truncated_overall,
+                "truncated": truncated,
+                "source": source,
             },
-            **payload,
+            files=sliced,
         )
 
     if output_mode == "count":
-        counts = _parse_count_output(raw)
         items = list(counts.items())
         sliced_items = items[offset : offset + head_limit] if head_limit else items[offset:]
         sliced_counts = dict(sliced_items)
@@ -337,12 +409,12 @@ async def grep_tool(params: dict[str, Any], context: dict[str, Any]) -> dict[str
                 "total_matches": total_hits,
                 "total_files": len(counts),
                 "returned_files": len(sliced_counts),
-                "truncated": truncated_overall,
+                "truncated": truncated,
+                "source": source,
             },
         )
 
     # content mode
-    matches = _parse_json_output(raw)
     sliced = matches[offset : offset + head_limit] if head_limit else matches[offset:]
 
     msg = f"Found {pluralize(len(matches), 'match', 'matches')}"
@@ -357,7 +429,8 @@ async def grep_tool(params: dict[str, Any], context: dict[str, Any]) -> dict[str
             "output_mode": output_mode,
             "total": len(matches),
             "returned": len(sliced),
-            "truncated": truncated_overall,
+            "truncated": truncated,
+            "source": source,
         },
     )
 
@@ -369,7 +442,7 @@ def register_grep_tool(registry) -> None:
         Tool(
             name="grep",
             description=(
-                "Content search powered by ripgrep. Supports full regex, "
+                "Fast indexed content search (ripgrep semantics). Supports full regex, "
                 "glob filters, file-type filters, context lines, count-only "
                 "and files-only modes, multiline matching, and pagination via "
                 "head_limit/offset."
@@ -439,8 +512,11 @@ def register_grep_tool(registry) -> None:
             category=ToolCategory.NAV_OPS,
             # Pattern + flags in, matches/counts dict out — JSON-clean.
             state_serializable=True,
-            # Stateless ripgrep wrapper; no cached index between calls.
+            # The code search index is a shared read-through cache; an
+            # interrupted call leaves nothing to roll back.
             holds_external_state=False,
+            # Search only; never modifies files.
+            read_only=True,
             examples=[
                 '{"tool_name": "grep", "parameters": {"pattern": "TODO"}}',
                 '{"tool_name": "grep", "parameters": {"pattern": "def \\\\w+_tool", "output_mode": "content", "-n": true, "-C": 2}}',
@@ -272,6 +272,8 @@ def register_list_dir_tool(registry) -> None:
             state_serializable=True,
             # Stateless directory listing.
             holds_external_state=False,
+            # Directory listing only.
+            read_only=True,
             examples=[
                 '{"tool_name": "list_dir", "parameters": {"dir_path": "."}}',
                 '{"tool_name": "list_dir", "parameters": {"dir_path": "src", "depth": 3, "limit": 50}}',
@@ -113,6 +113,7 @@ def register_get_project_config_tool(registry) -> None:
             executor=get_project_config_executor,
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "get_project_config", "parameters": {}}',
             ],
@@ -539,6 +539,7 @@ def register_node_config_tool(registry) -> None:
             # in the approval/HITL surface, not in this tool. Phase 2 HITL
             # may treat this specially but the tool itself is checkpointable.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "request_node_config", "parameters": {"node_name": "supabase", "preset": "supabase", "wait_for_input": false}}',
                 '{"tool_name": "request_node_config", "parameters": {"node_name": "payments", "preset": "rest_api", "wait_for_input": true, "field_overrides": [{"key": "PAYMENTS_API_KEY", "label": "Payments API Key", "type": "secret", "is_secret": true, "required": true}]}}',
@@ -157,6 +157,7 @@ def register_plan_tools(registry):
             state_serializable=True,
             # DB-backed plan rows; no in-tool persistent state.
             holds_external_state=False,
+            mutates_files=False,
         )
     )
 
@@ -198,5 +199,6 @@ def register_plan_tools(registry):
             state_serializable=True,
             # DB-backed plan rows; no in-tool persistent state.
             holds_external_state=False,
+            mutates_files=False,
         )
     )
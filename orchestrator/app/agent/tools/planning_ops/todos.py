@@ -175,6 +175,7 @@ def register_planning_tools(registry):
             state_serializable=True,
             # Reads from session-scoped DB rows; no in-tool state.
             holds_external_state=False,
+            mutates_files=False,
             examples=['{"tool_name": "todo_read", "parameters": {}}'],
         )
     )
@@ -216,6 +217,7 @@ def register_planning_tools(registry):
             state_serializable=True,
             # Replaces DB rows atomically; no in-tool state retained.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "todo_write", "parameters": {"todos": [{"content": "Read package.json", "status": "completed"}, {"content": "Update dependencies", "status": "in_progress"}, {"content": "Run tests", "status": "pending", "priority": "high"}]}}'
             ],
@@ -330,6 +330,7 @@ def register_container_lifecycle_tools(registry):
             # Mutates orchestrator state (containers) but the tool itself
             # holds no in-flight handle; success returns immediately.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "container_start", "parameters": {"container_name": "frontend"}}'
             ],
@@ -349,6 +350,7 @@ def register_container_lifecycle_tools(registry):
             state_serializable=True,
             # Synchronous orchestrator call; no in-tool persistent handle.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "container_stop", "parameters": {"container_name": "postgres"}}'
             ],
@@ -368,6 +370,7 @@ def register_container_lifecycle_tools(registry):
             state_serializable=True,
             # Synchronous orchestrator call (stop+start); no in-tool handle.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "container_restart", "parameters": {"container_name": "frontend"}}'
             ],
@@ -904,6 +904,7 @@ def register_kanban_tools(registry):
             state_serializable=True,
             # KanbanBoard/Task DB rows; no in-tool persistent state.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "kanban", "parameters": {"action": "get_board"}}',
                 '{"tool_name": "kanban", "parameters": {"action": "create_task", "title": "Fix auth bug", "column": "To Do", "priority": "high", "point_value": 5}}',
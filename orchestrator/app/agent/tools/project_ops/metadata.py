@@ -68,6 +68,7 @@ def register_project_tools(registry):
             state_serializable=True,
             # Single DB read; no in-tool state.
             holds_external_state=False,
+            mutates_files=False,
             examples=['{"tool_name": "get_project_info", "parameters": {}}'],
         )
     )
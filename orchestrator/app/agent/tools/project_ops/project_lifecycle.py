@@ -198,6 +198,7 @@ def register_project_lifecycle_tools(registry):
             state_serializable=True,
             # Synchronous orchestrator project bring-up; no in-tool handle.
             holds_external_state=False,
+            mutates_files=False,
             examples=['{"tool_name": "project_start", "parameters": {}}'],
         )
     )
@@ -216,6 +217,7 @@ def register_project_lifecycle_tools(registry):
             state_serializable=True,
             # Synchronous orchestrator teardown; no in-tool handle retained.
             holds_external_state=False,
+            mutates_files=False,
             examples=['{"tool_name": "project_stop", "parameters": {}}'],
         )
     )
@@ -234,6 +236,7 @@ def register_project_lifecycle_tools(registry):
             state_serializable=True,
             # Wraps stop+start; no in-tool persistent handle.
             holds_external_state=False,
+            mutates_files=False,
             examples=['{"tool_name": "project_restart", "parameters": {}}'],
         )
     )
@@ -5,7 +5,9 @@ Manages available tools for the agent and handles tool execution.
 Each tool is defined with name, description, parameters schema, and executor function.
 """
 
+import json
 import logging
+from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import StrEnum
@@ -69,6 +71,15 @@ class Tool:
             ContractGate skips the per-tool spend estimate for these tools
             to avoid double-counting against ``max_spend_per_run_usd`` —
             their spend is captured by the LiteLLM key. Default False.
+        read_only: The tool only reads project state and returns the same
+            result for the same parameters until something changes it.
+            Repeated calls within a run are answered from the run's memo
+            (see ``tool_memo``); every tool without this flag clears the
+            memo when it runs. Default False.
+        mutates_files: Running the tool can change project files, so the
+            run's /undo checkpoint must exist before it runs. Tools that
+            only touch the database, Redis, containers or the network set
+            this to False. Default True.
         examples: Example usage patterns
         system_prompt: Optional additional instructions for this tool
 
@@ -105,6 +116,17 @@ class Tool:
     #   double-counting against ``max_spend_per_run_usd``.
     compute_tier: int = 0
     delegates_to_model: bool = False
+    # ``read_only``: safe to memoize per run by (name, params). Mutating or
+    #   side-effecting tools must leave this False.
+    read_only: bool = False
+    # ``mutates_files``: can change project files (takes the run's /undo
+    #   checkpoint first, see ``checkpoint_manager``). Defaults to True so a
+    #   new tool is checkpointed unless it declares otherwise.
+    mutates_files: bool = True
+    # Rendered ``to_prompt_format`` text. Tools are treated as immutable
+    # once built (customisation goes through ``dataclasses.replace``, which
+    # starts the copy with an empty cache).
+    _prompt_text: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         # Enforce the Phase 1 tool-state annotation contract at construction
@@ -128,6 +150,11 @@ class Tool:
 
     def to_prompt_format(self) -> str:
         """Convert tool to format suitable for LLM system prompt."""
+        if self._prompt_text is None:
+            self._prompt_text = self._render_prompt_format()
+        return self._prompt_text
+
+    def _render_prompt_format(self) -> str:
         param_descriptions = []
         for param_name, param_info in self.parameters.get("properties", {}).items():
             required = param_name in self.parameters.get("required", [])
@@ -153,15 +180,36 @@ class Tool:
 """.strip()
 
 
+def render_tools_section(tools: list[Tool], heading: str) -> str:
+    """Tools grouped by category, as rendered into the system prompt."""
+    sections = []
+    for category in ToolCategory:
+        in_category = [t for t in tools if t.category == category]
+        if in_category:
+            sections.append(f"\n{heading} {category.value.replace('_', ' ').title()}\n")
+            for i, tool in enumerate(in_category, 1):
+                sections.append(f"{i}. {tool.to_prompt_format()}\n")
+    return "\n".join(sections)
+
+
 class ToolRegistry:
     """
     Registry of all available tools for the agent.
 
     Manages tool registration, lookup, and execution with proper error handling.
+
+    ``version`` changes whenever the tool set changes; the rendered prompt
+    section is memoised per version, so repeated renders are free and
+    byte-identical (which keeps the prompt-cache prefix stable).
     """
 
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self.version = 0
+        # Rendered outputs for the current version. May be shared with other
+        # registries derived from the same tools (see create_scoped_tool_registry);
+        # register() swaps in a fresh dict rather than clearing it.
+        self._rendered: dict[str, Any] = {}
         logger.info("ToolRegistry initialized")
 
     def register(self, tool: Tool):
@@ -169,6 +217,8 @@ class ToolRegistry:
         if tool.name in self._tools:
             logger.warning(f"Overwriting existing tool: {tool.name}")
         self._tools[tool.name] = tool
+        self.version += 1
+        self._rendered = {}
         logger.info(f"Registered tool: {tool.name} (category: {tool.category.value})")
 
     def get(self, name: str) -> Tool | None:
@@ -196,17 +246,12 @@ class ToolRegistry:
         Returns:
             Formatted string describing all available tools
         """
-        sections = []
-
-        # Group by category
-        for category in ToolCategory:
-            tools = self.list_tools(category)
-            if tools:
-                sections.append(f"\n## {category.value.replace('_', ' ').title()}\n")
-                for i, tool in enumerate(tools, 1):
-                    sections.append(f"{i}. {tool.to_prompt_format()}\n")
-
-        return "\n".join(sections)
+        section = self._rendered.get("prompt_section")
+        if section is None:
+            section = self._rendered["prompt_section"] = render_tools_section(
+                self.list_tools(), "##"
+            )
+        return section
 
     # Mapping from tool names to required Permission scope values.
     # Tools not listed here are unrestricted (e.g., read_file, todo_write, metadata).
@@ -396,8 +441,16 @@ class ToolRegistry:
                 f"[TOOL-EXEC] Starting tool: {tool_name} with params: {parameters} [edit_mode={edit_mode}]"
             )
 
-            # Execute the tool
-            result = await tool.executor(parameters, context)
+            # Take the run's file checkpoint (for /undo) before the first
+            # tool that can change files; no-op for read-only tools.
+            from ...services.checkpoint_manager import checkpoint_before_mutation
+
+            await checkpoint_before_mutation(tool, context)
+
+            # Execute the tool (read-only tools may be answered from the run's memo)
+            from .tool_memo import execute_memoized
+
+            result = await execute_memoized(tool, parameters, context)
 
             # Scrub secret values out of shell-tool output before the agent
             # ever sees it. Short secrets (< 6 chars) are skipped. The project
@@ -638,6 +691,17 @@ def _register_all_tools(registry: ToolRegistry):
     logger.info(f"Registered {len(registry._tools)} tools total")
 
 
+# Scoped tool sets derived from a parent registry, keyed by
+# (parent, parent.version, tool names, tool configs). Bounded; entries for an
+# old parent version simply age out.
+_SCOPED_CACHE_SIZE = 128
+_scoped_cache: OrderedDict[tuple, tuple[dict[str, Tool], dict[str, Any]]] = OrderedDict()
+
+
+def _configs_key(tool_configs: dict[str, dict[str, Any]]) -> str:
+    return json.dumps(tool_configs, sort_keys=True, default=str) if tool_configs else ""
+
+
 def create_scoped_tool_registry(
     tool_names: list[str], tool_configs: dict[str, dict[str, Any]] | None = None
 ) -> ToolRegistry:
@@ -647,6 +711,11 @@ def create_scoped_tool_registry(
     This enables agents to have restricted tool access with customized tool descriptions
     and examples, improving security and making agents more focused on their specific tasks.
 
+    The filtered tool set (including customised tool copies and their rendered
+    prompt text) is cached per global registry version, so deriving the same
+    scope again is a dict copy. Each call still returns its own
+    registry; registering into it does not affect other callers.
+
     Args:
         tool_names: List of tool names to include in the scoped registry
         tool_configs: Optional dict mapping tool names to custom configs
@@ -660,34 +729,50 @@ def create_scoped_tool_registry(
         >>> registry = create_scoped_tool_registry(["read_file", "write_file"], configs)
         >>> # This registry has file tools with customized descriptions
     """
-    from dataclasses import replace
-
-    scoped_registry = ToolRegistry()
     global_registry = get_tool_registry()
     tool_configs = tool_configs or {}
+    key = (global_registry, global_registry.version, tuple(tool_names), _configs_key(tool_configs))
+
+    cached = _scoped_cache.get(key)
+    if cached is None:
+        cached = (_filter_tools(global_registry, tool_names, tool_configs), {})
+        _scoped_cache[key] = cached
+        while len(_scoped_cache) > _SCOPED_CACHE_SIZE:
+            _scoped_cache.popitem(last=False)
+    else:
+        _scoped_cache.move_to_end(key)
+
+    tools, rendered = cached
+    scoped_registry = ToolRegistry()
+    scoped_registry._tools = dict(tools)
+    scoped_registry._rendered = rendered
+    logger.debug("Created scoped tool registry with %d tools: %s", len(tools), list(tools))
+    return scoped_registry
+
 
+def _filter_tools(
+    source: ToolRegistry, tool_names: list[str], tool_configs: dict[str, dict[str, Any]]
+) -> dict[str, Tool]:
+    """The named tools from ``source``, with per-tool config overrides applied."""
+    from dataclasses import replace
+
+    tools: dict[str, Tool] = {}
     missing_tools = []
     for name in tool_names:
-        tool = global_registry.get(name)
+        tool = source.get(name)
         if tool:
             # Apply custom configuration if provided
             if name in tool_configs:
                 config = tool_configs[name]
-                custom_description = config.get("description", tool.description)
-                custom_examples = config.get("examples", tool.examples)
-                custom_system_prompt = config.get("system_prompt", tool.system_prompt)
-
-                # Create a copy of the tool with custom description, examples, and system_prompt
-                custom_tool = replace(
+                # Copy of the tool with custom description, examples, and system_prompt
+                tool = replace(
                     tool,
-                    description=custom_description,
-                    examples=custom_examples,
-                    system_prompt=custom_system_prompt,
+                    description=config.get("description", tool.description),
+                    examples=config.get("examples", tool.examples),
+                    system_prompt=config.get("system_prompt", tool.system_prompt),
                 )
-                scoped_registry.register(custom_tool)
                 logger.info(f"Registered tool '{name}' with custom configuration")
-            else:
-                scoped_registry.register(tool)
+            tools[name] = tool
         else:
             missing_tools.append(name)
             logger.warning(f"Tool '{name}' not found in global registry")
@@ -697,9 +782,5 @@ def create_scoped_tool_registry(
             f"Could not add {len(missing_tools)} tools to scoped registry: {missing_tools}"
         )
 
-    logger.info(
-        f"Created scoped tool registry with {len(scoped_registry._tools)} tools: "
-        f"{list(scoped_registry._tools.keys())}"
-    )
-
-    return scoped_registry
+    logger.info(f"Created scoped tool registry with {len(tools)} tools: {list(tools.keys())}")
+    return tools
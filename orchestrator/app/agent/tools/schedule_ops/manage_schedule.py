@@ -348,6 +348,7 @@ def register_schedule_tools(registry):
             state_serializable=True,
             # AgentSchedule DB rows; no in-tool persistent state.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "manage_schedule", "parameters": {"action": "create", "name": "Daily report", "schedule": "daily at 9am", "prompt": "Generate a summary of project activity for {date}"}}',
                 '{"tool_name": "manage_schedule", "parameters": {"action": "list"}}',
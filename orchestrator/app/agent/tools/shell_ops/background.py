@@ -210,6 +210,7 @@ def register_background_tools(registry) -> None:
             # Pure inspection over the background-session registry; the
             # processes themselves are external state but this tool only reads.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "list_background_processes", "parameters": {}}',
             ],
@@ -252,6 +253,7 @@ def register_background_tools(registry) -> None:
             # Reads from the live PTY ringbuffer of an out-of-band background
             # process; the underlying handle is external state.
             holds_external_state=True,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "read_background_output", "parameters": {"session_id": "abc123"}}',
                 '{"tool_name": "read_background_output", "parameters": {"session_id": "abc123", "lines": 50, "delay_ms": 500}}',
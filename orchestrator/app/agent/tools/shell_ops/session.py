@@ -169,6 +169,7 @@ def register_session_tools(registry):
             # Tears down the PTY/shell handle owned by shell_open; while this
             # call itself is one-shot, it operates on external session state.
             holds_external_state=True,
+            mutates_files=False,
             examples=['{"tool_name": "shell_close", "parameters": {"session_id": "abc123"}}'],
         )
     )
@@ -196,6 +196,7 @@ def register_skill_tools(registry):
             state_serializable=True,
             # Loads from marketplace catalog/disk; no persistent skill session.
             holds_external_state=False,
+            mutates_files=False,
         )
     )
 
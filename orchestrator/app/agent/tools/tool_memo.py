@@ -0,0 +1,209 @@
+"""
+Run-scoped memo for read-only tools.
+
+Agents often repeat the exact same ``read_file`` / ``glob`` / ``grep`` /
+``git_status`` call several times in one run, and each repeat goes back to
+the container. Tools registered with ``read_only=True`` are answered from a
+per-run memo keyed by ``(tool, canonical params)`` instead.
+
+The memo lives on the run's execution context (``context["_tool_memo"]``),
+so it never outlives the run. Every call to a tool that is not read-only
+(writes, edits, patches, shell commands, git operations, ...) clears it,
+because any of them may change what a read would return. Changes made
+outside the run (the user editing in the IDE) are covered by a TTL.
+
+With ``agent_tool_memo_stub`` enabled a repeat is answered with a short
+"unchanged since call N" stub instead of the full output, saving context
+tokens when the earlier output is still in the conversation.
+
+Per-run hit/miss counters are reported by :func:`tool_memo_stats` and
+recorded in the agent message metadata.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any
+
+from ...services.task_profile import task_span
+
+if TYPE_CHECKING:
+    from .registry import Tool
+
+logger = logging.getLogger(__name__)
+
+_CONTEXT_KEY = "_tool_memo"
+
+# Entries kept per run before the least recently used are dropped.
+_MAX_ENTRIES = 128
+
+
+@dataclass
+class _Entry:
+    result: dict[str, Any]
+    call: int  # run-wide call number that produced the result
+    stored_at: float
+
+
+@dataclass
+class ToolMemo:
+    """Memoized read-only tool results for one agent run."""
+
+    ttl_seconds: float
+    stub: bool = False
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    calls: int = 0
+    # Bumped whenever a mutating tool starts or finishes; a read that
+    # overlapped one is not stored.
+    generation: int = 0
+    _entries: OrderedDict[str, _Entry] = field(default_factory=OrderedDict)
+
+    @staticmethod
+    def key(tool_name: str, parameters: dict[str, Any]) -> str | None:
+        try:
+            params = json.dumps(parameters, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+        return f"{tool_name}:{params}"
+
+    def lookup(self, key: str) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, result: dict[str, Any], call: int) -> None:
+        self._entries[key] = _Entry(copy.deepcopy(result), call, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > _MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+def get_tool_memo(context: dict[str, Any]) -> ToolMemo | None:
+    """The run's memo, created on first use; ``None`` when memoization is off."""
+    memo = context.get(_CONTEXT_KEY)
+    if memo is None:
+        from ...config import get_settings
+
+        settings = get_settings()
+        if not settings.agent_tool_memo_enabled:
+            return None
+        memo = context[_CONTEXT_KEY] = ToolMemo(
+            ttl_seconds=settings.agent_tool_memo_ttl_seconds,
+            stub=settings.agent_tool_memo_stub,
+        )
+    return memo
+
+
+def tool_memo_stats(context: dict[str, Any]) -> dict[str, Any] | None:
+    """Hit/miss counters of the run's memo, or ``None`` if nothing was looked up."""
+    memo = context.get(_CONTEXT_KEY)
+    if memo is None or not (memo.hits or memo.misses):
+        return None
+    return memo.stats()
+
+
+def _stub(tool_name: str, call: int) -> dict[str, Any]:
+    return {
+        "success": True,
+        "unchanged": True,
+        "message": (
+            f"Unchanged since call #{call} of this run: {tool_name} returned the same "
+            "result then. Refer to that output."
+        ),
+    }
+
+
+async def execute_memoized(
+    tool: Tool,
+    parameters: dict[str, Any],
+    context: dict[str, Any],
+    executor: Callable[[dict[str, Any], dict[str, Any]], Awaitable[Any]] | None = None,
+) -> Any:
+    """Run ``tool`` through the run's memo.
+
+    Read-only tools are answered from the memo when an identical call was
+    made earlier in the run; every other tool clears it. Every call is timed
+    as a span of the running agent task's latency profile.
+    """
+    with task_span("tool", tool.name):
+        return await _execute_memoized(tool, parameters, context, executor or tool.executor)
+
+
+async def _execute_memoized(
+    tool: Tool,
+    parameters: dict[str, Any],
+    context: dict[str, Any],
+    executor: Callable[[dict[str, Any], dict[str, Any]], Awaitable[Any]],
+) -> Any:
+    memo = get_tool_memo(context)
+    if memo is None:
+        return await executor(parameters, context)
+
+    memo.calls += 1
+    call = memo.calls
+    if not tool.read_only:
+        memo.invalidate()
+        try:
+            return await executor(parameters, context)
+        finally:
+            memo.invalidate()
+
+    key = ToolMemo.key(tool.name, parameters)
+    if key is None:
+        return await executor(parameters, context)
+    entry = memo.lookup(key)
+    if entry is not None:
+        memo.hits += 1
+        logger.info("[TOOL-MEMO] %s answered from call #%d", tool.name, entry.call)
+        if memo.stub:
+            return _stub(tool.name, entry.call)
+        return copy.deepcopy(entry.result)
+
+    memo.misses += 1
+    generation = memo.generation
+    result = await executor(parameters, context)
+    if isinstance(result, dict) and result.get("success", True) and memo.generation == generation:
+        memo.store(key, result, call)
+    return result
+
+
+def memoized_tool(tool: Tool) -> Tool:
+    """A copy of ``tool`` whose executor goes through the run's memo.
+
+    For registries that call ``tool.executor`` directly instead of going
+    through :meth:`ToolRegistry.execute`.
+    """
+    executor = tool.executor
+
+    async def _run(parameters: dict[str, Any], context: dict[str, Any]) -> Any:
+        return await execute_memoized(tool, parameters, context, executor)
+
+    return replace(tool, executor=_run)
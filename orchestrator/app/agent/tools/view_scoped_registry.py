@@ -10,7 +10,7 @@ import logging
 from typing import Any
 
 from .providers.base import AbstractToolProvider
-from .registry import Tool, ToolCategory, ToolRegistry
+from .registry import Tool, ToolCategory, ToolRegistry, render_tools_section
 from .view_context import ViewContext
 
 logger = logging.getLogger(__name__)
@@ -42,7 +42,12 @@ class ViewScopedToolRegistry:
         self._base_registry = base_registry or get_tool_registry()
         self._providers: dict[ViewContext, AbstractToolProvider] = {}
         self._active_view: ViewContext = ViewContext.BUILDER
-        self._view_tools_cache: dict[ViewContext, list[Tool]] = {}
+        # view -> (base registry version, tools)
+        self._view_tools_cache: dict[ViewContext, tuple[int, list[Tool]]] = {}
+        # Bumped whenever a provider changes or the cache is invalidated.
+        self._providers_version = 0
+        # (view, version) -> rendered prompt section
+        self._rendered: dict[tuple[ViewContext, tuple[int, int], str], Any] = {}
 
     def register_provider(self, provider: AbstractToolProvider):
         """
@@ -55,6 +60,8 @@ class ViewScopedToolRegistry:
         self._providers[view_context] = provider
         # Invalidate cache for this view
         self._view_tools_cache.pop(view_context, None)
+        self._providers_version += 1
+        self._rendered.clear()
         logger.info(f"Registered tool provider for view: {view_context.value}")
 
     def set_active_view(self, view: ViewContext):
@@ -71,6 +78,11 @@ class ViewScopedToolRegistry:
         """Get the currently active view context."""
         return self._active_view
 
+    @property
+    def version(self) -> tuple[int, int]:
+        """Changes whenever the base registry or the providers change."""
+        return (self._base_registry.version, self._providers_version)
+
     def get_available_tools(self) -> list[Tool]:
         """
         Get all tools available in the current view context.
@@ -79,8 +91,9 @@ class ViewScopedToolRegistry:
             List of Tool instances (base tools + view-specific tools)
         """
         # Check cache first
-        if self._active_view in self._view_tools_cache:
-            return self._view_tools_cache[self._active_view]
+        cached = self._view_tools_cache.get(self._active_view)
+        if cached is not None and cached[0] == self._base_registry.version:
+            return cached[1]
 
         # Start with base tools (always available)
         tools = list(self._base_registry.list_tools())
@@ -93,7 +106,7 @@ class ViewScopedToolRegistry:
             logger.debug(f"Added {len(view_tools)} tools from {self._active_view.value} provider")
 
         # Cache the result
-        self._view_tools_cache[self._active_view] = tools
+        self._view_tools_cache[self._active_view] = (self._base_registry.version, tools)
 
         return tools
 
@@ -297,20 +310,13 @@ class ViewScopedToolRegistry:
         Returns:
             Formatted string for system prompt with available tools
         """
-        available_tools = self.get_available_tools()
-
-        sections = []
-        sections.append(f"\n## Current View: {self._active_view.value.title()}\n")
-
-        # Group by category
-        for category in ToolCategory:
-            tools = [t for t in available_tools if t.category == category]
-            if tools:
-                sections.append(f"\n### {category.value.replace('_', ' ').title()}\n")
-                for i, tool in enumerate(tools, 1):
-                    sections.append(f"{i}. {tool.to_prompt_format()}\n")
-
-        return "\n".join(sections)
+        key = (self._active_view, self.version, "prompt_section")
+        section = self._rendered.get(key)
+        if section is None:
+            header = f"\n## Current View: {self._active_view.value.title()}\n"
+            tools_text = render_tools_section(self.get_available_tools(), "###")
+            section = self._rendered[key] = "\n".join(filter(None, [header, tools_text]))
+        return section
 
     def invalidate_cache(self, view: ViewContext | None = None):
         """
@@ -323,6 +329,8 @@ class ViewScopedToolRegistry:
             self._view_tools_cache.pop(view, None)
         else:
             self._view_tools_cache.clear()
+        self._providers_version += 1
+        self._rendered.clear()
 
     @property
     def _tools(self) -> dict[str, Tool]:
@@ -148,6 +148,7 @@ def register_web_fetch_tool(registry) -> None:
             state_serializable=True,
             # One-shot HTTP request; no persistent connection pool exposed.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "web_fetch", "parameters": {"url": "https://example.com/api/docs"}}',
                 '{"tool_name": "web_fetch", "parameters": {"url": "https://example.com/page", "timeout": 15}}',
@@ -145,6 +145,7 @@ def register_web_search_tool(registry) -> None:
             state_serializable=True,
             # Stateless provider call (Tavily/Brave/DuckDuckGo).
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "web_search", "parameters": {"query": "React 19 new features"}}',
                 '{"tool_name": "web_search", "parameters": {"query": "FastAPI websocket tutorial", "max_results": 3, "detailed": true}}',
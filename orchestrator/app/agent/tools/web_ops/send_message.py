@@ -291,6 +291,7 @@ def register_send_message_tools(registry):
             state_serializable=True,
             # Fire-and-forget webhook/POST; no persistent connection retained.
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "send_message", "parameters": {"message": "Build completed successfully! The app is ready at port 3000."}}',
                 '{"tool_name": "send_message", "parameters": {"message": "Found 3 critical security vulnerabilities in dependencies.", "channel": "discord"}}',
@@ -251,6 +251,7 @@ def register_manage_workflow_proposal_tool(registry) -> None:
             category=ToolCategory.PROJECT,
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
             compute_tier=0,
             examples=[
                 '{"tool_name": "manage_workflow_proposal", "parameters": {"action": "list", "automation_id": "..."}}',
@@ -195,6 +195,7 @@ def register_read_workflow_history_tool(registry) -> None:
             category=ToolCategory.PROJECT,
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
             compute_tier=0,
             examples=[
                 '{"tool_name": "read_workflow_history", "parameters": {"automation_id": "...", "limit": 10}}',
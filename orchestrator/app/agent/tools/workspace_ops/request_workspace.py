@@ -418,6 +418,7 @@ def register_workspace_tool(registry) -> None:
             executor=request_workspace_executor,
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "request_workspace", "parameters": {"reason": "so I can save your notes for later"}}',
             ],
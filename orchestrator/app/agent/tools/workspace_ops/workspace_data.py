@@ -577,6 +577,7 @@ def register_workspace_data_tool(registry) -> None:
             # Plain JSON params/results; rows in the platform DB, no sockets/PTYs.
             state_serializable=True,
             holds_external_state=False,
+            mutates_files=False,
             examples=[
                 '{"tool_name": "workspace_data", "parameters": {"action": "create_collection", "name": "submissions"}}',
                 '{"tool_name": "workspace_data", "parameters": {"action": "create_collection", "name": "contacts", "schema": {"type": "object", "required": ["email"], "properties": {"email": {"type": "string", "format": "email"}, "message": {"type": "string", "maxLength": 500}}, "additionalProperties": false}}}',
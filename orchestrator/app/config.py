@@ -525,6 +525,22 @@ class Settings(BaseSettings):
         2880  # Hibernate pods after X minutes of inactivity (2 days)
     )
 
+    # Predictive prewarm: restore volumes to a node cache ahead of expected use
+    # (learned time-of-day usage + upcoming cron automations). See services/prewarm.py.
+    k8s_prewarm_enabled: bool = True
+    k8s_prewarm_lookahead_minutes: int = 60  # Prewarm projects expected within this window
+    k8s_prewarm_history_days: int = 14  # Days of chat activity used to learn usage patterns
+    k8s_prewarm_min_score: float = 0.25  # Recency-weighted fraction of days used in the window
+    k8s_prewarm_max_per_cycle: int = 10  # Max restores queued per 5-minute cycle
+    k8s_prewarm_max_outstanding: int = 50  # Cluster budget: prewarmed-but-unused projects
+
+    # Lifecycle scheduler: bounded-concurrency queue for hibernate/restore jobs
+    # (runs under the idle_monitor lock). See services/lifecycle_scheduler.py.
+    k8s_lifecycle_max_concurrency: int = 8  # Cluster-wide in-flight hibernate/restore jobs
+    k8s_lifecycle_max_per_node: int = 2  # In-flight jobs per cache node (CSI/storage pressure)
+    k8s_lifecycle_max_attempts: int = 3  # Attempts before giving up on a job
+    k8s_lifecycle_retry_base_seconds: float = 15.0  # Exponential back-off base between attempts
+
     # ==========================================================================
     # Kubernetes Storage Settings
     # ==========================================================================
@@ -604,6 +620,99 @@ class Settings(BaseSettings):
 
     fileops_enabled: bool = True  # Feature flag for v2 file operations via CSI
     fileops_timeout: int = 30  # Default gRPC timeout for file operations (seconds)
+    fileops_route_cache_ttl_seconds: int = 30  # Cache volume → FileOps address (0 = off)
+    fileops_channel_pool_size: int = 32  # Max pooled FileOps channels (one per node)
+
+    # Orchestrator file content cache: project file reads are served from
+    # memory while the file's (mtime, size) is unchanged. 0 disables it.
+    file_content_cache_max_bytes: int = 64 * 1024 * 1024
+    file_content_cache_max_entry_bytes: int = 1024 * 1024  # Larger files are never cached
+    # File-tree snapshots (files/tree deltas, glob, read_many): re-list at most
+    # this often unless the orchestrator changed the project. 0 = always re-list.
+    file_tree_rescan_seconds: float = 2.0
+
+    # File change push notifications (chat WebSocket / SSE): batches are sent
+    # once a project has been quiet for the debounce window, and at least every
+    # max_delay while changes keep coming. Larger bursts send a rescan hint.
+    file_events_debounce_seconds: float = 0.3
+    file_events_max_delay_seconds: float = 2.0
+    file_events_max_paths: int = 500
+
+    # Trigram code search index for the agent grep tool (per project, in
+    # memory). Projects with more text than max_bytes keep using ripgrep.
+    # 0 disables the index. memory_max_bytes caps all indexes of one process
+    # (text plus postings); the least recently searched are dropped first.
+    code_search_index_max_bytes: int = 64 * 1024 * 1024
+    code_search_max_file_bytes: int = 512 * 1024  # Larger files are not indexed
+    code_search_max_projects: int = 4
+    code_search_memory_max_bytes: int = 128 * 1024 * 1024
+
+    # Run-scoped memo for read-only agent tools (read_file, glob, grep,
+    # git_status, ...). Repeats of an identical call within one run are
+    # answered from memory until a non-read-only tool runs or the entry is
+    # older than the TTL. With the stub enabled a repeat returns a short
+    # "unchanged since call N" note instead of the full output.
+    agent_tool_memo_enabled: bool = True
+    agent_tool_memo_ttl_seconds: float = 120.0
+    agent_tool_memo_stub: bool = False
+
+    # File checkpoints for /undo (services/checkpoint_manager.py). "lazy"
+    # takes it right before an agent run's first file-mutating tool call, so
+    # read-only turns take none. "background" also starts it when the run
+    # starts, concurrently with the first model request.
+    agent_checkpoint_mode: str = "lazy"  # "lazy" | "background"
+
+    # Per-project cache of agent startup context blocks (skill catalog,
+    # TESSLATE.md, workspace data overview, tier containers). Entries are
+    # invalidated by tag as their inputs change; the TTL bounds changes no
+    # tag observes. 0 disables the cache.
+    agent_context_cache_ttl_seconds: float = 300.0
+    agent_context_cache_max_entries: int = 512
+
+    # Phase-level latency profile of each agent task (services/task_profile.py):
+    # stored in the assistant message metadata and aggregated into histograms.
+    # Model/tool calls beyond this many spans are counted but not kept.
+    agent_task_profile_max_spans: int = 500
+
+    # Shared LLM API clients (services/llm_client_pool.py). One pooled client
+    # per (base_url, credential) is reused across agent tasks so keep-alive
+    # connections to LiteLLM / providers survive between turns. Clients for
+    # user keys (BYOK, per-user LiteLLM keys) are evicted LRU past
+    # max_clients and closed retire_seconds later. Every task on a replica
+    # shares the pinned master-key client, so max_connections bounds that
+    # replica's concurrent model streams; a request that finds all of them
+    # busy waits pool_timeout_seconds, then fails with a logged PoolTimeout.
+    llm_client_max_clients: int = 256
+    llm_client_max_connections: int = 1000
+    llm_client_max_keepalive: int = 100
+    llm_client_keepalive_seconds: float = 90.0
+    llm_client_pool_timeout_seconds: float = 30.0
+    llm_client_retire_seconds: float = 900.0
+
+    # Streamed chat_with_tools text deltas are coalesced until this many
+    # characters are pending or the oldest has waited coalesce_ms. 0 emits
+    # one event per provider chunk.
+    llm_stream_coalesce_chars: int = 0
+    llm_stream_coalesce_ms: float = 50.0
+
+    # Passive model health from real traffic (services/model_traffic.py):
+    # per-model TTFT, latency, tokens/s and upstream error rate over a
+    # sliding window. A model is "degraded" at degraded_error_rate.
+    model_traffic_window_seconds: int = 900
+    model_traffic_bucket_seconds: int = 60
+    model_degraded_error_rate: float = 0.5
+    # Agents whose config lists "equivalent_models" route across them
+    # ("model_routing": "fallback" | "hedge"). Hedged requests start the next
+    # model when the current one has produced nothing after this delay
+    # (overridable per agent with "model_hedge_delay_seconds").
+    model_hedge_delay_seconds: float = 8.0
+
+    # Prompt-cache effectiveness (services/prompt_cache_stats.py). The
+    # stability check diffs each agent request's system prompt sections and
+    # tool schemas against the previous request of the same chat, keeping
+    # the last prefix of up to stability_sessions chats.
+    prompt_cache_stability_check: bool = True
+    prompt_cache_stability_sessions: int = 256
 
     # ==========================================================================
     # AST Service (standalone Node gRPC service for JSX/TSX transforms)
@@ -636,6 +745,10 @@ class Settings(BaseSettings):
     compute_reaper_pvc_grace_seconds: int = (
         900  # matches pod max age — PVC never reaped while a pod could still be running
     )
+    # Orphan sweep (compute reaper loop): max concurrent deletes per cycle, and
+    # whether stuck proj-* Terminating namespaces are unstuck in the same pass.
+    orphan_sweep_concurrency: int = 8
+    orphan_sweep_namespaces_enabled: bool = True
     # Resource quota for tesslate-compute-pool namespace
     compute_pool_max_pods: int = 10
     compute_pool_cpu_request: str = "500m"
@@ -644,6 +757,11 @@ class Settings(BaseSettings):
     compute_pool_memory_limit: str = "40Gi"
     compute_pool_max_pvcs: int = 10
     compute_pool_pvc_size: str = "10Gi"
+    # Placement engine: how long the cached node-capacity view is trusted
+    # before re-listing nodes/pods, and the spread cap on Tier-2 project
+    # environments per node (0 = no cap, pure bin-packing).
+    compute_placement_cache_ttl_seconds: int = 15
+    compute_placement_max_environments_per_node: int = 0
 
     # Per-user soft cap on concurrently running (scale=1) app environments.
     # Paused environments (scale=0) do NOT count. Prevents one user from
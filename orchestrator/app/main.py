@@ -553,10 +553,13 @@ async def stats_flush_loop():
 
 
 async def _compute_pod_reaper_loop():
-    """Background task to reap orphaned ephemeral compute pods (Tier 1)."""
+    """Background task to reap orphaned compute pods, PVCs/PVs and stuck namespaces.
+
+    One list per resource kind per cycle — see services/orphan_sweep.py.
+    """
     import asyncio
 
-    from .services.compute_manager import get_compute_manager
+    from .services.orphan_sweep import get_orphan_sweep
 
     logger.info(
         "[COMPUTE-REAPER] Started — interval=%ds, max_age=%ds",
@@ -567,17 +570,19 @@ async def _compute_pod_reaper_loop():
     while True:
         await asyncio.sleep(settings.compute_reaper_interval_seconds)
         try:
-            compute = get_compute_manager()
-            reaped_pods = await compute.reap_orphaned_pods(
-                max_age_seconds=settings.compute_reaper_max_age_seconds,
-            )
-            if reaped_pods:
-                logger.warning("[COMPUTE-REAPER] Reaped %d orphaned pod(s)", reaped_pods)
-            reaped_pvcs = await compute.reap_orphaned_pvcs(
-                grace_seconds=settings.compute_reaper_pvc_grace_seconds,
+            result = await get_orphan_sweep().run(
+                pod_max_age_seconds=settings.compute_reaper_max_age_seconds,
+                pvc_grace_seconds=settings.compute_reaper_pvc_grace_seconds,
+                include_namespaces=settings.orphan_sweep_namespaces_enabled,
             )
-            if reaped_pvcs:
-                logger.warning("[COMPUTE-REAPER] Reaped %d orphaned PVC(s)", reaped_pvcs)
+            reaped = {kind: stats.reaped for kind, stats in result.kinds.items() if stats.reaped}
+            if reaped or result.errors:
+                logger.warning(
+                    "[COMPUTE-REAPER] Sweep reaped %s in %dms (%d error(s))",
+                    reaped,
+                    result.duration_ms,
+                    len(result.errors),
+                )
         except Exception:
             logger.exception("[COMPUTE-REAPER] Error during reap cycle")
 
@@ -772,6 +777,15 @@ async def startup():
     except Exception:
         logger.exception("Failed to register db_event_bus listeners (non-fatal)")
 
+    # Project context cache: container / workspace data / skill changes made
+    # by the API bump the tags the workers validate cached blocks against.
+    try:
+        from .services.project_context_cache import register_context_cache_listeners
+
+        register_context_cache_listeners()
+    except Exception:
+        logger.exception("Failed to register project context cache listeners (non-fatal)")
+
     # Wave 7: register the AppVersion source_id consistency listener so any
     # ORM write that would violate the (source_id == parent.source_id)
     # invariant raises AppVersionSourceMismatch on flush. Auto-registers on
@@ -849,7 +863,7 @@ async def startup():
             asyncio.create_task(dlock.run_with_lock("idle_monitor", idle_monitor_loop))
         else:
             asyncio.create_task(idle_monitor_loop())
-        logger.info("Idle environment monitor started")
+        logger.info("Idle environment monitor started (with lifecycle + prewarm schedulers)")
 
     # Initialize base cache (Docker mode only - async - doesn't block startup)
     if is_docker_mode():
@@ -930,7 +944,13 @@ async def startup():
 async def shutdown():
     from .services.cache_service import close_redis_client
     from .services.design.ast_client import shutdown_ast_client
+    from .services.file_events import get_file_change_notifier
+    from .services.llm_client_pool import shutdown_llm_client_pool
     from .services.pubsub import get_pubsub
+    from .services.volume_manager import shutdown_volume_manager
+
+    await get_file_change_notifier().stop()
+    logger.info("File change watchers stopped")
 
     # Stop Pub/Sub subscriber and forwarding tasks before closing Redis
     pubsub = get_pubsub()
@@ -941,6 +961,12 @@ async def shutdown():
     await shutdown_ast_client()
     logger.info("AST client channel closed")
 
+    await shutdown_volume_manager()
+    logger.info("FileOps channel pool closed")
+
+    await shutdown_llm_client_pool()
+    logger.info("LLM client pool closed")
+
     await close_redis_client()
     logger.info("Redis connection closed")
     await engine.dispose()
@@ -247,6 +247,10 @@ class ProjectSnapshot(Base):
     sync_blob_key = Column(String(255), nullable=True)
     sync_size_bytes = Column(BigInteger, nullable=True)
 
+    # Milliseconds spent in each hibernate/restore phase, e.g.
+    # {"create_ms": 310, "ready_ms": 4200, "restore_ms": 950}.
+    phase_timings = Column(JSON, nullable=True)
+
     # Soft delete support (for project deletion recovery)
     is_soft_deleted = Column(Boolean, default=False, nullable=False)
     soft_delete_expires_at = Column(
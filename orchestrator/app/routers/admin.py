@@ -672,6 +672,120 @@ async def get_metrics_summary(
         raise HTTPException(status_code=500, detail="Failed to get metrics summary") from e
 
 
+# ============================================================================
+# Infrastructure Metrics
+# ============================================================================
+
+
+@router.get("/metrics/prewarm")
+async def get_prewarm_metrics_endpoint(
+    admin: User = Depends(current_superuser),
+) -> dict[str, Any]:
+    """Environment prewarm scheduler hit/miss counters.
+
+    Published by the lock-holding pod each cycle; falls back to this pod's
+    in-process counters when the cache entry is missing.
+    """
+    from ..services.cache_service import cache
+    from ..services.prewarm import METRICS_CACHE_KEY, get_prewarm_metrics
+
+    metrics = await cache.get(METRICS_CACHE_KEY)
+    return metrics if metrics is not None else get_prewarm_metrics()
+
+
+@router.get("/metrics/lifecycle-queue")
+async def get_lifecycle_queue_metrics(
+    admin: User = Depends(current_superuser),
+) -> dict[str, Any]:
+    """Hibernate/restore work-queue depth, in-flight counts and retry stats."""
+    from ..services.cache_service import cache
+    from ..services.lifecycle_scheduler import METRICS_CACHE_KEY, get_lifecycle_scheduler
+
+    metrics = await cache.get(METRICS_CACHE_KEY)
+    return metrics if metrics is not None else get_lifecycle_scheduler().get_metrics()
+
+
+@router.get("/metrics/orphan-sweep")
+async def get_orphan_sweep_metrics(
+    admin: User = Depends(current_superuser),
+) -> dict[str, Any]:
+    """Orphan sweep per-kind reap counts and the last cycle's list/delete timings."""
+    from ..services.cache_service import cache
+    from ..services.orphan_sweep import METRICS_CACHE_KEY, get_sweep_metrics
+
+    metrics = await cache.get(METRICS_CACHE_KEY)
+    return metrics if metrics is not None else get_sweep_metrics()
+
+
+@router.get("/metrics/file-cache")
+async def get_file_cache_metrics(
+    project_id: str | None = None,
+    admin: User = Depends(current_superuser),
+) -> dict[str, Any]:
+    """Orchestrator file content cache hit rates for this replica, overall or for one project."""
+    from ..services.orchestration.file_cache import get_file_cache_metrics as _metrics
+
+    return _metrics(project_id)
+
+
+@router.get("/metrics/llm-clients")
+async def get_llm_client_metrics(
+    admin: User = Depends(current_superuser),
+) -> dict[str, Any]:
+    """Shared LLM client reuse and connection-pool counters across API and worker processes."""
+    from ..services.llm_client_pool import get_llm_client_pool_metrics
+
+    return await get_llm_client_pool_metrics()
+
+
+@router.get("/metrics/prompt-cache")
+async def get_prompt_cache_metrics(
+    admin: User = Depends(current_superuser),
+) -> dict[str, Any]:
+    """Prompt-cache hit rates per agent and model, and recent prefix invalidations."""
+    from ..services.prompt_cache_stats import get_prompt_cache_monitor
+
+    return await get_prompt_cache_monitor().stats()
+
+
+@router.get("/metrics/project-context-cache")
+async def get_project_context_cache_metrics(
+    admin: User = Depends(current_superuser),
+) -> dict[str, Any]:
+    """Per-block hit rates and build times of the agent startup context cache."""
+    from ..services.project_context_cache import get_project_context_cache
+
+    return await get_project_context_cache().stats()
+
+
+@router.get("/metrics/agent-phases")
+async def get_agent_phase_metrics(
+    admin: User = Depends(current_superuser),
+) -> dict[str, Any]:
+    """Latency histograms of agent task phases, model and tool calls, and recent tasks."""
+    from ..services.task_profile import get_task_profile_stats
+
+    return await get_task_profile_stats().stats()
+
+
+@router.get("/agent-profiles/{message_id}")
+async def get_agent_task_profile(
+    message_id: UUID,
+    width: int = Query(60, ge=10, le=200),
+    admin: User = Depends(current_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    """Waterfall of the latency profile stored on an agent message."""
+    from ..services.task_profile import render_waterfall
+
+    metadata = (
+        await db.execute(select(Message.message_metadata).where(Message.id == message_id))
+    ).scalar_one_or_none()
+    if metadata is None or not metadata.get("profile"):
+        raise HTTPException(status_code=404, detail="No profile recorded for this message")
+    return render_waterfall(metadata["profile"], width=width)
+
+
 # ============================================================================
 # Agent Management
 # ============================================================================
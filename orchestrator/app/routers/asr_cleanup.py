@@ -65,11 +65,12 @@ async def _cleanup_with_llm(transcript: str, model: str) -> str:
 
     # Lazy import so this router doesn't hard-require the openai package on
     # deployment modes that never use it.
-    from openai import AsyncOpenAI
+    from ..services.llm_client_pool import get_llm_client_pool
 
-    client = AsyncOpenAI(
+    client = get_llm_client_pool().get(
         api_key=settings.litellm_master_key or "na",
         base_url=settings.litellm_api_base,
+        pinned=True,
     )
 
     # Cap output length so a runaway model can't burn budget. ~half the input
@@ -906,11 +906,12 @@ async def compact_chat(
     settings = get_settings()
     compaction_model = settings.compaction_summary_model or settings.default_model
 
-    from openai import AsyncOpenAI
+    from ..services.llm_client_pool import get_llm_client_pool
 
-    client = AsyncOpenAI(
+    client = get_llm_client_pool().get(
         api_key=settings.litellm_master_key or "na",
         base_url=settings.litellm_api_base or "http://localhost:4000",
+        pinned=True,
     )
     adapter = OpenAIAdapter(model_name=compaction_model, client=client, temperature=0.3)
 
@@ -2578,6 +2579,58 @@ async def subscribe_project_agent_events(
     )
 
 
+@router.get("/files/stream")
+async def subscribe_file_changes(
+    project_id: str,
+    current_user: User = Depends(get_authenticated_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Push file change batches for a project via SSE.
+
+    Same payloads as the ``file_changes`` WebSocket messages (see
+    ``services/file_events.py``), for clients that only hold an SSE
+    connection. Replaces polling ``/files/tree`` for change detection.
+    """
+    from starlette.responses import StreamingResponse as StarletteStreamingResponse
+
+    from ..services.file_events import get_file_change_notifier
+    from ..services.orchestration import get_orchestrator
+
+    _project, denial_reason = await _authorize_ws_project_access(db, current_user, project_id)
+    if denial_reason is not None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    notifier = get_file_change_notifier()
+
+    async def event_stream():
+        queue = notifier.subscribe(project_id)
+        await notifier.watch(project_id, get_orchestrator())
+        try:
+            yield f"data: {json.dumps({'type': 'ready'})}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=15.0)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        except (asyncio.CancelledError, GeneratorExit):
+            return
+        finally:
+            notifier.unsubscribe(project_id, queue)
+            notifier.unwatch(project_id)
+
+    return StarletteStreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "Connection": "keep-alive",
+        },
+    )
+
+
 class ConnectionManager:
     def __init__(self):
         # Use (user_id, project_id) tuple as key to support multiple projects per user
@@ -2684,6 +2737,7 @@ async def _authorize_ws_project_access(
 async def websocket_endpoint(websocket: WebSocket, token: str, db: AsyncSession = Depends(get_db)):
     user = None
     project_id = None
+    watching_files = False
     try:
         # Verify token and get user. Audience is verified against the
         # fastapi-users default ("fastapi-users:auth") — legacy tokens without
@@ -2753,6 +2807,14 @@ async def websocket_endpoint(websocket: WebSocket, token: str, db: AsyncSession
             manager.active_connections[connection_key] = websocket
             logger.info(f"WebSocket connected: user {user.id}, project {project_id}")
 
+            # Push file_changes for this project while the socket is open.
+            from ..services.file_events import get_file_change_notifier
+            from ..services.orchestration import get_orchestrator
+
+            orchestrator = get_orchestrator()
+            watching_files = True
+            await get_file_change_notifier().watch(project_id, orchestrator)
+
             # Process the first message
             await handle_chat_message(first_message, user, db, websocket)
 
@@ -2778,6 +2840,10 @@ async def websocket_endpoint(websocket: WebSocket, token: str, db: AsyncSession
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
+        if watching_files:
+            from ..services.file_events import get_file_change_notifier
+
+            get_file_change_notifier().unwatch(project_id)
         if user and project_id:
             manager.disconnect(user.id, project_id)
 
@@ -361,6 +361,17 @@ async def _get_cached_model_health() -> dict[str, dict]:
     return cached if cached is not None else {}
 
 
+async def _get_model_traffic_stats() -> dict[str, dict]:
+    """Per-model TTFT, tokens/s and error rate from recent agent traffic."""
+    from ..services.model_traffic import get_model_traffic
+
+    try:
+        return await get_model_traffic().snapshot(max_age=10.0)
+    except Exception as e:
+        logger.debug(f"Model traffic stats unavailable: {e}")
+        return {}
+
+
 async def _get_cached_model_pricing() -> dict[str, dict[str, float]]:
     """
     Build a model-id → {input, output} pricing map from LiteLLM /model/info.
@@ -395,13 +406,15 @@ async def get_available_models(
     """
     from ..models import UserAPIKey, UserCustomModel, UserProvider
     from ..services.model_adapters import BUILTIN_PROVIDERS, resolve_model_name
+    from ..services.model_traffic import model_status
 
     # Get models, pricing, and health from LiteLLM in parallel (all cached independently)
-    litellm_models, pricing_map, health_map, vision_map = await asyncio.gather(
+    litellm_models, pricing_map, health_map, vision_map, traffic_map = await asyncio.gather(
         _get_cached_litellm_models(),
         _get_cached_model_pricing(),
         _get_cached_model_health(),
         _get_cached_model_vision_support(),
+        _get_model_traffic_stats(),
     )
 
     # Convert LiteLLM models to response format with pricing and health
@@ -558,6 +571,10 @@ async def get_available_models(
     disabled_set = set(_disabled_source)
     for model in all_models:
         model["disabled"] = model["id"] in disabled_set
+        # Live stats from agent traffic, keyed by the name sent to the API
+        api_name = resolve_model_name(model["id"])
+        model["traffic"] = traffic_map.get(api_name)
+        model["routing_status"] = model_status(model["traffic"], health_map.get(api_name))
 
     return {
         "models": all_models,
@@ -885,26 +885,35 @@ async def get_project(
 async def get_file_tree(
     project_slug: str,
     container_dir: str | None = None,
+    since: str | None = None,
     current_user: User = Depends(get_authenticated_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get recursive filtered file tree (metadata only, no content)."""
+    """Get recursive filtered file tree (metadata only, no content).
+
+    Every response carries a ``version`` cursor. Passing it back as ``since``
+    returns only ``added``/``modified``/``removed`` entries (``delta: true``);
+    an unknown or expired cursor falls back to the full ``files`` list.
+    """
     from ..services.volume_manager import VolumeRestoringError, VolumeUnavailableError
 
     project = await get_project_by_slug(db, project_slug, current_user)
 
     from ..services.orchestration import get_orchestrator
+    from ..services.orchestration.file_tree import get_file_tree_service
 
     orchestrator = get_orchestrator()
 
     try:
-        entries = await orchestrator.list_tree(
+        changes = await get_file_tree_service().get_changes(
+            orchestrator,
             user_id=current_user.id,
             project_id=project.id,
             container_name=None,
             subdir=container_dir,
+            since=since,
         )
-        return {"status": "ready", "files": entries}
+        return {"status": "ready", **changes}
     except VolumeRestoringError:
         return JSONResponse(
             status_code=202,
@@ -8,6 +8,7 @@ worker tasks, and reconnect flows.
 import logging
 import os
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 from uuid import UUID
 
 import aiofiles
@@ -24,6 +25,9 @@ from ..models import (
 from ..models_team import ProjectMembership
 from ..utils.resource_naming import get_project_path
 
+if TYPE_CHECKING:
+    from .project_context_cache import ContextBuildSession
+
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
@@ -572,6 +576,7 @@ async def enrich_project_context_for_run(
     project: Project | None,
     user_id: UUID,
     mentions: MentionPayload | None = None,
+    context_blocks: "ContextBuildSession | None" = None,
 ) -> RunContextEnrichment:
     """Single entry point for per-run project_context enrichment.
 
@@ -584,11 +589,23 @@ async def enrich_project_context_for_run(
     block now means: add a field on ``RunContextEnrichment``, add a builder
     here, and add the key to the submodule's render list. No call-site
     changes anywhere.
+
+    With ``context_blocks`` (the worker's project context cache session)
+    the data overview is reused until the project's workspace data changes.
+    The mention-driven focus block is per turn and always built.
     """
     if project is None:
         return RunContextEnrichment()
 
-    overview = await _build_data_overview(project, db)
+    if context_blocks is not None:
+        overview = await context_blocks.get(
+            "data_overview",
+            (),
+            ("workspace_data",),
+            lambda: _build_data_overview(project, db),
+        )
+    else:
+        overview = await _build_data_overview(project, db)
 
     focus: str | None = None
     payload = mentions or MentionPayload()
@@ -603,21 +620,21 @@ async def enrich_project_context_for_run(
     return RunContextEnrichment(data_overview=overview, data_focus=focus)
 
 
-async def build_tier_snapshot(project: Project | None, db: AsyncSession) -> dict:
+async def build_tier_snapshot(
+    project: Project | None, db: AsyncSession, *, containers: list[dict] | None = None
+) -> dict:
     """Compact view of the project's compute-tier state for agent context.
 
     Shape consumed by bash_exec / shell_open / project_control tier_status.
     Returns empty dict when project is None so callers can spread safely.
+    ``containers`` (from :func:`load_tier_containers`, possibly cached)
+    skips the container query.
     """
     if project is None:
         return {}
 
-    try:
-        result = await db.execute(select(Container).where(Container.project_id == project.id))
-        containers = result.scalars().all()
-    except Exception as e:
-        logger.warning("[TIER-SNAPSHOT] Failed to load containers: %s", e)
-        containers = []
+    if containers is None:
+        containers = await load_tier_containers(project, db)
 
     return {
         "compute_tier": project.compute_tier,
@@ -627,14 +644,26 @@ async def build_tier_snapshot(project: Project | None, db: AsyncSession) -> dict
             project.last_activity.isoformat() if project.last_activity is not None else None
         ),
         "namespace": f"proj-{project.id}" if project.compute_tier == "environment" else None,
-        "containers": [
-            {
-                "name": c.name,
-                "status": c.status,
-                "ready": c.status == "running",
-                "is_primary": c.is_primary is True,
-                "container_type": c.container_type,
-            }
-            for c in containers
-        ],
+        "containers": containers,
     }
+
+
+async def load_tier_containers(project: Project, db: AsyncSession) -> list[dict]:
+    """The ``containers`` list of :func:`build_tier_snapshot`."""
+    try:
+        result = await db.execute(select(Container).where(Container.project_id == project.id))
+        containers = result.scalars().all()
+    except Exception as e:
+        logger.warning("[TIER-SNAPSHOT] Failed to load containers: %s", e)
+        containers = []
+
+    return [
+        {
+            "name": c.name,
+            "status": c.status,
+            "ready": c.status == "running",
+            "is_primary": c.is_primary is True,
+            "container_type": c.container_type,
+        }
+        for c in containers
+    ]
@@ -15,13 +15,21 @@ Two strategies depending on platform and compute state:
 The checkpoint reference stored in message metadata is prefixed:
   - ``git:<40-char-hash>``  — git ghost commit
   - ``vol:<volume-id>``     — btrfs volume fork
+
+Agent runs take their checkpoint lazily (:class:`LazyCheckpoint`): right
+before the first tool call that can change project files, so read-only
+turns never pay for one and it stays off the path to the first model call.
 """
 
+import asyncio
 import contextlib
 import logging
 import re
+from typing import Any
 from uuid import UUID
 
+from .task_profile import task_span
+
 logger = logging.getLogger(__name__)
 
 # Valid 40-char lowercase hex git commit hash
@@ -429,3 +437,92 @@ class CheckpointManager:
         )
         stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
         return stdout.decode() + stderr.decode()
+
+
+# ====================================================================== #
+#  Lazy checkpoints for agent runs                                        #
+# ====================================================================== #
+
+_CONTEXT_KEY = "_checkpoint"
+
+
+class LazyCheckpoint:
+    """The checkpoint of one agent run, created on first demand.
+
+    Nothing happens until :meth:`start` or :meth:`ensure` is called;
+    creation then runs once, as its own task, so a cancelled tool call does
+    not abort it. Undo semantics are unchanged: the checkpoint still
+    captures the files before the run's first change, because every tool
+    that ran before it was read-only.
+    """
+
+    def __init__(self, manager: CheckpointManager):
+        self.manager = manager
+        self._task: asyncio.Task | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Begin creating the checkpoint in the background (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._create())
+
+    async def ensure(self) -> str | None:
+        """The checkpoint reference, creating it now if it was not started yet."""
+        self.start()
+        return await asyncio.shield(self._task)
+
+    async def result(self) -> str | None:
+        """The checkpoint reference if one was started (waiting for it), else ``None``."""
+        if self._task is None:
+            return None
+        try:
+            return await asyncio.shield(self._task)
+        except asyncio.CancelledError:
+            if not self._task.cancelled():
+                raise
+            return None
+
+    async def _create(self) -> str | None:
+        try:
+            with task_span("checkpoint", "file_checkpoint"):
+                ref = await self.manager.create_checkpoint()
+        except Exception as exc:
+            logger.warning("[CHECKPOINT] create failed (non-fatal): %s", exc)
+            return None
+        if ref:
+            logger.info("[CHECKPOINT] %s for project %s", ref[:16], self.manager.project_id)
+        return ref
+
+
+def attach_lazy_checkpoint(context: dict[str, Any], manager: CheckpointManager) -> LazyCheckpoint:
+    """Attach a :class:`LazyCheckpoint` to an agent run's execution context."""
+    checkpoint = context[_CONTEXT_KEY] = LazyCheckpoint(manager)
+    return checkpoint
+
+
+def mutates_files(tool: Any, context: dict[str, Any]) -> bool:
+    """Whether running ``tool`` in this context can change project files."""
+    if tool is None or getattr(tool, "read_only", False):
+        return False
+    # Plan mode blocks writes; its shell access is for reading only.
+    if context.get("edit_mode") == "plan":
+        return False
+    return getattr(tool, "mutates_files", True)
+
+
+async def checkpoint_before_mutation(tool: Any, context: dict[str, Any]) -> None:
+    """Make sure the run's checkpoint exists before ``tool`` changes any files.
+
+    No-op without a :class:`LazyCheckpoint` in ``context`` (chat debug
+    endpoints, automation paths without a project) and for tools that
+    cannot change files.
+    """
+    checkpoint = context.get(_CONTEXT_KEY)
+    if checkpoint is None or not mutates_files(tool, context):
+        return
+    if not checkpoint.started:
+        logger.info("[CHECKPOINT] first file-mutating tool: %s", getattr(tool, "name", tool))
+    await checkpoint.ensure()
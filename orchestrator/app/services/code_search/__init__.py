@@ -0,0 +1,26 @@
+"""
+Indexed code search for the agent's grep tool.
+
+Public surface:
+    from app.services.code_search import get_code_search_service, SearchRequest
+
+- index.py   — TrigramIndex: lowercase trigram postings + file contents
+- query.py   — regex → required literals, candidate verification, rg-style output
+- service.py — CodeSearchService: per-project background builds, incremental
+  sync from the file-tree snapshot, LRU over projects
+"""
+
+from __future__ import annotations
+
+from .index import TrigramIndex
+from .query import SearchRequest, SearchResult, plan_literals
+from .service import CodeSearchService, get_code_search_service
+
+__all__ = [
+    "CodeSearchService",
+    "SearchRequest",
+    "SearchResult",
+    "TrigramIndex",
+    "get_code_search_service",
+    "plan_literals",
+]
@@ -0,0 +1,162 @@
+"""
+Trigram inverted index over project text files.
+
+Every indexed file is split into the set of its lowercase character
+trigrams; postings map each trigram to the ids of the files containing it.
+A query literal (extracted from the regex by ``query.plan_literals``)
+narrows the search to files containing *all* of the literal's trigrams —
+usually a tiny fraction of the project — and only those are verified with
+the real regex.
+
+Postings are append-only ``array('I')`` lists. Replacing or removing a file
+retires its id instead of rewriting postings; dead ids are filtered when
+candidates are resolved, and the postings are rebuilt once dead ids
+outnumber live ones.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+Trigram = tuple[str, str, str]
+
+# Below this many retired ids compaction is not worth a rebuild.
+_MIN_DEAD_FOR_COMPACTION = 1024
+
+# Rough CPython cost of one postings key: the trigram tuple, its three
+# one-char strings (interned for ASCII), the array header and the dict slot.
+_TRIGRAM_OVERHEAD = 200
+
+
+def trigrams(text: str) -> set[Trigram]:
+    """Distinct lowercase trigrams of ``text``."""
+    low = text.lower()
+    return set(zip(low, low[1:], low[2:], strict=False))
+
+
+@dataclass(slots=True)
+class Document:
+    path: str
+    text: str
+    stamp: tuple[object, object]  # (size, mod_time) from the tree listing
+
+
+class TrigramIndex:
+    """Inverted trigram index with in-memory file contents for verification."""
+
+    def __init__(self) -> None:
+        self._postings: dict[Trigram, array] = {}
+        self._docs: list[Document | None] = []
+        self._ids: dict[str, int] = {}
+        self._bytes = 0
+        self._postings_len = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._ids
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory held: file text plus postings (retired ids included)."""
+        return self._bytes + 4 * self._postings_len + _TRIGRAM_OVERHEAD * len(self._postings)
+
+    def paths(self) -> Iterable[str]:
+        return self._ids.keys()
+
+    def get(self, path: str) -> Document | None:
+        doc_id = self._ids.get(path)
+        return self._docs[doc_id] if doc_id is not None else None
+
+    def add(self, path: str, text: str, stamp: tuple[object, object]) -> None:
+        """Index ``path`` with ``text``, replacing any previous version."""
+        self.remove(path)
+        doc_id = len(self._docs)
+        self._docs.append(Document(path=path, text=text, stamp=stamp))
+        self._ids[path] = doc_id
+        self._bytes += len(text)
+        self._post(doc_id, text)
+
+    def remove(self, path: str) -> None:
+        doc_id = self._ids.pop(path, None)
+        if doc_id is None:
+            return
+        doc = self._docs[doc_id]
+        self._docs[doc_id] = None
+        if doc is not None:
+            self._bytes -= len(doc.text)
+        dead = len(self._docs) - len(self._ids)
+        if dead >= _MIN_DEAD_FOR_COMPACTION and dead > len(self._ids):
+            self._compact()
+
+    def candidates(self, clauses: list[list[str]]) -> list[Document]:
+        """
+        Live documents that may match a query, sorted by path.
+
+        ``clauses`` is a conjunction of disjunctions of literals: a document
+        is a candidate if, for every clause, it contains the trigrams of at
+        least one of the clause's literals. No clauses means every document.
+        """
+        ids: set[int] | None = None
+        for clause in clauses:
+            clause_ids: set[int] = set()
+            for literal in clause:
+                clause_ids |= self._literal_ids(literal)
+            ids = clause_ids if ids is None else ids & clause_ids
+            if not ids:
+                return []
+
+        if ids is None:
+            docs = [d for d in self._docs if d is not None]
+        else:
+            docs = [d for d in map(self._docs.__getitem__, ids) if d is not None]
+        docs.sort(key=lambda d: d.path)
+        return docs
+
+    def _literal_ids(self, literal: str) -> set[int]:
+        grams = trigrams(literal)
+        postings = []
+        for gram in grams:
+            plist = self._postings.get(gram)
+            if plist is None:
+                return set()
+            postings.append(plist)
+        if not postings:
+            # Shorter than a trigram: cannot narrow.
+            return set(self._ids.values())
+        postings.sort(key=len)
+        ids = set(postings[0])
+        for plist in postings[1:]:
+            ids.intersection_update(plist)
+            if not ids:
+                break
+        return ids
+
+    def _post(self, doc_id: int, text: str) -> None:
+        postings = self._postings
+        grams = trigrams(text)
+        for gram in grams:
+            plist = postings.get(gram)
+            if plist is None:
+                postings[gram] = array("I", (doc_id,))
+            else:
+                plist.append(doc_id)
+        self._postings_len += len(grams)
+
+    def _compact(self) -> None:
+        live = [d for d in self._docs if d is not None]
+        self._postings = {}
+        self._postings_len = 0
+        self._docs = []
+        self._ids = {}
+        for doc_id, doc in enumerate(live):
+            self._docs.append(doc)
+            self._ids[doc.path] = doc_id
+            self._post(doc_id, doc.text)
@@ -0,0 +1,296 @@
+"""
+Query planning and verification for indexed code search.
+
+``plan_literals`` turns a regex into the literals every match must contain
+(used to pick candidate files from the trigram index); ``search`` verifies
+candidates with the real regex and produces results in the grep tool's
+shapes — file lists, per-file line counts, or ripgrep-style match records
+with context.
+
+Matching follows ripgrep's defaults as used by the grep tool: line-oriented
+unless ``multiline`` (then ``.`` also matches newlines), hidden files
+skipped, ``glob`` matched against the basename unless it contains ``/``.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import posixpath
+import re
+from dataclasses import dataclass, field
+
+# ``re`` exposes no public parse tree; the parser module is stable across
+# the supported Python versions.
+from re import _constants as sre_constants  # type: ignore[attr-defined]
+from re import _parser as sre_parser  # type: ignore[attr-defined]
+from typing import Any
+
+from .index import Document
+
+# ripgrep --type names understood by the index. Other types fall back to rg.
+RG_TYPES: dict[str, tuple[str, ...]] = {
+    "c": ("*.c", "*.h", "*.H"),
+    "cpp": ("*.C", "*.cc", "*.cpp", "*.cxx", "*.h", "*.hh", "*.hpp", "*.hxx", "*.inl"),
+    "css": ("*.css", "*.scss"),
+    "go": ("*.go",),
+    "html": ("*.htm", "*.html", "*.ejs"),
+    "java": ("*.java", "*.jsp", "*.jspx", "*.properties"),
+    "js": ("*.js", "*.jsx", "*.mjs", "*.cjs", "*.vue"),
+    "json": ("*.json", "composer.lock", "*.sarif"),
+    "md": ("*.markdown", "*.md", "*.mdown", "*.mdwn", "*.mkd", "*.mkdn", "*.mdx"),
+    "py": ("*.py", "*.pyi"),
+    "rust": ("*.rs",),
+    "sh": ("*.bash", "*.sh", "*.zsh", ".bashrc", ".zshrc", ".profile"),
+    "toml": ("*.toml", "Cargo.lock"),
+    "ts": ("*.ts", "*.tsx", "*.cts", "*.mts"),
+    "yaml": ("*.yaml", "*.yml"),
+}
+
+_MIN_LITERAL = 3
+
+# Where the project tree is mounted in dev containers (ripgrep's working
+# directory); absolute tool paths under it map onto index paths.
+CONTAINER_ROOT = "/app"
+
+
+# =============================================================================
+# Planning
+# =============================================================================
+
+
+def plan_literals(pattern: str) -> list[list[str]]:
+    """
+    Literals any match of ``pattern`` must contain, as AND-of-OR clauses.
+
+    Conservative: constructs that are not understood simply contribute no
+    clause, so a pattern with no usable literal yields ``[]`` (scan all).
+    """
+    try:
+        parsed = sre_parser.parse(pattern)
+    except re.error:
+        return []
+    clauses: list[list[str]] = []
+    run: list[str] = []
+    _walk(parsed, run, clauses)
+    _flush(run, clauses)
+    return clauses
+
+
+def _flush(run: list[str], clauses: list[list[str]]) -> None:
+    if len(run) >= _MIN_LITERAL:
+        clauses.append(["".join(run)])
+    run.clear()
+
+
+def _walk(seq: Any, run: list[str], clauses: list[list[str]]) -> None:
+    c = sre_constants
+    for op, av in seq:
+        if op is c.LITERAL:
+            run.append(chr(av))
+        elif op is c.SUBPATTERN:
+            # Plain grouping: its content continues the current literal run.
+            _walk(av[-1], run, clauses)
+        elif op in (c.MAX_REPEAT, c.MIN_REPEAT, c.POSSESSIVE_REPEAT):
+            lo, _hi, sub = av
+            _flush(run, clauses)
+            if lo >= 1:
+                inner: list[str] = []
+                _walk(sub, inner, clauses)
+                _flush(inner, clauses)
+        elif op is c.BRANCH:
+            _flush(run, clauses)
+            alternatives: list[str] = []
+            for alt in av[1]:
+                alt_clauses: list[list[str]] = []
+                alt_run: list[str] = []
+                _walk(alt, alt_run, alt_clauses)
+                _flush(alt_run, alt_clauses)
+                if not alt_clauses:
+                    # One alternative can match without any literal.
+                    alternatives = []
+                    break
+                alternatives.append(max((lit for cl in alt_clauses for lit in cl), key=len))
+            if alternatives:
+                clauses.append(alternatives)
+        else:
+            _flush(run, clauses)
+
+
+# =============================================================================
+# Verification
+# =============================================================================
+
+
+@dataclass
+class SearchRequest:
+    pattern: str
+    output_mode: str = "files_with_matches"
+    path: str | None = None
+    glob: str | None = None
+    file_type: str | None = None
+    ignore_case: bool = False
+    multiline: bool = False
+    before: int = 0
+    after: int = 0
+    max_content_bytes: int = 256 * 1024
+
+
+@dataclass
+class SearchResult:
+    files: list[str] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+    matches: list[dict[str, Any]] = field(default_factory=list)
+    truncated: bool = False
+    candidates: int = 0
+
+
+def supports(request: SearchRequest) -> bool:
+    """Whether the index can answer ``request`` exactly like ripgrep would."""
+    if request.file_type is not None and request.file_type not in RG_TYPES:
+        return False
+    try:
+        re.compile(request.pattern, _flags(request))
+    except re.error:
+        # Rust regex syntax Python lacks (\p{Greek}, \z, ...): ripgrep decides.
+        return False
+    return True
+
+
+def _flags(request: SearchRequest) -> int:
+    flags = re.MULTILINE | (re.IGNORECASE if request.ignore_case else 0)
+    if request.multiline:
+        flags |= re.DOTALL
+    return flags
+
+
+def search(docs: list[Document], request: SearchRequest) -> SearchResult:
+    """Verify candidate documents against the request's regex."""
+    rx = re.compile(request.pattern, _flags(request))
+
+    result = SearchResult()
+    content_bytes = 0
+    for doc in docs:
+        if not _selected(doc.path, request):
+            continue
+        result.candidates += 1
+        # Whole-file prefilter: any line match is also a match here.
+        if rx.search(doc.text) is None:
+            continue
+
+        hits = _multiline_hits(rx, doc.text) if request.multiline else _line_hits(rx, doc.text)
+        if not hits:
+            continue
+
+        result.files.append(doc.path)
+        result.counts[doc.path] = len(hits)
+        if request.output_mode != "content" or result.truncated:
+            continue
+        for record in _records(doc, hits, request):
+            content_bytes += len(record["line_text"])
+            if content_bytes > request.max_content_bytes:
+                result.truncated = True
+                break
+            result.matches.append(record)
+    return result
+
+
+def path_prefix(path: str | None) -> str | None:
+    """
+    ``path`` as a prefix of index paths (relative to the project root).
+
+    ``None`` means the whole tree. Absolute paths under ``CONTAINER_ROOT``
+    are made relative; other absolute paths are kept and match nothing.
+    """
+    if not path:
+        return None
+    path = posixpath.normpath(path)
+    if path == CONTAINER_ROOT or path.startswith(CONTAINER_ROOT + "/"):
+        path = path[len(CONTAINER_ROOT) :].lstrip("/")
+    return path if path not in ("", ".") else None
+
+
+def _selected(path: str, request: SearchRequest) -> bool:
+    segments = path.split("/")
+    if any(seg.startswith(".") for seg in segments):
+        return False
+    prefix = path_prefix(request.path)
+    if prefix is not None and path != prefix and not path.startswith(prefix + "/"):
+        return False
+    if request.glob and not _glob_match(path, request.glob):
+        return False
+    if request.file_type:
+        name = segments[-1]
+        if not any(fnmatch.fnmatchcase(name, g) for g in RG_TYPES[request.file_type]):
+            return False
+    return True
+
+
+def _glob_match(path: str, glob: str) -> bool:
+    negate = glob.startswith("!")
+    if negate:
+        glob = glob[1:]
+    if "/" in glob:
+        matched = fnmatch.fnmatchcase(path, glob.lstrip("/"))
+    else:
+        matched = fnmatch.fnmatchcase(path.rsplit("/", 1)[-1], glob)
+    return matched != negate
+
+
+def _split_lines(text: str) -> list[str]:
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+    return lines
+
+
+def _line_hits(rx: re.Pattern, text: str) -> list[tuple[int, int]]:
+    """(first, last) 0-based line index of every matching line."""
+    return [(i, i) for i, line in enumerate(_split_lines(text)) if rx.search(line)]
+
+
+def _multiline_hits(rx: re.Pattern, text: str) -> list[tuple[int, int]]:
+    hits: list[tuple[int, int]] = []
+    last_line = -1
+    for m in rx.finditer(text):
+        first = text.count("\n", 0, m.start())
+        if first <= last_line:
+            continue
+        end = m.end() - 1 if m.end() > m.start() else m.start()
+        last_line = first + text.count("\n", m.start(), max(end, m.start()))
+        hits.append((first, last_line))
+    return hits
+
+
+def _records(
+    doc: Document, hits: list[tuple[int, int]], request: SearchRequest
+) -> list[dict[str, Any]]:
+    lines = _split_lines(doc.text)
+    hit_lines = {i for first, last in hits for i in range(first, last + 1)}
+
+    def _ctx(i: int) -> dict[str, Any]:
+        return {"line_number": i + 1, "line_text": lines[i]}
+
+    records: list[dict[str, Any]] = []
+    emitted = -1  # last line already printed as match or context
+    for first, last in hits:
+        record: dict[str, Any] = {
+            "path": doc.path,
+            "line_number": first + 1,
+            "line_text": "\n".join(lines[first : last + 1]),
+        }
+        if request.before:
+            before = [_ctx(i) for i in range(max(emitted + 1, first - request.before), first)]
+            if before:
+                record["before_context"] = before
+        emitted = last
+        if request.after:
+            after = []
+            for i in range(last + 1, min(last + 1 + request.after, len(lines))):
+                if i in hit_lines:
+                    break
+                after.append(_ctx(i))
+                emitted = i
+            if after:
+                record["after_context"] = after
+        records.append(record)
+    return records
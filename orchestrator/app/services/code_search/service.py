@@ -0,0 +1,352 @@
+"""
+Per-project code search indexes.
+
+The first search in a project starts a background build: the file list
+comes from the shared file-tree snapshot and contents are read with
+``read_files_batch`` (streamed from the volume's FileOps node on
+Kubernetes, read from disk on local/docker), so no dev pod is needed.
+Until the build finishes ``search`` returns ``None`` and the grep tool
+keeps using ripgrep.
+
+Afterwards each search first syncs the index with the tree snapshot's delta
+since the index's cursor. Snapshots are marked dirty by the orchestrator's
+writes, its commands and the file-change watchers, so only files whose
+``(size, mod_time)`` changed are re-read. Projects whose text exceeds
+``code_search_index_max_bytes`` are not indexed and always use ripgrep.
+All indexes of a process together stay under ``code_search_memory_max_bytes``
+(text plus estimated postings): the least recently searched are dropped
+first, and a project that does not fit on its own uses ripgrep. Indexes
+live in memory only and are rebuilt after a restart.
+
+Indexing and regex verification are CPU-bound (seconds for tens of MB), so
+both run in a worker thread; the per-index lock keeps a sync from mutating
+the index while a search scans it. Indexes are per ``(project, container)``
+because each container sees its own tree.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from ..orchestration.file_tree import get_file_tree_service
+from .index import TrigramIndex
+from .query import SearchRequest, SearchResult, path_prefix, plan_literals, search, supports
+
+logger = logging.getLogger(__name__)
+
+# Files per read_files_batch call while (re)indexing.
+_READ_BATCH = 200
+
+# How long a project that failed to build or was too large stays on ripgrep
+# before another build is attempted.
+_RETRY_AFTER_SECONDS = 600.0
+
+
+@dataclass
+class _ProjectIndex:
+    index: TrigramIndex = field(default_factory=TrigramIndex)
+    cursor: str | None = None
+    ready: bool = False
+    build_task: asyncio.Task | None = None
+    # monotonic time before which no rebuild is attempted (too large / failed)
+    disabled_until: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class CodeSearchService:
+    """Trigram indexes for the most recently searched projects."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_file_bytes: int,
+        max_projects: int,
+        max_memory_bytes: int = 0,
+    ) -> None:
+        self._max_bytes = max(0, max_bytes)
+        self._max_file_bytes = max_file_bytes
+        self._max_projects = max(1, max_projects)
+        # 0: only max_bytes per project and max_projects bound memory.
+        self._max_memory_bytes = max(0, max_memory_bytes)
+        self._projects: OrderedDict[tuple[str, str], _ProjectIndex] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    async def search(
+        self,
+        orchestrator: Any,
+        user_id: UUID,
+        project_id: UUID | str,
+        container_name: str | None,
+        request: SearchRequest,
+    ) -> SearchResult | None:
+        """
+        Answer ``request`` from the project's index.
+
+        Returns ``None`` when the index cannot answer (disabled, still
+        building, project too large, unsupported request, or a ``path``
+        that matches no indexed file) — the caller falls back to ripgrep.
+        """
+        if not self.enabled or not supports(request):
+            return None
+        entry = self._entry(project_id, container_name)
+        if not entry.ready:
+            self._start_build(entry, orchestrator, user_id, project_id, container_name)
+            return None
+
+        async with entry.lock:
+            try:
+                await self._sync(entry, orchestrator, user_id, project_id, container_name)
+            except Exception as exc:
+                logger.warning(
+                    "[CODE-SEARCH] Sync failed for %s, using ripgrep: %s", project_id, exc
+                )
+                return None
+            if not entry.ready:
+                return None
+
+            started = time.perf_counter()
+            result = await asyncio.to_thread(_query, entry.index, request)
+        if result is None:
+            return None
+        logger.debug(
+            "[CODE-SEARCH] %r: %d/%d candidates, %d files in %.1fms",
+            request.pattern,
+            result.candidates,
+            len(entry.index),
+            len(result.files),
+            (time.perf_counter() - started) * 1000,
+        )
+        return result
+
+    async def warm(
+        self,
+        orchestrator: Any,
+        user_id: UUID,
+        project_id: UUID | str,
+        container_name: str | None,
+    ) -> bool:
+        """Build the project's index now if needed. Returns whether it is ready."""
+        entry = self._entry(project_id, container_name)
+        if not entry.ready:
+            self._start_build(entry, orchestrator, user_id, project_id, container_name)
+            if entry.build_task is not None:
+                with contextlib.suppress(Exception):
+                    await asyncio.shield(entry.build_task)
+        return entry.ready
+
+    def drop(self, project_id: UUID | str) -> None:
+        """Forget the project's indexes for every container."""
+        for scope in [k for k in self._projects if k[0] == str(project_id)]:
+            entry = self._projects.pop(scope)
+            if entry.build_task is not None:
+                entry.build_task.cancel()
+
+    def _fits_memory(self, entry: _ProjectIndex) -> bool:
+        """Drop least recently searched indexes until ``entry`` fits the budget.
+
+        False if ``entry`` alone exceeds it.
+        """
+        if not self._max_memory_bytes:
+            return True
+        used = sum(e.index.memory_bytes for e in self._projects.values() if e is not entry)
+        used += entry.index.memory_bytes
+        for scope in list(self._projects):
+            if used <= self._max_memory_bytes:
+                break
+            other = self._projects[scope]
+            if other is entry:
+                continue
+            del self._projects[scope]
+            if other.build_task is not None:
+                other.build_task.cancel()
+            used -= other.index.memory_bytes
+            logger.info("[CODE-SEARCH] Dropped index for %s to stay in memory budget", scope[0])
+        return used <= self._max_memory_bytes
+
+    def _entry(self, project_id: UUID | str, container_name: str | None) -> _ProjectIndex:
+        scope = (str(project_id), container_name or "")
+        entry = self._projects.get(scope)
+        if entry is None:
+            entry = self._projects[scope] = _ProjectIndex()
+            while len(self._projects) > self._max_projects:
+                _, evicted = self._projects.popitem(last=False)
+                if evicted.build_task is not None:
+                    evicted.build_task.cancel()
+        else:
+            self._projects.move_to_end(scope)
+        return entry
+
+    def _start_build(
+        self,
+        entry: _ProjectIndex,
+        orchestrator: Any,
+        user_id: UUID,
+        project_id: UUID | str,
+        container_name: str | None,
+    ) -> None:
+        if entry.build_task is not None and not entry.build_task.done():
+            return
+        if time.monotonic() < entry.disabled_until:
+            return
+        entry.build_task = asyncio.create_task(
+            self._build(entry, orchestrator, user_id, project_id, container_name)
+        )
+
+    async def _build(
+        self,
+        entry: _ProjectIndex,
+        orchestrator: Any,
+        user_id: UUID,
+        project_id: UUID | str,
+        container_name: str | None,
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            async with entry.lock:
+                entry.index = TrigramIndex()
+                entry.cursor = None
+                await self._sync(entry, orchestrator, user_id, project_id, container_name)
+                entry.ready = entry.cursor is not None
+        except Exception as exc:
+            entry.disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+            logger.warning("[CODE-SEARCH] Index build failed for %s: %s", project_id, exc)
+            return
+        if entry.ready:
+            logger.info(
+                "[CODE-SEARCH] Indexed %d files (%d bytes) for %s in %.1fs",
+                len(entry.index),
+                entry.index.total_bytes,
+                project_id,
+                time.perf_counter() - started,
+            )
+
+    async def _sync(
+        self,
+        entry: _ProjectIndex,
+        orchestrator: Any,
+        user_id: UUID,
+        project_id: UUID | str,
+        container_name: str | None,
+    ) -> None:
+        """Bring the index up to date with the tree snapshot. Caller holds the lock."""
+        changes = await get_file_tree_service().get_changes(
+            orchestrator, user_id, project_id, container_name, since=entry.cursor
+        )
+        if changes["version"] == entry.cursor:
+            return
+
+        if changes["delta"]:
+            upserts = changes["added"] + changes["modified"]
+            removed = list(changes["removed"])
+        else:
+            upserts = changes["files"]
+            listed = {e.get("path") for e in upserts}
+            removed = [p for p in entry.index.paths() if p not in listed]
+
+        to_read: dict[str, tuple[object, object]] = {}
+        for e in upserts:
+            path = e.get("path")
+            if not path or e.get("is_dir"):
+                continue
+            if any(seg.startswith(".") for seg in path.split("/")):
+                continue  # ripgrep skips hidden files by default
+            stamp = (e.get("size"), e.get("mod_time"))
+            size = e.get("size") or 0
+            if size > self._max_file_bytes:
+                if path in entry.index:
+                    removed.append(path)
+                continue
+            doc = entry.index.get(path)
+            if doc is None or doc.stamp != stamp:
+                to_read[path] = stamp
+
+        if removed:
+            await asyncio.to_thread(_remove_all, entry.index, removed)
+
+        paths = list(to_read)
+        for start in range(0, len(paths), _READ_BATCH):
+            batch = paths[start : start + _READ_BATCH]
+            files, errors = await orchestrator.read_files_batch(
+                user_id, project_id, container_name, batch
+            )
+            await asyncio.to_thread(_apply_batch, entry.index, files, errors, to_read)
+            if entry.index.total_bytes > self._max_bytes or not self._fits_memory(entry):
+                entry.index = TrigramIndex()
+                entry.cursor = None
+                entry.ready = False
+                entry.disabled_until = time.monotonic() + _RETRY_AFTER_SECONDS
+                logger.info(
+                    "[CODE-SEARCH] Project %s is too large to index; using ripgrep",
+                    project_id,
+                )
+                return
+
+        entry.cursor = changes["version"]
+
+
+# =============================================================================
+# Worker-thread helpers
+# =============================================================================
+
+
+def _remove_all(index: TrigramIndex, paths: list[str]) -> None:
+    for path in paths:
+        index.remove(path)
+
+
+def _apply_batch(
+    index: TrigramIndex,
+    files: list[dict[str, Any]],
+    errors: list[str],
+    to_read: dict[str, tuple[object, object]],
+) -> None:
+    for f in files:
+        content = f.get("content")
+        if isinstance(content, str) and f["path"] in to_read:
+            index.add(f["path"], content, to_read[f["path"]])
+    for path in errors:
+        index.remove(path)
+
+
+def _query(index: TrigramIndex, request: SearchRequest) -> SearchResult | None:
+    prefix = path_prefix(request.path)
+    if prefix is not None and not any(
+        p == prefix or p.startswith(prefix + "/") for p in index.paths()
+    ):
+        # Outside the indexed tree (or a path form the index doesn't know);
+        # let ripgrep resolve it rather than report no matches.
+        return None
+    return search(index.candidates(plan_literals(request.pattern)), request)
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: CodeSearchService | None = None
+
+
+def get_code_search_service() -> CodeSearchService:
+    """Process-wide code search indexes shared by all agent runs."""
+    global _instance
+    if _instance is None:
+        from ...config import get_settings
+
+        settings = get_settings()
+        _instance = CodeSearchService(
+            max_bytes=settings.code_search_index_max_bytes,
+            max_file_bytes=settings.code_search_max_file_bytes,
+            max_projects=settings.code_search_max_projects,
+            max_memory_bytes=settings.code_search_memory_max_bytes,
+        )
+    return _instance
@@ -23,6 +23,8 @@ from kubernetes import client as k8s_client
 from kubernetes.client.rest import ApiException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .project_context_cache import invalidate_project_context
+
 logger = logging.getLogger(__name__)
 
 # Per-request app_instance_id, set by callers (e.g. app_runtime_status.start)
@@ -56,6 +58,7 @@ async def _persist_failed_state(project_id: UUID, container_ids: list[UUID]) ->
                     update(Container).where(Container.id.in_(container_ids)).values(status="failed")
                 )
             await db.commit()
+            invalidate_project_context(project_id, "containers")
     except Exception:  # noqa: BLE001
         logger.debug("persist_failed_state ignored error", exc_info=True)
 
@@ -250,6 +253,13 @@ def placement_budget(containers: list) -> PlacementBudget:
     return PlacementBudget(cpu_millicores=total_cpu, memory_mib=total_mem)
 
 
+# Requests of a single Tier-1 pod (see _build_pod_manifest).
+_EPHEMERAL_POD_BUDGET = PlacementBudget(
+    cpu_millicores=_parse_cpu_millicores(_DEV_CONTAINER_CPU_REQUEST),
+    memory_mib=_parse_mem_mib(_DEV_CONTAINER_MEM_REQUEST),
+)
+
+
 class ComputeQuotaExceeded(Exception):
     """Raised when the concurrent compute pod limit is reached."""
 
@@ -260,6 +270,10 @@ _COMPUTE_PRIORITY_CLASS = "tesslate-ephemeral"
 _COMPUTE_RUN_AS_UID = 1000  # user, group, and fs_group for all compute pods
 _COMPUTE_POD_CPU_LIMIT = "2000m"
 _COMPUTE_POD_MEM_LIMIT = "4Gi"
+# Ranked placement candidates handed to the Hub's EnsureCached. A short
+# list keeps the Hub's own headroom tie-break from undoing bin-packing
+# while still leaving it fallbacks if the top node dies mid-call.
+_HUB_CANDIDATE_LIMIT = 3
 
 
 class ComputeManager:
@@ -298,21 +312,9 @@ class ComputeManager:
 
     async def _get_schedulable_nodes(self) -> list[str]:
         """Return names of all K8s nodes that are Ready and not cordoned."""
-        v1 = self._api()
-        try:
-            node_list = await asyncio.to_thread(v1.list_node)
-        except Exception:
-            logger.warning("[COMPUTE] Failed to list K8s nodes")
-            return []
-        result = []
-        for node in node_list.items or []:
-            if node.spec and node.spec.unschedulable:
-                continue
-            for cond in node.status.conditions or []:
-                if cond.type == "Ready" and cond.status == "True":
-                    result.append(node.metadata.name)
-                    break
-        return result
+        from .placement import get_placement_engine
+
+        return await get_placement_engine().schedulable_nodes()
 
     # ------------------------------------------------------------------
     # Compute namespace lifecycle (lazy init)
@@ -550,6 +552,24 @@ class ComputeManager:
         )
         return len(pod_list.items or [])
 
+    async def _place_ephemeral_pod(self, cache_node: str | None) -> str | None:
+        """Pick the node a Tier-1 pod prefers (soft affinity) and reserve it.
+
+        Always the volume's cache node, where its btrfs subvolume lives; the
+        best-packed node only when there is no cache node or it is no longer
+        schedulable.
+        """
+        from .placement import get_placement_engine
+
+        placement = get_placement_engine()
+        if cache_node and cache_node in await placement.schedulable_nodes():
+            node = cache_node
+        else:
+            node = await placement.pick(_EPHEMERAL_POD_BUDGET)
+        if node:
+            placement.reserve(node, _EPHEMERAL_POD_BUDGET, environment=False)
+        return node
+
     async def run_command(
         self,
         volume_id: str,
@@ -593,6 +613,7 @@ class ComputeManager:
 
         # Use reusable per-volume PV/PVC (not per-pod)
         pvc_name = await self._ensure_compute_pv_pvc(volume_id, node_name)
+        preferred_node = await self._place_ephemeral_pod(node_name)
 
         manifest = self._build_pod_manifest(
             pod_name=pod_name,
@@ -601,6 +622,7 @@ class ComputeManager:
             image=devserver_image,
             timeout=timeout,
             pvc_name=pvc_name,
+            preferred_node=preferred_node,
         )
 
         try:
@@ -670,6 +692,7 @@ class ComputeManager:
 
         # Use reusable per-volume PV/PVC (not per-pod)
         pvc_name = await self._ensure_compute_pv_pvc(volume_id, node_name)
+        preferred_node = await self._place_ephemeral_pod(node_name)
 
         manifest = self._build_pod_manifest(
             pod_name=pod_name,
@@ -678,6 +701,7 @@ class ComputeManager:
             image=devserver_image,
             timeout=1800,
             pvc_name=pvc_name,
+            preferred_node=preferred_node,
         )
         # Add ephemeral-specific labels
         manifest.metadata.labels["tesslate.io/component"] = "ephemeral-shell"
@@ -916,6 +940,7 @@ class ComputeManager:
         timeout: int = 120,
         pvc_name: str | None = None,
         state_model: str = "per_install_volume",
+        preferred_node: str | None = None,
     ) -> k8s_client.V1Pod:
         """Build the ephemeral pod manifest (CSI PVC volume, PSA restricted).
 
@@ -931,6 +956,9 @@ class ComputeManager:
           legitimately write outside ``/tmp`` to mounted volumes — RO root
           would break them. Stateless apps have no such write contract, so
           RO root catches the silent-write class loudly.
+
+        ``preferred_node`` (from the placement engine) becomes a soft node
+        affinity so the pod lands next to the cached volume when it can.
         """
         pvc_name = pvc_name or f"compute-pvc-{pod_name}"
         # See state_model gating above. We only flip readOnlyRootFilesystem
@@ -938,6 +966,27 @@ class ComputeManager:
         # surface that RO root would break.
         read_only_root = state_model == "stateless"
 
+        affinity = None
+        if preferred_node:
+            affinity = k8s_client.V1Affinity(
+                node_affinity=k8s_client.V1NodeAffinity(
+                    preferred_during_scheduling_ignored_during_execution=[
+                        k8s_client.V1PreferredSchedulingTerm(
+                            weight=80,
+                            preference=k8s_client.V1NodeSelectorTerm(
+                                match_expressions=[
+                                    k8s_client.V1NodeSelectorRequirement(
+                                        key="kubernetes.io/hostname",
+                                        operator="In",
+                                        values=[preferred_node],
+                                    )
+                                ]
+                            ),
+                        )
+                    ]
+                )
+            )
+
         return k8s_client.V1Pod(
             metadata=k8s_client.V1ObjectMeta(
                 name=pod_name,
@@ -954,6 +1003,7 @@ class ComputeManager:
                 active_deadline_seconds=timeout + 30,  # K8s safety net slightly after app timeout
                 termination_grace_period_seconds=5,
                 automount_service_account_token=False,
+                affinity=affinity,
                 security_context=k8s_client.V1PodSecurityContext(
                     run_as_user=_COMPUTE_RUN_AS_UID,
                     run_as_group=_COMPUTE_RUN_AS_UID,
@@ -1528,8 +1578,29 @@ class ComputeManager:
         #    enough headroom for the placement unit. The Hub handles data
         #    transfer internally (peer-transfer or CAS restore) and
         #    prefers the node where the volume already lives (fast path).
+        #    Candidates come from the placement engine, ranked by fit,
+        #    volume locality and packing. The owner from the Hub registry
+        #    is always kept among them so the Hub's fast path still wins;
+        #    project.cache_node can lag behind an ownership transfer.
+        from .placement import get_placement_engine
+
         vm = get_volume_manager()
-        candidate_nodes = await self._get_schedulable_nodes()
+        placement = get_placement_engine()
+        try:
+            owner_node = await vm.get_volume_owner(volume_id) or project.cache_node
+        except Exception as e:
+            logger.warning(
+                "[COMPUTE-T2] Owner lookup for volume %s failed, using cache_node: %s",
+                volume_id,
+                e,
+            )
+            owner_node = project.cache_node
+        candidate_nodes = await placement.candidate_nodes(
+            budget,
+            cached_on=[owner_node] if owner_node else [],
+            owner=owner_node,
+            limit=_HUB_CANDIDATE_LIMIT,
+        )
         if not candidate_nodes:
             raise RuntimeError("No schedulable compute nodes available")
         node_name = await vm.ensure_cached(
@@ -1538,6 +1609,7 @@ class ComputeManager:
             budget_cpu=budget.cpu_millicores,
             budget_mem=budget.memory_mib * 1024 * 1024,  # MiB → bytes for Hub
         )
+        placement.reserve(node_name, budget, environment=True)
 
         # 3. Separate service and dev containers
         service_containers = [
@@ -2171,6 +2243,7 @@ class ComputeManager:
             .values(status="stopped")
         )
         await db.commit()
+        invalidate_project_context(project.id, "containers")
 
 
 # ------------------------------------------------------------------
@@ -497,7 +497,7 @@ class DeploymentBuilder:
         Collect deployment files directly from a btrfs volume via FileOps gRPC.
 
         Uses ListTree to enumerate files (with server-side exclusions) and
-        concurrent ReadFile calls to fetch contents. This bypasses the slow
+        batched ReadFilesStream calls to fetch contents. This bypasses the slow
         tar|base64-over-exec path that chokes on large build outputs.
 
         Args:
@@ -572,49 +572,70 @@ class DeploymentBuilder:
 
         logger.info(f"FileOps listed {len(file_entries)} files in {target_rel}")
 
-        # Read files concurrently in batches to avoid overwhelming the gRPC server
+        # Stream contents in batches; each batch is one ReadFilesStream call
+        # whose files arrive as raw chunks rather than one base64 response.
+        # Batches are also bounded by bytes so the unary ReadFiles fallback
+        # (older CSI nodes) stays under the 64 MB message limit once base64'd.
         max_file_size = 10 * 1024 * 1024  # 10 MB per file
-        batch_size = 50
+        max_batch_files = 200
+        max_batch_bytes = 32 * 1024 * 1024
+        prefix = "" if target_rel == "." else target_rel.rstrip("/") + "/"
         files: list[DeploymentFile] = []
 
-        for i in range(0, len(file_entries), batch_size):
-            batch = file_entries[i : i + batch_size]
-            tasks = []
-            for entry in batch:
-                if entry.size > max_file_size:
-                    logger.warning(f"Skipping oversized file {entry.path} ({entry.size} bytes)")
-                    continue
-                tasks.append(
-                    self._read_single_file_via_fileops(client, volume_id, entry, target_rel)
-                )
+        batches: list[list[str]] = [[]]
+        batch_bytes = 0
+        for entry in file_entries:
+            if entry.size > max_file_size:
+                logger.warning(f"Skipping oversized file {entry.path} ({entry.size} bytes)")
+                continue
+            if batches[-1] and (
+                len(batches[-1]) >= max_batch_files or batch_bytes + entry.size > max_batch_bytes
+            ):
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(entry.path)
+            batch_bytes += entry.size
+
+        def _add(blob) -> None:
+            if blob.error is not None:
+                logger.warning(f"Failed to read {blob.path}: {blob.error}")
+                return
+            # Make path relative to the target directory
+            rel_path = blob.path
+            if prefix and rel_path.startswith(prefix):
+                rel_path = rel_path[len(prefix) :]
+            files.append(DeploymentFile(path=rel_path, content=blob.data))
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.warning(f"Failed to read file: {result}")
-                    continue
-                if result is not None:
-                    files.append(result)
+        for batch in batches:
+            if not batch:
+                continue
+            pending = set(batch)
+            try:
+                async for blob in client.iter_files(
+                    volume_id, batch, max_file_size=max_file_size, timeout=120
+                ):
+                    pending.discard(blob.path)
+                    _add(blob)
+            except Exception as e:
+                # Retry whatever the batch did not deliver one file at a time,
+                # so a dropped stream costs at most the files that really fail.
+                logger.warning(
+                    f"Batch read of {len(batch)} files failed, retrying "
+                    f"{len(pending)} file by file: {e}"
+                )
+                for path in batch:
+                    if path not in pending:
+                        continue
+                    try:
+                        async for blob in client.iter_files(
+                            volume_id, [path], max_file_size=max_file_size, timeout=30
+                        ):
+                            _add(blob)
+                    except Exception as exc:
+                        logger.warning(f"Failed to read {path}: {exc}")
 
         return files
 
-    async def _read_single_file_via_fileops(
-        self, client, volume_id: str, entry, target_rel: str
-    ) -> DeploymentFile | None:
-        """Read a single file via FileOps and return a DeploymentFile."""
-        try:
-            content = await client.read_file(volume_id, entry.path, timeout=30)
-            # Make path relative to the target directory
-            rel_path = entry.path
-            if target_rel != ".":
-                prefix = target_rel.rstrip("/") + "/"
-                if rel_path.startswith(prefix):
-                    rel_path = rel_path[len(prefix) :]
-            return DeploymentFile(path=rel_path, content=content)
-        except Exception as e:
-            logger.warning(f"Failed to read {entry.path}: {e}")
-            return None
-
     async def _read_file_async(self, file_path: str) -> bytes:
         """Read a file asynchronously."""
         loop = asyncio.get_event_loop()
@@ -0,0 +1,284 @@
+"""
+Per-project file change notifications pushed to editors.
+
+Instead of polling ``/files/tree`` and re-reading open files, clients receive
+``file_changes`` messages over the chat WebSocket (``/api/chat/ws/{token}``)
+or the SSE stream at ``/api/chat/files/stream``::
+
+    {"type": "file_changes",
+     "payload": {"project_id": "...",
+                 "changes": [{"path": "src/App.tsx", "kind": "changed"}, ...],
+                 "rescan": false}}
+
+``kind`` is ``"changed"`` (created or modified) or ``"deleted"``; paths are
+relative to the project root. ``rescan: true`` means the project changed in
+ways that could not be enumerated (a command ran on a backend without a
+watcher, or a burst exceeded ``file_events_max_paths``) — clients should
+refresh with a delta tree request (``/files/tree?since=<version>``).
+
+Changes are fed by the orchestrators' own writes and deletes (which covers
+the ``write_file``, ``edit`` and ``apply_patch`` tools), by ``execute_command``
+on Kubernetes, and by a ``watchfiles`` watcher over the project directory on
+the local and docker backends while someone is subscribed. Bursts such as
+``npm install`` are coalesced: a batch is sent once the project has been
+quiet for ``file_events_debounce_seconds``, and at least every
+``file_events_max_delay_seconds`` while changes keep arriving.
+
+Batches are delivered to subscribers on this process and published through
+``PubSub.publish_file_changes`` so other replicas forward them to theirs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from .project_context_cache import invalidate_project_files
+
+logger = logging.getLogger(__name__)
+
+# Identifies batches published by this process so the Redis subscriber does
+# not deliver them a second time.
+INSTANCE_ID = uuid.uuid4().hex
+
+_SUBSCRIBER_QUEUE_SIZE = 256
+
+
+@dataclass
+class _Pending:
+    first_at: float
+    last_at: float
+    changes: dict[str, str] = field(default_factory=dict)
+    rescan: bool = False
+
+
+@dataclass
+class _Watcher:
+    refs: int = 0
+    task: asyncio.Task | None = None
+
+
+class FileChangeNotifier:
+    """Debounces per-project file changes and fans them out to subscribers."""
+
+    def __init__(self, debounce: float, max_delay: float, max_paths: int) -> None:
+        self._debounce = max(0.0, debounce)
+        self._max_delay = max(self._debounce, max_delay)
+        self._max_paths = max_paths
+        self._pending: dict[str, _Pending] = {}
+        self._flushers: dict[str, asyncio.Task] = {}
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._watchers: dict[str, _Watcher] = {}
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def record(self, project_id: UUID | str, path: str, *, deleted: bool = False) -> None:
+        """Queue a change to ``path`` (relative to the project root)."""
+        invalidate_project_files(project_id, path)
+        pending = self._touch(str(project_id))
+        if pending is not None:
+            pending.changes[path] = "deleted" if deleted else "changed"
+
+    def record_rescan(self, project_id: UUID | str) -> None:
+        """Queue a hint that the project changed in unknown places."""
+        invalidate_project_files(project_id)
+        pending = self._touch(str(project_id))
+        if pending is not None:
+            pending.rescan = True
+
+    def _touch(self, scope: str) -> _Pending | None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Called off the event loop (worker thread); nothing can flush it.
+            return None
+        now = time.monotonic()
+        pending = self._pending.get(scope)
+        if pending is None:
+            pending = self._pending[scope] = _Pending(first_at=now, last_at=now)
+        pending.last_at = now
+        flusher = self._flushers.get(scope)
+        if flusher is None or flusher.done():
+            self._flushers[scope] = asyncio.create_task(self._flush_when_quiet(scope))
+        return pending
+
+    async def _flush_when_quiet(self, scope: str) -> None:
+        try:
+            while True:
+                pending = self._pending.get(scope)
+                if pending is None:  # flushed explicitly
+                    return
+                wake = min(pending.last_at + self._debounce, pending.first_at + self._max_delay)
+                delay = wake - time.monotonic()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            await self.flush(scope)
+        finally:
+            if self._flushers.get(scope) is asyncio.current_task():
+                del self._flushers[scope]
+
+    async def flush(self, project_id: UUID | str) -> None:
+        """Send the pending batch for ``project_id`` now, if there is one."""
+        scope = str(project_id)
+        pending = self._pending.pop(scope, None)
+        if pending is None:
+            return
+        changes = [{"path": p, "kind": k} for p, k in pending.changes.items()]
+        rescan = pending.rescan
+        if len(changes) > self._max_paths:
+            changes, rescan = [], True
+        payload = {"project_id": scope, "changes": changes, "rescan": rescan}
+
+        await self.dispatch_local(scope, payload)
+        try:
+            from .pubsub import get_pubsub
+
+            pubsub = get_pubsub()
+            if pubsub:
+                await pubsub.publish_file_changes(scope, payload)
+        except Exception as e:
+            logger.debug(f"[FILE-EVENTS] Pub/Sub publish failed (non-blocking): {e}")
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+    async def dispatch_local(self, project_id: UUID | str, payload: dict[str, Any]) -> None:
+        """Deliver a batch to this process's WebSocket and SSE subscribers."""
+        from ..routers.chat import manager
+
+        scope = str(project_id)
+        message = json.dumps({"type": "file_changes", "payload": payload})
+
+        for (user_id, conn_project_id), websocket in list(manager.active_connections.items()):
+            if str(conn_project_id) != scope:
+                continue
+            try:
+                await websocket.send_text(message)
+            except Exception as e:
+                logger.warning(f"[FILE-EVENTS] Failed to send to WebSocket: {e}")
+                manager.disconnect(user_id, conn_project_id)
+
+        for queue in list(self._subscribers.get(scope, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("[FILE-EVENTS] SSE subscriber queue full; dropping batch")
+
+    def subscribe(self, project_id: UUID | str) -> asyncio.Queue:
+        """Register an SSE subscriber; returns a queue of JSON messages."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(str(project_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, project_id: UUID | str, queue: asyncio.Queue) -> None:
+        scope = str(project_id)
+        subs = self._subscribers.get(scope)
+        if subs is None:
+            return
+        subs.discard(queue)
+        if not subs:
+            del self._subscribers[scope]
+
+    # ------------------------------------------------------------------
+    # Filesystem watchers (local / docker)
+    # ------------------------------------------------------------------
+    async def watch(self, project_id: UUID | str, orchestrator: Any) -> None:
+        """
+        Start watching the project directory, if the backend exposes one.
+
+        Reference-counted: every call must be paired with ``unwatch``.
+        """
+        scope = str(project_id)
+        watcher = self._watchers.setdefault(scope, _Watcher())
+        watcher.refs += 1
+        if watcher.refs > 1:
+            return
+
+        try:
+            root = await orchestrator.get_watch_root(UUID(scope))
+        except Exception as e:
+            logger.warning(f"[FILE-EVENTS] Could not resolve watch root for {scope}: {e}")
+            root = None
+        # The last subscriber may have left while the root was resolved.
+        if root is not None and self._watchers.get(scope) is watcher and watcher.refs > 0:
+            watcher.task = asyncio.create_task(self._watch_loop(scope, root))
+
+    def unwatch(self, project_id: UUID | str) -> None:
+        scope = str(project_id)
+        watcher = self._watchers.get(scope)
+        if watcher is None:
+            return
+        watcher.refs -= 1
+        if watcher.refs <= 0:
+            del self._watchers[scope]
+            if watcher.task is not None:
+                watcher.task.cancel()
+
+    async def _watch_loop(self, scope: str, root: Path) -> None:
+        try:
+            from watchfiles import Change, awatch
+        except ImportError:
+            logger.warning("[FILE-EVENTS] watchfiles not installed; file watching disabled")
+            return
+
+        from .orchestration.file_tree import get_file_tree_service
+
+        logger.info(f"[FILE-EVENTS] Watching {root} for project {scope}")
+        try:
+            # watchfiles' DefaultFilter already skips .git, node_modules,
+            # __pycache__, editor swap files and the like.
+            async for batch in awatch(root, debounce=max(1, int(self._debounce * 1000))):
+                get_file_tree_service().mark_dirty(scope)
+                for change, changed_path in batch:
+                    rel = Path(os.path.relpath(changed_path, root)).as_posix()
+                    self.record(scope, rel, deleted=change == Change.deleted)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[FILE-EVENTS] Watcher for project {scope} stopped: {e}")
+
+    async def stop(self) -> None:
+        """Cancel watchers and pending flushes (shutdown / tests)."""
+        tasks = [w.task for w in self._watchers.values() if w.task is not None]
+        tasks.extend(self._flushers.values())
+        self._watchers.clear()
+        self._flushers.clear()
+        self._pending.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: FileChangeNotifier | None = None
+
+
+def get_file_change_notifier() -> FileChangeNotifier:
+    """Process-wide notifier shared by the orchestrators and routers."""
+    global _instance
+    if _instance is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        _instance = FileChangeNotifier(
+            debounce=settings.file_events_debounce_seconds,
+            max_delay=settings.file_events_max_delay_seconds,
+            max_paths=settings.file_events_max_paths,
+        )
+    return _instance
@@ -6,14 +6,25 @@ sends JSON-encoded request/response bodies over gRPC.  Cluster-internal
 traffic is protected by NetworkPolicy, so plaintext gRPC is fine.
 
 Bytes fields (file content, tar archives) are base64-encoded on the wire
-because Go's json.Marshal encodes []byte as base64.
+because Go's json.Marshal encodes []byte as base64.  The streaming RPCs
+(``ReadFilesStream``, ``TarExtractStream``) avoid that: they go through the
+same forced "json" codec, which writes their messages as binary frames — a
+length-prefixed JSON header followed by raw bytes — chunked so neither side
+buffers a whole payload.  Nodes running an older driver answer those with
+UNIMPLEMENTED; the client then remembers the address for a while and uses
+the unary JSON RPCs instead.
 """
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import logging
+import struct
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Collection
 from dataclasses import dataclass
 
 import grpc
@@ -23,6 +34,74 @@ logger = logging.getLogger(__name__)
 
 _MAX_MESSAGE_SIZE = 64 * 1024 * 1024  # 64 MB
 
+# Pooled channels live across requests, so keepalive pings detect a dead CSI
+# node between calls. The Go server's default enforcement policy answers
+# pings sent more often than every 5 minutes (or with no active stream) with
+# GOAWAY, so stay at that floor and only ping while RPCs are in flight.
+_POOLED_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", _MAX_MESSAGE_SIZE),
+    ("grpc.max_receive_message_length", _MAX_MESSAGE_SIZE),
+    ("grpc.keepalive_time_ms", 300_000),
+    ("grpc.keepalive_timeout_ms", 20_000),
+    ("grpc.keepalive_permit_without_calls", 0),
+]
+# Evicted channels are closed with a grace period so RPCs still running on
+# them (borrowed by another request just before eviction) can finish.
+_EVICT_GRACE_SECONDS = 30.0
+
+
+# Streaming frames: [u32 big-endian header length][header JSON][raw payload].
+_FRAME_PREFIX = struct.Struct(">I")
+# Payload bytes per frame — matches streamChunkSize in the Go server.
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class _AddressMemo:
+    """Bounded, expiring set of node addresses, for per-node RPC negotiation.
+
+    Node IPs churn and drivers are upgraded in place, so an address is
+    forgotten after ``ttl`` seconds (and re-probed on next use) and only the
+    ``maxsize`` most recently recorded addresses are kept.
+    """
+
+    def __init__(self, maxsize: int = 64, ttl: float = 3600.0) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._expires: OrderedDict[str, float] = OrderedDict()
+
+    def add(self, address: str) -> None:
+        self._expires[address] = time.monotonic() + self._ttl
+        self._expires.move_to_end(address)
+        while len(self._expires) > self._maxsize:
+            self._expires.popitem(last=False)
+
+    def __contains__(self, address: str) -> bool:
+        expires = self._expires.get(address)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del self._expires[address]
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def clear(self) -> None:
+        self._expires.clear()
+
+
+# Addresses whose FileOps server has no streaming RPCs (older CSI driver).
+# Process-wide so the probe costs one UNIMPLEMENTED per node, not per call.
+_unary_only_addresses = _AddressMemo()
+# Addresses that have answered a streaming RPC. Uploads to any other node
+# keep what they sent so an UNIMPLEMENTED answer can be retried as unary.
+_streaming_addresses = _AddressMemo()
+# Addresses whose FileOps server has no StatPaths RPC, and how many StatPath
+# calls stand in for it at once there.
+_no_stat_paths_addresses = _AddressMemo()
+_STAT_FALLBACK_CONCURRENCY = 16
+
 
 def _serialize(obj: dict) -> bytes:
     """Serialize a dict to JSON bytes for the gRPC wire format."""
@@ -34,10 +113,54 @@ def _deserialize(data: bytes) -> dict:
     return json.loads(data) if data else {}
 
 
+def _encode_frame(frame: tuple[dict, bytes | memoryview]) -> bytes:
+    """Encode a ``(header, payload)`` pair as a binary stream frame."""
+    header, payload = frame
+    raw_header = json.dumps(header).encode("utf-8") if header else b""
+    return b"".join((_FRAME_PREFIX.pack(len(raw_header)), raw_header, payload))
+
+
+def _decode_frame(data: bytes) -> tuple[dict, memoryview]:
+    """Decode a binary stream frame; the payload is a view into ``data``."""
+    if len(data) < _FRAME_PREFIX.size:
+        raise ValueError(f"frame too short: {len(data)} bytes")
+    (header_len,) = _FRAME_PREFIX.unpack_from(data)
+    start = _FRAME_PREFIX.size + header_len
+    if start > len(data):
+        raise ValueError(f"frame header length {header_len} exceeds message size {len(data)}")
+    header = json.loads(data[_FRAME_PREFIX.size : start]) if header_len else {}
+    return header, memoryview(data)[start:]
+
+
+async def _tar_frames(
+    volume_id: str,
+    path: str,
+    chunks: AsyncIterable[bytes],
+    uid: int,
+    gid: int,
+    sent: list[bytes] | None,
+) -> AsyncIterator[tuple[dict, memoryview]]:
+    """Cut a streamed tar archive into TarExtractStream frames; the first names the target.
+
+    Chunks are appended to ``sent`` (when given) as they are consumed.
+    """
+    header: dict = {"volume_id": volume_id, "path": path, "uid": uid, "gid": gid}
+    async for chunk in chunks:
+        if sent is not None:
+            sent.append(chunk)
+        view = memoryview(chunk)
+        for start in range(0, len(view), _STREAM_CHUNK_SIZE):
+            yield header, view[start : start + _STREAM_CHUNK_SIZE]
+            header = {}
+    if header:
+        yield header, memoryview(b"")
+
+
 # The CSI driver uses a registered JSON codec (not protobuf).
 # Go clients use grpc.ForceCodec(jsonCodec{}) which sets content-type
 # to application/grpc+json. Python gRPC doesn't have ForceCodec, so
-# we set the content-type via call metadata.
+# we set the content-type via call metadata. The streaming RPCs use the
+# same content-type; the server's codec frames their messages itself.
 _JSON_METADATA = (("content-type", "application/grpc+json"),)
 
 
@@ -51,6 +174,7 @@ class FileInfo:
     is_dir: bool
     mod_time: int
     mode: int
+    mod_time_ns: int = 0  # set by StatPath/StatPaths only; 0 from older drivers
 
 
 @dataclass(frozen=True, slots=True)
@@ -62,6 +186,60 @@ class FileContent:
     size: int
 
 
+@dataclass(frozen=True, slots=True)
+class FileBlob:
+    """Raw content of a single file from a streamed batch read.
+
+    ``error`` is set (and ``data`` empty) for paths the server could not
+    read: missing, a directory, over ``max_file_size`` or outside the volume.
+    """
+
+    path: str
+    data: bytes
+    size: int
+    error: str | None = None
+
+
+async def _apply_read_budget(
+    blobs: AsyncIterator[FileBlob], request: dict
+) -> AsyncIterator[FileBlob]:
+    """Enforce ReadFilesStream budgets on blobs from a node that ignored them."""
+    max_read = request["max_read_bytes"]
+    remaining = request["max_total_bytes"] or None
+    tail = request["tail"]
+    skip = set(request["skip_extensions"])
+    async for blob in blobs:
+        if remaining is not None and remaining <= 0:
+            return
+        name = blob.path.rsplit("/", 1)[-1]
+        if skip and "." in name and name.rsplit(".", 1)[1].lower() in skip:
+            yield FileBlob(path=blob.path, data=b"", size=0, error="binary file extension")
+            continue
+        if blob.error is None:
+            limit = len(blob.data)
+            if max_read:
+                limit = min(limit, max_read)
+            if remaining is not None:
+                limit = min(limit, remaining)
+                remaining -= limit
+            if limit < len(blob.data):
+                data = blob.data[-limit:] if tail and limit else blob.data[:limit]
+                blob = FileBlob(path=blob.path, data=data, size=max(blob.size, len(blob.data)))
+        yield blob
+
+
+def _stat_info(info: dict) -> FileInfo:
+    return FileInfo(
+        name=info.get("name", ""),
+        path=info.get("path", ""),
+        size=info.get("size", 0),
+        is_dir=info.get("is_dir", False),
+        mod_time=info.get("mod_time", 0),
+        mode=info.get("mode", 0),
+        mod_time_ns=info.get("mod_time_ns", 0),
+    )
+
+
 class FileOpsClient:
     """Async client for the btrfs CSI FileOps gRPC service.
 
@@ -73,9 +251,16 @@ class FileOpsClient:
             await client.write_file_text("vol-abc", "/app/index.ts", "console.log('hi')")
     """
 
-    def __init__(self, address: str) -> None:
+    def __init__(self, address: str, *, channel: grpc.aio.Channel | None = None) -> None:
         self._address = address
-        self._channel: grpc.aio.Channel | None = None
+        self._channel: grpc.aio.Channel | None = channel
+        # A channel passed in is borrowed from a FileOpsChannelPool and
+        # outlives this client — close() leaves it open.
+        self._pooled = channel is not None
+
+    @property
+    def address(self) -> str:
+        return self._address
 
     async def _ensure_channel(self) -> grpc.aio.Channel:
         if self._channel is None:
@@ -98,6 +283,36 @@ class FileOpsClient:
         )
         return await call(request, timeout=timeout, metadata=_JSON_METADATA)
 
+    def _streaming_supported(self) -> bool:
+        return self._address not in _unary_only_addresses
+
+    def _fall_back_to_unary(self, exc: grpc.aio.AioRpcError) -> bool:
+        """Record that this node lacks the streaming RPCs if ``exc`` says so."""
+        if exc.code() != grpc.StatusCode.UNIMPLEMENTED:
+            return False
+        _unary_only_addresses.add(self._address)
+        logger.info("[FILEOPS] %s has no streaming RPCs, using unary JSON", self._address)
+        return True
+
+    async def _stream(
+        self, method: str, request: dict, *, timeout: float
+    ) -> AsyncIterator[tuple[dict, memoryview]]:
+        """Invoke a server-streaming FileOps RPC and yield its decoded frames."""
+        channel = await self._ensure_channel()
+        call = channel.unary_stream(
+            f"/fileops.FileOps/{method}",
+            request_serializer=_serialize,
+            response_deserializer=_decode_frame,
+        )(request, timeout=timeout, metadata=_JSON_METADATA)
+        try:
+            async for frame in call:
+                _streaming_addresses.add(self._address)
+                yield frame
+        finally:
+            # No-op once the stream has finished; stops the server early when
+            # the consumer bails out.
+            call.cancel()
+
     # ------------------------------------------------------------------
     # File operations
     # ------------------------------------------------------------------
@@ -222,18 +437,153 @@ class FileOpsClient:
         errors = resp.get("errors") or []
         return files, errors
 
+    async def iter_files(
+        self,
+        volume_id: str,
+        paths: list[str],
+        *,
+        max_file_size: int = 100_000,
+        max_read_bytes: int = 0,
+        max_total_bytes: int = 0,
+        tail: bool = False,
+        skip_extensions: Collection[str] = (),
+        timeout: float = 30.0,
+    ) -> AsyncIterator[FileBlob]:
+        """Stream raw file contents via ReadFilesStream, one blob per path.
+
+        Blobs are yielded in request order as each file completes, so large
+        batches are consumed incrementally rather than held in one response.
+        Falls back to the unary ReadFiles RPC on nodes without streaming.
+
+        The optional budgets are applied on the node: at most
+        ``max_read_bytes`` of each file (its head, or its tail with ``tail``)
+        are sent instead of rejecting files over ``max_file_size``, paths
+        with an extension in ``skip_extensions`` come back as errors without
+        being read, and the stream ends once ``max_total_bytes`` content
+        bytes were sent. A truncated blob has ``len(data) < size``. Nodes
+        that predate the budgets (and the unary fallback) send whole files;
+        the same limits are then applied here so callers see one behaviour.
+        """
+        budgeted = bool(max_read_bytes or max_total_bytes or skip_extensions)
+        request: dict = {"volume_id": volume_id, "paths": paths, "max_file_size": max_file_size}
+        if budgeted:
+            request.update(
+                max_read_bytes=max_read_bytes,
+                max_total_bytes=max_total_bytes,
+                tail=tail,
+                skip_extensions=sorted({e.lower().lstrip(".") for e in skip_extensions}),
+            )
+            blobs = self._iter_file_blobs(request, tail=tail, timeout=timeout)
+            async for blob in _apply_read_budget(blobs, request):
+                yield blob
+            return
+        async for blob in self._iter_file_blobs(request, tail=False, timeout=timeout):
+            yield blob
+
+    async def _iter_file_blobs(
+        self, request: dict, *, tail: bool, timeout: float
+    ) -> AsyncIterator[FileBlob]:
+        if self._streaming_supported():
+            started = False
+            current: str | None = None
+            parts: list[memoryview] = []
+            file_size = expected = received = 0
+            try:
+                async for header, payload in self._stream(
+                    "ReadFilesStream", request, timeout=timeout
+                ):
+                    started = True
+                    path = header.get("path", "")
+                    if header.get("error"):
+                        if path == current:
+                            # Read failed mid-file: drop the partial content.
+                            current, parts = None, []
+                        yield FileBlob(path=path, data=b"", size=0, error=header["error"])
+                        continue
+                    size = header.get("size", 0)
+                    # ``length`` is set when a read budget cut the file short.
+                    length = header.get("length", 0)
+                    start = size - length if tail and length else 0
+                    if header.get("offset", 0) == start:
+                        if current is not None:
+                            # File shrank while being read; keep what arrived.
+                            yield FileBlob(path=current, data=b"".join(parts), size=file_size)
+                        current, parts = path, []
+                        file_size, expected, received = size, length or size, 0
+                    elif current is None:
+                        continue  # file grew past its stat size; already yielded
+                    parts.append(payload)
+                    received += len(payload)
+                    if received >= expected:
+                        yield FileBlob(path=current, data=b"".join(parts), size=file_size)
+                        current, parts = None, []
+                if current is not None:
+                    yield FileBlob(path=current, data=b"".join(parts), size=file_size)
+                return
+            except grpc.aio.AioRpcError as exc:
+                if started or not self._fall_back_to_unary(exc):
+                    raise
+
+        resp = await self._call(
+            "ReadFiles",
+            {k: request[k] for k in ("volume_id", "paths", "max_file_size")},
+            timeout=timeout,
+        )
+        # The unary response is not in request order.
+        by_path: dict[str, FileBlob] = {}
+        for f in resp.get("files") or []:
+            by_path[f["path"]] = FileBlob(
+                path=f["path"], data=base64.b64decode(f.get("data", "")), size=f.get("size", 0)
+            )
+        for path in resp.get("errors") or []:
+            by_path[path] = FileBlob(path=path, data=b"", size=0, error="unreadable")
+        for path in request["paths"]:
+            blob = by_path.pop(path, None)
+            if blob is not None:
+                yield blob
+        for blob in by_path.values():
+            yield blob
+
     async def stat_path(self, volume_id: str, path: str, *, timeout: float = 30.0) -> FileInfo:
         """Get file/directory metadata."""
         resp = await self._call("StatPath", {"volume_id": volume_id, "path": path}, timeout=timeout)
-        info = resp.get("info", {})
-        return FileInfo(
-            name=info.get("name", ""),
-            path=info.get("path", ""),
-            size=info.get("size", 0),
-            is_dir=info.get("is_dir", False),
-            mod_time=info.get("mod_time", 0),
-            mode=info.get("mode", 0),
-        )
+        return _stat_info(resp.get("info", {}))
+
+    async def stat_paths(
+        self, volume_id: str, paths: list[str], *, timeout: float = 30.0
+    ) -> dict[str, FileInfo]:
+        """Metadata for several paths in one StatPaths call, keyed by path.
+
+        Missing or invalid paths are left out. Nodes running an older driver
+        get bounded concurrent StatPath calls instead.
+        """
+        if not paths:
+            return {}
+        if self._address not in _no_stat_paths_addresses:
+            try:
+                resp = await self._call(
+                    "StatPaths", {"volume_id": volume_id, "paths": paths}, timeout=timeout
+                )
+                return {e["path"]: _stat_info(e) for e in (resp.get("entries") or [])}
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                _no_stat_paths_addresses.add(self._address)
+                logger.info("[FILEOPS] %s has no StatPaths RPC, using StatPath", self._address)
+
+        sem = asyncio.Semaphore(_STAT_FALLBACK_CONCURRENCY)
+
+        async def _one(path: str) -> FileInfo | None:
+            async with sem:
+                try:
+                    return await self.stat_path(volume_id, path, timeout=timeout)
+                except grpc.aio.AioRpcError as e:
+                    if e.code() in (grpc.StatusCode.NOT_FOUND, grpc.StatusCode.INVALID_ARGUMENT):
+                        return None
+                    raise
+
+        infos = await asyncio.gather(*(_one(p) for p in paths))
+        return {p: info for p, info in zip(paths, infos, strict=True) if info is not None}
 
     async def delete_path(self, volume_id: str, path: str, *, timeout: float = 30.0) -> None:
         """Delete a file or directory on a volume."""
@@ -286,6 +636,48 @@ class FileOpsClient:
         )
         logger.info("TarExtract succeeded: volume=%s path=%s", volume_id, path)
 
+    async def tar_extract_stream(
+        self,
+        volume_id: str,
+        path: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        uid: int = 1000,
+        gid: int = 1000,
+        timeout: float = 60.0,
+    ) -> None:
+        """Extract a tar archive read from ``chunks`` via TarExtractStream.
+
+        The archive goes out as raw frames while it is read, so it is never
+        held in memory, base64-inflated or bound by the 64 MB message limit.
+        Falls back to ``tar_extract`` on nodes without streaming; until a
+        node has answered a streaming RPC, the chunks already sent are kept
+        for that retry.
+        """
+        sent: list[bytes] | None = None
+        if self._streaming_supported():
+            sent = None if self._address in _streaming_addresses else []
+            channel = await self._ensure_channel()
+            call = channel.stream_unary(
+                "/fileops.FileOps/TarExtractStream",
+                request_serializer=_encode_frame,
+                response_deserializer=_deserialize,
+            )
+            try:
+                await call(
+                    _tar_frames(volume_id, path, chunks, uid, gid, sent),
+                    timeout=timeout,
+                    metadata=_JSON_METADATA,
+                )
+                _streaming_addresses.add(self._address)
+                logger.info("TarExtractStream succeeded: volume=%s path=%s", volume_id, path)
+                return
+            except grpc.aio.AioRpcError as exc:
+                if sent is None or not self._fall_back_to_unary(exc):
+                    raise
+        data = b"".join([*(sent or []), *[chunk async for chunk in chunks]])
+        await self.tar_extract(volume_id, path, data, uid=uid, gid=gid, timeout=timeout)
+
     # ------------------------------------------------------------------
     # Convenience wrappers
     # ------------------------------------------------------------------
@@ -364,8 +756,8 @@ class FileOpsClient:
     # ------------------------------------------------------------------
 
     async def close(self) -> None:
-        """Gracefully close the underlying gRPC channel."""
-        if self._channel is not None:
+        """Gracefully close the underlying gRPC channel (pooled channels stay open)."""
+        if self._channel is not None and not self._pooled:
             await self._channel.close()
             self._channel = None
 
@@ -374,3 +766,56 @@ class FileOpsClient:
 
     async def __aexit__(self, *exc: object) -> None:
         await self.close()
+
+
+class FileOpsChannelPool:
+    """LRU pool of long-lived FileOps channels, one per node address.
+
+    A cluster has one FileOps endpoint per compute node, so the pool stays
+    small; ``max_channels`` only bounds it when nodes churn. Channels are
+    created lazily and shared by every client routed to the same node.
+    """
+
+    def __init__(self, max_channels: int = 32) -> None:
+        self._max_channels = max(1, max_channels)
+        self._channels: OrderedDict[str, grpc.aio.Channel] = OrderedDict()
+        self._closing: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def get(self, address: str) -> grpc.aio.Channel:
+        """Return the pooled channel for ``address``, creating it if needed."""
+        channel = self._channels.get(address)
+        if channel is not None:
+            self._channels.move_to_end(address)
+            return channel
+
+        channel = grpc.aio.insecure_channel(address, options=_POOLED_CHANNEL_OPTIONS)
+        self._channels[address] = channel
+        while len(self._channels) > self._max_channels:
+            evicted, old = self._channels.popitem(last=False)
+            logger.debug("[FILEOPS] Evicting pooled channel to %s", evicted)
+            self._close_later(old)
+        return channel
+
+    def discard(self, address: str) -> None:
+        """Drop the channel for ``address`` (e.g. its node went away)."""
+        channel = self._channels.pop(address, None)
+        if channel is not None:
+            self._close_later(channel)
+
+    def _close_later(self, channel: grpc.aio.Channel) -> None:
+        task = asyncio.get_running_loop().create_task(channel.close(grace=_EVICT_GRACE_SECONDS))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        """Close every pooled channel (app shutdown)."""
+        channels = list(self._channels.values())
+        self._channels.clear()
+        await asyncio.gather(
+            *(channel.close() for channel in channels),
+            *self._closing,
+            return_exceptions=True,
+        )
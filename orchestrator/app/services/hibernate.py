@@ -14,11 +14,15 @@ from uuid import UUID
 logger = logging.getLogger(__name__)
 
 
-async def hibernate_project_bg(project_id: UUID, user_id: UUID) -> None:
+async def hibernate_project_bg(project_id: UUID, user_id: UUID, *, reraise: bool = False) -> None:
     """Background: stop compute, sync to Hub, mark hibernated.
 
     Safe to call from asyncio.create_task() — opens its own DB session,
     catches all exceptions, and always leaves the project in a valid state.
+
+    With ``reraise=True`` (lifecycle scheduler), a failure leaves the
+    project in 'stopping' and re-raises so the job can be retried; the
+    scheduler calls :func:`mark_hibernate_failed` once it gives up.
     """
     from ..database import AsyncSessionLocal
     from ..models import Project
@@ -76,6 +80,21 @@ async def hibernate_project_bg(project_id: UUID, user_id: UUID) -> None:
             logger.info("[HIBERNATE] Project %s hibernated successfully", project_id)
 
         except Exception:
+            if reraise:
+                await db.rollback()
+                raise
             logger.exception("[HIBERNATE] Failed for project %s", project_id)
             project.environment_status = "stopped"
             await db.commit()
+
+
+async def mark_hibernate_failed(project_id: UUID) -> None:
+    """Converge a project whose hibernation was abandoned to 'stopped'."""
+    from ..database import AsyncSessionLocal
+    from ..models import Project
+
+    async with AsyncSessionLocal() as db:
+        project = await db.get(Project, project_id)
+        if project and project.environment_status == "stopping":
+            project.environment_status = "stopped"
+            await db.commit()
@@ -3,7 +3,11 @@ Idle Monitor — background loop for compute idle shutdown.
 
 Finds active T2 environments past the idle threshold:
 - Warning: publishes `idle_warning` WebSocket event.
-- Shutdown: transitions to 'stopping' and dispatches hibernate_project_bg().
+- Shutdown: transitions to 'stopping' and queues hibernate_project_bg() on
+  the lifecycle scheduler (bounded concurrency, retry with back-off).
+
+The loop owns the lifecycle scheduler and the prewarm scheduler, so both
+only run on the pod holding the ``idle_monitor`` distributed lock.
 
 Disk eviction is no longer handled here — the Volume Hub manages cache
 lifecycle autonomously.
@@ -29,22 +33,37 @@ _WARNING_GRACE_MINUTES = 5
 
 async def idle_monitor_loop() -> None:
     """Check every 60s for idle T2 environments and scale them to zero."""
+    from .lifecycle_scheduler import get_lifecycle_scheduler
+    from .prewarm import prewarm_loop
+
     logger.info("[IDLE] Idle environment monitor started")
 
-    while True:
-        try:
-            await _check_idle_environments()
-        except asyncio.CancelledError:
-            logger.info("[IDLE] Idle monitor cancelled")
-            raise
-        except Exception:
-            logger.exception("[IDLE] Error in idle monitor loop")
+    scheduler = get_lifecycle_scheduler()
+    companions = [
+        asyncio.create_task(scheduler.run()),
+        asyncio.create_task(prewarm_loop()),
+    ]
+
+    try:
+        while True:
+            try:
+                await _check_idle_environments()
+                await scheduler.publish_metrics()
+            except asyncio.CancelledError:
+                logger.info("[IDLE] Idle monitor cancelled")
+                raise
+            except Exception:
+                logger.exception("[IDLE] Error in idle monitor loop")
 
-        try:
-            await asyncio.sleep(60)
-        except asyncio.CancelledError:
-            logger.info("[IDLE] Idle monitor cancelled during sleep")
-            raise
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                logger.info("[IDLE] Idle monitor cancelled during sleep")
+                raise
+    finally:
+        for task in companions:
+            task.cancel()
+        await asyncio.gather(*companions, return_exceptions=True)
 
 
 async def _check_idle_environments() -> None:
@@ -115,9 +134,7 @@ async def _check_idle_environments() -> None:
                     project.hibernated_at = datetime.now(UTC)
                     await db.commit()
 
-                    from .hibernate import hibernate_project_bg
-
-                    asyncio.create_task(hibernate_project_bg(project.id, project.owner_id))
+                    _queue_hibernation(project)
 
             except Exception:
                 logger.exception("[IDLE] Failed to process idle project %s", project.slug)
@@ -126,8 +143,35 @@ async def _check_idle_environments() -> None:
         await _recover_stuck_stopping(db, now)
 
 
+def _queue_hibernation(project: Project) -> None:
+    """Hand a 'stopping' project to the lifecycle scheduler."""
+    from .hibernate import hibernate_project_bg, mark_hibernate_failed
+    from .lifecycle_scheduler import PRIORITY_HIBERNATE, get_lifecycle_scheduler
+
+    project_id, owner_id = project.id, project.owner_id
+
+    async def _give_up(_exc: BaseException) -> None:
+        await mark_hibernate_failed(project_id)
+
+    get_lifecycle_scheduler().submit(
+        "hibernate",
+        project_id,
+        lambda: hibernate_project_bg(project_id, owner_id, reraise=True),
+        priority=PRIORITY_HIBERNATE,
+        node=project.cache_node,
+        on_give_up=_give_up,
+    )
+
+
 async def _recover_stuck_stopping(db, now: datetime) -> None:
-    """Reset projects stuck in 'stopping' for >10 min back to 'stopped'."""
+    """Reset projects stuck in 'stopping' for >10 min back to 'stopped'.
+
+    Projects still queued or running on the lifecycle scheduler are not
+    stuck — they're waiting for a concurrency slot or a retry.
+    """
+    from .lifecycle_scheduler import get_lifecycle_scheduler
+
+    scheduler = get_lifecycle_scheduler()
     stuck = await db.execute(
         select(Project).where(
             Project.environment_status == "stopping",
@@ -137,7 +181,9 @@ async def _recover_stuck_stopping(db, now: datetime) -> None:
             ),
         )
     )
-    stuck_projects = stuck.scalars().all()
+    stuck_projects = [
+        p for p in stuck.scalars().all() if not scheduler.is_pending("hibernate", p.id)
+    ]
     for p in stuck_projects:
         logger.warning(
             "[IDLE] Recovering stuck project %s from 'stopping' to 'stopped'",
@@ -0,0 +1,325 @@
+"""
+Lifecycle Scheduler — bounded-concurrency work queue for hibernate/restore.
+
+After a quiet period the idle monitor can find dozens of projects past the
+idle threshold in a single tick. Firing one ``asyncio.create_task`` per
+project sends all of their volume syncs and deployment scale-downs to the
+API server and CSI driver at once. This queue smooths that out:
+
+- Global and per-node concurrency limits (``k8s_lifecycle_max_concurrency``,
+  ``k8s_lifecycle_max_per_node``). The node key is the project's
+  ``cache_node`` hint; jobs with no hint share an ``"unknown"`` bucket.
+- Priority: prewarm restores, then background hibernation. Within a
+  priority, FIFO. (User-initiated restores run inline on the API pod
+  that serves the request, not through this queue.)
+- Retry with exponential back-off + jitter up to
+  ``k8s_lifecycle_max_attempts``; an optional ``on_give_up`` callback
+  converges state after the final failure.
+- De-duplication on ``(kind, project_id)``: re-submitting a queued or
+  running job is a no-op.
+
+The scheduler is started by ``idle_monitor_loop`` and so only runs on the
+pod holding the ``idle_monitor`` distributed lock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_PREWARM_RESTORE = 0
+PRIORITY_HIBERNATE = 1
+
+METRICS_CACHE_KEY = "lifecycle_queue_metrics"
+METRICS_CACHE_TTL = 600
+
+_UNKNOWN_NODE = "unknown"
+_BACKOFF_MAX_SECONDS = 300.0
+_BACKOFF_JITTER_FRACTION = 0.2
+
+
+@dataclass(order=True)
+class LifecycleJob:
+    """A queued hibernate/restore operation.
+
+    Ordered by ``(priority, seq)`` so the heap pops higher-priority jobs
+    first and preserves submission order within a priority.
+    """
+
+    priority: int
+    seq: int
+    kind: str = field(compare=False)  # "hibernate" | "restore"
+    project_id: UUID = field(compare=False)
+    node: str = field(compare=False)
+    run: Callable[[], Awaitable[Any]] = field(compare=False, repr=False)
+    on_give_up: Callable[[BaseException], Awaitable[None]] | None = field(
+        default=None, compare=False, repr=False
+    )
+    attempts: int = field(default=0, compare=False)
+    not_before: float = field(default=0.0, compare=False)
+    enqueued_at: float = field(default_factory=time.monotonic, compare=False)
+
+    @property
+    def key(self) -> tuple[str, UUID]:
+        return (self.kind, self.project_id)
+
+
+class LifecycleScheduler:
+    """Priority work queue with global and per-node concurrency caps."""
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        max_per_node: int | None = None,
+        max_attempts: int | None = None,
+        retry_base_seconds: float | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.max_concurrency = max_concurrency or settings.k8s_lifecycle_max_concurrency
+        self.max_per_node = max_per_node or settings.k8s_lifecycle_max_per_node
+        self.max_attempts = max_attempts or settings.k8s_lifecycle_max_attempts
+        self.retry_base_seconds = (
+            retry_base_seconds
+            if retry_base_seconds is not None
+            else settings.k8s_lifecycle_retry_base_seconds
+        )
+
+        self._heap: list[LifecycleJob] = []
+        self._seq = itertools.count()
+        self._keys: set[tuple[str, UUID]] = set()
+        self._running: dict[asyncio.Task, LifecycleJob] = {}
+        self._per_node: dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._metrics = self._empty_metrics()
+
+    @staticmethod
+    def _empty_metrics() -> dict[str, Any]:
+        return {
+            "submitted": 0,
+            "deduplicated": 0,
+            "completed": 0,
+            "retried": 0,
+            "failed": 0,
+            "wait_seconds_total": 0.0,
+            "run_seconds_total": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        kind: str,
+        project_id: UUID,
+        run: Callable[[], Awaitable[Any]],
+        *,
+        priority: int,
+        node: str | None = None,
+        on_give_up: Callable[[BaseException], Awaitable[None]] | None = None,
+    ) -> bool:
+        """Queue a job. Returns False if the same (kind, project) is already queued/running."""
+        key = (kind, project_id)
+        if key in self._keys:
+            self._metrics["deduplicated"] += 1
+            return False
+
+        job = LifecycleJob(
+            priority=priority,
+            seq=next(self._seq),
+            kind=kind,
+            project_id=project_id,
+            node=node or _UNKNOWN_NODE,
+            run=run,
+            on_give_up=on_give_up,
+        )
+        heapq.heappush(self._heap, job)
+        self._keys.add(key)
+        self._metrics["submitted"] += 1
+        self._wakeup.set()
+        return True
+
+    def is_pending(self, kind: str, project_id: UUID) -> bool:
+        """True if a job for (kind, project) is queued or running."""
+        return (kind, project_id) in self._keys
+
+    # ------------------------------------------------------------------
+    # Dispatcher
+    # ------------------------------------------------------------------
+
+    async def run(self) -> None:
+        """Dispatch queued jobs until cancelled. Cancels in-flight jobs on exit."""
+        logger.info(
+            "[LIFECYCLE] Scheduler started (global=%d, per_node=%d, attempts=%d)",
+            self.max_concurrency,
+            self.max_per_node,
+            self.max_attempts,
+        )
+        try:
+            while True:
+                self._wakeup.clear()
+                delay = self._dispatch_ready()
+                if delay is None:
+                    await self._wakeup.wait()
+                else:
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        finally:
+            for task in list(self._running):
+                task.cancel()
+            if self._running:
+                await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _dispatch_ready(self) -> float | None:
+        """Start every runnable job; return seconds until the next back-off expires."""
+        now = time.monotonic()
+        deferred: list[LifecycleJob] = []
+        next_ready: float | None = None
+
+        while self._heap and len(self._running) < self.max_concurrency:
+            job = heapq.heappop(self._heap)
+            if job.not_before > now:
+                wait = job.not_before - now
+                next_ready = wait if next_ready is None else min(next_ready, wait)
+                deferred.append(job)
+                continue
+            if self._per_node.get(job.node, 0) >= self.max_per_node:
+                deferred.append(job)
+                continue
+            self._start(job, now)
+
+        for job in deferred:
+            heapq.heappush(self._heap, job)
+        return next_ready
+
+    def _start(self, job: LifecycleJob, now: float) -> None:
+        job.attempts += 1
+        self._per_node[job.node] = self._per_node.get(job.node, 0) + 1
+        self._metrics["wait_seconds_total"] += now - job.enqueued_at
+        task = asyncio.create_task(self._execute(job))
+        self._running[task] = job
+        task.add_done_callback(self._on_done)
+
+    async def _execute(self, job: LifecycleJob) -> None:
+        started = time.monotonic()
+        try:
+            await job.run()
+        finally:
+            self._metrics["run_seconds_total"] += time.monotonic() - started
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        job = self._running.pop(task)
+        self._per_node[job.node] -= 1
+        if self._per_node[job.node] <= 0:
+            del self._per_node[job.node]
+
+        if task.cancelled():
+            self._keys.discard(job.key)
+            return
+
+        exc = task.exception()
+        if exc is None:
+            self._metrics["completed"] += 1
+            self._keys.discard(job.key)
+        elif job.attempts < self.max_attempts:
+            delay = self._backoff_seconds(job.attempts)
+            logger.warning(
+                "[LIFECYCLE] %s for project %s failed (attempt %d/%d), retrying in %.0fs: %s",
+                job.kind,
+                job.project_id,
+                job.attempts,
+                self.max_attempts,
+                delay,
+                exc,
+            )
+            self._metrics["retried"] += 1
+            job.not_before = time.monotonic() + delay
+            job.enqueued_at = time.monotonic()
+            heapq.heappush(self._heap, job)
+        else:
+            logger.error(
+                "[LIFECYCLE] %s for project %s gave up after %d attempts: %s",
+                job.kind,
+                job.project_id,
+                job.attempts,
+                exc,
+            )
+            self._metrics["failed"] += 1
+            self._keys.discard(job.key)
+            if job.on_give_up is not None:
+                give_up = asyncio.create_task(job.on_give_up(exc))
+                give_up.add_done_callback(_log_give_up_failure)
+
+        self._wakeup.set()
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        # Exponential with capped + jittered output.
+        raw = min(_BACKOFF_MAX_SECONDS, self.retry_base_seconds * (2 ** (attempt - 1)))
+        jitter = raw * _BACKOFF_JITTER_FRACTION * (2 * random.random() - 1)
+        return max(0.0, raw + jitter)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Queue depth, in-flight counts and cumulative job statistics."""
+        queued_by_kind: dict[str, int] = {}
+        for job in self._heap:
+            queued_by_kind[job.kind] = queued_by_kind.get(job.kind, 0) + 1
+        started = self._metrics["completed"] + self._metrics["retried"] + self._metrics["failed"]
+        return {
+            **self._metrics,
+            "queued": len(self._heap),
+            "queued_by_kind": queued_by_kind,
+            "running": len(self._running),
+            "running_by_node": dict(self._per_node),
+            "avg_wait_seconds": (
+                round(self._metrics["wait_seconds_total"] / started, 2) if started else 0
+            ),
+            "avg_run_seconds": (
+                round(self._metrics["run_seconds_total"] / started, 2) if started else 0
+            ),
+        }
+
+    async def publish_metrics(self) -> None:
+        """Mirror metrics into the distributed cache for the admin endpoint."""
+        from .cache_service import cache
+
+        try:
+            await cache.set(METRICS_CACHE_KEY, self.get_metrics(), ttl=METRICS_CACHE_TTL)
+        except Exception:
+            logger.debug("[LIFECYCLE] Failed to publish metrics", exc_info=True)
+
+
+def _log_give_up_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("[LIFECYCLE] on_give_up callback failed", exc_info=task.exception())
+
+
+# ------------------------------------------------------------------
+# Singleton
+# ------------------------------------------------------------------
+
+_instance: LifecycleScheduler | None = None
+
+
+def get_lifecycle_scheduler() -> LifecycleScheduler:
+    """Get or create the global LifecycleScheduler singleton."""
+    global _instance
+    if _instance is None:
+        _instance = LifecycleScheduler()
+    return _instance
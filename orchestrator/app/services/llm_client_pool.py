@@ -0,0 +1,486 @@
+"""
+Process-wide pool of LLM API clients.
+
+Every ``AsyncOpenAI`` owns an httpx connection pool. Building one per agent
+task (and per compaction adapter) meant every run re-did the TCP and TLS
+handshakes to LiteLLM or the provider before its first token. Clients are
+shared per ``(base_url, credential fingerprint, headers, max_retries)`` so
+keep-alive connections survive across turns and tasks.
+
+- System credentials (LiteLLM master key, provider keys from env vars) are
+  pinned for the life of the process.
+- User credentials (BYOK keys, per-user LiteLLM keys, cloud tokens) live in
+  an LRU capped at ``llm_client_max_clients``. An evicted client may still
+  be streaming for a running task, so it is closed only after
+  ``llm_client_retire_seconds``.
+- httpx connections belong to the event loop that opened them; a client
+  built on another loop (``asyncio.run`` in scripts, tests) is rebuilt.
+
+Keys hold a SHA-256 fingerprint of the credential, never the credential.
+A request that finds all ``llm_client_max_connections`` of its client busy
+waits ``llm_client_pool_timeout_seconds`` and then fails with
+``httpx.PoolTimeout``, logged and counted, instead of queueing for the full
+read timeout.
+
+Counters and connection gauges are published to Redis in batches (see
+:mod:`.redis_batch`) so the admin endpoint on any API replica reports every
+API and worker process, not just the one serving the request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+from openai import AsyncOpenAI
+
+from .redis_batch import RedisBatchWriter
+
+logger = logging.getLogger(__name__)
+
+# Same read/connect defaults the OpenAI SDK applies to the httpx client it
+# builds itself; the pool wait is configurable.
+_READ_TIMEOUT = 600.0
+_CONNECT_TIMEOUT = 5.0
+_DEFAULT_MAX_RETRIES = 2
+
+_REDIS_COUNTERS_KEY = "llm_client_pool:counters"
+_REDIS_GAUGES_KEY = "llm_client_pool:gauges"
+# A process's published gauges stop counting this long after its last flush
+# (it went idle or away); its counters stay in the totals.
+_GAUGE_MAX_AGE = 300.0
+_PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+_COUNTER_FIELDS = (
+    "hits",
+    "misses",
+    "evictions",
+    "closed",
+    "requests",
+    "connects",
+    "tls_handshakes",
+    "pool_timeouts",
+)
+_GAUGE_FIELDS = (
+    "clients",
+    "pinned_clients",
+    "retired_clients",
+    "open_connections",
+    "idle_connections",
+)
+
+
+def _credential_fingerprint(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()[:24]
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+@dataclass
+class _ConnectionCounters:
+    requests: int = 0
+    connects: int = 0
+    tls_handshakes: int = 0
+    pool_timeouts: int = 0
+
+
+class _Transport(httpx.AsyncHTTPTransport):
+    """Transport that logs and counts requests that found the pool exhausted."""
+
+    def __init__(self, counters: _ConnectionCounters, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._counters = counters
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            return await super().handle_async_request(request)
+        except httpx.PoolTimeout:
+            self._counters.pool_timeouts += 1
+            logger.warning(
+                "[LLM-POOL] connection pool exhausted for %s; request gave up waiting "
+                "(raise llm_client_max_connections if this persists)",
+                request.url.host,
+            )
+            raise
+
+
+@dataclass
+class _Entry:
+    client: AsyncOpenAI
+    transport: httpx.AsyncHTTPTransport
+    loop: asyncio.AbstractEventLoop | None
+    pinned: bool
+    counters: _ConnectionCounters = field(default_factory=_ConnectionCounters)
+
+    def connections(self) -> tuple[int, int]:
+        """(open, idle) connections in the transport's pool."""
+        pool = getattr(self.transport, "_pool", None)
+        conns = list(getattr(pool, "connections", None) or [])
+        idle = sum(1 for c in conns if c.is_idle())
+        return len(conns), idle
+
+
+class LLMClientPool(RedisBatchWriter):
+    """Shared ``AsyncOpenAI`` clients keyed by endpoint and credential."""
+
+    log_prefix = "[LLM-POOL]"
+
+    def __init__(
+        self,
+        *,
+        max_clients: int = 256,
+        max_connections: int = 1000,
+        max_keepalive: int = 100,
+        keepalive_seconds: float = 90.0,
+        pool_timeout_seconds: float = 30.0,
+        retire_seconds: float = 900.0,
+    ) -> None:
+        super().__init__()
+        self.max_clients = max_clients
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_seconds,
+        )
+        self.timeout = httpx.Timeout(
+            _READ_TIMEOUT, connect=_CONNECT_TIMEOUT, pool=pool_timeout_seconds
+        )
+        self.retire_seconds = retire_seconds
+
+        self._pinned: dict[tuple, _Entry] = {}
+        self._lru: OrderedDict[tuple, _Entry] = OrderedDict()
+        # Evicted or replaced clients waiting to be closed: (retired_at, entry)
+        self._retired: list[tuple[float, _Entry]] = []
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.closed = 0
+        # Traffic of clients that have since been closed, so totals don't drop.
+        self._closed_counters = _ConnectionCounters()
+        # Counter values already added to the shared totals in Redis.
+        self._flushed: dict[str, int] = dict.fromkeys(_COUNTER_FIELDS, 0)
+        self._dirty = False
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def get(
+        self,
+        *,
+        api_key: str,
+        base_url: str,
+        default_headers: dict[str, str] | None = None,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+        pinned: bool = False,
+    ) -> AsyncOpenAI:
+        """Shared client for ``base_url`` and ``api_key``, built on first use.
+
+        ``pinned`` marks system credentials that are never evicted; anything
+        else counts against ``max_clients``.
+        """
+        key = (
+            str(base_url).rstrip("/"),
+            _credential_fingerprint(api_key),
+            tuple(sorted((default_headers or {}).items())),
+            max_retries,
+        )
+        loop = _running_loop()
+        self._close_retired()
+        self._touch()
+
+        entry = self._pinned.get(key) or self._lru.get(key)
+        if entry is not None and self._usable(entry, loop):
+            self.hits += 1
+            if not entry.pinned:
+                self._lru.move_to_end(key)
+            return entry.client
+        if entry is not None:
+            # Built on a loop that is gone or different; its sockets can't be reused.
+            self._drop(key, entry)
+
+        self.misses += 1
+        entry = self._build(api_key, base_url, default_headers, max_retries, loop, pinned)
+        if pinned:
+            self._pinned[key] = entry
+        else:
+            self._lru[key] = entry
+            while len(self._lru) > self.max_clients:
+                _, old = self._lru.popitem(last=False)
+                self.evictions += 1
+                self._retired.append((time.monotonic(), old))
+        return entry.client
+
+    @staticmethod
+    def _usable(entry: _Entry, loop: asyncio.AbstractEventLoop | None) -> bool:
+        if entry.loop is None or loop is None:
+            return True
+        return entry.loop is loop and not entry.loop.is_closed()
+
+    def _build(
+        self,
+        api_key: str,
+        base_url: str,
+        default_headers: dict[str, str] | None,
+        max_retries: int,
+        loop: asyncio.AbstractEventLoop | None,
+        pinned: bool,
+    ) -> _Entry:
+        counters = _ConnectionCounters()
+        transport = _Transport(counters, limits=self.limits)
+
+        async def _trace(event: str, info: dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                counters.connects += 1
+            elif event == "connection.start_tls.complete":
+                counters.tls_handshakes += 1
+
+        async def _on_request(request: httpx.Request) -> None:
+            counters.requests += 1
+            self._touch()
+            request.extensions.setdefault("trace", _trace)
+
+        http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=self.timeout,
+            follow_redirects=True,
+            event_hooks={"request": [_on_request]},
+        )
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            default_headers=default_headers or None,
+            max_retries=max_retries,
+            http_client=http_client,
+        )
+        logger.debug("[LLM-POOL] new client for %s (pinned=%s)", base_url, pinned)
+        return _Entry(client, transport, loop, pinned, counters)
+
+    def _drop(self, key: tuple, entry: _Entry) -> None:
+        self._pinned.pop(key, None)
+        self._lru.pop(key, None)
+        self._retired.append((time.monotonic(), entry))
+
+    # -------------------------------------------------------------------------
+    # Closing
+    # -------------------------------------------------------------------------
+
+    def _close_retired(self) -> None:
+        if not self._retired:
+            return
+        cutoff = time.monotonic() - self.retire_seconds
+        due = [e for t, e in self._retired if t <= cutoff]
+        if not due:
+            return
+        self._retired = [(t, e) for t, e in self._retired if t > cutoff]
+        loop = _running_loop()
+        for entry in due:
+            self._account_closed(entry)
+            if loop is not None and entry.loop is loop and not loop.is_closed():
+                loop.create_task(self._close_entry(entry))
+
+    def _account_closed(self, entry: _Entry) -> None:
+        self.closed += 1
+        self._closed_counters.requests += entry.counters.requests
+        self._closed_counters.connects += entry.counters.connects
+        self._closed_counters.tls_handshakes += entry.counters.tls_handshakes
+        self._closed_counters.pool_timeouts += entry.counters.pool_timeouts
+
+    @staticmethod
+    async def _close_entry(entry: _Entry) -> None:
+        with contextlib.suppress(Exception):
+            await entry.client.close()
+
+    async def aclose(self) -> None:
+        """Close every client, including retired ones still in their grace period."""
+        entries = [
+            *self._pinned.values(),
+            *self._lru.values(),
+            *(e for _, e in self._retired),
+        ]
+        self._pinned.clear()
+        self._lru.clear()
+        self._retired.clear()
+        loop = _running_loop()
+        for entry in entries:
+            self._account_closed(entry)
+            if entry.loop is None or (entry.loop is loop and not entry.loop.is_closed()):
+                await self._close_entry(entry)
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def _touch(self) -> None:
+        self._dirty = True
+        self._schedule_flush()
+
+    def _local_values(self) -> tuple[dict[str, int], dict[str, int]]:
+        """(counters, gauges) of this process."""
+        live = [*self._pinned.values(), *self._lru.values()]
+        totals = _ConnectionCounters(**vars(self._closed_counters))
+        open_conns = idle_conns = 0
+        for entry in [*live, *(e for _, e in self._retired)]:
+            totals.requests += entry.counters.requests
+            totals.connects += entry.counters.connects
+            totals.tls_handshakes += entry.counters.tls_handshakes
+            totals.pool_timeouts += entry.counters.pool_timeouts
+            opened, idle = entry.connections()
+            open_conns += opened
+            idle_conns += idle
+        counters = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "closed": self.closed,
+            **vars(totals),
+        }
+        gauges = {
+            "clients": len(live),
+            "pinned_clients": len(self._pinned),
+            "retired_clients": len(self._retired),
+            "open_connections": open_conns,
+            "idle_connections": idle_conns,
+        }
+        return counters, gauges
+
+    def _has_unflushed(self) -> bool:
+        return self._dirty
+
+    def _take_unflushed(self) -> tuple[dict[str, int], dict[str, int]]:
+        self._dirty = False
+        counters, gauges = self._local_values()
+        deltas = {name: counters[name] - self._flushed[name] for name in _COUNTER_FIELDS}
+        self._flushed = counters
+        return deltas, gauges
+
+    def _queue_writes(self, pipe: Any, batch: tuple[dict[str, int], dict[str, int]]) -> None:
+        deltas, gauges = batch
+        for name, value in deltas.items():
+            if value:
+                pipe.hincrby(_REDIS_COUNTERS_KEY, name, value)
+        pipe.hset(_REDIS_GAUGES_KEY, _PROCESS_ID, json.dumps({**gauges, "at": time.time()}))
+
+    def _build_stats(
+        self, counters: dict[str, int], gauges: dict[str, int], processes: int
+    ) -> dict[str, Any]:
+        lookups = counters["hits"] + counters["misses"]
+        requests = counters["requests"]
+        return {
+            "processes": processes,
+            "clients": gauges["clients"],
+            "pinned_clients": gauges["pinned_clients"],
+            "retired_clients": gauges["retired_clients"],
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+            "evictions": counters["evictions"],
+            "closed": counters["closed"],
+            "requests": requests,
+            "connects": counters["connects"],
+            "tls_handshakes": counters["tls_handshakes"],
+            # Share of requests that went out on an already-open connection.
+            "connection_reuse_rate": (
+                round(1 - counters["connects"] / requests, 3) if requests else 0.0
+            ),
+            "open_connections": gauges["open_connections"],
+            "idle_connections": gauges["idle_connections"],
+            # Per client, per process.
+            "max_connections": self.limits.max_connections,
+            "pool_timeouts": counters["pool_timeouts"],
+        }
+
+    def local_stats(self) -> dict[str, Any]:
+        """Client reuse and connection-pool counters for this process."""
+        counters, gauges = self._local_values()
+        return self._build_stats(counters, gauges, 1)
+
+    async def stats(self) -> dict[str, Any]:
+        """Counters summed over every process (this one without Redis).
+
+        Gauges count processes that flushed within the last ``_GAUGE_MAX_AGE``
+        seconds; older entries are dropped from Redis.
+        """
+
+        def _reads(pipe: Any) -> None:
+            pipe.hgetall(_REDIS_COUNTERS_KEY)
+            pipe.hgetall(_REDIS_GAUGES_KEY)
+
+        rows = await self._read_redis(_reads)
+        if rows is None:
+            return self.local_stats()
+        raw_counters, raw_gauges = (row or {} for row in rows)
+
+        counters = {name: int(raw_counters.get(name, 0)) for name in _COUNTER_FIELDS}
+        gauges = dict.fromkeys(_GAUGE_FIELDS, 0)
+        processes = 0
+        stale = []
+        cutoff = time.time() - _GAUGE_MAX_AGE
+        for process, raw in raw_gauges.items():
+            try:
+                published = json.loads(raw)
+            except ValueError:
+                published = {}
+            if published.get("at", 0) < cutoff:
+                stale.append(process)
+                continue
+            processes += 1
+            for name in _GAUGE_FIELDS:
+                gauges[name] += int(published.get(name, 0))
+        if stale:
+            await self._read_redis(lambda pipe: pipe.hdel(_REDIS_GAUGES_KEY, *stale))
+        return self._build_stats(counters, gauges, processes)
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: LLMClientPool | None = None
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    """Get the process-wide LLM client pool."""
+    global _instance
+    if _instance is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        _instance = LLMClientPool(
+            max_clients=settings.llm_client_max_clients,
+            max_connections=settings.llm_client_max_connections,
+            max_keepalive=settings.llm_client_max_keepalive,
+            keepalive_seconds=settings.llm_client_keepalive_seconds,
+            pool_timeout_seconds=settings.llm_client_pool_timeout_seconds,
+            retire_seconds=settings.llm_client_retire_seconds,
+        )
+    return _instance
+
+
+async def get_llm_client_pool_metrics() -> dict[str, Any]:
+    """Pool metrics across processes; this process's pool is created if needed."""
+    return await get_llm_client_pool().stats()
+
+
+async def shutdown_llm_client_pool() -> None:
+    """Close all pooled clients (called on app / worker shutdown)."""
+    global _instance
+    if _instance is not None:
+        await _instance.aclose()
+        _instance = None
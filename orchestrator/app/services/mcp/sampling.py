@@ -250,9 +250,9 @@ class McpSamplingHandler:
 
         # Call LiteLLM via AsyncOpenAI
         try:
-            from openai import AsyncOpenAI
+            from ..llm_client_pool import get_llm_client_pool
 
-            client = AsyncOpenAI(
+            client = get_llm_client_pool().get(
                 api_key=self._litellm_api_key,
                 base_url=self._litellm_api_base,
                 max_retries=1,
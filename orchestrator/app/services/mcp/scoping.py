@@ -76,6 +76,9 @@ async def resolve_mcp_configs(
         )
         .where(UserMcpConfig.is_active.is_(True))
         .where(or_(*conditions))
+        # Stable order: bridged tools and catalogs end up in the cached
+        # prompt prefix, which must not reshuffle between runs.
+        .order_by(UserMcpConfig.created_at, UserMcpConfig.id)
     )
 
     if agent_id is not None:
@@ -11,8 +11,12 @@ Supported:
 - Future: Ollama, HuggingFace, etc.
 """
 
+import asyncio
+import contextlib
+import copy
 import logging
 import os
+import time
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator
 from typing import Any
@@ -22,6 +26,11 @@ from openai import AsyncOpenAI
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .llm_client_pool import get_llm_client_pool
+from .model_traffic import is_upstream_error, record_model_call
+from .prompt_cache_stats import check_prompt_prefix, record_prompt_cache_usage
+from .stream_assembly import StreamAssembler, usage_from_chunk
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -331,10 +340,11 @@ def _build_provider_client(provider_slug: str, model_name: str) -> AsyncOpenAI:
         or provider_config["base_url"]
     )
     logger.info("DB-less: using %s API for model: %s", provider_config["name"], model_name)
-    return AsyncOpenAI(
+    return get_llm_client_pool().get(
         api_key=api_key,
         base_url=base_url,
         default_headers=provider_config.get("default_headers", {}),
+        pinned=True,
     )
 
 
@@ -453,7 +463,7 @@ def _build_litellm_client(model_name: str, settings: Any) -> AsyncOpenAI:
             f"(DB-less) operation.",
         )
     logger.info("DB-less: using LiteLLM proxy for model: %s", model_name)
-    return AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=1)
+    return get_llm_client_pool().get(api_key=api_key, base_url=base_url, max_retries=1, pinned=True)
 
 
 async def get_llm_client(
@@ -482,7 +492,8 @@ async def get_llm_client(
         db: Database session, or ``None`` for standalone env-var resolution.
 
     Returns:
-        Configured AsyncOpenAI client ready to use
+        Configured AsyncOpenAI client ready to use. Clients are shared
+        process-wide (see :mod:`.llm_client_pool`); callers must not close them.
 
     Raises:
         ValueError: If user not found, provider not found, or API key not configured
@@ -540,7 +551,7 @@ async def get_llm_client(
         user_key_data = await get_user_api_key(user_id, provider_slug, db)
         effective_base_url = user_key_data["base_url"] or provider_config["base_url"]
 
-        return AsyncOpenAI(
+        return get_llm_client_pool().get(
             api_key=user_key_data["key"],
             base_url=effective_base_url,
             default_headers=provider_config.get("default_headers", {}),
@@ -588,7 +599,7 @@ async def get_llm_client(
         effective_base_url = user_key_data["base_url"] or provider_config["base_url"]
 
         # Return client configured for the provider
-        return AsyncOpenAI(
+        return get_llm_client_pool().get(
             api_key=user_key_data["key"],
             base_url=effective_base_url,
             default_headers=provider_config.get("default_headers", {}),
@@ -620,7 +631,7 @@ async def get_llm_client(
                         "Desktop paired; routing model %s through cloud proxy",
                         model_name,
                     )
-                    return AsyncOpenAI(
+                    return get_llm_client_pool().get(
                         api_key=cloud_token,
                         base_url=f"{get_cloud_url()}/api/v1",
                         max_retries=1,
@@ -635,10 +646,11 @@ async def get_llm_client(
                     "User has no litellm_api_key; using master key for LiteLLM proxy (model=%s)",
                     model_name,
                 )
-                return AsyncOpenAI(
+                return get_llm_client_pool().get(
                     api_key=settings.litellm_master_key,
                     base_url=settings.litellm_api_base,
                     max_retries=1,
+                    pinned=True,
                 )
 
             _env_fallbacks = [
@@ -655,7 +667,13 @@ async def get_llm_client(
                         env_var,
                         model_name,
                     )
-                    return AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=1)
+                    # Same ``<PROVIDER>_API_BASE`` override as the DB-less path.
+                    base_url = (
+                        _os.environ.get(f"{env_var.removesuffix('_API_KEY')}_API_BASE") or base_url
+                    )
+                    return get_llm_client_pool().get(
+                        api_key=api_key, base_url=base_url, max_retries=1, pinned=True
+                    )
 
             # Last resort: if user has any active BYOK provider, use it.
             # This lets unprefixed default models (e.g. "claude-sonnet-4.6")
@@ -680,7 +698,7 @@ async def get_llm_client(
                         model_name,
                         any_key.provider,
                     )
-                    return AsyncOpenAI(
+                    return get_llm_client_pool().get(
                         api_key=decode_key(any_key.encrypted_value),
                         base_url=any_key.base_url or provider_cfg["base_url"],
                         default_headers=provider_cfg.get("default_headers", {}),
@@ -696,11 +714,21 @@ async def get_llm_client(
             )
 
         logger.info(f"Using LiteLLM proxy for model: {model_name}")
-        return AsyncOpenAI(
+        return get_llm_client_pool().get(
             api_key=user.litellm_api_key, base_url=settings.litellm_api_base, max_retries=1
         )
 
 
+def uses_system_credentials(client: Any) -> bool:
+    """True if ``client`` talks to the platform's LiteLLM proxy rather than a user key."""
+    from ..config import get_settings
+
+    base_url = os.environ.get(LITELLM_API_BASE_ENV_VAR) or get_settings().litellm_api_base
+    if not base_url:
+        return False
+    return str(getattr(client, "base_url", "")).rstrip("/") == base_url.rstrip("/")
+
+
 class ModelAdapter(ABC):
     """
     Abstract base class for model adapters.
@@ -813,6 +841,9 @@ class OpenAIAdapter(ModelAdapter):
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.thinking_effort = thinking_effort
+        # Only traffic through the shared LiteLLM proxy says anything about
+        # the model's health for everyone; BYOK keys have their own limits.
+        self.system_credentials = uses_system_credentials(client)
 
         logger.info(f"OpenAIAdapter initialized - model: {model_name}")
 
@@ -840,6 +871,8 @@ class OpenAIAdapter(ModelAdapter):
         if max_tokens:
             request_params["max_tokens"] = max_tokens
 
+        started = time.monotonic()
+        first_token_at = None
         try:
             # Inject prompt caching breakpoints for eligible models (e.g. Claude).
             from .prompt_caching import inject_cache_breakpoints
@@ -859,27 +892,33 @@ class OpenAIAdapter(ModelAdapter):
                 if chunk.choices and len(chunk.choices) > 0:
                     delta = chunk.choices[0].delta
                     if delta.content:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
                         yield delta.content
                 # Capture usage from the final chunk (no choices, has usage)
+                # (includes Anthropic/Bedrock cache metrics when present)
                 if hasattr(chunk, "usage") and chunk.usage:
-                    self._last_usage = {
-                        "prompt_tokens": getattr(chunk.usage, "prompt_tokens", 0),
-                        "completion_tokens": getattr(chunk.usage, "completion_tokens", 0),
-                    }
-                    # Capture Anthropic/Bedrock cache metrics when present
-                    for field in (
-                        "cache_creation_input_tokens",
-                        "cache_read_input_tokens",
-                        "cached_tokens",
-                    ):
-                        val = getattr(chunk.usage, field, None)
-                        if val:
-                            self._last_usage[field] = val
+                    self._last_usage = usage_from_chunk(chunk.usage)
 
             logger.debug(f"Streaming complete for {self.model_name}")
+            record_prompt_cache_usage(self.model_name, self._last_usage)
+            record_model_call(
+                self.model_name,
+                started=started,
+                first_token_at=first_token_at,
+                output_tokens=(self._last_usage or {}).get("completion_tokens") or 0,
+                system_credentials=self.system_credentials,
+            )
 
         except Exception as e:
             logger.error(f"OpenAI API streaming error: {e}", exc_info=True)
+            if is_upstream_error(e):
+                record_model_call(
+                    self.model_name,
+                    started=started,
+                    error=True,
+                    system_credentials=self.system_credentials,
+                )
             raise RuntimeError(f"Model API error: {str(e)}") from e
 
     async def chat_with_tools(
@@ -925,7 +964,9 @@ class OpenAIAdapter(ModelAdapter):
                     extra_body["thinking"] = {"type": "enabled", "budget_tokens": budget}
                 request_params["extra_body"] = extra_body
 
-        # Inject prompt caching breakpoints for eligible models (e.g. Claude).
+        # Catch prefix changes that would miss the prompt cache, then
+        # inject caching breakpoints for eligible models (e.g. Claude).
+        check_prompt_prefix(self.model_name, messages, tools)
         try:
             from .prompt_caching import inject_cache_breakpoints
 
@@ -946,13 +987,29 @@ class OpenAIAdapter(ModelAdapter):
             return self._stream_with_tools(request_params)
 
         # Non-streaming path — accumulate and return the submodule-contract dict.
+        started = time.monotonic()
         try:
             response = await self.client.chat.completions.create(**request_params)
         except Exception as e:
             logger.error("chat_with_tools error: %s", e, exc_info=True)
+            if is_upstream_error(e):
+                record_model_call(
+                    self.model_name,
+                    started=started,
+                    error=True,
+                    system_credentials=self.system_credentials,
+                )
             raise RuntimeError(f"Model API error: {e}") from e
 
-        return self._format_response(response)
+        result = self._format_response(response)
+        record_prompt_cache_usage(self.model_name, result["usage"])
+        record_model_call(
+            self.model_name,
+            started=started,
+            output_tokens=result["usage"].get("completion_tokens", 0),
+            system_credentials=self.system_credentials,
+        )
+        return result
 
     def _format_response(self, response: Any) -> dict[str, Any]:
         """Convert a non-streaming OpenAI response into the adapter-contract dict."""
@@ -974,17 +1031,10 @@ class OpenAIAdapter(ModelAdapter):
         usage: dict[str, Any] = {}
         raw_usage = getattr(response, "usage", None)
         if raw_usage is not None:
-            usage["prompt_tokens"] = getattr(raw_usage, "prompt_tokens", 0) or 0
-            usage["completion_tokens"] = getattr(raw_usage, "completion_tokens", 0) or 0
+            usage = usage_from_chunk(raw_usage)
+            usage["prompt_tokens"] = usage["prompt_tokens"] or 0
+            usage["completion_tokens"] = usage["completion_tokens"] or 0
             usage["total_tokens"] = getattr(raw_usage, "total_tokens", 0) or 0
-            for field in (
-                "cache_creation_input_tokens",
-                "cache_read_input_tokens",
-                "cached_tokens",
-            ):
-                val = getattr(raw_usage, field, None)
-                if val:
-                    usage[field] = val
         return {
             "content": getattr(message, "content", "") or "",
             "tool_calls": tool_calls,
@@ -997,79 +1047,273 @@ class OpenAIAdapter(ModelAdapter):
         self, request_params: dict[str, Any]
     ) -> AsyncGenerator[dict, None]:
         """Async generator for the streaming path of chat_with_tools."""
+        from ..config import get_settings
+
+        settings = get_settings()
+        assembler = StreamAssembler(
+            coalesce_chars=settings.llm_stream_coalesce_chars,
+            coalesce_seconds=settings.llm_stream_coalesce_ms / 1000,
+        )
+        started = time.monotonic()
         try:
             params = {**request_params, "stream": True, "stream_options": {"include_usage": True}}
             api_stream = await self.client.chat.completions.create(**params)
 
-            tool_calls_data: dict[int, dict[str, Any]] = {}
-            content_text = ""
-            finish_reason = None
-            usage_data: dict[str, Any] | None = None
-
             async for chunk in api_stream:
-                if hasattr(chunk, "usage") and chunk.usage:
-                    usage_data = {
-                        "prompt_tokens": getattr(chunk.usage, "prompt_tokens", 0),
-                        "completion_tokens": getattr(chunk.usage, "completion_tokens", 0),
-                    }
-                    for field in (
-                        "cache_creation_input_tokens",
-                        "cache_read_input_tokens",
-                        "cached_tokens",
-                    ):
-                        val = getattr(chunk.usage, field, None)
-                        if val:
-                            usage_data[field] = val
-                if not chunk.choices:
-                    continue
-                choice = chunk.choices[0]
-                delta = choice.delta
-                if choice.finish_reason:
-                    finish_reason = choice.finish_reason
-                if delta.content:
-                    content_text += delta.content
-                    yield {"type": "text_delta", "content": delta.content}
-                if delta.tool_calls:
-                    for tc_delta in delta.tool_calls:
-                        idx = tc_delta.index
-                        if idx not in tool_calls_data:
-                            tool_calls_data[idx] = {
-                                "id": "",
-                                "function": {"name": "", "arguments": ""},
-                            }
-                        if tc_delta.id:
-                            tool_calls_data[idx]["id"] = tc_delta.id
-                        if tc_delta.function:
-                            if tc_delta.function.name:
-                                tool_calls_data[idx]["function"]["name"] = tc_delta.function.name
-                            if tc_delta.function.arguments:
-                                tool_calls_data[idx]["function"]["arguments"] += (
-                                    tc_delta.function.arguments
-                                )
-
-            if tool_calls_data:
-                sorted_calls = [tool_calls_data[i] for i in sorted(tool_calls_data)]
-                yield {"type": "tool_calls_complete", "tool_calls": sorted_calls}
+                text = assembler.feed(chunk)
+                if text:
+                    yield {"type": "text_delta", "content": text}
+
+            text = assembler.drain()
+            if text:
+                yield {"type": "text_delta", "content": text}
+
+            tool_calls = assembler.tool_calls()
+            if tool_calls:
+                yield {"type": "tool_calls_complete", "tool_calls": tool_calls}
 
             yield {
                 "type": "done",
-                "finish_reason": finish_reason or ("tool_calls" if tool_calls_data else "stop"),
-                "usage": usage_data,
+                "finish_reason": assembler.finish_reason
+                or ("tool_calls" if tool_calls else "stop"),
+                "usage": assembler.usage,
             }
 
             logger.debug(
                 "chat_with_tools stream complete: %d chars, %d tool calls",
-                len(content_text),
-                len(tool_calls_data),
+                assembler.content_chars,
+                len(tool_calls),
+            )
+            record_prompt_cache_usage(self.model_name, assembler.usage)
+            record_model_call(
+                self.model_name,
+                started=started,
+                first_token_at=assembler.first_delta_at,
+                output_tokens=(assembler.usage or {}).get("completion_tokens") or 0,
+                system_credentials=self.system_credentials,
             )
         except Exception as e:
             logger.error("chat_with_tools stream error: %s", e, exc_info=True)
+            if is_upstream_error(e):
+                record_model_call(
+                    self.model_name,
+                    started=started,
+                    error=True,
+                    system_credentials=self.system_credentials,
+                )
             raise RuntimeError(f"Model API error: {e}") from e
 
     def get_model_name(self) -> str:
         return self.model_name
 
 
+async def _single(awaitable: Any) -> AsyncGenerator[Any, None]:
+    """One-item async iterator, so whole responses race like streams."""
+    yield await awaitable
+
+
+class RoutedModelAdapter(ModelAdapter):
+    """
+    Routes each request across an agent's equivalent models.
+
+    Candidates are re-ordered on every request by live health (see
+    :mod:`.model_traffic`): healthy models first, then by first-token
+    latency. In ``fallback`` mode the next candidate is tried when one fails
+    with an upstream error (connection, timeout, 429, 5xx) before producing
+    output. ``hedge`` also starts the next candidate when the current one has
+    produced nothing after ``hedge_delay`` seconds and keeps whichever
+    answers first.
+
+    Once a stream has produced output it is never switched.
+    """
+
+    def __init__(
+        self,
+        adapters: list[OpenAIAdapter],
+        mode: str = "fallback",
+        hedge_delay: float = 8.0,
+    ):
+        if not adapters:
+            raise ValueError("RoutedModelAdapter needs at least one adapter")
+        if mode not in ("fallback", "hedge"):
+            raise ValueError(f"Unknown model routing mode '{mode}'")
+        self.adapters = adapters
+        self.mode = mode
+        self.hedge_delay = hedge_delay
+
+    @property
+    def model_name(self) -> str:
+        return self.adapters[0].model_name
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        # Used for side requests (compaction) that stay on the configured model.
+        return self.adapters[0].client
+
+    def get_model_name(self) -> str:
+        return self.model_name
+
+    async def _ranked(self) -> list[OpenAIAdapter]:
+        from .model_traffic import rank_equivalent_models
+
+        try:
+            order = await rank_equivalent_models([a.model_name for a in self.adapters])
+        except Exception as e:
+            logger.debug("[MODEL-ROUTER] ranking unavailable, using configured order: %s", e)
+            return list(self.adapters)
+        return [self.adapters[i] for i in order]
+
+    async def _first_response(self, candidates: list[OpenAIAdapter], open_stream: Any) -> Any:
+        """Open candidates in order until one yields its first item.
+
+        ``open_stream(adapter, attempt)`` returns an awaitable of an async
+        iterator. Returns ``(iterator, first_item)``; the iterator is
+        exhausted when ``first_item`` is ``_EXHAUSTED``.
+        """
+
+        async def _pull(adapter: OpenAIAdapter, attempt: int) -> tuple[Any, Any]:
+            agen = await open_stream(adapter, attempt)
+            try:
+                return agen, await agen.__anext__()
+            except StopAsyncIteration:
+                return agen, _EXHAUSTED
+
+        tasks: dict[asyncio.Task, OpenAIAdapter] = {}
+        started = 0
+        last_error: BaseException | None = None
+
+        def _launch() -> None:
+            nonlocal started
+            adapter = candidates[started]
+            tasks[asyncio.create_task(_pull(adapter, started))] = adapter
+            started += 1
+
+        _launch()
+        try:
+            while tasks:
+                can_hedge = self.mode == "hedge" and started < len(candidates)
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=self.hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    logger.info(
+                        "[MODEL-ROUTER] no response from %s after %.1fs, hedging with %s",
+                        ", ".join(a.model_name for a in tasks.values()),
+                        self.hedge_delay,
+                        candidates[started].model_name,
+                    )
+                    _launch()
+                    continue
+                for task in done:
+                    adapter = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if not is_upstream_error(error.__cause__ or error):
+                        raise error
+                    last_error = error
+                    logger.warning(
+                        "[MODEL-ROUTER] %s failed (%s), falling back", adapter.model_name, error
+                    )
+                if not tasks and started < len(candidates):
+                    _launch()
+            assert last_error is not None
+            raise last_error
+        finally:
+            # Losing hedges: cancel the ones still waiting, close any that
+            # answered at the same moment as the winner.
+            for task in tasks:
+                task.cancel()
+            for outcome in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(outcome, tuple):
+                    with contextlib.suppress(Exception):
+                        await outcome[0].aclose()
+
+    @staticmethod
+    def _messages_for(messages: list[dict], attempt: int) -> list[dict]:
+        # Adapters rewrite cache breakpoints in place; a concurrent hedge
+        # or a retry on another model gets its own copy.
+        return messages if attempt == 0 else copy.deepcopy(messages)
+
+    async def chat(self, messages: list[dict[str, str]], **kwargs) -> AsyncGenerator[str, None]:
+        async def _open(adapter: OpenAIAdapter, attempt: int) -> Any:
+            return adapter.chat(self._messages_for(messages, attempt), **kwargs)
+
+        agen, first = await self._first_response(await self._ranked(), _open)
+        if first is _EXHAUSTED:
+            return
+        yield first
+        async for chunk in agen:
+            yield chunk
+
+    async def chat_with_tools(
+        self,
+        messages: list[dict],
+        tools: list[dict] | None = None,
+        tool_choice: str = "auto",
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> dict | AsyncGenerator[dict, None]:
+        candidates = await self._ranked()
+
+        async def _open(adapter: OpenAIAdapter, attempt: int) -> Any:
+            result = adapter.chat_with_tools(
+                self._messages_for(messages, attempt), tools, tool_choice, stream, **kwargs
+            )
+            return await result if stream else _single(result)
+
+        if not stream:
+            _, response = await self._first_response(candidates, _open)
+            return response
+
+        async def _events() -> AsyncGenerator[dict, None]:
+            agen, first = await self._first_response(candidates, _open)
+            if first is _EXHAUSTED:
+                return
+            yield first
+            async for event in agen:
+                yield event
+
+        return _events()
+
+
+_EXHAUSTED = object()
+
+
+async def create_routed_model_adapter(
+    model_name: str,
+    equivalent_models: list[str],
+    user_id: UUID | None = None,
+    db: AsyncSession | None = None,
+    mode: str = "fallback",
+    hedge_delay: float | None = None,
+    **kwargs,
+) -> ModelAdapter:
+    """
+    Adapter for ``model_name`` that can route to its ``equivalent_models``.
+
+    Equivalent models the user cannot reach (no key configured, unknown
+    provider) are skipped. Returns a plain adapter when none remain.
+    """
+    from ..config import get_settings
+
+    adapters = [await create_model_adapter(model_name, user_id=user_id, db=db, **kwargs)]
+    for name in equivalent_models:
+        if name == model_name:
+            continue
+        try:
+            adapters.append(await create_model_adapter(name, user_id=user_id, db=db, **kwargs))
+        except ValueError as e:
+            logger.warning("[MODEL-ROUTER] skipping equivalent model %s: %s", name, e)
+    if len(adapters) == 1:
+        return adapters[0]
+    if hedge_delay is None:
+        hedge_delay = get_settings().model_hedge_delay_seconds
+    return RoutedModelAdapter(adapters, mode=mode, hedge_delay=hedge_delay)
+
+
 async def create_model_adapter(
     model_name: str,
     user_id: UUID | None = None,
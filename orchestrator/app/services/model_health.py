@@ -2,6 +2,8 @@
 Background model health checker.
 
 Tests each LiteLLM model with a tiny completion every 10 minutes.
+Models that served real traffic during the interval are not probed; their
+status comes from the passive stats in :mod:`.model_traffic` instead.
 Results cached in distributed cache for the /api/marketplace/models endpoint.
 """
 
@@ -67,6 +69,27 @@ async def _probe_model(
         }
 
 
+def _results_from_traffic(
+    traffic: dict[str, dict[str, Any]], model_ids: list[str]
+) -> dict[str, dict]:
+    """Health results for models with recent successful or failed traffic."""
+    results = {}
+    for model_id in model_ids:
+        stats = traffic.get(model_id)
+        if not stats or stats["status"] == "unknown":
+            continue
+        latency_ms = stats["ttft_ms"] or stats["latency_ms"]
+        result: dict[str, Any] = {
+            "status": "healthy" if stats["status"] == "healthy" else "unhealthy",
+            "latency": round(latency_ms / 1000, 2) if latency_ms is not None else -1,
+            "source": "traffic",
+        }
+        if stats["status"] != "healthy":
+            result["error"] = f"{stats['error_rate']:.0%} of recent requests failed"
+        results[model_id] = result
+    return results
+
+
 async def _run_health_cycle(base_url: str, headers: dict, model_ids: list[str]) -> dict[str, dict]:
     """Test all models in parallel with a shared HTTP session."""
     url = f"{base_url}/v1/chat/completions"
@@ -118,28 +141,36 @@ async def model_health_check_loop():
                 await asyncio.sleep(CHECK_INTERVAL)
                 continue
 
-            # 2. If previous cycle is still running, mark stuck models as timeout
+            # 2. Models with live traffic don't need a probe
+            from .model_traffic import get_model_traffic
+
+            passive = _results_from_traffic(await get_model_traffic().snapshot(), model_ids)
+            probe_ids = [mid for mid in model_ids if mid not in passive]
+
+            # 3. If previous cycle is still running, mark stuck models as timeout
             if _current_cycle is not None and not _current_cycle.done():
                 logger.warning(
                     "Previous health check cycle still running — cancelling and marking as timeout"
                 )
                 _current_cycle.cancel()
-                timeout_map = {mid: {"status": "timeout", "latency": -1} for mid in model_ids}
-                await cache.set(CACHE_KEY, timeout_map, ttl=CACHE_TTL)
+                timeout_map = {mid: {"status": "timeout", "latency": -1} for mid in probe_ids}
+                await cache.set(CACHE_KEY, {**timeout_map, **passive}, ttl=CACHE_TTL)
 
-            # 3. Run the new cycle as a tracked task
-            _current_cycle = asyncio.create_task(_run_health_cycle(base_url, headers, model_ids))
-            results = await _current_cycle
+            # 4. Run the new cycle as a tracked task
+            _current_cycle = asyncio.create_task(_run_health_cycle(base_url, headers, probe_ids))
+            results = {**await _current_cycle, **passive}
 
-            # 4. Cache the results
+            # 5. Cache the results
             await cache.set(CACHE_KEY, results, ttl=CACHE_TTL)
 
             healthy = sum(1 for r in results.values() if r["status"] == "healthy")
             unhealthy = sum(1 for r in results.values() if r["status"] == "unhealthy")
             timed_out = sum(1 for r in results.values() if r["status"] == "timeout")
             logger.info(
-                "Model health check complete: %d models — %d healthy, %d unhealthy, %d timeout",
+                "Model health check complete: %d models (%d from traffic) — "
+                "%d healthy, %d unhealthy, %d timeout",
                 len(results),
+                len(passive),
                 healthy,
                 unhealthy,
                 timed_out,
@@ -0,0 +1,336 @@
+"""
+Passive model health from real LLM traffic.
+
+``OpenAIAdapter`` records every request made through the shared LiteLLM
+proxy here (BYOK traffic is left out): time to first token (streamed
+requests), total latency, output tokens/s and errors. Counters are kept in
+time buckets over a sliding window and flushed to Redis in batches so the
+API replicas see what the workers observed; without Redis the process-local
+buckets are used.
+
+The combined view (:func:`model_status`) feeds three consumers:
+
+- ``RoutedModelAdapter`` orders an agent's equivalent models by it.
+- ``model_health_check_loop`` skips the active probe for models that had
+  traffic in the last interval.
+- ``/api/marketplace/models`` returns the stats next to the probe result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass, fields
+from typing import Any
+
+from .redis_batch import RedisBatchWriter
+from .task_profile import record_task_span
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "model_traffic:"
+_SNAPSHOT_TTL = 10.0  # seconds a fetched snapshot is reused for routing
+
+# Below this many requests in the window the error rate is not trusted.
+_MIN_REQUESTS_FOR_STATUS = 3
+
+
+@dataclass
+class _Counters:
+    requests: float = 0
+    errors: float = 0
+    ttft_sum: float = 0
+    ttft_count: float = 0
+    latency_sum: float = 0
+    output_tokens: float = 0
+    generation_seconds: float = 0
+
+    def add(self, other: _Counters) -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+def _summarize(c: _Counters, degraded_error_rate: float) -> dict[str, Any]:
+    ok = c.requests - c.errors
+    error_rate = c.errors / c.requests if c.requests else 0.0
+    if c.requests < _MIN_REQUESTS_FOR_STATUS:
+        status = "healthy" if ok else "unknown"
+    elif ok == 0:
+        status = "down"
+    elif error_rate >= degraded_error_rate:
+        status = "degraded"
+    else:
+        status = "healthy"
+    return {
+        "requests": int(c.requests),
+        "errors": int(c.errors),
+        "error_rate": round(error_rate, 3),
+        "ttft_ms": round(c.ttft_sum / c.ttft_count * 1000) if c.ttft_count else None,
+        "latency_ms": round(c.latency_sum / ok * 1000) if ok > 0 else None,
+        "tokens_per_second": (
+            round(c.output_tokens / c.generation_seconds, 1) if c.generation_seconds > 0 else None
+        ),
+        "status": status,
+    }
+
+
+class ModelTrafficStats(RedisBatchWriter):
+    """Sliding-window per-model counters, shared across processes via Redis."""
+
+    log_prefix = "[MODEL-TRAFFIC]"
+
+    def __init__(
+        self,
+        window_seconds: int = 900,
+        bucket_seconds: int = 60,
+        degraded_error_rate: float = 0.5,
+    ) -> None:
+        super().__init__()
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.degraded_error_rate = degraded_error_rate
+        # bucket start -> model -> counters
+        self._buckets: dict[int, dict[str, _Counters]] = {}
+        self._unflushed: dict[int, dict[str, _Counters]] = {}
+        self._snapshot: dict[str, dict[str, Any]] | None = None
+        self._snapshot_at = 0.0
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    def record(
+        self,
+        model: str,
+        *,
+        latency: float,
+        ttft: float | None = None,
+        output_tokens: int = 0,
+        error: bool = False,
+    ) -> None:
+        """Record one finished (or failed) request."""
+        sample = _Counters(requests=1)
+        if error:
+            sample.errors = 1
+        else:
+            sample.latency_sum = latency
+            if ttft is not None:
+                sample.ttft_sum, sample.ttft_count = ttft, 1
+            if output_tokens:
+                sample.output_tokens = output_tokens
+                sample.generation_seconds = max(latency - (ttft or 0.0), 1e-3)
+
+        bucket = int(time.time()) // self.bucket_seconds * self.bucket_seconds
+        for target in (self._buckets, self._unflushed):
+            target.setdefault(bucket, {}).setdefault(model, _Counters()).add(sample)
+        self._prune(bucket)
+        self._schedule_flush()
+
+    def _prune(self, current_bucket: int) -> None:
+        oldest = current_bucket - self.window_seconds
+        for bucket in [b for b in self._buckets if b <= oldest]:
+            del self._buckets[bucket]
+
+    def _has_unflushed(self) -> bool:
+        return bool(self._unflushed)
+
+    def _take_unflushed(self) -> dict[int, dict[str, _Counters]]:
+        pending, self._unflushed = self._unflushed, {}
+        return pending
+
+    def _queue_writes(self, pipe: Any, batch: dict[int, dict[str, _Counters]]) -> None:
+        for bucket, models in batch.items():
+            key = f"{_REDIS_PREFIX}{bucket}"
+            for model, counters in models.items():
+                for f in fields(counters):
+                    value = getattr(counters, f.name)
+                    if value:
+                        pipe.hincrbyfloat(key, f"{model}|{f.name}", value)
+            pipe.expire(key, self.window_seconds + self.bucket_seconds)
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def _window_buckets(self) -> list[int]:
+        now = int(time.time()) // self.bucket_seconds * self.bucket_seconds
+        count = self.window_seconds // self.bucket_seconds
+        return [now - i * self.bucket_seconds for i in range(count)]
+
+    def local_snapshot(self) -> dict[str, dict[str, Any]]:
+        """Window stats from this process only."""
+        totals: dict[str, _Counters] = {}
+        for bucket in self._window_buckets():
+            for model, counters in self._buckets.get(bucket, {}).items():
+                totals.setdefault(model, _Counters()).add(counters)
+        return {m: _summarize(c, self.degraded_error_rate) for m, c in totals.items()}
+
+    async def snapshot(self, *, max_age: float = 0.0) -> dict[str, dict[str, Any]]:
+        """Window stats across all processes; falls back to this process without Redis.
+
+        ``max_age`` lets hot paths reuse a recent snapshot instead of reading
+        Redis on every request.
+        """
+        if (
+            max_age
+            and self._snapshot is not None
+            and time.monotonic() - self._snapshot_at < max_age
+        ):
+            return self._snapshot
+        snapshot = await self._read_shared()
+        if snapshot is None:
+            snapshot = self.local_snapshot()
+        self._snapshot, self._snapshot_at = snapshot, time.monotonic()
+        return snapshot
+
+    async def _read_shared(self) -> dict[str, dict[str, Any]] | None:
+        def _reads(pipe: Any) -> None:
+            for bucket in self._window_buckets():
+                pipe.hgetall(f"{_REDIS_PREFIX}{bucket}")
+
+        rows = await self._read_redis(_reads)
+        if rows is None:
+            return None
+
+        totals: dict[str, _Counters] = {}
+        for row in rows:
+            for field_name, value in (row or {}).items():
+                model, _, name = field_name.rpartition("|")
+                counters = totals.setdefault(model, _Counters())
+                with contextlib.suppress(AttributeError, ValueError):
+                    setattr(counters, name, getattr(counters, name) + float(value))
+        return {m: _summarize(c, self.degraded_error_rate) for m, c in totals.items()}
+
+
+def is_upstream_error(exc: BaseException) -> bool:
+    """True for failures that say something about the model's health.
+
+    Connection errors, timeouts, rate limits and 5xx responses count; request
+    errors (400 context too long, 401 bad key, ...) are the caller's problem.
+    """
+    import openai
+
+    if isinstance(exc, (openai.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+# =============================================================================
+# Combined passive + active view
+# =============================================================================
+
+# Active probe statuses (model_health) mapped onto traffic statuses.
+_PROBE_STATUS = {"healthy": "healthy", "unhealthy": "down", "timeout": "degraded"}
+
+
+def model_status(traffic: dict[str, Any] | None, probe: dict[str, Any] | None) -> str:
+    """Routing status from passive stats, falling back to the last active probe.
+
+    Real traffic wins once there is enough of it; otherwise the probe
+    decides. ``unknown`` means neither source has seen the model.
+    """
+    known = traffic and traffic.get("status") not in (None, "unknown")
+    if known and (traffic["requests"] >= _MIN_REQUESTS_FOR_STATUS or not probe):
+        return traffic["status"]
+    if probe and probe.get("status") in _PROBE_STATUS:
+        return _PROBE_STATUS[probe["status"]]
+    return "unknown"
+
+
+_STATUS_RANK = {"healthy": 0, "unknown": 1, "degraded": 2, "down": 3}
+
+
+def rank_models(
+    models: list[str],
+    traffic: dict[str, dict[str, Any]],
+    probes: dict[str, dict[str, Any]],
+) -> list[int]:
+    """Positions of equivalent ``models`` in routing order.
+
+    Ordered by status, then first-token latency (total latency for models
+    only seen on non-streamed requests). Models without latency data keep
+    their configured order after the measured ones of the same status.
+    """
+
+    def _key(position: int) -> tuple[int, float, int]:
+        stats = traffic.get(models[position]) or {}
+        status = model_status(stats, probes.get(models[position]))
+        latency = stats.get("ttft_ms") or stats.get("latency_ms")
+        return (_STATUS_RANK[status], latency if latency is not None else float("inf"), position)
+
+    return sorted(range(len(models)), key=_key)
+
+
+async def rank_equivalent_models(models: list[str]) -> list[int]:
+    """:func:`rank_models` against the current traffic stats and probe results."""
+    from .cache_service import cache
+    from .model_health import CACHE_KEY as HEALTH_CACHE_KEY
+
+    traffic = await get_model_traffic().snapshot(max_age=_SNAPSHOT_TTL)
+    probes = await cache.get(HEALTH_CACHE_KEY) or {}
+    return rank_models(models, traffic, probes)
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: ModelTrafficStats | None = None
+
+
+def get_model_traffic() -> ModelTrafficStats:
+    """Get the process-wide traffic stats."""
+    global _instance
+    if _instance is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        _instance = ModelTrafficStats(
+            window_seconds=settings.model_traffic_window_seconds,
+            bucket_seconds=settings.model_traffic_bucket_seconds,
+            degraded_error_rate=settings.model_degraded_error_rate,
+        )
+    return _instance
+
+
+def record_model_call(
+    model: str,
+    *,
+    started: float,
+    first_token_at: float | None = None,
+    output_tokens: int = 0,
+    error: bool = False,
+    system_credentials: bool = True,
+) -> None:
+    """Record a request that started at ``started`` (``time.monotonic()``) and ends now.
+
+    Calls made with a user's own key (``system_credentials=False``) are left
+    out of the shared model stats: their rate limits and outages belong to
+    that key, not to the model everyone else is routed to. Every call is
+    added to the running agent task's latency profile.
+    """
+    ttft = (first_token_at - started) if first_token_at is not None else None
+    if system_credentials:
+        try:
+            now = time.monotonic()
+            get_model_traffic().record(
+                model,
+                latency=now - started,
+                ttft=ttft,
+                output_tokens=output_tokens,
+                error=error,
+            )
+        except Exception as e:  # stats must never break a request
+            logger.debug("[MODEL-TRAFFIC] record failed: %s", e)
+    record_task_span(
+        "model",
+        model,
+        started,
+        ttft_ms=round(ttft * 1000, 1) if ttft is not None else None,
+        output_tokens=output_tokens or None,
+        error=error or None,
+    )
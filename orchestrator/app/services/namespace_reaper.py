@@ -25,6 +25,15 @@ from kubernetes.client.rest import ApiException
 logger = logging.getLogger(__name__)
 
 
+def is_stuck_project_namespace(ns: client.V1Namespace) -> bool:
+    """True for a proj-* namespace that is stuck in Terminating."""
+    return (
+        ns.metadata.name.startswith("proj-")
+        and ns.status is not None
+        and ns.status.phase == "Terminating"
+    )
+
+
 @dataclass
 class ReaperResult:
     """Outcome of a single reaper run."""
@@ -81,11 +90,7 @@ class NamespaceReaper:
     def _list_stuck_namespaces(self) -> list[client.V1Namespace]:
         """Return proj-* namespaces in Terminating phase."""
         all_ns = self._v1.list_namespace().items
-        return [
-            ns
-            for ns in all_ns
-            if ns.metadata.name.startswith("proj-") and ns.status.phase == "Terminating"
-        ]
+        return [ns for ns in all_ns if is_stuck_project_namespace(ns)]
 
     def _force_delete_pods(self, namespace: str, result: ReaperResult) -> None:
         """Stage 1: force-delete all pods in the namespace."""
@@ -5,14 +5,23 @@ Defines the common interface that all container orchestrators must implement.
 This ensures feature parity between Docker and Kubernetes deployments.
 """
 
+import posixpath
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
 from typing import Any
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..file_events import get_file_change_notifier
 from .deployment_mode import DeploymentMode
+from .file_cache import Stamp, get_file_content_cache
+from .file_tree import get_file_tree_service
+from .read_budget import ReadBudget, clip_text, file_record, skip_error
+
+# Paths per read_files_batch call in the generic read_files_stream.
+_STREAM_READ_BATCH = 32
 
 
 class BaseOrchestrator(ABC):
@@ -347,6 +356,122 @@ class BaseOrchestrator(ABC):
         """
         pass
 
+    async def read_files_stream(
+        self,
+        user_id: UUID,
+        project_id: UUID,
+        container_name: str,
+        paths: list[str],
+        budget: ReadBudget,
+        subdir: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Read files in ``paths`` order under a byte budget, streaming results.
+
+        Yields ``{path, content, size, truncated}`` per file read (``size`` is
+        the full file size) or ``{path, error}`` for paths that were skipped
+        by extension or could not be read. Stops once
+        ``budget.max_total_bytes`` bytes were read; later paths are not
+        yielded.
+
+        This default reads whole files through ``read_files_batch`` and cuts
+        them afterwards; backends override it to apply the budget where the
+        bytes are read.
+        """
+        spent = 0
+        for start in range(0, len(paths), _STREAM_READ_BATCH):
+            if spent >= budget.max_total_bytes:
+                return
+            batch = [p for p in paths[start : start + _STREAM_READ_BATCH] if not budget.skips(p)]
+            files, _errors = await self.read_files_batch(
+                user_id, project_id, container_name, batch, subdir=subdir
+            )
+            by_path = {f["path"]: f for f in files}
+            for path in paths[start : start + _STREAM_READ_BATCH]:
+                if spent >= budget.max_total_bytes:
+                    return
+                if budget.skips(path):
+                    yield skip_error(path)
+                    continue
+                rec = by_path.get(path)
+                if rec is None:
+                    yield {"path": path, "error": "read failed"}
+                    continue
+                content = rec.get("content") or ""
+                limit = budget.limit(len(content.encode("utf-8", errors="replace")), spent)
+                text, nbytes, truncated = clip_text(content, limit, budget.tail)
+                spent += nbytes
+                yield file_record(path, text, int(rec.get("size") or nbytes), truncated)
+
+    # =========================================================================
+    # FILE CONTENT CACHE / TREE SNAPSHOTS / CHANGE NOTIFICATIONS
+    # Backends route text reads through _read_through_cache with a stamp from
+    # a cheap stat, call _invalidate_cached_file and _publish_file_change
+    # after their own writes and deletes, and _mark_tree_dirty after running
+    # commands in the project.
+    # =========================================================================
+
+    async def _read_through_cache(
+        self,
+        project_id: UUID,
+        key: str,
+        stamp: Stamp | None,
+        load: Callable[[], Awaitable[str | None]],
+    ) -> str | None:
+        """
+        Serve ``key`` from the file content cache while ``stamp`` matches.
+
+        On a miss ``load`` reads the file and the result is cached under the
+        stamp observed *before* the read, so a concurrent edit can only make
+        the entry look stale, never mask new content. ``stamp=None`` (stat
+        unavailable) bypasses the cache.
+        """
+        cache = get_file_content_cache()
+        scope = str(project_id)
+        if stamp is not None:
+            cached = cache.get(scope, key, stamp)
+            if cached is not None:
+                return cached
+        content = await load()
+        if content is not None and stamp is not None:
+            cache.put(scope, key, stamp, content)
+        return content
+
+    def _invalidate_cached_file(self, project_id: UUID, key: str) -> None:
+        """Drop ``key`` from the file content cache after writing or deleting it.
+
+        Also marks the project's file-tree snapshots stale.
+        """
+        get_file_content_cache().invalidate(str(project_id), key)
+        self._mark_tree_dirty(project_id)
+
+    def _mark_tree_dirty(self, project_id: UUID) -> None:
+        """Force the next file-tree request for ``project_id`` to rescan."""
+        get_file_tree_service().mark_dirty(project_id)
+
+    def _publish_file_change(
+        self,
+        project_id: UUID,
+        file_path: str,
+        subdir: str | None = None,
+        *,
+        deleted: bool = False,
+    ) -> None:
+        """Queue a push notification for a file this orchestrator changed."""
+        path = posixpath.join(subdir, file_path) if subdir else file_path
+        get_file_change_notifier().record(
+            project_id, posixpath.normpath(path).lstrip("/"), deleted=deleted
+        )
+
+    async def get_watch_root(self, project_id: UUID) -> Path | None:
+        """
+        Directory on this host holding the project's files, for change watchers.
+
+        ``None`` (the default) means the files are not locally visible;
+        change notifications then come only from the orchestrator itself.
+        """
+        return None
+
     # =========================================================================
     # SHELL OPERATIONS (for agent tools)
     # =========================================================================
@@ -35,6 +35,7 @@ from ...config import get_settings
 from ..secret_manager_env import build_env_overrides
 from .base import BaseOrchestrator
 from .deployment_mode import DeploymentMode
+from .read_budget import ReadBudget, stream_from_disk
 
 logger = logging.getLogger(__name__)
 
@@ -621,6 +622,14 @@ class DockerOrchestrator(BaseOrchestrator):
         """Get the filesystem path for a project."""
         return self.projects_path / project_slug
 
+    async def get_watch_root(self, project_id: UUID) -> Path | None:
+        """The project's directory on the shared projects volume."""
+        project_slug = await self._get_project_slug(project_id)
+        if not project_slug:
+            return None
+        project_path = self.get_project_path(project_slug)
+        return project_path if project_path.is_dir() else None
+
     def _safe_project_path(
         self, project_slug: str, file_path: str, subdir: str | None = None
     ) -> Path:
@@ -802,8 +811,7 @@ class DockerOrchestrator(BaseOrchestrator):
             if not full_path.exists():
                 return None
 
-            async with aiofiles.open(full_path, encoding="utf-8") as f:
-                return await f.read()
+            return await self._read_text_cached(project_id, full_path)
 
         except ValueError as e:
             logger.warning(f"[DOCKER] Path traversal blocked in read_file: {e}")
@@ -846,6 +854,8 @@ class DockerOrchestrator(BaseOrchestrator):
 
             async with aiofiles.open(full_path, "w", encoding="utf-8") as f:
                 await f.write(content)
+            self._invalidate_cached_file(project_id, str(full_path))
+            self._publish_file_change(project_id, file_path, subdir)
 
             logger.debug(f"[DOCKER] Wrote file {file_path} to project {project_slug}")
             return True
@@ -877,6 +887,8 @@ class DockerOrchestrator(BaseOrchestrator):
 
             if full_path.exists():
                 await aiofiles.os.remove(full_path)
+                self._invalidate_cached_file(project_id, str(full_path))
+                self._publish_file_change(project_id, file_path, subdir, deleted=True)
                 logger.debug(f"[DOCKER] Deleted file {file_path}")
             return True
 
@@ -1124,12 +1136,23 @@ class DockerOrchestrator(BaseOrchestrator):
             return None
 
         try:
-            async with aiofiles.open(full_path, encoding="utf-8") as f:
-                content = await f.read()
+            content = await self._read_text_cached(project_id, full_path)
             return {"path": file_path, "content": content, "size": len(content)}
         except (OSError, UnicodeDecodeError):
             return None
 
+    async def _read_text_cached(self, project_id: UUID, full_path: Path) -> str:
+        """Read a UTF-8 project file, served from the file content cache while unchanged."""
+        st = full_path.stat()
+
+        async def _load() -> str:
+            async with aiofiles.open(full_path, encoding="utf-8") as f:
+                return await f.read()
+
+        return await self._read_through_cache(
+            project_id, str(full_path), (st.st_mtime_ns, st.st_size), _load
+        )
+
     async def read_files_batch(
         self,
         user_id: UUID,
@@ -1167,6 +1190,29 @@ class DockerOrchestrator(BaseOrchestrator):
                 files.append(result)
         return files, errors
 
+    async def read_files_stream(
+        self,
+        user_id: UUID,
+        project_id: UUID,
+        container_name: str,
+        paths: list[str],
+        budget: ReadBudget,
+        subdir: str | None = None,
+        project_slug: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream files from the local filesystem, reading only what ``budget`` allows."""
+        if not project_slug:
+            project_slug = await self._get_project_slug(project_id)
+            if not project_slug:
+                for path in paths:
+                    yield {"path": path, "error": "project not found"}
+                return
+
+        async for record in stream_from_disk(
+            paths, budget, lambda p: self._safe_project_path(project_slug, p, subdir)
+        ):
+            yield record
+
     async def project_exists(self, project_slug: str) -> bool:
         """Check if a project directory exists."""
         project_path = self.get_project_path(project_slug)
@@ -1390,6 +1436,8 @@ class DockerOrchestrator(BaseOrchestrator):
             raise RuntimeError(f"Command timed out after {timeout} seconds") from None
         except Exception as e:
             raise RuntimeError(f"Command execution failed: {e}") from e
+        finally:
+            self._mark_tree_dirty(project_id)
 
     async def is_container_ready(
         self, user_id: UUID, project_id: UUID, container_name: str
@@ -0,0 +1,167 @@
+"""
+Validated file content cache for orchestrator reads.
+
+Agents re-read the same project files many times per run (``read_file``,
+``read_many_files``, compaction's restored-files block, skill discovery), and
+every read otherwise goes to FileOps, a pod exec or the local disk. The cache
+keeps decoded file contents in memory keyed by ``(project, path)``.
+
+An entry is only served while its *stamp* — the file's ``(mtime, size)`` from
+a cheap stat the backend performs first — still matches, so edits made
+outside the orchestrator (dev servers, shells, git) are never masked. The
+orchestrator's own writes and deletes drop the entry immediately, so a read
+after a write never depends on the mtime having moved.
+
+The cache is bounded by total content bytes with LRU eviction. Per-project
+hit/miss counters are exposed via ``get_file_cache_metrics()`` and the
+``/api/admin/metrics/file-cache`` endpoint.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+# (mtime, size) — mtime in whatever unit the backend's stat reports.
+Stamp = tuple[int, int]
+
+# Projects tracked in the per-project metrics before the least recently
+# active ones are dropped.
+_MAX_TRACKED_PROJECTS = 1024
+
+
+@dataclass(slots=True)
+class _Entry:
+    stamp: Stamp
+    content: str
+    nbytes: int
+
+
+class FileContentCache:
+    """Byte-bounded LRU of file contents, validated by (mtime, size) stamps."""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int) -> None:
+        self._max_bytes = max(0, max_bytes)
+        self._max_entry_bytes = min(max(0, max_entry_bytes), self._max_bytes)
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, scope: str, path: str, stamp: Stamp) -> str | None:
+        """Return the cached content if its stamp still matches, else None."""
+        if not self.enabled:
+            return None
+        key = (scope, path)
+        entry = self._entries.get(key)
+        if entry is not None and entry.stamp == stamp:
+            self._entries.move_to_end(key)
+            _record(scope, hit=True)
+            return entry.content
+        if entry is not None:
+            self._drop(key)
+        _record(scope, hit=False)
+        return None
+
+    def put(self, scope: str, path: str, stamp: Stamp, content: str) -> None:
+        """Cache ``content`` read after observing ``stamp``."""
+        nbytes = stamp[1]
+        if not self.enabled or nbytes > self._max_entry_bytes:
+            return
+        key = (scope, path)
+        self._drop(key)
+        self._entries[key] = _Entry(stamp=stamp, content=content, nbytes=nbytes)
+        self._bytes += nbytes
+        while self._bytes > self._max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, scope: str, path: str) -> None:
+        """Forget ``path`` — called after the orchestrator writes or deletes it."""
+        self._drop((scope, path))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+_project_metrics: OrderedDict[str, dict[str, int]] = OrderedDict()
+
+
+def _record(scope: str, *, hit: bool) -> None:
+    counters = _project_metrics.get(scope)
+    if counters is None:
+        counters = _project_metrics[scope] = {"hits": 0, "misses": 0}
+        while len(_project_metrics) > _MAX_TRACKED_PROJECTS:
+            _project_metrics.popitem(last=False)
+    else:
+        _project_metrics.move_to_end(scope)
+    counters["hits" if hit else "misses"] += 1
+
+
+def _with_rate(counters: dict[str, int]) -> dict[str, Any]:
+    total = counters["hits"] + counters["misses"]
+    hit_rate = (counters["hits"] / total * 100) if total > 0 else 0
+    return {**counters, "total_requests": total, "hit_rate_percent": round(hit_rate, 2)}
+
+
+def get_file_cache_metrics(project_id: str | None = None) -> dict[str, Any]:
+    """Hit/miss statistics for this process, overall and per project."""
+    if project_id is not None:
+        return _with_rate(_project_metrics.get(str(project_id), {"hits": 0, "misses": 0}))
+
+    totals = {
+        "hits": sum(c["hits"] for c in _project_metrics.values()),
+        "misses": sum(c["misses"] for c in _project_metrics.values()),
+    }
+    cache = _instance
+    return {
+        **_with_rate(totals),
+        "entries": len(cache) if cache is not None else 0,
+        "bytes": cache.total_bytes if cache is not None else 0,
+        "projects": {scope: _with_rate(c) for scope, c in _project_metrics.items()},
+    }
+
+
+def reset_file_cache_metrics() -> None:
+    """Reset metrics (useful for testing)."""
+    _project_metrics.clear()
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: FileContentCache | None = None
+
+
+def get_file_content_cache() -> FileContentCache:
+    """Process-wide cache shared by every orchestrator instance."""
+    global _instance
+    if _instance is None:
+        from ...config import get_settings
+
+        settings = get_settings()
+        _instance = FileContentCache(
+            max_bytes=settings.file_content_cache_max_bytes,
+            max_entry_bytes=settings.file_content_cache_max_entry_bytes,
+        )
+    return _instance
@@ -0,0 +1,253 @@
+"""
+Versioned project file-tree snapshots with delta responses.
+
+``list_tree`` walks the whole project on every call, and the file explorer,
+``glob`` and ``read_many_files`` call it on every refresh. For large monorepos
+that is a multi-megabyte JSON payload per poll even when nothing changed.
+
+``FileTreeService`` keeps one snapshot per ``(project, container, subdir)``:
+every entry carries the snapshot version at which it was last added or
+changed, and removed paths leave a tombstone with the version of their
+removal. A client that sends back the cursor of its last response receives
+only the entries added, modified or removed since then.
+
+Snapshots are refreshed by re-listing the tree and diffing it by
+``(is_dir, size, mod_time)``:
+
+- at most once per ``file_tree_rescan_seconds`` while nothing is known to
+  have changed, which picks up edits from dev servers, shells and git;
+- on the next request after the orchestrator itself wrote, deleted or ran a
+  command in the project (``mark_dirty``), so callers always see their own
+  changes.
+
+Cursors are ``"<epoch>:<version>"``. The epoch is random per snapshot, so a
+cursor from before a process restart or an evicted snapshot is recognised as
+unusable and answered with the full tree instead of a wrong delta.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+# Snapshots kept in memory before the least recently used are evicted.
+_MAX_SNAPSHOTS = 256
+
+# Tombstones kept per snapshot. Once exceeded the oldest are dropped and
+# cursors older than them get a full tree instead of a delta.
+_MAX_TOMBSTONES = 10_000
+
+SnapshotKey = tuple[str, str, str]
+
+
+def _signature(entry: dict[str, Any]) -> tuple[Any, Any, Any]:
+    return (bool(entry.get("is_dir")), entry.get("size"), entry.get("mod_time"))
+
+
+@dataclass(slots=True)
+class _Node:
+    entry: dict[str, Any]
+    created: int  # version at which the path (re)appeared
+    version: int  # version of the last change
+
+
+@dataclass
+class _Snapshot:
+    epoch: str = field(default_factory=lambda: secrets.token_hex(4))
+    version: int = 0
+    nodes: dict[str, _Node] = field(default_factory=dict)
+    tombstones: OrderedDict[str, int] = field(default_factory=OrderedDict)
+    # Oldest version a delta can still be computed from.
+    floor: int = 0
+    files: list[dict[str, Any]] = field(default_factory=list)
+    scanned_at: float = 0.0
+    dirty: bool = True
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def cursor(self) -> str:
+        return f"{self.epoch}:{self.version}"
+
+    def apply(self, entries: list[dict[str, Any]]) -> bool:
+        """Diff a fresh listing into the snapshot. Returns True if anything changed."""
+        nxt = self.version + 1
+        changed = False
+        seen: set[str] = set()
+
+        for entry in entries:
+            path = entry.get("path")
+            if not path:
+                continue
+            seen.add(path)
+            node = self.nodes.get(path)
+            if node is None:
+                self.nodes[path] = _Node(entry=entry, created=nxt, version=nxt)
+                self.tombstones.pop(path, None)
+                changed = True
+            elif _signature(node.entry) != _signature(entry):
+                node.entry = entry
+                node.version = nxt
+                changed = True
+
+        for path in [p for p in self.nodes if p not in seen]:
+            del self.nodes[path]
+            self.tombstones[path] = nxt
+            changed = True
+        while len(self.tombstones) > _MAX_TOMBSTONES:
+            _, dropped = self.tombstones.popitem(last=False)
+            self.floor = max(self.floor, dropped)
+
+        if changed:
+            self.version = nxt
+            self.files = [node.entry for node in self.nodes.values()]
+        return changed
+
+    def delta(self, since: str | None) -> dict[str, Any] | None:
+        """Changes after cursor ``since``, or None if it cannot be honoured."""
+        if not since:
+            return None
+        epoch, _, raw = since.partition(":")
+        try:
+            base = int(raw)
+        except ValueError:
+            return None
+        if epoch != self.epoch or base < self.floor or base > self.version:
+            return None
+
+        added: list[dict[str, Any]] = []
+        modified: list[dict[str, Any]] = []
+        if base < self.version:
+            for node in self.nodes.values():
+                if node.created > base:
+                    added.append(node.entry)
+                elif node.version > base:
+                    modified.append(node.entry)
+        removed = [path for path, version in self.tombstones.items() if version > base]
+        return {"added": added, "modified": modified, "removed": removed}
+
+
+class FileTreeService:
+    """Per-project file-tree snapshots refreshed on demand from ``list_tree``."""
+
+    def __init__(self, rescan_interval: float, max_snapshots: int = _MAX_SNAPSHOTS) -> None:
+        self._rescan_interval = max(0.0, rescan_interval)
+        self._max_snapshots = max_snapshots
+        self._snapshots: OrderedDict[SnapshotKey, _Snapshot] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    async def list_tree(
+        self,
+        orchestrator: Any,
+        user_id: UUID,
+        project_id: UUID | str,
+        container_name: str | None,
+        subdir: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Drop-in for ``orchestrator.list_tree`` served from the snapshot.
+
+        The returned list is shared with the snapshot and must not be mutated.
+        """
+        snap = await self._fresh(orchestrator, user_id, project_id, container_name, subdir)
+        return snap.files
+
+    async def get_changes(
+        self,
+        orchestrator: Any,
+        user_id: UUID,
+        project_id: UUID | str,
+        container_name: str | None,
+        subdir: str | None = None,
+        since: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Tree changes since cursor ``since``.
+
+        Returns ``{"delta": True, "added", "modified", "removed", "version"}``
+        when ``since`` is a cursor this snapshot can answer, otherwise
+        ``{"delta": False, "files", "version"}`` with the full tree. Clients
+        apply ``added`` and ``modified`` as upserts keyed by path.
+        """
+        snap = await self._fresh(orchestrator, user_id, project_id, container_name, subdir)
+        delta = snap.delta(since)
+        if delta is None:
+            return {"delta": False, "files": snap.files, "version": snap.cursor}
+        return {"delta": True, **delta, "version": snap.cursor}
+
+    def mark_dirty(self, project_id: UUID | str) -> None:
+        """Force a rescan of every snapshot of ``project_id`` on its next use."""
+        scope = str(project_id)
+        for key, snap in self._snapshots.items():
+            if key[0] == scope:
+                snap.dirty = True
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+    def _snapshot(self, key: SnapshotKey) -> _Snapshot:
+        snap = self._snapshots.get(key)
+        if snap is None:
+            snap = self._snapshots[key] = _Snapshot()
+            while len(self._snapshots) > self._max_snapshots:
+                self._snapshots.popitem(last=False)
+        else:
+            self._snapshots.move_to_end(key)
+        return snap
+
+    async def _fresh(
+        self,
+        orchestrator: Any,
+        user_id: UUID,
+        project_id: UUID | str,
+        container_name: str | None,
+        subdir: str | None,
+    ) -> _Snapshot:
+        key = (str(project_id), container_name or "", subdir or "")
+        snap = self._snapshot(key)
+        async with snap.lock:
+            if not snap.dirty and time.monotonic() - snap.scanned_at < self._rescan_interval:
+                return snap
+            # Cleared before listing so a write that lands mid-scan marks the
+            # snapshot dirty again instead of being lost.
+            snap.dirty = False
+            try:
+                entries = await orchestrator.list_tree(
+                    user_id=user_id,
+                    project_id=project_id,
+                    container_name=container_name,
+                    subdir=subdir,
+                )
+            except BaseException:
+                snap.dirty = True
+                raise
+            if snap.apply(entries):
+                logger.debug("[TREE] %s -> version %d", key, snap.version)
+            snap.scanned_at = time.monotonic()
+        return snap
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: FileTreeService | None = None
+
+
+def get_file_tree_service() -> FileTreeService:
+    """Process-wide tree snapshots shared by the API and agent tools."""
+    global _instance
+    if _instance is None:
+        from ...config import get_settings
+
+        _instance = FileTreeService(rescan_interval=get_settings().file_tree_rescan_seconds)
+    return _instance
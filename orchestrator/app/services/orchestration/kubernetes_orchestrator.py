@@ -45,12 +45,14 @@ from kubernetes.client.rest import ApiException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 if TYPE_CHECKING:
-    from ..fileops_client import FileOpsClient
+    from ..fileops_client import FileBlob, FileOpsClient
 
+from ..file_events import get_file_change_notifier
 from ..snapshot_manager import get_snapshot_manager
 from ..volume_manager import VolumeRestoringError, VolumeUnavailableError
 from .base import BaseOrchestrator
 from .deployment_mode import DeploymentMode
+from .file_cache import Stamp, get_file_content_cache
 from .kubernetes.client import KubernetesClient, get_k8s_client
 from .kubernetes.helpers import (
     create_file_manager_deployment,
@@ -58,9 +60,26 @@ from .kubernetes.helpers import (
     create_pvc_manifest,
     generate_git_clone_script,
 )
+from .read_budget import ReadBudget, clip_text, decode_range, file_record, skip_error
 
 logger = logging.getLogger(__name__)
 
+
+def _stat_stamp(info) -> Stamp | None:
+    """File content cache stamp from a FileOps StatPath result.
+
+    None (do not cache) from drivers predating ``mod_time_ns``: with
+    whole-second mtimes a same-size edit from a shell within the second
+    would keep serving the old content.
+    """
+    if not info.mod_time_ns:
+        return None
+    return (info.mod_time_ns, info.size)
+
+
+# Paths per FileOps call in read_files_stream.
+_STREAM_READ_CHUNK = 64
+
 # Directories, files, and extensions to exclude from tree listings (matches docker.py).
 _TREE_EXCLUDE_DIRS = [
     "node_modules",
@@ -213,50 +232,46 @@ class KubernetesOrchestrator(BaseOrchestrator):
     async def _fileops_call(self, volume_id: str, fn, *args, **kwargs):
         """Execute a FileOps RPC with automatic recovery.
 
+        The volume → node route is cached and the channel pooled (see
+        VolumeManager.get_fileops_client), so a warm call is a single RPC.
+
         Recovery layers:
         1. Owner unreachable/unavailable → recover_volume (relocate via Hub)
-        2. FAILED_PRECONDITION (volume missing from disk) → re-resolve via Hub
-        3. Still FAILED_PRECONDITION after retry → VolumeRestoringError
+        2. UNAVAILABLE on a cached route → drop route + channel, re-run from 1
+        3. FAILED_PRECONDITION (volume missing from disk) → re-resolve via Hub
+        4. Still FAILED_PRECONDITION after retry → VolumeRestoringError
 
         Every file operation gets the same guarantee: either you get your
         data, or you get a clear VolumeRestoringError/VolumeUnavailableError.
         """
-        from ..volume_manager import (
-            VolumeOwnerUnreachableError,
-            VolumeUnavailableError,
-            get_volume_manager,
-        )
+        from ..volume_manager import get_volume_manager
 
         vm = get_volume_manager()
+        cached_route = vm.has_fileops_route(volume_id)
+        client = await self._fileops_client_with_recovery(volume_id)
 
-        # Layer 1: auto-recover when owner node is dead/unreachable
-        try:
-            client = await vm.get_fileops_client(volume_id)
-        except (VolumeOwnerUnreachableError, VolumeUnavailableError) as e:
-            logger.warning(
-                "[K8S] Volume %s owner unavailable (%s) — attempting auto-recovery",
-                volume_id,
-                type(e).__name__,
-            )
-            try:
-                result = await vm.recover_volume(volume_id)
-                logger.info(
-                    "[K8S] Volume %s auto-recovered to node %s",
-                    volume_id,
-                    result["node_name"],
-                )
-                await self._update_project_cache_node(volume_id, result["node_name"])
-                client = await vm.get_fileops_client(volume_id)
-            except Exception as recovery_err:
-                logger.error("[K8S] Volume %s auto-recovery failed: %s", volume_id, recovery_err)
-                raise VolumeUnavailableError(volume_id) from recovery_err
-
-        # Layer 2: FAILED_PRECONDITION recovery (volume subvolume missing from disk)
+        # Layers 2-3: stale cached route, volume subvolume missing from disk
         try:
             async with client:
                 return await fn(client, *args, **kwargs)
         except grpc.aio.AioRpcError as e:
-            if e.code() != grpc.StatusCode.FAILED_PRECONDITION:
+            if e.code() == grpc.StatusCode.UNAVAILABLE and cached_route:
+                # The cached route skipped the Hub, which would have reported
+                # the owner unreachable — resolve (and recover) once more.
+                logger.warning(
+                    "[K8S] FileOps node %s unavailable for %s — dropping cached route",
+                    client.address,
+                    volume_id,
+                )
+                vm.invalidate_fileops_route(volume_id, drop_channel=True)
+                client = await self._fileops_client_with_recovery(volume_id)
+                try:
+                    async with client:
+                        return await fn(client, *args, **kwargs)
+                except grpc.aio.AioRpcError as retry_err:
+                    if retry_err.code() != grpc.StatusCode.FAILED_PRECONDITION:
+                        raise
+            elif e.code() != grpc.StatusCode.FAILED_PRECONDITION:
                 raise
             logger.warning(
                 "[K8S] FileOps volume missing (FAILED_PRECONDITION) for %s — re-resolving via Hub",
@@ -264,6 +279,7 @@ class KubernetesOrchestrator(BaseOrchestrator):
             )
 
         # Re-resolve triggers CAS restore in the Hub if volume is gone.
+        vm.invalidate_fileops_route(volume_id)
         retry_client = await vm.get_fileops_client(volume_id)
         try:
             async with retry_client:
@@ -274,9 +290,41 @@ class KubernetesOrchestrator(BaseOrchestrator):
                     "[K8S] FileOps volume %s still restoring after re-resolve — signaling restoring",
                     volume_id,
                 )
+                vm.invalidate_fileops_route(volume_id)
                 raise VolumeRestoringError(volume_id) from retry_err
             raise
 
+    async def _fileops_client_with_recovery(self, volume_id: str) -> "FileOpsClient":
+        """Layer 1 of _fileops_call: get a client, relocating the volume via the
+        Hub when its owner node is dead/unreachable."""
+        from ..volume_manager import (
+            VolumeOwnerUnreachableError,
+            VolumeUnavailableError,
+            get_volume_manager,
+        )
+
+        vm = get_volume_manager()
+        try:
+            return await vm.get_fileops_client(volume_id)
+        except (VolumeOwnerUnreachableError, VolumeUnavailableError) as e:
+            logger.warning(
+                "[K8S] Volume %s owner unavailable (%s) — attempting auto-recovery",
+                volume_id,
+                type(e).__name__,
+            )
+            try:
+                result = await vm.recover_volume(volume_id)
+                logger.info(
+                    "[K8S] Volume %s auto-recovered to node %s",
+                    volume_id,
+                    result["node_name"],
+                )
+                await self._update_project_cache_node(volume_id, result["node_name"])
+                return await vm.get_fileops_client(volume_id)
+            except Exception as recovery_err:
+                logger.error("[K8S] Volume %s auto-recovery failed: %s", volume_id, recovery_err)
+                raise VolumeUnavailableError(volume_id) from recovery_err
+
     async def _update_project_cache_node(self, volume_id: str, node_name: str) -> None:
         """Update project.cache_node after volume relocation (fire-and-forget)."""
         from sqlalchemy import select as sa_select
@@ -1253,33 +1301,32 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
             if is_initialized and "project-storage" in pvc_names:
                 snapshot_pvcs.insert(0, "project-storage")
 
-            for pvc_name in snapshot_pvcs:
-                snapshot, error = await snapshot_manager.create_snapshot(
-                    project_id=project_id,
-                    user_id=user_id,
-                    db=db,
-                    snapshot_type="hibernation",
-                    pvc_name=pvc_name,
-                )
+            # All PVCs are snapshotted and awaited together, so hibernation
+            # time tracks the slowest PVC rather than the sum of all of them.
+            snapshots, error = await snapshot_manager.create_snapshots(
+                project_id=project_id,
+                user_id=user_id,
+                db=db,
+                pvc_names=snapshot_pvcs,
+                snapshot_type="hibernation",
+            )
 
-                if error or snapshot is None:
-                    logger.error(
-                        f"[K8S:HIBERNATE] ❌ Failed to create snapshot for PVC {pvc_name}: {error}"
-                    )
-                    return False
+            if error or len(snapshots) != len(snapshot_pvcs):
+                logger.error(f"[K8S:HIBERNATE] ❌ Failed to create snapshots: {error}")
+                return False
 
-                success, wait_error = await snapshot_manager.wait_for_snapshot_ready(
-                    snapshot=snapshot, db=db
-                )
+            success, wait_error = await snapshot_manager.wait_for_snapshots_ready(
+                snapshots=snapshots, db=db
+            )
 
-                if not success:
-                    logger.error(
-                        f"[K8S:HIBERNATE] ❌ Snapshot for PVC {pvc_name} did not become ready: {wait_error}"
-                    )
-                    return False
+            if not success:
+                logger.error(f"[K8S:HIBERNATE] ❌ Snapshots did not become ready: {wait_error}")
+                return False
 
+            for snapshot in snapshots:
                 logger.info(
-                    f"[K8S:HIBERNATE] ✅ VolumeSnapshot ready for PVC {pvc_name}: {snapshot.snapshot_name}"
+                    f"[K8S:HIBERNATE] ✅ VolumeSnapshot ready for PVC {snapshot.pvc_name}: "
+                    f"{snapshot.snapshot_name} (timings: {snapshot.phase_timings})"
                 )
 
             return True
@@ -1314,49 +1361,48 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
         try:
             snapshot_manager = get_snapshot_manager()
 
-            restored_project_storage = False
+            to_restore = await snapshot_manager.get_latest_ready_snapshots_by_pvc(
+                project_id=project_id,
+                db=db,
+                snapshot_type="hibernation",
+            )
 
-            if await snapshot_manager.has_existing_snapshot(
-                project_id, db, pvc_name="project-storage", snapshot_type="hibernation"
-            ):
-                restored_project_storage, error = await snapshot_manager.restore_from_snapshot(
-                    project_id=project_id,
-                    user_id=user_id,
-                    db=db,
-                    pvc_name="project-storage",
+            # project-storage restores from its latest ready snapshot of any
+            # type (a manual save may be newer than the last hibernation).
+            if "project-storage" in to_restore:
+                latest = await snapshot_manager.get_latest_ready_snapshot(
+                    project_id=project_id, db=db, pvc_name="project-storage"
                 )
-                if not restored_project_storage:
-                    logger.error(
-                        f"[K8S:RESTORE] ❌ Failed to restore project-storage from snapshot: {error}"
-                    )
+                if latest:
+                    to_restore["project-storage"] = latest
             else:
                 logger.warning(f"[K8S:RESTORE] No project-storage snapshot found for {project_id}")
 
-            service_snapshots = await snapshot_manager.get_latest_ready_snapshots_by_pvc(
+            # Restore every PVC in parallel.
+            results = await snapshot_manager.restore_from_snapshots(
                 project_id=project_id,
+                user_id=user_id,
                 db=db,
-                snapshot_type="hibernation",
+                snapshots=to_restore,
             )
 
-            for pvc_name, snapshot in service_snapshots.items():
+            restored_project_storage = False
+            for pvc_name, (success, error) in results.items():
                 if pvc_name == "project-storage":
-                    continue
-                success, error = await snapshot_manager.restore_from_snapshot(
-                    project_id=project_id,
-                    user_id=user_id,
-                    db=db,
-                    snapshot_id=snapshot.id,
-                    pvc_name=pvc_name,
-                )
-                if not success:
+                    restored_project_storage = success
+                    if not success:
+                        logger.error(
+                            f"[K8S:RESTORE] ❌ Failed to restore project-storage from snapshot: {error}"
+                        )
+                elif success:
+                    logger.info(
+                        f"[K8S:RESTORE] ✅ Restored service PVC {pvc_name} from snapshot "
+                        f"{to_restore[pvc_name].snapshot_name}"
+                    )
+                else:
                     logger.error(
                         f"[K8S:RESTORE] ❌ Failed to restore service PVC {pvc_name}: {error}"
                     )
-                    return restored_project_storage
-
-                logger.info(
-                    f"[K8S:RESTORE] ✅ Restored service PVC {pvc_name} from snapshot {snapshot.snapshot_name}"
-                )
 
             if restored_project_storage:
                 logger.info("[K8S:RESTORE] ✅ PVCs restored from snapshot (lazy loading active)")
@@ -1412,6 +1458,10 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
 
         return str(normalized)
 
+    @staticmethod
+    def _file_cache_key(volume_id: str, vol_path: str) -> str:
+        return f"{volume_id}:{vol_path}"
+
     async def read_file(
         self,
         user_id: UUID,
@@ -1431,11 +1481,20 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
             volume_id, cache_node = await self._get_project_volume_info(project_id)
 
         vol_path = self._build_volume_path(file_path, subdir)
-        try:
-            return await self._fileops_call(
-                volume_id,
-                lambda c, vid=volume_id, vp=vol_path: c.read_file_text(vid, vp),
+
+        async def _read(c):
+            # StatPath is cheap next to moving the content, and validates
+            # the cached copy.
+            info = await c.stat_path(volume_id, vol_path)
+            return await self._read_through_cache(
+                project_id,
+                self._file_cache_key(volume_id, vol_path),
+                None if info.is_dir else _stat_stamp(info),
+                lambda: c.read_file_text(volume_id, vol_path),
             )
+
+        try:
+            return await self._fileops_call(volume_id, _read)
         except grpc.aio.AioRpcError as e:
             if e.code() == grpc.StatusCode.NOT_FOUND:
                 return None
@@ -1472,6 +1531,8 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
                 volume_id,
                 lambda c, vid=volume_id, vp=vol_path, ct=content: c.write_file_text(vid, vp, ct),
             )
+            self._invalidate_cached_file(project_id, self._file_cache_key(volume_id, vol_path))
+            self._publish_file_change(project_id, file_path, subdir)
             return True
         except Exception as e:
             logger.error(f"[K8S] FileOps write_file error: {e}")
@@ -1496,6 +1557,8 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
                 volume_id,
                 lambda c, vid=volume_id, vp=vol_path, d=data: c.write_file(vid, vp, d),
             )
+            self._invalidate_cached_file(project_id, self._file_cache_key(volume_id, vol_path))
+            self._publish_file_change(project_id, file_path)
             return True
         except Exception as e:
             logger.error(f"[K8S] FileOps write_binary error: {e}")
@@ -1523,6 +1586,8 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
                 volume_id,
                 lambda c, vid=volume_id, vp=vol_path: c.delete_path(vid, vp),
             )
+            self._invalidate_cached_file(project_id, self._file_cache_key(volume_id, vol_path))
+            self._publish_file_change(project_id, file_path, deleted=True)
             return True
         except grpc.aio.AioRpcError as e:
             if e.code() == grpc.StatusCode.NOT_FOUND:
@@ -1672,32 +1737,211 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
         volume_id: str | None = None,
         cache_node: str | None = None,
     ) -> tuple[list[dict[str, Any]], list[str]]:
-        """Batch-read multiple files via FileOps ReadFiles RPC."""
+        """Batch-read multiple files via the FileOps ReadFilesStream RPC."""
         _ = user_id, container_name
 
         if volume_id is None:
             volume_id, cache_node = await self._get_project_volume_info(project_id)
 
         vol_paths = [self._build_volume_path(p, subdir) for p in paths]
-        # Map volume paths back to original caller paths for the response.
-        vol_to_orig = dict(zip(vol_paths, paths, strict=True))
-        try:
-            file_contents, rpc_errors = await self._fileops_call(
-                volume_id,
-                lambda c, vid=volume_id, vp=vol_paths: c.read_files(vid, vp, max_file_size=100_000),
-            )
-            files = [
-                {"path": vol_to_orig.get(fc.path, fc.path), "content": fc.data, "size": fc.size}
-                for fc in file_contents
-            ]
-            errors = [vol_to_orig.get(e, e) for e in rpc_errors]
+
+        max_file_size = 100_000
+        cache = get_file_content_cache()
+        scope = str(project_id)
+
+        async def _read(c):
+            # Stat every path in one call (no content moves), serve unchanged
+            # files from the content cache and stream only the rest.
+            infos = await c.stat_paths(volume_id, vol_paths)
+            contents: dict[str, tuple[str, int]] = {}
+            stamps: dict[str, Stamp] = {}
+            for vp in vol_paths:
+                info = infos.get(vp)
+                if info is None or info.is_dir:
+                    continue  # the read below reports it
+                stamp = _stat_stamp(info)
+                if stamp is None:
+                    continue
+                if info.size <= max_file_size:
+                    cached = cache.get(scope, self._file_cache_key(volume_id, vp), stamp)
+                    if cached is not None:
+                        contents[vp] = (cached, info.size)
+                        continue
+                stamps[vp] = stamp
+
+            # Blobs are matched by path; a path asked for twice is read once.
+            misses = list(dict.fromkeys(vp for vp in vol_paths if vp not in contents))
+            failed: set[str] = set()
+            if misses:
+                async for blob in c.iter_files(volume_id, misses, max_file_size=max_file_size):
+                    if blob.error is not None:
+                        failed.add(blob.path)
+                        continue
+                    try:
+                        text = blob.data.decode("utf-8")
+                    except UnicodeDecodeError:
+                        # Lossy text is returned but never cached: read_file
+                        # treats undecodable files as unreadable.
+                        text = blob.data.decode("utf-8", errors="replace")
+                    else:
+                        stamp = stamps.get(blob.path)
+                        if stamp is not None:
+                            key = self._file_cache_key(volume_id, blob.path)
+                            cache.put(scope, key, stamp, text)
+                    contents[blob.path] = (text, blob.size)
+
+            files: list[dict[str, Any]] = []
+            errors: list[str] = []
+            for vp, orig in zip(vol_paths, paths, strict=True):
+                if vp in contents and vp not in failed:
+                    text, size = contents[vp]
+                    files.append({"path": orig, "content": text, "size": size})
+                else:
+                    errors.append(orig)
             return files, errors
+
+        try:
+            return await self._fileops_call(volume_id, _read)
         except (VolumeRestoringError, VolumeUnavailableError):
             raise
         except Exception as e:
             logger.error(f"[K8S] FileOps read_files_batch error: {e}")
             return [], list(paths)
 
+    async def read_files_stream(
+        self,
+        user_id: UUID,
+        project_id: UUID,
+        container_name: str,
+        paths: list[str],
+        budget: ReadBudget,
+        subdir: str | None = None,
+        # Volume routing hints
+        volume_id: str | None = None,
+        cache_node: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream files via ReadFilesStream with the budget enforced on the node.
+
+        Paths are sent in chunks, each one FileOps call with the usual
+        recovery. Within a chunk, unchanged files that fit the per-file
+        budget come from the content cache; the rest are streamed with the
+        per-file cap, extension filter and the remaining total budget pushed
+        down, so truncated and skipped files never leave the node.
+        """
+        _ = user_id, container_name
+
+        if volume_id is None:
+            volume_id, cache_node = await self._get_project_volume_info(project_id)
+
+        cache = get_file_content_cache()
+        scope = str(project_id)
+
+        async def _read_chunk(c, chunk: list[str], spent: int):
+            vol_paths = {
+                p: self._build_volume_path(p, subdir) for p in chunk if not budget.skips(p)
+            }
+            infos = await c.stat_paths(volume_id, list(vol_paths.values()))
+            hits: dict[str, str] = {}
+            stamps: dict[str, Stamp] = {}
+            for p, vp in vol_paths.items():
+                info = infos.get(vp)
+                if info is None or info.is_dir:
+                    continue  # the read below reports it
+                stamp = _stat_stamp(info)
+                if stamp is None:
+                    continue
+                stamps[p] = stamp
+                if info.size <= budget.max_bytes_per_file:
+                    key = self._file_cache_key(volume_id, vol_paths[p])
+                    cached = cache.get(scope, key, stamps[p])
+                    if cached is not None:
+                        hits[p] = cached
+
+            # Blobs are matched by path (not position): a chunk can name the
+            # same file twice, or under two spellings, and it is read once.
+            blobs = c.iter_files(
+                volume_id,
+                list(dict.fromkeys(vp for p, vp in vol_paths.items() if p not in hits)),
+                max_read_bytes=budget.max_bytes_per_file,
+                max_total_bytes=budget.max_total_bytes - spent,
+                tail=budget.tail,
+                skip_extensions=budget.skip_extensions,
+            )
+            fetched: dict[str, FileBlob] = {}
+
+            async def _blob(vp: str) -> "FileBlob | None":
+                while vp not in fetched:
+                    blob = await anext(blobs, None)
+                    if blob is None:
+                        return None
+                    fetched[blob.path] = blob
+                return fetched[vp]
+
+            records: list[dict[str, Any]] = []
+            used = 0
+            try:
+                for p in chunk:
+                    if spent + used >= budget.max_total_bytes:
+                        break
+                    if budget.skips(p):
+                        records.append(skip_error(p))
+                        continue
+                    if p in hits:
+                        size = len(hits[p].encode("utf-8"))
+                        limit = budget.limit(size, spent + used)
+                        text, nbytes, truncated = clip_text(hits[p], limit, budget.tail)
+                        used += nbytes
+                        records.append(file_record(p, text, size, truncated))
+                        continue
+
+                    blob = await _blob(vol_paths[p])
+                    if blob is None:
+                        break  # the node stopped: total budget spent
+                    if blob.error is not None:
+                        records.append({"path": p, "error": blob.error})
+                        continue
+                    data = blob.data
+                    # Cache hits earlier in the chunk were not counted on the node.
+                    limit = budget.max_total_bytes - spent - used
+                    if len(data) > limit:
+                        data = data[-limit:] if budget.tail else data[:limit]
+                    truncated = len(data) < blob.size
+                    if not truncated and p in stamps:
+                        try:
+                            text = data.decode("utf-8")
+                        except UnicodeDecodeError:
+                            text = data.decode("utf-8", errors="replace")
+                        else:
+                            key = self._file_cache_key(volume_id, vol_paths[p])
+                            cache.put(scope, key, stamps[p], text)
+                    else:
+                        text = decode_range(data, truncated=truncated, tail=budget.tail)
+                    used += len(data)
+                    records.append(file_record(p, text, blob.size, truncated))
+            finally:
+                # Cancels the stream if the budget ran out mid-chunk.
+                await blobs.aclose()
+            return records, used
+
+        spent = 0
+        for start in range(0, len(paths), _STREAM_READ_CHUNK):
+            if spent >= budget.max_total_bytes:
+                return
+            chunk = paths[start : start + _STREAM_READ_CHUNK]
+            try:
+                records, used = await self._fileops_call(volume_id, _read_chunk, chunk, spent)
+            except (VolumeRestoringError, VolumeUnavailableError):
+                raise
+            except Exception as e:
+                logger.error(f"[K8S] FileOps read_files_stream error: {e}")
+                for p in chunk:
+                    yield {"path": p, "error": "read failed"}
+                continue
+            spent += used
+            for record in records:
+                yield record
+
     # =========================================================================
     # SHELL OPERATIONS
     # =========================================================================
@@ -1756,6 +2000,10 @@ find /app -maxdepth 2 -name 'package.json' 2>/dev/null | head -1
         except Exception as e:
             logger.error(f"[K8S] Error executing command: {e}")
             raise
+        finally:
+            self._mark_tree_dirty(project_id)
+            # No watcher on project volumes: tell editors to re-sync the tree.
+            get_file_change_notifier().record_rescan(project_id)
 
     async def is_container_ready(
         self, user_id: UUID, project_id: UUID, container_name: str
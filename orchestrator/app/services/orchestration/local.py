@@ -29,6 +29,7 @@ import contextlib
 import logging
 import os
 import signal
+import stat
 import tempfile
 import time
 import uuid
@@ -41,6 +42,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import BaseOrchestrator
 from .deployment_mode import DeploymentMode
+from .read_budget import ReadBudget, stream_from_disk
 
 logger = logging.getLogger(__name__)
 
@@ -629,6 +631,10 @@ class LocalOrchestrator(BaseOrchestrator):
         """
         return _get_project_root()
 
+    async def get_watch_root(self, project_id: UUID) -> Path | None:
+        """The project's on-disk root (see :meth:`_resolve_project_root`)."""
+        return await self._resolve_project_root(project_id)
+
     async def _resolve_project_root(
         self,
         project_id: UUID | None,
@@ -1025,24 +1031,33 @@ class LocalOrchestrator(BaseOrchestrator):
             logger.warning("[LOCAL] read_file refused: %s", exc)
             return None
 
-        if not target.exists() or not target.is_file():
+        try:
+            st = target.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
             return None
 
-        try:
-            return target.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            logger.warning(
-                "[LOCAL] read_file utf-8 decode failed for %s; retrying as latin-1",
-                target,
-            )
+        async def _load() -> str | None:
             try:
-                return target.read_text(encoding="latin-1")
+                return target.read_text(encoding="utf-8")
+            except UnicodeDecodeError:
+                logger.warning(
+                    "[LOCAL] read_file utf-8 decode failed for %s; retrying as latin-1",
+                    target,
+                )
+                try:
+                    return target.read_text(encoding="latin-1")
+                except OSError as exc:
+                    logger.error("[LOCAL] read_file failed: %s", exc)
+                    return None
             except OSError as exc:
                 logger.error("[LOCAL] read_file failed: %s", exc)
                 return None
-        except OSError as exc:
-            logger.error("[LOCAL] read_file failed: %s", exc)
-            return None
+
+        return await self._read_through_cache(
+            project_id, str(target), (st.st_mtime_ns, st.st_size), _load
+        )
 
     async def write_file(
         self,
@@ -1127,6 +1142,8 @@ class LocalOrchestrator(BaseOrchestrator):
 
             os.replace(tmp_path, str(target))
             tmp_path = None  # Ownership handed off.
+            self._invalidate_cached_file(project_id, str(target))
+            self._publish_file_change(project_id, file_path, subdir)
             logger.debug("[LOCAL] Wrote file %s (%d bytes)", target, len(content))
             return True
         except OSError as exc:
@@ -1166,6 +1183,8 @@ class LocalOrchestrator(BaseOrchestrator):
 
         try:
             os.remove(target)
+            self._invalidate_cached_file(project_id, str(target))
+            self._publish_file_change(project_id, file_path, deleted=True)
             logger.debug("[LOCAL] Deleted file %s", target)
             return True
         except OSError as exc:
@@ -1460,6 +1479,22 @@ class LocalOrchestrator(BaseOrchestrator):
             await _read_one(p)
         return files, errors
 
+    async def read_files_stream(
+        self,
+        user_id: UUID,
+        project_id: UUID,
+        container_name: str,
+        paths: list[str],
+        budget: ReadBudget,
+        subdir: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream files from the project root, reading only what ``budget`` allows."""
+        root = await self._resolve_project_root(project_id, None)
+        async for record in stream_from_disk(
+            paths, budget, lambda p: _safe_resolve(root, p, subdir)
+        ):
+            yield record
+
     # =========================================================================
     # SHELL OPERATIONS
     # =========================================================================
@@ -1533,6 +1568,8 @@ class LocalOrchestrator(BaseOrchestrator):
         except Exception as exc:
             await self._terminate_process_group(process)
             raise RuntimeError(f"[LOCAL] Command execution failed: {exc}") from exc
+        finally:
+            self._mark_tree_dirty(project_id)
 
         out = (stdout or b"").decode("utf-8", errors="replace")
         err = (stderr or b"").decode("utf-8", errors="replace")
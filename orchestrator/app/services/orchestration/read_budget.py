@@ -0,0 +1,147 @@
+"""
+Byte budgets for streamed batch reads.
+
+``BaseOrchestrator.read_files_stream`` takes a ``ReadBudget`` and enforces it
+where the bytes are read — on disk for the local and docker backends, on the
+FileOps node for Kubernetes — so a glob over large files moves only the
+bytes that will be returned instead of whole files that are then cut down.
+
+The helpers here are shared by the backends: ``stream_from_disk`` runs the
+whole loop for backends with the project on a local filesystem,
+``read_range`` reads the head or tail of a file without loading the rest,
+``clip_text`` applies the same
+limit to content that is already in memory (content cache hits, the
+generic fallback), and ``decode_range`` turns a cut byte range back into
+text without a replacement character where the cut split a UTF-8 sequence.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class ReadBudget:
+    """Limits for one ``read_files_stream`` call."""
+
+    max_bytes_per_file: int
+    max_total_bytes: int
+    # Keep the end of truncated files (logs) instead of the beginning.
+    tail: bool = False
+    # Lowercase extensions including the dot, e.g. ``".png"``.
+    skip_extensions: frozenset[str] = field(default_factory=frozenset)
+
+    def skips(self, path: str) -> bool:
+        """Whether ``path`` is excluded by its extension without being read."""
+        if not self.skip_extensions:
+            return False
+        name = path.rsplit("/", 1)[-1]
+        dot = name.rfind(".")
+        return dot != -1 and name[dot:].lower() in self.skip_extensions
+
+    def limit(self, size: int, spent: int) -> int:
+        """Bytes of a ``size``-byte file that may be read after ``spent`` bytes."""
+        return max(0, min(size, self.max_bytes_per_file, self.max_total_bytes - spent))
+
+
+def skip_error(path: str) -> dict[str, str]:
+    return {"path": path, "error": "binary file extension"}
+
+
+def read_range(path: Path, limit: int, tail: bool) -> tuple[bytes, int]:
+    """
+    Read at most ``limit`` bytes of ``path`` (the last ones when ``tail``).
+
+    Returns ``(data, size)`` where ``size`` is the file size at open time.
+    Blocking; run it in a worker thread.
+    """
+    if not stat.S_ISREG(os.stat(path).st_mode):
+        raise IsADirectoryError(f"not a regular file: {path}")
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if tail and size > limit:
+            f.seek(size - limit)
+        return f.read(limit), size
+
+
+def _trim_partial_utf8(data: bytes, cut_start: bool, cut_end: bool) -> bytes:
+    if cut_start:
+        # Skip continuation bytes of a sequence that started before the cut.
+        skip = 0
+        while skip < min(3, len(data)) and data[skip] & 0xC0 == 0x80:
+            skip += 1
+        data = data[skip:]
+    if cut_end:
+        # Drop a lead byte (and its continuations) whose sequence was cut off.
+        for back in range(1, min(4, len(data)) + 1):
+            byte = data[-back]
+            if byte & 0xC0 == 0x80:
+                continue
+            if byte >= 0xC0:
+                need = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+                if need > back:
+                    data = data[:-back]
+            break
+    return data
+
+
+def decode_range(data: bytes, *, truncated: bool, tail: bool) -> str:
+    """Decode a (possibly cut) byte range of a text file."""
+    if truncated:
+        data = _trim_partial_utf8(data, cut_start=tail, cut_end=not tail)
+    return data.decode("utf-8", errors="replace")
+
+
+def clip_text(text: str, limit: int, tail: bool) -> tuple[str, int, bool]:
+    """
+    Apply a byte ``limit`` to in-memory ``text``.
+
+    Returns ``(text, byte_length, truncated)``.
+    """
+    encoded = text.encode("utf-8", errors="replace")
+    if len(encoded) <= limit:
+        return text, len(encoded), False
+    cut = encoded[-limit:] if tail and limit else encoded[:limit]
+    clipped = decode_range(cut, truncated=True, tail=tail)
+    return clipped, len(clipped.encode("utf-8", errors="replace")), True
+
+
+def file_record(path: str, content: str, size: int, truncated: bool) -> dict[str, object]:
+    """The shape ``read_files_stream`` yields for a file that was read."""
+    return {"path": path, "content": content, "size": size, "truncated": truncated}
+
+
+async def stream_from_disk(
+    paths: list[str], budget: ReadBudget, resolve: Callable[[str], Path]
+) -> AsyncIterator[dict[str, object]]:
+    """
+    ``read_files_stream`` for a project on a local filesystem.
+
+    ``resolve`` maps a project-relative path to a file on disk and raises
+    (``ValueError``/``PermissionError``) for paths outside the project.
+    """
+    spent = 0
+    for path in paths:
+        remaining = budget.max_total_bytes - spent
+        if remaining <= 0:
+            return
+        if budget.skips(path):
+            yield skip_error(path)
+            continue
+        try:
+            target = resolve(path)
+            limit = min(budget.max_bytes_per_file, remaining)
+            data, size = await asyncio.to_thread(read_range, target, limit, budget.tail)
+        except (OSError, ValueError) as exc:
+            yield {"path": path, "error": str(exc) or "read failed"}
+            continue
+        truncated = len(data) < size
+        spent += len(data)
+        yield file_record(
+            path, decode_range(data, truncated=truncated, tail=budget.tail), size, truncated
+        )
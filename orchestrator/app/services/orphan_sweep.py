@@ -0,0 +1,525 @@
+"""
+Orphan sweep — one reconciliation pass over everything the backend reaps.
+
+Replaces the separate per-kind scans of the compute reaper loop
+(``ComputeManager.reap_orphaned_pods`` then ``reap_orphaned_pvcs``, which
+listed the compute pool twice) and folds in the stuck-namespace scan of
+:class:`NamespaceReaper` (which used to run as its own CronJob and is now
+only a manual entry point) with a single cycle:
+
+  1. List each resource kind exactly once, narrowed by label selector:
+     tier-1 pods, compute-pool PVCs, tier-1 PVs, backend-managed namespaces.
+  2. Read one DB snapshot (the set of volume ids still owned by a project).
+  3. Decide every reap in memory — see :func:`plan_sweep`.
+  4. Issue the deletes with bounded concurrency.  Deletes carry a UID
+     precondition so an object recreated under the same name after the
+     list (e.g. a PVC re-ensured by a new compute pod) is never removed.
+
+Per-kind counts and durations are returned as a :class:`SweepResult` and
+mirrored into the distributed cache for ``GET /api/admin/metrics/orphan-sweep``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from kubernetes import client as k8s_client
+from kubernetes.client.rest import ApiException
+
+from .compute_manager import _TIER1_LABEL_SELECTOR
+from .namespace_reaper import is_stuck_project_namespace
+
+logger = logging.getLogger(__name__)
+
+METRICS_CACHE_KEY = "orphan_sweep_metrics"
+METRICS_CACHE_TTL = 3600
+
+_PROJECT_NAMESPACE_SELECTOR = "managed-by=tesslate-backend"
+_COMPUTE_PVC_PREFIX = "vol-pvc-"
+_ACTIVE_POD_PHASES = ("Running", "Pending")
+
+KINDS = ("pods", "pvcs", "pvs", "namespaces")
+
+
+@dataclass(slots=True)
+class KindStats:
+    """Outcome of one resource kind within a sweep."""
+
+    listed: int = 0
+    reaped: int = 0
+    failed: int = 0
+    duration_ms: int = 0
+
+
+@dataclass
+class SweepResult:
+    """Outcome of a single sweep: per-kind stats plus cycle totals."""
+
+    kinds: dict[str, KindStats] = field(default_factory=lambda: {k: KindStats() for k in KINDS})
+    namespace_pods_deleted: int = 0
+    duration_ms: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def reaped(self, kind: str) -> int:
+        return self.kinds[kind].reaped
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "kinds": {kind: asdict(stats) for kind, stats in self.kinds.items()},
+            "namespace_pods_deleted": self.namespace_pods_deleted,
+            "duration_ms": self.duration_ms,
+            "errors": list(self.errors),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Reap:
+    """One planned delete. ``uid`` is the listed object's UID (precondition)."""
+
+    name: str
+    uid: str | None
+    age_seconds: float = 0.0
+    pv_name: str | None = None  # PVCs only: backing PV to delete afterwards
+    pv_uid: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SweepPlan:
+    """Every reap decision of one cycle, computed from a single listing."""
+
+    pods: list[Reap] = field(default_factory=list)
+    pvcs: list[Reap] = field(default_factory=list)
+    pvs: list[Reap] = field(default_factory=list)
+    namespaces: list[k8s_client.V1Namespace] = field(default_factory=list)
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+_sweep_metrics: dict[str, Any] = {
+    "cycles": 0,
+    "reaped": dict.fromkeys(KINDS, 0),
+    "failed": dict.fromkeys(KINDS, 0),
+    "last": None,
+}
+
+
+def get_sweep_metrics() -> dict[str, Any]:
+    """Get cumulative sweep counters and the last cycle's per-kind stats."""
+    return {
+        "cycles": _sweep_metrics["cycles"],
+        "reaped": dict(_sweep_metrics["reaped"]),
+        "failed": dict(_sweep_metrics["failed"]),
+        "last": _sweep_metrics["last"],
+    }
+
+
+def reset_sweep_metrics() -> None:
+    """Reset sweep metrics (useful for testing)."""
+    global _sweep_metrics
+    _sweep_metrics = {
+        "cycles": 0,
+        "reaped": dict.fromkeys(KINDS, 0),
+        "failed": dict.fromkeys(KINDS, 0),
+        "last": None,
+    }
+
+
+def _record(result: SweepResult) -> None:
+    _sweep_metrics["cycles"] += 1
+    for kind, stats in result.kinds.items():
+        _sweep_metrics["reaped"][kind] += stats.reaped
+        _sweep_metrics["failed"][kind] += stats.failed
+    _sweep_metrics["last"] = result.as_dict()
+
+
+async def _publish_metrics() -> None:
+    """Mirror counters into the distributed cache for the admin endpoint."""
+    from .cache_service import cache
+
+    try:
+        await cache.set(METRICS_CACHE_KEY, get_sweep_metrics(), ttl=METRICS_CACHE_TTL)
+    except Exception:
+        logger.debug("[SWEEP] Failed to publish metrics", exc_info=True)
+
+
+# =============================================================================
+# Decisions
+# =============================================================================
+
+
+def _age(obj, now: datetime) -> float | None:
+    creation = obj.metadata.creation_timestamp
+    if creation is None:
+        return None
+    return (now - creation).total_seconds()
+
+
+def plan_sweep(
+    *,
+    pods: list | None,
+    pvcs: list | None,
+    pvs: list | None,
+    namespaces: list | None,
+    live_volume_ids: set[str] | None,
+    now: datetime,
+    pod_max_age_seconds: int,
+    pvc_grace_seconds: int,
+) -> SweepPlan:
+    """Decide every reap of a cycle in memory.
+
+    A kind whose listing failed is passed as ``None`` and nothing that
+    depends on it is reaped (PVCs need the pod list; PVs need the PVC list).
+
+    - pods:       tier-1 pods older than ``pod_max_age_seconds``
+    - pvcs:       compute-pool PVCs no surviving Running/Pending pod mounts,
+                  past ``pvc_grace_seconds`` — or immediately when the DB
+                  snapshot shows no project owns the volume any more
+    - pvs:        Released tier-1 PVs whose claim is gone (left behind when
+                  a PVC was deleted outside this sweep)
+    - namespaces: proj-* namespaces stuck in Terminating
+    """
+    plan = SweepPlan()
+
+    doomed_pods: set[str] = set()
+    if pods is not None:
+        for pod in pods:
+            age = _age(pod, now)
+            if age is not None and age > pod_max_age_seconds:
+                plan.pods.append(Reap(pod.metadata.name, pod.metadata.uid, age))
+                doomed_pods.add(pod.metadata.name)
+
+    pv_uids = {pv.metadata.name: pv.metadata.uid for pv in pvs or []}
+    # PVs still bound to a listed PVC (or deleted together with it below).
+    claimed_pvs = {pvc.spec.volume_name for pvc in pvcs or [] if pvc.spec and pvc.spec.volume_name}
+
+    if pods is not None and pvcs is not None:
+        # Pods reaped this cycle no longer hold their claims.
+        active_claims: set[str] = set()
+        for pod in pods:
+            if pod.metadata.name in doomed_pods:
+                continue
+            phase = (pod.status.phase or "") if pod.status else ""
+            if phase in _ACTIVE_POD_PHASES:
+                for volume in pod.spec.volumes or []:
+                    if volume.persistent_volume_claim:
+                        active_claims.add(volume.persistent_volume_claim.claim_name)
+
+        for pvc in pvcs:
+            name = pvc.metadata.name
+            pv_name = (pvc.spec.volume_name or "") if pvc.spec else ""
+            age = _age(pvc, now)
+            disowned = (
+                live_volume_ids is not None
+                and name.startswith(_COMPUTE_PVC_PREFIX)
+                and name.removeprefix(_COMPUTE_PVC_PREFIX) not in live_volume_ids
+            )
+            if name in active_claims or age is None or (age < pvc_grace_seconds and not disowned):
+                continue
+            plan.pvcs.append(
+                Reap(
+                    name,
+                    pvc.metadata.uid,
+                    age,
+                    pv_name=pv_name or None,
+                    pv_uid=pv_uids.get(pv_name),
+                )
+            )
+
+    if pvs is not None and pvcs is not None:
+        for pv in pvs:
+            name = pv.metadata.name
+            phase = (pv.status.phase or "") if pv.status else ""
+            if phase == "Released" and name not in claimed_pvs:
+                plan.pvs.append(Reap(name, pv.metadata.uid, _age(pv, now) or 0.0))
+
+    if namespaces is not None:
+        plan.namespaces.extend(ns for ns in namespaces if is_stuck_project_namespace(ns))
+
+    return plan
+
+
+# =============================================================================
+# Sweep
+# =============================================================================
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+def _delete_options(uid: str | None, *, force: bool = False) -> k8s_client.V1DeleteOptions:
+    return k8s_client.V1DeleteOptions(
+        grace_period_seconds=0 if force else None,
+        preconditions=k8s_client.V1Preconditions(uid=uid) if uid else None,
+    )
+
+
+class OrphanSweep:
+    """List-once, decide-in-memory, bounded-delete reaper for the backend."""
+
+    def __init__(
+        self,
+        core_v1: k8s_client.CoreV1Api | None = None,
+        *,
+        concurrency: int | None = None,
+    ) -> None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        self._v1 = core_v1
+        self._namespace = settings.compute_pool_namespace
+        self._concurrency = max(1, concurrency or settings.orphan_sweep_concurrency)
+
+    def _api(self) -> k8s_client.CoreV1Api:
+        if self._v1 is None:
+            from .k8s_auth import load_in_cluster_or_kube
+
+            load_in_cluster_or_kube()
+            self._v1 = k8s_client.CoreV1Api()
+        return self._v1
+
+    async def run(
+        self,
+        *,
+        pod_max_age_seconds: int,
+        pvc_grace_seconds: int,
+        include_namespaces: bool = True,
+        now: datetime | None = None,
+    ) -> SweepResult:
+        """Run one sweep and return per-kind counts and durations."""
+        started = time.monotonic()
+        result = SweepResult()
+        v1 = self._api()
+        ns = self._namespace
+
+        listings = await asyncio.gather(
+            self._list(
+                result, "pods", v1.list_namespaced_pod, ns, label_selector=_TIER1_LABEL_SELECTOR
+            ),
+            self._list(result, "pvcs", v1.list_namespaced_persistent_volume_claim, ns),
+            self._list(
+                result, "pvs", v1.list_persistent_volume, label_selector=_TIER1_LABEL_SELECTOR
+            ),
+            self._list(
+                result,
+                "namespaces",
+                v1.list_namespace,
+                label_selector=_PROJECT_NAMESPACE_SELECTOR,
+            )
+            if include_namespaces
+            else _none(),
+        )
+        pods, pvcs, pvs, namespaces = listings
+
+        # DB snapshot after the listing: any PVC we saw whose project existed
+        # at list time is guaranteed to show up as owned.
+        live_volume_ids = await self._load_live_volume_ids(result) if pvcs else None
+
+        plan = plan_sweep(
+            pods=pods,
+            pvcs=pvcs,
+            pvs=pvs,
+            namespaces=namespaces,
+            live_volume_ids=live_volume_ids,
+            now=now or datetime.now(UTC),
+            pod_max_age_seconds=pod_max_age_seconds,
+            pvc_grace_seconds=pvc_grace_seconds,
+        )
+
+        sem = asyncio.Semaphore(self._concurrency)
+        # Pods first so their claims are released before the PVC deletes.
+        await self._apply(result, "pods", plan.pods, sem, self._delete_pod)
+        await self._apply(result, "pvcs", plan.pvcs, sem, self._delete_pvc)
+        await self._apply(result, "pvs", plan.pvs, sem, self._delete_pv)
+        await self._apply(result, "namespaces", plan.namespaces, sem, self._unstick_namespace)
+
+        result.duration_ms = _elapsed_ms(started)
+        _record(result)
+        await _publish_metrics()
+        return result
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _list(self, result: SweepResult, kind: str, fn, *args, **kwargs) -> list | None:
+        started = time.monotonic()
+        try:
+            items = (await asyncio.to_thread(fn, *args, **kwargs)).items or []
+        except ApiException as exc:
+            if exc.status == 404:
+                items = []  # Compute-pool namespace doesn't exist yet
+            else:
+                result.errors.append(f"list {kind}: {exc.reason}")
+                items = None
+        except Exception as exc:
+            result.errors.append(f"list {kind}: {exc}")
+            items = None
+        stats = result.kinds[kind]
+        stats.listed = len(items or [])
+        stats.duration_ms += _elapsed_ms(started)
+        return items
+
+    async def _load_live_volume_ids(self, result: SweepResult) -> set[str] | None:
+        """Volume ids still owned by a project, or None if the DB is unavailable."""
+        from sqlalchemy import select
+
+        from ..database import AsyncSessionLocal
+        from ..models import Project
+
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = await db.execute(
+                    select(Project.volume_id).where(Project.volume_id.isnot(None))
+                )
+                return {volume_id for (volume_id,) in rows.all()}
+        except Exception as exc:
+            # Fall back to grace-period-only decisions for PVCs.
+            result.errors.append(f"load volume ids: {exc}")
+            return None
+
+    async def _apply(self, result: SweepResult, kind: str, items: list, sem, action) -> None:
+        if not items:
+            return
+        started = time.monotonic()
+
+        async def _bounded(item) -> bool:
+            async with sem:
+                return await action(item, result)
+
+        outcomes = await asyncio.gather(*[_bounded(item) for item in items])
+        stats = result.kinds[kind]
+        stats.reaped += sum(1 for ok in outcomes if ok)
+        stats.failed += sum(1 for ok in outcomes if not ok)
+        stats.duration_ms += _elapsed_ms(started)
+
+    async def _call(self, result: SweepResult, what: str, fn, *args, **kwargs) -> bool:
+        """Run one write; 404/409 (already gone / recreated since the list) is a skip."""
+        try:
+            await asyncio.to_thread(fn, *args, **kwargs)
+            return True
+        except ApiException as exc:
+            if exc.status not in (404, 409):
+                result.errors.append(f"{what}: {exc.reason}")
+                logger.warning("[SWEEP] Failed to reap %s: %s", what, exc.reason)
+            return False
+
+    async def _delete_pod(self, reap: Reap, result: SweepResult) -> bool:
+        ok = await self._call(
+            result,
+            f"pod {reap.name}",
+            self._v1.delete_namespaced_pod,
+            reap.name,
+            self._namespace,
+            body=_delete_options(reap.uid, force=True),
+            grace_period_seconds=0,
+        )
+        if ok:
+            # PV/PVC are reusable — they are judged separately below
+            logger.warning(
+                "[SWEEP] Reaped orphaned pod %s (age: %.0fs)", reap.name, reap.age_seconds
+            )
+        return ok
+
+    async def _delete_pvc(self, reap: Reap, result: SweepResult) -> bool:
+        ok = await self._call(
+            result,
+            f"PVC {reap.name}",
+            self._v1.delete_namespaced_persistent_volume_claim,
+            reap.name,
+            self._namespace,
+            body=_delete_options(reap.uid),
+        )
+        if not ok:
+            return False
+        logger.warning("[SWEEP] Reaped orphaned PVC %s (age: %.0fs)", reap.name, reap.age_seconds)
+        if reap.pv_name and await self._call(
+            result,
+            f"PV {reap.pv_name}",
+            self._v1.delete_persistent_volume,
+            reap.pv_name,
+            body=_delete_options(reap.pv_uid),
+        ):
+            logger.warning("[SWEEP] Deleted orphaned PV %s", reap.pv_name)
+        return True
+
+    async def _delete_pv(self, reap: Reap, result: SweepResult) -> bool:
+        ok = await self._call(
+            result,
+            f"PV {reap.name}",
+            self._v1.delete_persistent_volume,
+            reap.name,
+            body=_delete_options(reap.uid),
+        )
+        if ok:
+            logger.warning("[SWEEP] Deleted released PV %s", reap.name)
+        return ok
+
+    async def _unstick_namespace(self, ns: k8s_client.V1Namespace, result: SweepResult) -> bool:
+        """Force-delete remaining pods, then strip namespace finalizers.
+
+        Same 2-stage escalation as :class:`NamespaceReaper`; PVC finalizers
+        are left alone for the reasons documented there.
+        """
+        name = ns.metadata.name
+        try:
+            pods = (await asyncio.to_thread(self._v1.list_namespaced_pod, name)).items or []
+        except ApiException as exc:
+            if exc.status == 404:
+                return False
+            result.errors.append(f"list pods in {name}: {exc.reason}")
+            pods = []
+
+        deleted = await asyncio.gather(
+            *[
+                self._call(
+                    result,
+                    f"pod {pod.metadata.name} in {name}",
+                    self._v1.delete_namespaced_pod,
+                    pod.metadata.name,
+                    name,
+                    body=_delete_options(None, force=True),
+                    grace_period_seconds=0,
+                )
+                for pod in pods
+            ]
+        )
+        result.namespace_pods_deleted += sum(1 for ok in deleted if ok)
+
+        if not (ns.spec and ns.spec.finalizers):
+            return True
+        ok = await self._call(
+            result,
+            f"finalizers of namespace {name}",
+            self._v1.replace_namespace_finalize,
+            name,
+            k8s_client.V1Namespace(
+                metadata=k8s_client.V1ObjectMeta(name=name),
+                spec=k8s_client.V1NamespaceSpec(finalizers=[]),
+            ),
+        )
+        if ok:
+            logger.warning("[SWEEP] Stripped finalizers from stuck namespace %s", name)
+        return ok
+
+
+async def _none() -> None:
+    return None
+
+
+_orphan_sweep: OrphanSweep | None = None
+
+
+def get_orphan_sweep() -> OrphanSweep:
+    """Get or create the global OrphanSweep instance."""
+    global _orphan_sweep
+    if _orphan_sweep is None:
+        _orphan_sweep = OrphanSweep()
+    return _orphan_sweep
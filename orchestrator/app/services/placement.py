@@ -0,0 +1,283 @@
+"""
+Node-aware placement for compute pods and project volumes.
+
+Keeps a short-lived, cached view of schedulable node capacity (one node
+list + one pod list per refresh, instead of per-node reads on every
+request) and ranks candidate nodes for a placement unit by:
+
+- fit:      free CPU and memory must cover the placement budget
+- locality: the project volume is already cached on the node, so compute
+            starts without a cross-node volume transfer
+- packing:  among fitting nodes, the tighter fit wins so lightly used nodes
+            can drain and be scaled down by the autoscaler
+- spread:   nodes at the per-node environment cap are treated as full
+
+Tier-2 environment starts hand the ranked list to the Volume Hub as
+``candidate_nodes``; Tier-1 ephemeral pods get a soft node affinity to the
+top-ranked node.  Reservations are accounted locally between refreshes so
+a burst of starts does not pile onto the node that looked emptiest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Collection
+from dataclasses import dataclass
+
+from kubernetes import client as k8s_client
+
+from .compute_manager import PlacementBudget, _parse_cpu_millicores, _parse_mem_mib
+
+logger = logging.getLogger(__name__)
+
+_LOCALITY_WEIGHT = 100.0
+_PACKING_WEIGHT = 10.0
+_ENVIRONMENT_COMPONENT = "dev-container"
+
+
+@dataclass(slots=True)
+class NodeCapacity:
+    """Allocatable and requested resources for one schedulable node."""
+
+    name: str
+    cpu_allocatable: int
+    mem_allocatable_mib: int
+    cpu_requested: int = 0
+    mem_requested_mib: int = 0
+    environments: int = 0
+
+    @property
+    def free_cpu(self) -> int:
+        return max(0, self.cpu_allocatable - self.cpu_requested)
+
+    @property
+    def free_mem_mib(self) -> int:
+        return max(0, self.mem_allocatable_mib - self.mem_requested_mib)
+
+    def fits(self, budget: PlacementBudget) -> bool:
+        return budget.cpu_millicores <= self.free_cpu and budget.memory_mib <= self.free_mem_mib
+
+
+@dataclass(frozen=True, slots=True)
+class NodeScore:
+    """Ranking result for one candidate node."""
+
+    node: str
+    score: float
+    fits: bool
+    cached: bool
+
+
+def score_nodes(
+    nodes: Collection[NodeCapacity],
+    budget: PlacementBudget,
+    *,
+    cached_on: Collection[str] = (),
+    max_environments_per_node: int = 0,
+) -> list[NodeScore]:
+    """Rank nodes for a placement unit, best first.
+
+    Nodes that fit the budget (and are under the spread cap) always rank
+    ahead of nodes that do not; within each group the score orders them.
+    """
+    ranked: list[NodeScore] = []
+    for node in nodes:
+        fits = node.fits(budget) and (
+            max_environments_per_node <= 0 or node.environments < max_environments_per_node
+        )
+        cached = node.name in cached_on
+
+        score = _LOCALITY_WEIGHT if cached else 0.0
+        if fits and node.cpu_allocatable and node.mem_allocatable_mib:
+            cpu_used = (node.cpu_requested + budget.cpu_millicores) / node.cpu_allocatable
+            mem_used = (node.mem_requested_mib + budget.memory_mib) / node.mem_allocatable_mib
+            score += _PACKING_WEIGHT * (cpu_used + mem_used) / 2
+
+        ranked.append(NodeScore(node=node.name, score=score, fits=fits, cached=cached))
+
+    ranked.sort(key=lambda s: (not s.fits, -s.score, s.node))
+    return ranked
+
+
+def _pod_requests(pod) -> tuple[int, int]:
+    """Effective (cpu millicores, memory MiB) requests of a pod.
+
+    Regular containers run together (sum); init containers run one at a
+    time (max) — same rule the kube-scheduler applies.
+    """
+    cpu = mem = 0
+    for container in pod.spec.containers or []:
+        requests = (container.resources.requests or {}) if container.resources else {}
+        cpu += _parse_cpu_millicores(requests.get("cpu", "0"))
+        mem += _parse_mem_mib(requests.get("memory", "0"))
+
+    init_cpu = init_mem = 0
+    for container in pod.spec.init_containers or []:
+        requests = (container.resources.requests or {}) if container.resources else {}
+        init_cpu = max(init_cpu, _parse_cpu_millicores(requests.get("cpu", "0")))
+        init_mem = max(init_mem, _parse_mem_mib(requests.get("memory", "0")))
+
+    return max(cpu, init_cpu), max(mem, init_mem)
+
+
+class PlacementEngine:
+    """Cached node-capacity view and candidate ranking for compute placement."""
+
+    def __init__(self, ttl_seconds: float | None = None) -> None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        self._ttl = (
+            ttl_seconds if ttl_seconds is not None else settings.compute_placement_cache_ttl_seconds
+        )
+        self._max_environments = settings.compute_placement_max_environments_per_node
+        self._v1: k8s_client.CoreV1Api | None = None
+        self._nodes: dict[str, NodeCapacity] = {}
+        self._expires_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    def _api(self) -> k8s_client.CoreV1Api:
+        if self._v1 is None:
+            from .k8s_auth import load_in_cluster_or_kube
+
+            load_in_cluster_or_kube()
+            self._v1 = k8s_client.CoreV1Api()
+        return self._v1
+
+    def _snapshot_sync(self) -> dict[str, NodeCapacity]:
+        """List Ready, uncordoned nodes and their requested resources."""
+        v1 = self._api()
+        nodes: dict[str, NodeCapacity] = {}
+        for node in v1.list_node().items or []:
+            if node.spec and node.spec.unschedulable:
+                continue
+            ready = any(
+                cond.type == "Ready" and cond.status == "True"
+                for cond in node.status.conditions or []
+            )
+            if not ready:
+                continue
+            allocatable = node.status.allocatable or {}
+            nodes[node.metadata.name] = NodeCapacity(
+                name=node.metadata.name,
+                cpu_allocatable=_parse_cpu_millicores(allocatable.get("cpu", "0")),
+                mem_allocatable_mib=_parse_mem_mib(allocatable.get("memory", "0")),
+            )
+
+        pods = v1.list_pod_for_all_namespaces(
+            field_selector="status.phase!=Succeeded,status.phase!=Failed"
+        )
+        for pod in pods.items or []:
+            capacity = nodes.get(pod.spec.node_name or "")
+            if capacity is None:
+                continue
+            cpu, mem = _pod_requests(pod)
+            capacity.cpu_requested += cpu
+            capacity.mem_requested_mib += mem
+            labels = pod.metadata.labels or {}
+            if labels.get("tesslate.io/component") == _ENVIRONMENT_COMPONENT:
+                capacity.environments += 1
+
+        return nodes
+
+    async def refresh(self, force: bool = False) -> None:
+        """Refresh the node view if it is stale (or unconditionally with ``force``)."""
+        if not force and time.monotonic() < self._expires_at:
+            return
+        async with self._refresh_lock:
+            # Double-check after acquiring lock — another coroutine may have refreshed
+            if not force and time.monotonic() < self._expires_at:
+                return
+            try:
+                nodes = await asyncio.to_thread(self._snapshot_sync)
+            except Exception as e:
+                # Keep serving the previous view; retry on the next call.
+                logger.warning("[PLACEMENT] Failed to refresh node capacity: %s", e)
+                return
+            self._nodes = nodes
+            self._expires_at = time.monotonic() + self._ttl
+            logger.debug("[PLACEMENT] Refreshed capacity for %d schedulable nodes", len(nodes))
+
+    def invalidate(self) -> None:
+        """Force the next call to re-read node capacity."""
+        self._expires_at = 0.0
+
+    async def schedulable_nodes(self) -> list[str]:
+        """Names of all Ready, uncordoned nodes."""
+        await self.refresh()
+        return sorted(self._nodes)
+
+    async def rank(
+        self, budget: PlacementBudget, *, cached_on: Collection[str] = ()
+    ) -> list[NodeScore]:
+        """Rank schedulable nodes for ``budget``, best first."""
+        await self.refresh()
+        return score_nodes(
+            self._nodes.values(),
+            budget,
+            cached_on=cached_on,
+            max_environments_per_node=self._max_environments,
+        )
+
+    async def candidate_nodes(
+        self,
+        budget: PlacementBudget,
+        *,
+        cached_on: Collection[str] = (),
+        owner: str | None = None,
+        limit: int | None = None,
+    ) -> list[str]:
+        """Ranked names of nodes that fit ``budget`` (at most ``limit``).
+
+        Soft filter, like the Hub's headroom check: when nothing fits, every
+        schedulable node is returned (ranked) so pods still go Pending and
+        the cluster autoscaler sees the demand.
+
+        A schedulable ``owner`` (the node holding the volume) is always
+        among the candidates, in place of the last one if needed: the Hub
+        only skips the copy when the owner is a candidate, and applies its
+        own headroom check to it.
+        """
+        ranked = await self.rank(budget, cached_on=cached_on)
+        names = [s.node for s in ranked if s.fits]
+        if not names and ranked:
+            logger.warning(
+                "[PLACEMENT] No node fits %dm CPU / %d MiB — offering all %d nodes",
+                budget.cpu_millicores,
+                budget.memory_mib,
+                len(ranked),
+            )
+            names = [s.node for s in ranked]
+        if limit:
+            names = names[:limit]
+        if owner and owner not in names and any(s.node == owner for s in ranked):
+            names = [*names[: limit - 1], owner] if limit else [*names, owner]
+        return names
+
+    async def pick(self, budget: PlacementBudget, *, cached_on: Collection[str] = ()) -> str | None:
+        """Best node for ``budget`` (``None`` if no node is schedulable)."""
+        candidates = await self.candidate_nodes(budget, cached_on=cached_on)
+        return candidates[0] if candidates else None
+
+    def reserve(self, node_name: str, budget: PlacementBudget, *, environment: bool) -> None:
+        """Account a placement locally until the next refresh picks it up."""
+        capacity = self._nodes.get(node_name)
+        if capacity is None:
+            return
+        capacity.cpu_requested += budget.cpu_millicores
+        capacity.mem_requested_mib += budget.memory_mib
+        if environment:
+            capacity.environments += 1
+
+
+_placement_engine: PlacementEngine | None = None
+
+
+def get_placement_engine() -> PlacementEngine:
+    """Get or create the global PlacementEngine instance."""
+    global _placement_engine
+    if _placement_engine is None:
+        _placement_engine = PlacementEngine()
+    return _placement_engine
@@ -0,0 +1,459 @@
+"""
+Prewarm — predictive volume restore ahead of expected project use.
+
+The idle monitor only reacts: once a project hibernates, the Volume Hub may
+evict its cache and the next open pays the full CAS restore before any pod
+can start. This loop looks at recent usage and upcoming automations and
+queues ``VolumeManager.ensure_cached()`` on the lifecycle scheduler for the
+projects most likely to be opened soon, so the restore has already
+happened when the user arrives. Runs alongside the idle monitor under its
+distributed lock.
+
+Signals:
+- User chat messages over the last ``k8s_prewarm_history_days`` days,
+  bucketed by time of day and weighted towards recent days.
+- ``Project.last_activity`` (counts as one more sample).
+- Active cron ``automation_triggers`` whose ``next_run_at`` falls inside
+  the lookahead window (always prewarmed, budget permitting).
+
+Budget: at most ``k8s_prewarm_max_per_cycle`` restores per tick and at
+most ``k8s_prewarm_max_outstanding`` prewarmed-but-not-yet-used projects
+at any time. Each prewarm is later scored as a hit (project became active
+before the record expired) or a miss, and the counters are published to
+the distributed cache for ``GET /api/admin/metrics/prewarm``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from functools import partial
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import or_, select
+
+from ..config import get_settings
+from ..database import AsyncSessionLocal
+from ..models import Chat, Message, Project
+
+logger = logging.getLogger(__name__)
+
+CHECK_INTERVAL = 300  # seconds between prewarm cycles
+METRICS_CACHE_KEY = "env_prewarm_metrics"
+METRICS_CACHE_TTL = 3600
+
+# Weight of a day's activity halves every N days, so yesterday's session
+# counts more than one from last week.
+_RECENCY_HALF_LIFE_DAYS = 2.0
+
+# Statuses where compute is down and the volume may have left the cache.
+_COLD_STATUSES = ("hibernated", "stopped")
+
+
+@dataclass(frozen=True, slots=True)
+class PrewarmCandidate:
+    """A project the scheduler expects to be opened within the lookahead."""
+
+    project_id: UUID
+    volume_id: str
+    score: float
+    reason: str  # "history" | "automation"
+    cache_node: str | None = None  # last known node, for the scheduler's per-node cap
+
+
+@dataclass(slots=True)
+class _PrewarmRecord:
+    """An outstanding prewarm awaiting hit/miss classification."""
+
+    prewarmed_at: datetime
+    expires_at: datetime
+    reason: str
+
+
+# Outstanding prewarms, keyed by project id. Only the lock holder runs the
+# loop, so in-process state is sufficient; a leader change just loses the
+# hit/miss attribution for in-flight records.
+_outstanding: dict[UUID, _PrewarmRecord] = {}
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+_prewarm_metrics = {
+    "cycles": 0,
+    "prewarmed": 0,
+    "hits": 0,
+    "misses": 0,
+    "errors": 0,
+    "budget_skipped": 0,
+    "automation_prewarms": 0,
+    "hit_lead_seconds_total": 0.0,
+}
+
+
+def get_prewarm_metrics() -> dict[str, Any]:
+    """Get prewarm hit/miss statistics."""
+    decided = _prewarm_metrics["hits"] + _prewarm_metrics["misses"]
+    hit_rate = (_prewarm_metrics["hits"] / decided * 100) if decided > 0 else 0
+    avg_lead = (
+        _prewarm_metrics["hit_lead_seconds_total"] / _prewarm_metrics["hits"]
+        if _prewarm_metrics["hits"] > 0
+        else 0
+    )
+    return {
+        **_prewarm_metrics,
+        "outstanding": len(_outstanding),
+        "hit_rate_percent": round(hit_rate, 2),
+        "avg_hit_lead_seconds": round(avg_lead, 1),
+    }
+
+
+def reset_prewarm_metrics() -> None:
+    """Reset prewarm metrics and outstanding records (useful for testing)."""
+    global _prewarm_metrics
+    _prewarm_metrics = {
+        "cycles": 0,
+        "prewarmed": 0,
+        "hits": 0,
+        "misses": 0,
+        "errors": 0,
+        "budget_skipped": 0,
+        "automation_prewarms": 0,
+        "hit_lead_seconds_total": 0.0,
+    }
+    _outstanding.clear()
+
+
+# =============================================================================
+# Prediction
+# =============================================================================
+
+
+def _in_window(t: time, start: time, end: time) -> bool:
+    """True if time-of-day ``t`` falls in [start, end], wrapping midnight."""
+    if start <= end:
+        return start <= t <= end
+    return t >= start or t <= end
+
+
+def usage_score(
+    samples: list[datetime],
+    now: datetime,
+    lookahead: timedelta,
+    history_days: int,
+) -> float:
+    """Probability-like score that a project is used in ``[now, now + lookahead]``.
+
+    For each of the last ``history_days`` days, checks whether any sample
+    fell into the same time-of-day window on that day. Days are weighted
+    by exponential recency decay; the score is the weighted fraction of
+    days that had activity in the window (0.0 – 1.0).
+    """
+    if not samples or history_days <= 0:
+        return 0.0
+
+    start_tod = now.time()
+    end_tod = (now + lookahead).time()
+    today = now.date()
+
+    active_days: set[date] = set()
+    for ts in samples:
+        ts = ts if ts.tzinfo else ts.replace(tzinfo=UTC)
+        ts = ts.astimezone(UTC)
+        age_days = (today - ts.date()).days
+        if 1 <= age_days <= history_days and _in_window(ts.time(), start_tod, end_tod):
+            active_days.add(ts.date())
+
+    decay = math.log(2) / _RECENCY_HALF_LIFE_DAYS
+    total = 0.0
+    hit = 0.0
+    for age in range(1, history_days + 1):
+        weight = math.exp(-decay * (age - 1))
+        total += weight
+        if today - timedelta(days=age) in active_days:
+            hit += weight
+    return hit / total if total else 0.0
+
+
+def select_candidates(
+    history: dict[UUID, list[datetime]],
+    volumes: dict[UUID, str],
+    automation_projects: set[UUID],
+    now: datetime,
+    *,
+    lookahead: timedelta,
+    history_days: int,
+    min_score: float,
+    limit: int,
+    cache_nodes: dict[UUID, str | None] | None = None,
+) -> list[PrewarmCandidate]:
+    """Rank cold projects by expected use and return the top ``limit``.
+
+    Projects with an automation due inside the lookahead always rank
+    first (score 1.0). ``volumes`` restricts the candidate set to cold
+    projects that actually have a volume to restore; ``cache_nodes``
+    carries each project's ``cache_node`` hint onto its candidate.
+    """
+    if limit <= 0:
+        return []
+
+    candidates: list[PrewarmCandidate] = []
+    cache_nodes = cache_nodes or {}
+    for project_id, volume_id in volumes.items():
+        node = cache_nodes.get(project_id)
+        if project_id in automation_projects:
+            candidates.append(PrewarmCandidate(project_id, volume_id, 1.0, "automation", node))
+            continue
+        score = usage_score(history.get(project_id, []), now, lookahead, history_days)
+        if score >= min_score:
+            candidates.append(PrewarmCandidate(project_id, volume_id, score, "history", node))
+
+    candidates.sort(key=lambda c: (c.reason == "automation", c.score), reverse=True)
+    return candidates[:limit]
+
+
+# =============================================================================
+# Loop
+# =============================================================================
+
+
+async def prewarm_loop() -> None:
+    """Every 5 min, restore volumes for projects expected to open soon."""
+    logger.info("[PREWARM] Environment prewarm scheduler started")
+
+    while True:
+        try:
+            await run_prewarm_cycle()
+        except asyncio.CancelledError:
+            logger.info("[PREWARM] Prewarm scheduler cancelled")
+            raise
+        except Exception:
+            logger.exception("[PREWARM] Error in prewarm loop")
+
+        try:
+            await asyncio.sleep(CHECK_INTERVAL)
+        except asyncio.CancelledError:
+            logger.info("[PREWARM] Prewarm scheduler cancelled during sleep")
+            raise
+
+
+async def run_prewarm_cycle() -> None:
+    """One scheduler tick: score outstanding prewarms, then issue new ones."""
+    settings = get_settings()
+    if not settings.k8s_prewarm_enabled:
+        return
+
+    now = datetime.now(UTC)
+    lookahead = timedelta(minutes=settings.k8s_prewarm_lookahead_minutes)
+    _prewarm_metrics["cycles"] += 1
+
+    async with AsyncSessionLocal() as db:
+        await _score_outstanding(db, now)
+
+        budget = min(
+            settings.k8s_prewarm_max_per_cycle,
+            settings.k8s_prewarm_max_outstanding - len(_outstanding),
+        )
+
+        volumes, cache_nodes = await _load_cold_volumes(db)
+        for project_id in _outstanding:
+            volumes.pop(project_id, None)
+        if not volumes:
+            await _publish_metrics()
+            return
+
+        history = await _load_activity_history(
+            db, list(volumes), now - timedelta(days=settings.k8s_prewarm_history_days + 1)
+        )
+        automation_projects = await _load_due_automation_projects(db, now, now + lookahead)
+
+        ranked = select_candidates(
+            history,
+            volumes,
+            automation_projects,
+            now,
+            lookahead=lookahead,
+            history_days=settings.k8s_prewarm_history_days,
+            min_score=settings.k8s_prewarm_min_score,
+            limit=len(volumes),
+            cache_nodes=cache_nodes,
+        )
+        selected = ranked[: max(budget, 0)]
+        _prewarm_metrics["budget_skipped"] += len(ranked) - len(selected)
+
+        if selected:
+            _prewarm(selected, now, expires_at=now + lookahead * 2)
+
+    await _publish_metrics()
+
+
+async def _load_cold_volumes(db) -> tuple[dict[UUID, str], dict[UUID, str | None]]:
+    """Map project_id → volume_id and → cache_node for cold projects with a volume."""
+    result = await db.execute(
+        select(Project.id, Project.volume_id, Project.cache_node).where(
+            Project.environment_status.in_(_COLD_STATUSES),
+            Project.volume_id.is_not(None),
+        )
+    )
+    rows = [row for row in result.all() if row[1]]
+    return {pid: vid for pid, vid, _ in rows}, {pid: node for pid, _, node in rows}
+
+
+async def _load_activity_history(
+    db, project_ids: list[UUID], since: datetime
+) -> dict[UUID, list[datetime]]:
+    """Collect usage timestamps per project (user messages + last_activity)."""
+    history: dict[UUID, list[datetime]] = {pid: [] for pid in project_ids}
+    if not project_ids:
+        return history
+
+    msg_rows = await db.execute(
+        select(Chat.project_id, Message.created_at)
+        .join(Message, Message.chat_id == Chat.id)
+        .where(
+            Chat.project_id.in_(project_ids),
+            Message.role == "user",
+            Message.created_at >= since,
+        )
+    )
+    for project_id, created_at in msg_rows.all():
+        if created_at is not None:
+            history[project_id].append(created_at)
+
+    activity_rows = await db.execute(
+        select(Project.id, Project.last_activity).where(
+            Project.id.in_(project_ids), Project.last_activity >= since
+        )
+    )
+    for project_id, last_activity in activity_rows.all():
+        if last_activity is not None:
+            history[project_id].append(last_activity)
+
+    return history
+
+
+async def _load_due_automation_projects(db, start: datetime, end: datetime) -> set[UUID]:
+    """Projects targeted by an active cron trigger due in [start, end]."""
+    from ..models_automations import AutomationDefinition, AutomationTrigger
+
+    rows = await db.execute(
+        select(AutomationDefinition.target_project_id, AutomationDefinition.workspace_project_id)
+        .join(AutomationTrigger, AutomationTrigger.automation_id == AutomationDefinition.id)
+        .where(
+            AutomationTrigger.kind == "cron",
+            AutomationTrigger.is_active.is_(True),
+            AutomationTrigger.next_run_at >= start,
+            AutomationTrigger.next_run_at <= end,
+            or_(
+                AutomationDefinition.target_project_id.is_not(None),
+                AutomationDefinition.workspace_project_id.is_not(None),
+            ),
+        )
+    )
+    projects: set[UUID] = set()
+    for target_id, workspace_id in rows.all():
+        projects.update(pid for pid in (target_id, workspace_id) if pid is not None)
+    return projects
+
+
+async def _score_outstanding(db, now: datetime) -> None:
+    """Classify outstanding prewarms as hits (used) or misses (expired)."""
+    if not _outstanding:
+        return
+
+    result = await db.execute(
+        select(Project.id, Project.last_activity, Project.environment_status).where(
+            Project.id.in_(list(_outstanding))
+        )
+    )
+    rows = {pid: (last_activity, status) for pid, last_activity, status in result.all()}
+
+    for project_id, record in list(_outstanding.items()):
+        last_activity, status = rows.get(project_id, (None, None))
+        if last_activity is not None and last_activity.tzinfo is None:
+            last_activity = last_activity.replace(tzinfo=UTC)
+
+        if last_activity is not None and last_activity >= record.prewarmed_at:
+            _prewarm_metrics["hits"] += 1
+            _prewarm_metrics["hit_lead_seconds_total"] += (
+                last_activity - record.prewarmed_at
+            ).total_seconds()
+            del _outstanding[project_id]
+            logger.info("[PREWARM] Hit for project %s (%s)", project_id, record.reason)
+        elif status is None or now >= record.expires_at:
+            _prewarm_metrics["misses"] += 1
+            del _outstanding[project_id]
+            logger.debug("[PREWARM] Miss for project %s (%s)", project_id, record.reason)
+
+
+def _prewarm(candidates: list[PrewarmCandidate], now: datetime, *, expires_at: datetime) -> None:
+    """Queue a restore job per candidate on the lifecycle scheduler.
+
+    Records are added at submission so queued restores count against the
+    outstanding budget; a job that gives up drops its record again.
+    """
+    from .lifecycle_scheduler import PRIORITY_PREWARM_RESTORE, get_lifecycle_scheduler
+
+    scheduler = get_lifecycle_scheduler()
+    for candidate in candidates:
+        submitted = scheduler.submit(
+            "restore",
+            candidate.project_id,
+            partial(_restore_volume, candidate),
+            priority=PRIORITY_PREWARM_RESTORE,
+            node=candidate.cache_node,
+            on_give_up=partial(_restore_failed, candidate),
+        )
+        if not submitted:
+            continue
+        _outstanding[candidate.project_id] = _PrewarmRecord(
+            prewarmed_at=now, expires_at=expires_at, reason=candidate.reason
+        )
+        _prewarm_metrics["prewarmed"] += 1
+        if candidate.reason == "automation":
+            _prewarm_metrics["automation_prewarms"] += 1
+
+
+async def _restore_volume(candidate: PrewarmCandidate) -> None:
+    """Scheduler job: restore the volume into a node cache, record the node."""
+    from .volume_manager import get_volume_manager
+
+    node = await get_volume_manager().ensure_cached(candidate.volume_id)
+    logger.info(
+        "[PREWARM] Volume for project %s cached on %s (reason=%s, score=%.2f)",
+        candidate.project_id,
+        node,
+        candidate.reason,
+        candidate.score,
+    )
+
+    # Refresh the cache_node hint so start_environment's placement sees
+    # where the volume landed.
+    async with AsyncSessionLocal() as db:
+        project = await db.get(Project, candidate.project_id)
+        if project is not None:
+            project.cache_node = node
+            await db.commit()
+
+
+async def _restore_failed(candidate: PrewarmCandidate, exc: BaseException) -> None:
+    """Scheduler give-up callback: drop the record so it isn't scored."""
+    _prewarm_metrics["errors"] += 1
+    _prewarm_metrics["prewarmed"] -= 1
+    _outstanding.pop(candidate.project_id, None)
+    logger.warning("[PREWARM] Restore failed for project %s: %s", candidate.project_id, exc)
+
+
+async def _publish_metrics() -> None:
+    """Mirror counters into the distributed cache for the admin endpoint."""
+    from .cache_service import cache
+
+    try:
+        await cache.set(METRICS_CACHE_KEY, get_prewarm_metrics(), ttl=METRICS_CACHE_TTL)
+    except Exception:
+        logger.debug("[PREWARM] Failed to publish metrics", exc_info=True)
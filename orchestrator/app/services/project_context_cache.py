@@ -0,0 +1,456 @@
+"""
+Per-project cache for the context blocks an agent task builds at startup.
+
+Every task used to rebuild the skill catalog (DB queries plus ``SKILL.md``
+reads in the container), the ``TESSLATE.md`` block, the workspace data
+overview and the tier snapshot's container list from scratch, before the
+first model call. Back-to-back messages in the same project almost always
+get the same blocks, so they are cached here in the worker process.
+
+Each block depends on a few *tags*. A tag is a version counter; whatever
+changes the underlying data bumps it, and a cached block is served only
+while every one of its tags still has the version it was built against:
+
+==================  ======================================================
+``containers``      Container rows of the project inserted/updated/deleted
+                    (including status changes, so blocks read from a
+                    container are rebuilt once it comes up)
+``workspace_data``  Workspace collections or records of the project changed
+``files:tesslate``  A ``TESSLATE.md`` in the project was written or deleted
+``files:skills``    A file under ``.agents/skills/`` was written or deleted
+``skills``          (global) Skill assignments or skill rows changed
+==================  ======================================================
+
+ORM changes are picked up by mapper listeners (staged per session, bumped
+after commit; see :func:`register_context_cache_listeners`), file changes by
+:class:`~app.services.file_events.FileChangeNotifier`, and the few bulk SQL
+updates of container rows bump ``containers`` explicitly. Versions are
+counted locally and in Redis so a change made by the API process reaches the
+workers. Changes nothing observes (a shell in the container editing
+``TESSLATE.md``) are covered by ``agent_context_cache_ttl_seconds``.
+
+Build time and hit/miss counters are kept per block: a task's own timings go
+into the assistant message metadata (``context_blocks``), the aggregates to
+``/api/admin/metrics/project-context-cache``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .redis_batch import RedisBatchWriter
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "project_ctx:tags:"
+_REDIS_TTL = 7 * 24 * 3600
+_STATS_KEY = "project_ctx:stats"
+_GLOBAL_SCOPE = "*"
+
+# Tags that live in the global scope rather than per project.
+_GLOBAL_TAGS = frozenset({"skills"})
+
+# File-backed tags, all bumped when a project changed in unknown places.
+_FILE_TAGS = ("files:tesslate", "files:skills")
+
+_SESSION_KEY = "_project_ctx_tags"
+
+
+def file_tags(path: str) -> tuple[str, ...]:
+    """Tags affected by a change to ``path`` (relative to the project root)."""
+    path = "/" + path.lstrip("/")
+    tags = []
+    if path.rsplit("/", 1)[-1] == "TESSLATE.md":
+        tags.append("files:tesslate")
+    if "/.agents/skills/" in path:
+        tags.append("files:skills")
+    return tuple(tags)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    versions: tuple[tuple[int, int], ...]
+    built_at: float
+
+
+@dataclass
+class _BlockStats:
+    hits: int = 0
+    misses: int = 0
+    build_ms_total: float = 0.0
+    last_build_ms: float | None = None
+
+    def summary(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "avg_build_ms": round(self.build_ms_total / self.misses, 1) if self.misses else None,
+            "last_build_ms": self.last_build_ms,
+        }
+
+
+class ProjectContextCache(RedisBatchWriter):
+    """LRU of built context blocks, validated by tag versions and a TTL."""
+
+    log_prefix = "[CONTEXT-CACHE]"
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 512) -> None:
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        # scope -> tag -> version bumped by this process
+        self._local: dict[str, dict[str, int]] = {}
+        self._stats: dict[str, _BlockStats] = {}
+        self._unflushed: dict[str, _BlockStats] = {}
+        self._pending_flush: set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    # -------------------------------------------------------------------------
+    # Invalidation
+    # -------------------------------------------------------------------------
+
+    def invalidate(self, project_id: Any, *tags: str) -> None:
+        """Bump ``tags`` for ``project_id`` (global tags ignore the project)."""
+        by_scope: dict[str, list[str]] = {}
+        for tag in tags:
+            scope = _GLOBAL_SCOPE if tag in _GLOBAL_TAGS else str(project_id)
+            by_scope.setdefault(scope, []).append(tag)
+            local = self._local.setdefault(scope, {})
+            local[tag] = local.get(tag, 0) + 1
+        if not by_scope:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._bump_shared(by_scope))
+        self._pending_flush.add(task)
+        task.add_done_callback(self._pending_flush.discard)
+
+    def invalidate_files(self, project_id: Any, path: str | None = None) -> None:
+        """Bump the file tags touched by ``path``, or all of them when unknown."""
+        tags = _FILE_TAGS if path is None else file_tags(path)
+        if tags:
+            self.invalidate(project_id, *tags)
+
+    async def _bump_shared(self, by_scope: dict[str, list[str]]) -> None:
+        try:
+            from .cache_service import get_redis_client
+
+            redis = await get_redis_client()
+            if redis is None:
+                return
+            pipe = redis.pipeline(transaction=False)
+            for scope, tags in by_scope.items():
+                key = f"{_REDIS_PREFIX}{scope}"
+                for tag in tags:
+                    pipe.hincrby(key, tag, 1)
+                pipe.expire(key, _REDIS_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug("[CONTEXT-CACHE] shared invalidation failed: %s", e)
+
+    async def _shared_versions(self, scopes: list[str]) -> dict[str, dict[str, int]]:
+        try:
+            from .cache_service import get_redis_client
+
+            redis = await get_redis_client()
+            if redis is None:
+                return {}
+            pipe = redis.pipeline(transaction=False)
+            for scope in scopes:
+                pipe.hgetall(f"{_REDIS_PREFIX}{scope}")
+            rows = await pipe.execute()
+        except Exception as e:
+            logger.debug("[CONTEXT-CACHE] shared version read failed: %s", e)
+            return {}
+        return {
+            scope: {tag: int(v) for tag, v in (row or {}).items()}
+            for scope, row in zip(scopes, rows, strict=False)
+        }
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    async def session(self, project_id: Any) -> ContextBuildSession:
+        """Start a task's lookups for ``project_id``, reading tag versions once."""
+        scope = str(project_id) if project_id else ""
+        shared: dict[str, dict[str, int]] = {}
+        if self.enabled:
+            shared = await self._shared_versions([scope, _GLOBAL_SCOPE])
+        return ContextBuildSession(self, scope, shared)
+
+    def _versions(
+        self, scope: str, tags: tuple[str, ...], shared: dict[str, dict[str, int]]
+    ) -> tuple[tuple[int, int], ...]:
+        out = []
+        for tag in tags:
+            tag_scope = _GLOBAL_SCOPE if tag in _GLOBAL_TAGS else scope
+            out.append(
+                (
+                    shared.get(tag_scope, {}).get(tag, 0),
+                    self._local.get(tag_scope, {}).get(tag, 0),
+                )
+            )
+        return tuple(out)
+
+    def _lookup(self, key: tuple, versions: tuple) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.versions != versions or time.monotonic() - entry.built_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: tuple, value: Any, versions: tuple) -> None:
+        self._entries[key] = _Entry(value, versions, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _record(self, block: str, *, hit: bool, build_ms: float | None = None) -> None:
+        for target in (self._stats, self._unflushed):
+            stats = target.setdefault(block, _BlockStats())
+            if hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+                stats.build_ms_total += build_ms or 0.0
+                stats.last_build_ms = build_ms
+        self._schedule_flush()
+
+    def _has_unflushed(self) -> bool:
+        return bool(self._unflushed)
+
+    def _take_unflushed(self) -> dict[str, _BlockStats]:
+        pending, self._unflushed = self._unflushed, {}
+        return pending
+
+    def _queue_writes(self, pipe: Any, batch: dict[str, _BlockStats]) -> None:
+        for block, stats in batch.items():
+            pipe.hincrby(_STATS_KEY, f"{block}|hits", stats.hits)
+            pipe.hincrby(_STATS_KEY, f"{block}|misses", stats.misses)
+            pipe.hincrbyfloat(_STATS_KEY, f"{block}|build_ms", stats.build_ms_total)
+
+    def local_stats(self) -> dict[str, Any]:
+        """Counters of this process only."""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "blocks": {name: s.summary() for name, s in sorted(self._stats.items())},
+        }
+
+    async def stats(self) -> dict[str, Any]:
+        """Counters across all workers; this process only without Redis."""
+        local = self.local_stats()
+        rows = await self._read_redis(lambda pipe: pipe.hgetall(_STATS_KEY))
+        if rows is None:
+            return local
+        (row,) = rows
+
+        totals: dict[str, _BlockStats] = {}
+        for field_name, value in (row or {}).items():
+            block, _, name = field_name.rpartition("|")
+            stats = totals.setdefault(block, _BlockStats())
+            if name == "hits":
+                stats.hits = int(value)
+            elif name == "misses":
+                stats.misses = int(value)
+            elif name == "build_ms":
+                stats.build_ms_total = float(value)
+        for block, stats in totals.items():
+            stats.last_build_ms = getattr(self._stats.get(block), "last_build_ms", None)
+        return {
+            **local,
+            "blocks": {name: s.summary() for name, s in sorted(totals.items())},
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _copy(value: Any) -> Any:
+    # Callers may add to the lists / dicts they get back.
+    return value if isinstance(value, str | None) else copy.deepcopy(value)
+
+
+@dataclass
+class ContextBuildSession:
+    """One task's view of the cache: fixed tag versions and per-block timings."""
+
+    cache: ProjectContextCache
+    scope: str
+    shared: dict[str, dict[str, int]]
+    # block -> {"cached": bool, "ms": float}
+    report: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    async def get(
+        self,
+        block: str,
+        key: tuple,
+        tags: tuple[str, ...],
+        build: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        The cached ``block`` for ``key``, or the result of ``build()``.
+
+        ``None`` (the block could not be built, e.g. its container was not
+        reachable) is returned but not cached.
+        """
+        started = time.perf_counter()
+        cache = self.cache
+        if not cache.enabled:
+            value = await build()
+            self.report[block] = {"cached": False, "ms": _ms_since(started)}
+            return value
+
+        cache_key = (self.scope, block, key)
+        versions = cache._versions(self.scope, tags, self.shared)
+        entry = cache._lookup(cache_key, versions)
+        if entry is not None:
+            cache._record(block, hit=True)
+            self.report[block] = {"cached": True, "ms": _ms_since(started)}
+            return _copy(entry.value)
+
+        value = await build()
+        build_ms = _ms_since(started)
+        cache._record(block, hit=False, build_ms=build_ms)
+        self.report[block] = {"cached": False, "ms": build_ms}
+        # Stored against the versions read before the build, so a change that
+        # lands while building invalidates the entry on the next lookup.
+        if value is not None:
+            cache._store(cache_key, _copy(value), versions)
+        return value
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+# =============================================================================
+# ORM change tracking
+# =============================================================================
+
+
+def _stage(session: Any, project_id: Any, tag: str) -> None:
+    session.info.setdefault(_SESSION_KEY, set()).add((str(project_id), tag))
+
+
+def _make_listener(tag: str, project_attr: str | None) -> Callable:
+    def _listener(_mapper, _connection, target) -> None:  # SA signature
+        try:
+            from sqlalchemy.orm import Session
+
+            session = Session.object_session(target)
+            if session is None:
+                return
+            if tag == "skills" and getattr(target, "item_type", "skill") != "skill":
+                return
+            project_id = getattr(target, project_attr) if project_attr else None
+            _stage(session, project_id, tag)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("[CONTEXT-CACHE] stage failed (%s): %s", tag, exc)
+
+    return _listener
+
+
+def _on_after_commit(session: Any) -> None:
+    staged = session.info.pop(_SESSION_KEY, None)
+    if not staged:
+        return
+    cache = get_project_context_cache()
+    for project_id, tag in staged:
+        cache.invalidate(project_id, tag)
+
+
+def _on_after_rollback(session: Any, *_: object) -> None:
+    session.info.pop(_SESSION_KEY, None)
+
+
+_LISTENERS_REGISTERED = False
+
+
+def register_context_cache_listeners() -> None:
+    """Idempotently attach the mapper / session listeners that bump tags."""
+    global _LISTENERS_REGISTERED
+    if _LISTENERS_REGISTERED:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    from ..models import AgentSkillAssignment, Container, MarketplaceAgent
+    from ..models_workspace_data import WorkspaceCollection, WorkspaceRecord
+
+    tracked = (
+        (Container, "containers", "project_id"),
+        (WorkspaceCollection, "workspace_data", "project_id"),
+        (WorkspaceRecord, "workspace_data", "project_id"),
+        (AgentSkillAssignment, "skills", None),
+        (MarketplaceAgent, "skills", None),
+    )
+    for model, tag, project_attr in tracked:
+        listener = _make_listener(tag, project_attr)
+        for op in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, op, listener)
+
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_rollback", _on_after_rollback)
+    event.listen(Session, "after_soft_rollback", _on_after_rollback)
+
+    _LISTENERS_REGISTERED = True
+    logger.info("[CONTEXT-CACHE] change listeners registered")
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: ProjectContextCache | None = None
+
+
+def get_project_context_cache() -> ProjectContextCache:
+    """Get the process-wide project context cache."""
+    global _instance
+    if _instance is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        _instance = ProjectContextCache(
+            ttl_seconds=settings.agent_context_cache_ttl_seconds,
+            max_entries=settings.agent_context_cache_max_entries,
+        )
+    return _instance
+
+
+def invalidate_project_context(project_id: Any, *tags: str) -> None:
+    """Bump ``tags`` for ``project_id``; never raises."""
+    try:
+        get_project_context_cache().invalidate(project_id, *tags)
+    except Exception as e:
+        logger.debug("[CONTEXT-CACHE] invalidate failed: %s", e)
+
+
+def invalidate_project_files(project_id: Any, path: str | None = None) -> None:
+    """Bump the file tags for a change to ``path`` (``None``: unknown paths)."""
+    try:
+        get_project_context_cache().invalidate_files(project_id, path)
+    except Exception as e:
+        logger.debug("[CONTEXT-CACHE] file invalidate failed: %s", e)
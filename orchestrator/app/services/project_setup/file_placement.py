@@ -5,7 +5,10 @@ import os
 import shutil
 import subprocess
 import tarfile
+import tempfile
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from typing import BinaryIO
 
 from ...services.base_config_parser import (
     TesslateProjectConfig,
@@ -19,6 +22,9 @@ SKIP_DIRS = frozenset(
     {".git", "node_modules", ".next", "__pycache__", ".venv", "venv", "dist", "build"}
 )
 
+# Archive bytes read from the spool file per upload chunk.
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @dataclass
 class PlacedFiles:
@@ -172,19 +178,22 @@ async def _place_kubernetes(
     if task:
         task.update_progress(60, 100, "Writing files to volume...")
 
-    # Build tar archive locally — one gRPC call instead of N per-file writes
-    tar_data, files_written = await asyncio.to_thread(
-        _build_source_tar, source_path, config if write_config else None
-    )
-
     discovery = NodeDiscovery()
     address = await discovery.get_fileops_address(node_name)
 
-    async with FileOpsClient(address) as client:
-        await client.tar_extract(volume_id, ".", tar_data)
+    # Build a tar archive locally — one streamed upload instead of N per-file
+    # writes. It is spooled to disk so large templates never sit in memory.
+    with tempfile.TemporaryFile() as archive:
+        files_written = await asyncio.to_thread(
+            _write_source_tar, archive, source_path, config if write_config else None
+        )
+        tar_size = archive.tell()
+        archive.seek(0)
+        async with FileOpsClient(address) as client:
+            await client.tar_extract_stream(volume_id, ".", _read_chunks(archive))
 
     logger.info(
-        f"[PLACEMENT] Placed {files_written} files on volume {volume_id} via tar ({len(tar_data)} bytes)"
+        f"[PLACEMENT] Placed {files_written} files on volume {volume_id} via tar ({tar_size} bytes)"
     )
 
     if task:
@@ -193,20 +202,26 @@ async def _place_kubernetes(
     return PlacedFiles(volume_id=volume_id, node_name=node_name)
 
 
-def _build_source_tar(
+async def _read_chunks(fileobj: BinaryIO) -> AsyncIterator[bytes]:
+    """Read ``fileobj`` to the end in upload-sized chunks, off the event loop."""
+    while chunk := await asyncio.to_thread(fileobj.read, _UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+def _write_source_tar(
+    fileobj: BinaryIO,
     source_path: str,
     config: TesslateProjectConfig | None = None,
-) -> tuple[bytes, int]:
-    """Build a tar archive from a source directory.
+) -> int:
+    """Write a tar archive of a source directory to ``fileobj``.
 
-    Runs in a thread (blocking I/O). Returns (tar_bytes, file_count).
+    Runs in a thread (blocking I/O). Returns the number of files archived.
     Excludes common generated/dependency directories (node_modules, .git, etc.).
     Optionally injects .tesslate/config.json into the archive.
     """
-    buf = io.BytesIO()
     file_count = 0
 
-    with tarfile.open(fileobj=buf, mode="w") as tar:
+    with tarfile.open(fileobj=fileobj, mode="w") as tar:
         for root, dirs, files in os.walk(source_path):
             # Prune skipped directories in-place so os.walk doesn't descend
             dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
@@ -229,4 +244,4 @@ def _build_source_tar(
             tar.addfile(info, io.BytesIO(config_bytes))
             file_count += 1
 
-    return buf.getvalue(), file_count
+    return file_count
@@ -0,0 +1,398 @@
+"""
+Prompt-cache effectiveness: hit rates and prefix stability.
+
+``prompt_caching.inject_cache_breakpoints`` places breakpoints, but a cached
+prefix only hits when the request starts with exactly the same bytes as a
+previous one. Two things are tracked here:
+
+- **Hit rate.** ``OpenAIAdapter`` records the cache counters of every
+  response (``cache_read_input_tokens`` / ``cache_creation_input_tokens``
+  from Anthropic, ``cached_tokens`` from OpenAI-style providers) per agent
+  and model. Counters are flushed to Redis so the admin endpoint on any API
+  replica sees what the workers recorded.
+- **Prefix stability.** Before each agent-loop request the cacheable prefix
+  is split into sections (each ``=== Header ===`` block of the system
+  prompt, and the tool schemas) and compared with the previous request of
+  the same chat and model. A changed section invalidates the cache from
+  that point on, so each change is logged with a unified diff and a hint
+  when the cause looks like a timestamp or an ordering change.
+
+The agent and chat come from :data:`current_prompt_cache_scope`, set by the
+worker for the duration of an agent task.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+from .redis_batch import RedisBatchWriter
+
+logger = logging.getLogger(__name__)
+
+_REDIS_USAGE_KEY = "prompt_cache:usage"
+_REDIS_CHANGES_KEY = "prompt_cache:prefix_changes"
+
+_SECTION_HEADER = re.compile(r"^=== (.+?) ===[ \t]*$", re.MULTILINE)
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}|\b\d{1,2}:\d{2}(:\d{2})?\b")
+
+
+@dataclass(frozen=True)
+class PromptCacheScope:
+    """Who a request is for: the agent (metrics label) and chat (stability key)."""
+
+    agent: str
+    session: str
+
+
+# Set by the worker around an agent task. Requests made outside a scope are
+# counted under "unscoped" and skip the stability check.
+current_prompt_cache_scope: ContextVar[PromptCacheScope | None] = ContextVar(
+    "current_prompt_cache_scope", default=None
+)
+
+
+# =============================================================================
+# Hit-rate counters
+# =============================================================================
+
+
+@dataclass
+class _UsageCounters:
+    requests: int = 0
+    hit_requests: int = 0
+    prompt_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+    def add(self, other: _UsageCounters) -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+def _summarize(c: _UsageCounters) -> dict[str, Any]:
+    # Providers disagree on whether prompt_tokens includes cached tokens;
+    # the larger of the two readings is the request's input size.
+    input_tokens = max(c.prompt_tokens, c.cache_read_tokens + c.cache_write_tokens)
+    return {
+        **asdict(c),
+        "token_hit_rate": round(c.cache_read_tokens / input_tokens, 3) if input_tokens else 0.0,
+        "request_hit_rate": round(c.hit_requests / c.requests, 3) if c.requests else 0.0,
+    }
+
+
+def _usage_sample(usage: dict[str, Any]) -> _UsageCounters:
+    read = usage.get("cache_read_input_tokens") or usage.get("cached_tokens") or 0
+    return _UsageCounters(
+        requests=1,
+        hit_requests=1 if read else 0,
+        prompt_tokens=usage.get("prompt_tokens") or 0,
+        cache_read_tokens=read,
+        cache_write_tokens=usage.get("cache_creation_input_tokens") or 0,
+    )
+
+
+# =============================================================================
+# Prefix sections
+# =============================================================================
+
+
+@dataclass
+class PrefixChange:
+    """One section of the cacheable prefix that differs from the previous request."""
+
+    agent: str
+    session: str
+    model: str
+    section: str
+    # "whitespace", "reordered" (same lines, new order), "timestamp" (changed
+    # lines carry a date or time), "added" / "removed" (whole section) or None.
+    hint: str | None
+    diff: str
+    at: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _message_text(message: dict[str, Any]) -> str:
+    content = message.get("content")
+    if isinstance(content, list):
+        # Block format after inject_cache_breakpoints; cache_control markers
+        # are not part of the cached bytes we care about.
+        return "".join(b.get("text", "") for b in content if isinstance(b, dict))
+    return content or ""
+
+
+def prefix_sections(messages: list[dict[str, Any]], tools: list[dict] | None) -> dict[str, str]:
+    """Split the cacheable prefix into named sections, in prompt order."""
+    sections: dict[str, str] = {}
+    if messages and messages[0].get("role") == "system":
+        text = _message_text(messages[0])
+        headers = list(_SECTION_HEADER.finditer(text))
+        # A section owns the newline before its header, so appending a
+        # section doesn't show up as a change to the one before it.
+        starts = [max(m.start() - 1, 0) for m in headers] + [len(text)]
+        sections["system"] = text[: starts[0]]
+        for i, match in enumerate(headers):
+            name = f"system: {match.group(1)}"
+            # Same header twice: keep both, distinguishable.
+            while name in sections:
+                name += "'"
+            sections[name] = text[starts[i] : starts[i + 1]]
+    if tools:
+        # Serialized exactly as sent (no sort_keys): key order is part of the prefix.
+        sections["tools"] = "\n".join(json.dumps(t, indent=1) for t in tools)
+    return sections
+
+
+def _hint(before: str | None, after: str | None, changed_lines: list[str]) -> str | None:
+    if before is None:
+        return "added"
+    if after is None:
+        return "removed"
+    before_lines, after_lines = before.splitlines(), after.splitlines()
+    if [ln.strip() for ln in before_lines] == [ln.strip() for ln in after_lines]:
+        return "whitespace"
+    if sorted(before_lines) == sorted(after_lines):
+        return "reordered"
+    if any(_TIMESTAMP.search(line) for line in changed_lines):
+        return "timestamp"
+    return None
+
+
+def _diff(
+    before: str | None, after: str | None, section: str, max_lines: int
+) -> tuple[str, str | None]:
+    lines = list(
+        difflib.unified_diff(
+            (before or "").splitlines(),
+            (after or "").splitlines(),
+            fromfile=f"previous/{section}",
+            tofile=f"current/{section}",
+            lineterm="",
+            n=1,
+        )
+    )
+    changed = [ln[1:] for ln in lines[2:] if ln.startswith(("+", "-"))]
+    if len(lines) > max_lines:
+        lines = lines[:max_lines] + [f"... ({len(lines) - max_lines} more diff lines)"]
+    return "\n".join(lines), _hint(before, after, changed)
+
+
+# =============================================================================
+# Monitor
+# =============================================================================
+
+
+class PromptCacheMonitor(RedisBatchWriter):
+    """Per-agent/per-model cache counters and prefix-change log."""
+
+    log_prefix = "[PROMPT-CACHE]"
+
+    def __init__(
+        self,
+        *,
+        stability_check: bool = True,
+        max_sessions: int = 256,
+        max_changes: int = 50,
+        diff_lines: int = 40,
+    ) -> None:
+        super().__init__()
+        self.stability_check = stability_check
+        self.max_sessions = max_sessions
+        self.diff_lines = diff_lines
+        # (agent, model) -> counters
+        self._usage: dict[tuple[str, str], _UsageCounters] = {}
+        self._unflushed: dict[tuple[str, str], _UsageCounters] = {}
+        # (session, model) -> {section: (digest, text)} of the last request
+        self._prefixes: OrderedDict[tuple[str, str], dict[str, tuple[str, str]]] = OrderedDict()
+        self._changes: deque[PrefixChange] = deque(maxlen=max_changes)
+        self._unflushed_changes: list[PrefixChange] = []
+        self.checks = 0
+        self.invalidations: dict[str, int] = {}
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    def record_usage(self, model: str, usage: dict[str, Any] | None) -> None:
+        """Count one response's prompt and cache tokens."""
+        if not usage:
+            return
+        scope = current_prompt_cache_scope.get()
+        key = (scope.agent if scope else "unscoped", model)
+        sample = _usage_sample(usage)
+        for target in (self._usage, self._unflushed):
+            target.setdefault(key, _UsageCounters()).add(sample)
+        self._schedule_flush()
+
+    def check_prefix(
+        self, model: str, messages: list[dict[str, Any]], tools: list[dict] | None
+    ) -> list[PrefixChange]:
+        """Compare this request's prefix with the previous one in the same chat."""
+        scope = current_prompt_cache_scope.get()
+        if not self.stability_check or scope is None:
+            return []
+        self.checks += 1
+        current = {
+            name: (hashlib.sha1(text.encode()).hexdigest(), text)
+            for name, text in prefix_sections(messages, tools).items()
+        }
+        key = (scope.session, model)
+        previous = self._prefixes.pop(key, None)
+        self._prefixes[key] = current
+        while len(self._prefixes) > self.max_sessions:
+            self._prefixes.popitem(last=False)
+        if previous is None:
+            return []
+
+        changes = []
+        for section in [*current, *(s for s in previous if s not in current)]:
+            before, after = previous.get(section), current.get(section)
+            if before is not None and after is not None and before[0] == after[0]:
+                continue
+            diff, hint = _diff(
+                before[1] if before else None,
+                after[1] if after else None,
+                section,
+                self.diff_lines,
+            )
+            changes.append(
+                PrefixChange(scope.agent, scope.session, model, section, hint, diff, time.time())
+            )
+        for change in changes:
+            self.invalidations[change.section] = self.invalidations.get(change.section, 0) + 1
+            self._changes.append(change)
+            self._unflushed_changes.append(change)
+            logger.warning(
+                "[PROMPT-CACHE] %s prefix section '%s' changed for agent %s (%s); "
+                "cache invalidated from here on\n%s",
+                model,
+                change.section,
+                change.agent,
+                change.hint or "content",
+                change.diff,
+            )
+        if changes:
+            self._schedule_flush()
+        return changes
+
+    def _has_unflushed(self) -> bool:
+        return bool(self._unflushed or self._unflushed_changes)
+
+    def _take_unflushed(self) -> tuple[dict, list]:
+        batch = (self._unflushed, self._unflushed_changes)
+        self._unflushed, self._unflushed_changes = {}, []
+        return batch
+
+    def _queue_writes(self, pipe: Any, batch: tuple[dict, list]) -> None:
+        usage, changes = batch
+        for (agent, model), counters in usage.items():
+            for f in fields(counters):
+                value = getattr(counters, f.name)
+                if value:
+                    pipe.hincrby(_REDIS_USAGE_KEY, f"{agent}|{model}|{f.name}", value)
+        for change in changes:
+            pipe.lpush(_REDIS_CHANGES_KEY, json.dumps(change.to_dict()))
+        if changes:
+            pipe.ltrim(_REDIS_CHANGES_KEY, 0, self._changes.maxlen - 1)
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def local_stats(self) -> dict[str, Any]:
+        """Hit rates and recent prefix changes from this process only."""
+        return self._build_stats(self._usage, [c.to_dict() for c in reversed(self._changes)])
+
+    def _build_stats(
+        self, usage: dict[tuple[str, str], _UsageCounters], changes: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        by_agent: dict[str, _UsageCounters] = {}
+        by_model: dict[str, _UsageCounters] = {}
+        total = _UsageCounters()
+        for (agent, model), counters in usage.items():
+            by_agent.setdefault(agent, _UsageCounters()).add(counters)
+            by_model.setdefault(model, _UsageCounters()).add(counters)
+            total.add(counters)
+        return {
+            "total": _summarize(total),
+            "by_agent": {a: _summarize(c) for a, c in sorted(by_agent.items())},
+            "by_model": {m: _summarize(c) for m, c in sorted(by_model.items())},
+            "prefix_checks": self.checks,
+            "prefix_invalidations": dict(self.invalidations),
+            "recent_prefix_changes": changes,
+        }
+
+    async def stats(self) -> dict[str, Any]:
+        """Hit rates and prefix changes from every process (this one without Redis)."""
+
+        def _reads(pipe: Any) -> None:
+            pipe.hgetall(_REDIS_USAGE_KEY)
+            pipe.lrange(_REDIS_CHANGES_KEY, 0, -1)
+
+        rows = await self._read_redis(_reads)
+        if rows is None:
+            return self.local_stats()
+        raw_usage, raw_changes = rows
+
+        usage: dict[tuple[str, str], _UsageCounters] = {}
+        for field_name, value in (raw_usage or {}).items():
+            agent, _, rest = field_name.partition("|")
+            model, _, name = rest.rpartition("|")
+            counters = usage.setdefault((agent, model), _UsageCounters())
+            if hasattr(counters, name):
+                setattr(counters, name, getattr(counters, name) + int(value))
+        changes = []
+        for raw in raw_changes or []:
+            try:
+                changes.append(json.loads(raw))
+            except ValueError:
+                continue
+        return self._build_stats(usage, changes)
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: PromptCacheMonitor | None = None
+
+
+def get_prompt_cache_monitor() -> PromptCacheMonitor:
+    """Get the process-wide prompt-cache monitor."""
+    global _instance
+    if _instance is None:
+        from ..config import get_settings
+
+        settings = get_settings()
+        _instance = PromptCacheMonitor(
+            stability_check=settings.prompt_cache_stability_check,
+            max_sessions=settings.prompt_cache_stability_sessions,
+        )
+    return _instance
+
+
+def check_prompt_prefix(model: str, messages: list[dict], tools: list[dict] | None) -> None:
+    """Run the prefix stability check; never raises."""
+    try:
+        get_prompt_cache_monitor().check_prefix(model, messages, tools)
+    except Exception as e:  # diagnostics must never break a request
+        logger.debug("[PROMPT-CACHE] prefix check failed: %s", e)
+
+
+def record_prompt_cache_usage(model: str, usage: dict[str, Any] | None) -> None:
+    """Record a response's cache counters; never raises."""
+    try:
+        get_prompt_cache_monitor().record_usage(model, usage)
+    except Exception as e:
+        logger.debug("[PROMPT-CACHE] record failed: %s", e)
@@ -29,6 +29,9 @@ class PubSub(Protocol):
         self, user_id: UUID, project_id: UUID, notification: dict
     ) -> None: ...
 
+    # Project-wide file change batches (see services/file_events.py)
+    async def publish_file_changes(self, project_id: str, payload: dict) -> None: ...
+
     # Agent event streams (durable, replayable)
     async def publish_agent_event(self, task_id: str, event: dict) -> None: ...
 
@@ -103,6 +103,11 @@ class LocalPubSub:
             {"type": notification.get("type", "agent_task_notification"), "payload": notification},
         )
 
+    async def publish_file_changes(self, project_id: str, payload: dict) -> None:
+        # Single process: FileChangeNotifier has already delivered the batch
+        # to every subscriber.
+        return None
+
     async def _fanout_local(self, user_id: UUID, project_id: UUID, message: dict) -> None:
         subs = self._status_subscribers.get((user_id, project_id))
         if not subs:
@@ -471,6 +471,35 @@ class RedisPubSub:
         except Exception as e:
             logger.warning(f"Failed to publish agent task notification: {e}")
 
+    async def publish_file_changes(self, project_id: str, payload: dict):
+        """Fan a file change batch out to the other replicas.
+
+        Project-wide rather than per user: every replica forwards it to all of
+        its connections for the project. ``origin`` lets the publishing
+        replica skip its own message, having already delivered it locally.
+        """
+        from ..cache_service import get_redis_client
+        from ..file_events import INSTANCE_ID
+
+        redis = await get_redis_client()
+        if not redis:
+            return
+
+        channel = f"{CHANNEL_PREFIX}files:{project_id}"
+        message = json.dumps(
+            {
+                "type": "file_changes",
+                "origin": INSTANCE_ID,
+                "project_id": str(project_id),
+                "payload": payload,
+            }
+        )
+
+        try:
+            await redis.publish(channel, message)
+        except Exception as e:
+            logger.warning(f"Failed to publish file changes: {e}")
+
     async def _forward_agent_events_to_ws(
         self, user_id: UUID, project_id: UUID, task_id: str, chat_id: str | None = None
     ):
@@ -565,6 +594,16 @@ class RedisPubSub:
         try:
             data = json.loads(message["data"])
             msg_type = data.get("type", "")
+
+            if msg_type == "file_changes":
+                from ..file_events import INSTANCE_ID, get_file_change_notifier
+
+                if data.get("origin") != INSTANCE_ID:
+                    await get_file_change_notifier().dispatch_local(
+                        data["project_id"], data.get("payload", {})
+                    )
+                return
+
             user_id = UUID(data["user_id"])
             project_id = UUID(data["project_id"])
             payload = data.get("payload", {})
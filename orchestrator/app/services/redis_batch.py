@@ -0,0 +1,111 @@
+"""
+Per-process stats flushed to Redis in batches.
+
+Model traffic, prompt-cache and context-cache counters and task profiles
+are recorded on the hot path of every agent request. Each keeps its
+counters in memory and writes the delta to Redis at most once per
+``flush_interval`` so the admin endpoints on any API replica see what the
+workers recorded; without Redis the process-local numbers are served.
+
+:class:`RedisBatchWriter` owns the scheduling. A record made while a flush
+is pending is picked up by it; otherwise a flush is scheduled for the end of
+the current interval, so the last records before a quiet period are written
+too instead of waiting for the next record.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0  # seconds between batched Redis writes per process
+
+
+class RedisBatchWriter(ABC):
+    """Base for stats that batch their writes to Redis.
+
+    Subclasses implement :meth:`_has_unflushed`, :meth:`_take_unflushed` and
+    :meth:`_queue_writes`, call :meth:`_schedule_flush` after recording, and read the shared view
+    through :meth:`_read_redis`.
+    """
+
+    log_prefix = "[STATS]"
+
+    def __init__(self, *, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+        self._flush_task: asyncio.Task | None = None
+
+    @abstractmethod
+    def _has_unflushed(self) -> bool:
+        """True if anything was recorded since the last flush."""
+
+    @abstractmethod
+    def _take_unflushed(self) -> Any:
+        """Return the data recorded since the last flush and reset it."""
+
+    @abstractmethod
+    def _queue_writes(self, pipe: Any, batch: Any) -> None:
+        """Queue the Redis writes for a batch from :meth:`_take_unflushed`."""
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        delay = max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+        self._flush_task = loop.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        await self.flush()
+        self._flush_task = None
+        # Records made while the pipeline was executing found this task running.
+        if self._has_unflushed():
+            self._schedule_flush()
+
+    async def flush(self) -> None:
+        """Write unflushed data to Redis (no-op without Redis)."""
+        self._last_flush = time.monotonic()
+        if not self._has_unflushed():
+            return
+        batch = self._take_unflushed()
+        try:
+            from .cache_service import get_redis_client
+
+            redis = await get_redis_client()
+            if redis is None:
+                return
+            pipe = redis.pipeline(transaction=False)
+            self._queue_writes(pipe, batch)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug("%s flush failed: %s", self.log_prefix, e)
+
+    async def _read_redis(self, queue_reads: Callable[[Any], None]) -> list[Any] | None:
+        """Flush, then run the reads ``queue_reads`` adds to a pipeline.
+
+        Returns the pipeline results, or None without Redis or on error.
+        """
+        try:
+            from .cache_service import get_redis_client
+
+            redis = await get_redis_client()
+            if redis is None:
+                return None
+            await self.flush()
+            pipe = redis.pipeline(transaction=False)
+            queue_reads(pipe)
+            return await pipe.execute()
+        except Exception as e:
+            logger.debug("%s shared read failed: %s", self.log_prefix, e)
+            return None
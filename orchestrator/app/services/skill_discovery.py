@@ -116,11 +116,14 @@ async def _discover_builtin_skills(db: AsyncSession) -> list[SkillCatalogEntry]:
                 MarketplaceAgent.id,
                 MarketplaceAgent.name,
                 MarketplaceAgent.description,
-            ).where(
+            )
+            .where(
                 MarketplaceAgent.is_builtin.is_(True),
                 MarketplaceAgent.is_active.is_(True),
                 MarketplaceAgent.item_type == "skill",
             )
+            # Stable order: the catalog is part of the cached system prompt.
+            .order_by(MarketplaceAgent.name, MarketplaceAgent.id)
         )
         rows = result.all()
         return [
@@ -158,6 +161,7 @@ async def _discover_db_skills(
                 MarketplaceAgent.is_active.is_(True),
                 MarketplaceAgent.item_type == "skill",
             )
+            .order_by(MarketplaceAgent.name, MarketplaceAgent.id)
         )
         rows = result.all()
 
@@ -213,7 +217,7 @@ async def _discover_file_skills_local(project_id: str, db: AsyncSession) -> list
         for root in roots:
             if not root.exists() or not root.is_dir():
                 continue
-            for skill_md in root.rglob("SKILL.md"):
+            for skill_md in sorted(root.rglob("SKILL.md")):
                 try:
                     depth = len(skill_md.relative_to(root).parents)
                     if depth > 4:
@@ -281,7 +285,9 @@ async def _discover_file_skills(
         if proc.returncode != 0 or not stdout.strip():
             return []
 
-        skill_paths = stdout.decode("utf-8").strip().split("\n")
+        # ``find`` order depends on the filesystem; sort so the catalog (part
+        # of the cached system prompt) is the same on every run.
+        skill_paths = sorted(stdout.decode("utf-8").strip().split("\n"))
         skills = []
 
         for path in skill_paths:
@@ -14,6 +14,7 @@ Deleting the PVC before the snapshot is ready will result in data corruption.
 
 import asyncio
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Any
 from uuid import UUID
@@ -29,6 +30,19 @@ from ..models import Project, ProjectSnapshot
 logger = logging.getLogger(__name__)
 
 
+def _elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+def _record_phase(snapshot: ProjectSnapshot, phase: str, ms: int) -> None:
+    """Merge one phase duration into ``snapshot.phase_timings``.
+
+    Reassigns the dict (rather than mutating it) so SQLAlchemy sees the
+    JSON column as dirty.
+    """
+    snapshot.phase_timings = {**(snapshot.phase_timings or {}), phase: ms}
+
+
 class SnapshotManager:
     """Manages Kubernetes VolumeSnapshots for project hibernation and versioning."""
 
@@ -94,93 +108,182 @@ class SnapshotManager:
         Returns:
             Tuple of (ProjectSnapshot record, error message or None)
         """
+        snapshots, error = await self.create_snapshots(
+            project_id=project_id,
+            user_id=user_id,
+            db=db,
+            pvc_names=[pvc_name],
+            snapshot_type=snapshot_type,
+            label=label,
+        )
+        if error or not snapshots:
+            return None, error
+        return snapshots[0], None
+
+    async def create_snapshots(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        db: AsyncSession,
+        pvc_names: list[str],
+        snapshot_type: str = "hibernation",
+        label: str | None = None,
+    ) -> tuple[list[ProjectSnapshot], str | None]:
+        """
+        Create VolumeSnapshots for several PVCs of a project at once.
+
+        The Kubernetes create calls are issued concurrently, so hibernating a
+        project with service PVCs costs one API round trip instead of one per
+        PVC. Rotation and the DB records go through ``db`` sequentially (an
+        AsyncSession is not safe for concurrent use).
+
+        CRITICAL: Caller must call wait_for_snapshots_ready() before deleting the PVCs.
+
+        Args:
+            project_id: Project UUID
+            user_id: User UUID
+            db: Database session
+            pvc_names: PVCs to snapshot
+            snapshot_type: "hibernation" or "manual"
+            label: Optional user-provided label for manual snapshots
+
+        Returns:
+            Tuple of (ProjectSnapshot records for every VolumeSnapshot that was
+            created, error message or None). On a partial failure the created
+            snapshots are still recorded so rotation can clean them up later.
+        """
         namespace = self._get_project_namespace(str(project_id))
-        snapshot_name = self._generate_snapshot_name(str(project_id), snapshot_type)
+        base_name = self._generate_snapshot_name(str(project_id), snapshot_type)
+        # PVCs snapshotted in the same second would collide on the timestamped
+        # name, so every PVC except project-storage gets its name as a suffix.
+        snapshot_names = {
+            pvc_name: base_name if pvc_name == "project-storage" else f"{base_name}-{pvc_name}"
+            for pvc_name in pvc_names
+        }
 
         logger.info(
-            f"[SNAPSHOT] Creating {snapshot_type} snapshot for project {project_id}: {snapshot_name}"
+            f"[SNAPSHOT] Creating {snapshot_type} snapshots for project {project_id}: "
+            f"{', '.join(snapshot_names.values())}"
         )
 
-        try:
-            # Get PVC size for metadata
+        async def _start(pvc_name: str) -> tuple[int | None, int]:
             volume_size_bytes = await self._get_pvc_size_bytes(namespace, pvc_name)
-
-            # Create VolumeSnapshot manifest
-            snapshot_manifest = {
-                "apiVersion": f"{self.snapshot_group}/{self.snapshot_version}",
-                "kind": "VolumeSnapshot",
-                "metadata": {
-                    "name": snapshot_name,
-                    "namespace": namespace,
-                    "labels": {
-                        "app": "tesslate",
-                        "managed-by": "tesslate-backend",
-                        "project-id": str(project_id),
-                        "user-id": str(user_id),
-                        "snapshot-type": snapshot_type,
-                    },
-                },
-                "spec": {
-                    "volumeSnapshotClassName": self.snapshot_class,
-                    "source": {"persistentVolumeClaimName": pvc_name},
-                },
-            }
-
-            # Create snapshot in Kubernetes
-            await asyncio.to_thread(
-                self.custom_api.create_namespaced_custom_object,
-                group=self.snapshot_group,
-                version=self.snapshot_version,
-                namespace=namespace,
-                plural=self.snapshot_plural,
-                body=snapshot_manifest,
+            started = time.monotonic()
+            await self._create_volumesnapshot(
+                project_id,
+                user_id,
+                namespace,
+                snapshot_names[pvc_name],
+                snapshot_type,
+                pvc_name,
             )
+            return volume_size_bytes, _elapsed_ms(started)
 
-            logger.info(f"[SNAPSHOT] ✅ VolumeSnapshot created: {snapshot_name}")
+        results = await asyncio.gather(
+            *(_start(pvc_name) for pvc_name in pvc_names), return_exceptions=True
+        )
 
-            # Rotate old snapshots if we exceed the limit
-            await self._rotate_snapshots(project_id, db, pvc_name=pvc_name)
+        errors: list[str] = []
+        created: list[tuple[str, int | None, int]] = []
+        for pvc_name, result in zip(pvc_names, results, strict=True):
+            if isinstance(result, ApiException):
+                errors.append(
+                    f"Kubernetes API error creating snapshot for {pvc_name}: {result.reason}"
+                )
+            elif isinstance(result, BaseException):
+                errors.append(f"Failed to create snapshot for {pvc_name}: {result}")
+            else:
+                logger.info(f"[SNAPSHOT] ✅ VolumeSnapshot created: {snapshot_names[pvc_name]}")
+                created.append((pvc_name, *result))
+        for error_msg in errors:
+            logger.error(f"[SNAPSHOT] ❌ {error_msg}")
 
-            # Mark existing snapshots for this PVC as not latest
-            await db.execute(
-                update(ProjectSnapshot)
-                .where(
-                    and_(
-                        ProjectSnapshot.project_id == project_id,
-                        ProjectSnapshot.pvc_name == pvc_name,
+        records: list[ProjectSnapshot] = []
+        try:
+            for pvc_name, volume_size_bytes, create_ms in created:
+                # Rotate old snapshots if we exceed the limit
+                await self._rotate_snapshots(project_id, db, pvc_name=pvc_name)
+
+                # Mark existing snapshots for this PVC as not latest
+                await db.execute(
+                    update(ProjectSnapshot)
+                    .where(
+                        and_(
+                            ProjectSnapshot.project_id == project_id,
+                            ProjectSnapshot.pvc_name == pvc_name,
+                        )
                     )
+                    .values(is_latest=False)
                 )
-                .values(is_latest=False)
-            )
 
-            # Create database record
-            snapshot_record = ProjectSnapshot(
-                project_id=project_id,
-                user_id=user_id,
-                snapshot_name=snapshot_name,
-                snapshot_namespace=namespace,
-                pvc_name=pvc_name,
-                volume_size_bytes=volume_size_bytes,
-                snapshot_type=snapshot_type,
-                status="pending",
-                label=label or ("Auto-save" if snapshot_type == "hibernation" else "Manual save"),
-                is_latest=True,
-                is_soft_deleted=False,
-            )
-            db.add(snapshot_record)
-            await db.commit()
-            await db.refresh(snapshot_record)
-
-            return snapshot_record, None
+                # Create database record
+                snapshot_record = ProjectSnapshot(
+                    project_id=project_id,
+                    user_id=user_id,
+                    snapshot_name=snapshot_names[pvc_name],
+                    snapshot_namespace=namespace,
+                    pvc_name=pvc_name,
+                    volume_size_bytes=volume_size_bytes,
+                    snapshot_type=snapshot_type,
+                    status="pending",
+                    label=label
+                    or ("Auto-save" if snapshot_type == "hibernation" else "Manual save"),
+                    is_latest=True,
+                    is_soft_deleted=False,
+                    phase_timings={"create_ms": create_ms},
+                )
+                db.add(snapshot_record)
+                records.append(snapshot_record)
 
-        except ApiException as e:
-            error_msg = f"Kubernetes API error creating snapshot: {e.reason}"
-            logger.error(f"[SNAPSHOT] ❌ {error_msg}")
-            return None, error_msg
+            if records:
+                await db.commit()
+                for snapshot_record in records:
+                    await db.refresh(snapshot_record)
         except Exception as e:
-            error_msg = f"Failed to create snapshot: {str(e)}"
+            error_msg = f"Failed to record snapshots: {str(e)}"
             logger.error(f"[SNAPSHOT] ❌ {error_msg}", exc_info=True)
-            return None, error_msg
+            return [], error_msg
+
+        return records, "; ".join(errors) or None
+
+    async def _create_volumesnapshot(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        namespace: str,
+        snapshot_name: str,
+        snapshot_type: str,
+        pvc_name: str,
+    ) -> None:
+        """Create the Kubernetes VolumeSnapshot object (no DB access)."""
+        snapshot_manifest = {
+            "apiVersion": f"{self.snapshot_group}/{self.snapshot_version}",
+            "kind": "VolumeSnapshot",
+            "metadata": {
+                "name": snapshot_name,
+                "namespace": namespace,
+                "labels": {
+                    "app": "tesslate",
+                    "managed-by": "tesslate-backend",
+                    "project-id": str(project_id),
+                    "user-id": str(user_id),
+                    "snapshot-type": snapshot_type,
+                },
+            },
+            "spec": {
+                "volumeSnapshotClassName": self.snapshot_class,
+                "source": {"persistentVolumeClaimName": pvc_name},
+            },
+        }
+
+        await asyncio.to_thread(
+            self.custom_api.create_namespaced_custom_object,
+            group=self.snapshot_group,
+            version=self.snapshot_version,
+            namespace=namespace,
+            plural=self.snapshot_plural,
+            body=snapshot_manifest,
+        )
 
     async def wait_for_snapshot_ready(
         self, snapshot: ProjectSnapshot, db: AsyncSession, timeout_seconds: int | None = None
@@ -199,18 +302,87 @@ class SnapshotManager:
         Returns:
             Tuple of (success, error message or None)
         """
+        return await self.wait_for_snapshots_ready([snapshot], db, timeout_seconds)
+
+    async def wait_for_snapshots_ready(
+        self,
+        snapshots: list[ProjectSnapshot],
+        db: AsyncSession,
+        timeout_seconds: int | None = None,
+    ) -> tuple[bool, str | None]:
+        """
+        Wait for several VolumeSnapshots to become ready.
+
+        The snapshots are polled concurrently, so the total wait is that of the
+        slowest snapshot rather than the sum. Status, ``ready_at`` and the
+        ``ready_ms`` phase timing are written afterwards in one commit.
+
+        CRITICAL: This MUST return True before deleting the source PVCs.
+
+        Args:
+            snapshots: ProjectSnapshot records from create_snapshots()
+            db: Database session
+            timeout_seconds: Maximum wait time per snapshot (default from config)
+
+        Returns:
+            Tuple of (all ready, error message or None)
+        """
         if timeout_seconds is None:
             timeout_seconds = self.settings.k8s_snapshot_ready_timeout_seconds
 
+        results = await asyncio.gather(
+            *(
+                self._poll_until_ready(
+                    snapshot.snapshot_name, snapshot.snapshot_namespace, timeout_seconds
+                )
+                for snapshot in snapshots
+            )
+        )
+
+        errors: list[str] = []
+        project = None
+        for snapshot, (ready, error_msg, ready_ms) in zip(snapshots, results, strict=True):
+            _record_phase(snapshot, "ready_ms", ready_ms)
+            if not ready:
+                snapshot.status = "error"
+                errors.append(error_msg or f"Snapshot {snapshot.snapshot_name} failed")
+                continue
+
+            snapshot.status = "ready"
+            snapshot.ready_at = datetime.now(UTC)
+
+            # Update project's latest_snapshot_id
+            if project is None:
+                project = await db.get(Project, snapshot.project_id)
+            if project:
+                project.latest_snapshot_id = snapshot.id
+
+        await db.commit()
+
+        if errors:
+            return False, "; ".join(errors)
+        return True, None
+
+    async def _poll_until_ready(
+        self, snapshot_name: str, namespace: str, timeout_seconds: int
+    ) -> tuple[bool, str | None, int]:
+        """
+        Poll a VolumeSnapshot until readyToUse, a 404, or the timeout.
+
+        Touches only the Kubernetes API so several polls can run concurrently.
+
+        Returns:
+            Tuple of (ready, error message or None, elapsed milliseconds)
+        """
         logger.info(
-            f"[SNAPSHOT] Waiting for snapshot {snapshot.snapshot_name} to become ready (timeout: {timeout_seconds}s)"
+            f"[SNAPSHOT] Waiting for snapshot {snapshot_name} to become ready (timeout: {timeout_seconds}s)"
         )
 
-        start_time = datetime.now(UTC)
+        started = time.monotonic()
         last_status: dict[str, Any] = {}
 
         while True:
-            elapsed = (datetime.now(UTC) - start_time).total_seconds()
+            elapsed = time.monotonic() - started
             if elapsed >= timeout_seconds:
                 status_bits = []
                 if "readyToUse" in last_status:
@@ -222,18 +394,13 @@ class SnapshotManager:
                         f"content={last_status.get('boundVolumeSnapshotContentName')}"
                     )
                 error_msg = (
-                    f"Snapshot {snapshot.snapshot_name} did not become ready within "
+                    f"Snapshot {snapshot_name} did not become ready within "
                     f"{timeout_seconds} seconds"
                 )
                 if status_bits:
                     error_msg = f"{error_msg} (last_status: {', '.join(status_bits)})"
                 logger.error(f"[SNAPSHOT] ❌ {error_msg}")
-
-                # Update status to error
-                snapshot.status = "error"
-                await db.commit()
-
-                return False, error_msg
+                return False, error_msg, _elapsed_ms(started)
 
             try:
                 # Get snapshot status from Kubernetes
@@ -241,38 +408,23 @@ class SnapshotManager:
                     self.custom_api.get_namespaced_custom_object,
                     group=self.snapshot_group,
                     version=self.snapshot_version,
-                    namespace=snapshot.snapshot_namespace,
+                    namespace=namespace,
                     plural=self.snapshot_plural,
-                    name=snapshot.snapshot_name,
+                    name=snapshot_name,
                 )
 
                 status = k8s_snapshot.get("status", {})
                 last_status = status
-                ready_to_use = status.get("readyToUse", False)
-
-                if ready_to_use:
-                    logger.info(
-                        f"[SNAPSHOT] ✅ Snapshot {snapshot.snapshot_name} is ready ({elapsed:.1f}s)"
-                    )
 
-                    # Update database record
-                    snapshot.status = "ready"
-                    snapshot.ready_at = datetime.now(UTC)
-
-                    # Update project's latest_snapshot_id
-                    project = await db.get(Project, snapshot.project_id)
-                    if project:
-                        project.latest_snapshot_id = snapshot.id
-
-                    await db.commit()
-
-                    return True, None
+                if status.get("readyToUse", False):
+                    logger.info(f"[SNAPSHOT] ✅ Snapshot {snapshot_name} is ready ({elapsed:.1f}s)")
+                    return True, None, _elapsed_ms(started)
 
                 # Log progress
                 if int(elapsed) % 5 == 0:
                     logger.info(
                         "[SNAPSHOT] Waiting for %s... (%ss, ready=%s, error=%s, content=%s)",
-                        snapshot.snapshot_name,
+                        snapshot_name,
                         int(elapsed),
                         status.get("readyToUse"),
                         status.get("error"),
@@ -281,11 +433,9 @@ class SnapshotManager:
 
             except ApiException as e:
                 if e.status == 404:
-                    error_msg = f"Snapshot {snapshot.snapshot_name} not found"
+                    error_msg = f"Snapshot {snapshot_name} not found"
                     logger.error(f"[SNAPSHOT] ❌ {error_msg}")
-                    snapshot.status = "error"
-                    await db.commit()
-                    return False, error_msg
+                    return False, error_msg, _elapsed_ms(started)
                 logger.warning(f"[SNAPSHOT] API error checking snapshot status: {e.reason}")
             except Exception as e:
                 logger.warning(f"[SNAPSHOT] Error checking snapshot status: {e}")
@@ -316,8 +466,6 @@ class SnapshotManager:
         Returns:
             Tuple of (success, error message or None)
         """
-        namespace = self._get_project_namespace(str(project_id))
-
         # Get snapshot record
         if snapshot_id:
             snapshot = await db.get(ProjectSnapshot, snapshot_id)
@@ -332,6 +480,68 @@ class SnapshotManager:
             if not snapshot:
                 return False, f"No ready snapshot found for project {project_id} PVC {pvc_name}"
 
+        results = await self.restore_from_snapshots(project_id, user_id, db, {pvc_name: snapshot})
+        return results[pvc_name]
+
+    async def restore_from_snapshots(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        db: AsyncSession,
+        snapshots: dict[str, ProjectSnapshot],
+    ) -> dict[str, tuple[bool, str | None]]:
+        """
+        Create PVCs from several VolumeSnapshots in parallel.
+
+        Each PVC restore (VolumeSnapshot recreation + PVC creation) runs
+        concurrently; the ``restore_ms`` phase timing is then written to each
+        snapshot record in one commit.
+
+        Args:
+            project_id: Project UUID
+            user_id: User UUID
+            db: Database session
+            snapshots: Snapshot record to restore, keyed by target PVC name
+
+        Returns:
+            Mapping of PVC name to (success, error message or None)
+        """
+        namespace = self._get_project_namespace(str(project_id))
+
+        async def _timed(pvc_name: str, snapshot: ProjectSnapshot):
+            started = time.monotonic()
+            result = await self._restore_pvc(project_id, user_id, namespace, snapshot, pvc_name)
+            return result, _elapsed_ms(started)
+
+        results = await asyncio.gather(
+            *(_timed(pvc_name, snapshot) for pvc_name, snapshot in snapshots.items())
+        )
+
+        outcome: dict[str, tuple[bool, str | None]] = {}
+        for (pvc_name, snapshot), (result, restore_ms) in zip(
+            snapshots.items(), results, strict=True
+        ):
+            _record_phase(snapshot, "restore_ms", restore_ms)
+            outcome[pvc_name] = result
+
+        try:
+            await db.commit()
+        except Exception as e:
+            # Timings are diagnostic only - never fail a restore over them.
+            logger.warning(f"[SNAPSHOT] Could not record restore timings: {e}")
+            await db.rollback()
+
+        return outcome
+
+    async def _restore_pvc(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        namespace: str,
+        snapshot: ProjectSnapshot,
+        pvc_name: str,
+    ) -> tuple[bool, str | None]:
+        """Create one PVC from a VolumeSnapshot (no DB access)."""
         logger.info(
             f"[SNAPSHOT] Restoring from snapshot {snapshot.snapshot_name} to PVC {pvc_name}"
         )
@@ -777,27 +987,25 @@ class SnapshotManager:
         hibernation_snapshots = [s for s in snapshots if s.snapshot_type == "hibernation"]
         manual_snapshots = [s for s in snapshots if s.snapshot_type == "manual"]
 
-        deleted = 0
-        # Delete oldest hibernation snapshots first
-        for snapshot in hibernation_snapshots:
-            if deleted >= to_delete:
-                break
-            await self._delete_snapshot(snapshot, db)
-            deleted += 1
+        # Delete oldest hibernation snapshots first, then oldest manual ones
+        victims = (hibernation_snapshots + manual_snapshots)[:to_delete]
 
-        # If still need to delete, remove oldest manual snapshots
-        for snapshot in manual_snapshots:
-            if deleted >= to_delete:
-                break
-            await self._delete_snapshot(snapshot, db)
-            deleted += 1
+        # The Kubernetes deletes are independent, so issue them concurrently;
+        # the DB deletions stay sequential on the shared session.
+        await asyncio.gather(*(self._delete_k8s_snapshot(snapshot) for snapshot in victims))
+        for snapshot in victims:
+            await self._delete_snapshot_record(snapshot, db)
 
-        logger.info(f"[SNAPSHOT] Rotated {deleted} old snapshots for project {project_id}")
+        logger.info(f"[SNAPSHOT] Rotated {len(victims)} old snapshots for project {project_id}")
 
     async def _delete_snapshot(self, snapshot: ProjectSnapshot, db: AsyncSession) -> None:
         """Delete a snapshot from both Kubernetes and database."""
-        snapshot_content_name = None
+        await self._delete_k8s_snapshot(snapshot)
+        await self._delete_snapshot_record(snapshot, db)
 
+    async def _delete_k8s_snapshot(self, snapshot: ProjectSnapshot) -> None:
+        """Delete a snapshot's VolumeSnapshot and VolumeSnapshotContent (no DB access)."""
+        snapshot_content_name = None
         try:
             # First, get the VolumeSnapshot to find its bound VolumeSnapshotContent
             try:
@@ -855,6 +1063,8 @@ class SnapshotManager:
                         f"[SNAPSHOT] Failed to delete VolumeSnapshotContent {snapshot_content_name}: {e.reason}"
                     )
 
+    async def _delete_snapshot_record(self, snapshot: ProjectSnapshot, db: AsyncSession) -> None:
+        """Delete a snapshot's DB row with its own commit."""
         # Delete from database and commit immediately. An independent commit here
         # ensures this deletion survives even if the caller's outer transaction is
         # rolled back — for example, when create_snapshot fails after _rotate_snapshots
@@ -0,0 +1,142 @@
+"""
+Streaming response assembly for OpenAI-compatible chat completions.
+
+Concatenating each delta onto a string (``text += delta``) copies the whole
+accumulated text on every chunk. For long generations and large tool-call
+arguments (a ``write_file`` carrying a whole file arrives as thousands of
+small argument fragments) that is quadratic in CPU and churns memory. The
+assembler keeps fragments in lists and joins them once at the end.
+
+Text deltas can optionally be coalesced for downstream consumers: with
+``coalesce_chars`` above 1, instead of one event per provider chunk, pending
+text is released once it reaches ``coalesce_chars`` or has been held for
+``coalesce_seconds`` (checked as chunks arrive), and always before tool
+calls or the end of the stream.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+# Provider-specific prompt cache counters passed through when present.
+_CACHE_USAGE_FIELDS = ("cache_creation_input_tokens", "cache_read_input_tokens", "cached_tokens")
+
+
+def usage_from_chunk(raw_usage: Any) -> dict[str, Any]:
+    """Token usage dict from a chunk's ``usage`` object."""
+    usage = {
+        "prompt_tokens": getattr(raw_usage, "prompt_tokens", 0),
+        "completion_tokens": getattr(raw_usage, "completion_tokens", 0),
+    }
+    for name in _CACHE_USAGE_FIELDS:
+        val = getattr(raw_usage, name, None)
+        if val:
+            usage[name] = val
+    # OpenAI reports prompt cache hits under prompt_tokens_details.
+    details = getattr(raw_usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached and "cached_tokens" not in usage:
+        usage["cached_tokens"] = cached
+    return usage
+
+
+@dataclass
+class _ToolCallParts:
+    id: str = ""
+    name: str = ""
+    arguments: list[str] = field(default_factory=list)
+
+
+class StreamAssembler:
+    """Accumulates one streamed completion: text, tool calls, finish reason, usage."""
+
+    def __init__(self, coalesce_chars: int = 0, coalesce_seconds: float = 0.0) -> None:
+        self.coalesce_chars = coalesce_chars
+        self.coalesce_seconds = coalesce_seconds
+        self.finish_reason: str | None = None
+        # time.monotonic() of the first text or tool-call delta (time to first token)
+        self.first_delta_at: float | None = None
+        self.usage: dict[str, Any] | None = None
+        self._text: list[str] = []
+        self._text_chars = 0
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._pending_since = 0.0
+        self._tool_calls: dict[int, _ToolCallParts] = {}
+
+    def feed(self, chunk: Any) -> str | None:
+        """Absorb one stream chunk; returns text to emit now, if any."""
+        raw_usage = getattr(chunk, "usage", None)
+        if raw_usage:
+            self.usage = usage_from_chunk(raw_usage)
+        if not chunk.choices:
+            return None
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+        delta = choice.delta
+        if self.first_delta_at is None and (delta.content or delta.tool_calls):
+            self.first_delta_at = time.monotonic()
+        emit = self._add_text(delta.content) if delta.content else None
+        if delta.tool_calls:
+            for tc_delta in delta.tool_calls:
+                self._add_tool_call_delta(tc_delta)
+        return emit
+
+    def _add_text(self, text: str) -> str | None:
+        self._text.append(text)
+        self._text_chars += len(text)
+        if self.coalesce_chars <= 1:
+            return text
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= self.coalesce_chars or (
+            self.coalesce_seconds > 0
+            and time.monotonic() - self._pending_since >= self.coalesce_seconds
+        ):
+            return self.drain()
+        return None
+
+    def _add_tool_call_delta(self, tc_delta: Any) -> None:
+        parts = self._tool_calls.get(tc_delta.index)
+        if parts is None:
+            parts = self._tool_calls[tc_delta.index] = _ToolCallParts()
+        if tc_delta.id:
+            parts.id = tc_delta.id
+        func = tc_delta.function
+        if func:
+            if func.name:
+                parts.name = func.name
+            if func.arguments:
+                parts.arguments.append(func.arguments)
+
+    def drain(self) -> str | None:
+        """Release coalesced text still held back."""
+        if not self._pending:
+            return None
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_chars = 0
+        return text
+
+    @property
+    def content(self) -> str:
+        return "".join(self._text)
+
+    @property
+    def content_chars(self) -> int:
+        return self._text_chars
+
+    def tool_calls(self) -> list[dict[str, Any]]:
+        """Completed tool calls in index order, arguments joined."""
+        return [
+            {
+                "id": parts.id,
+                "function": {"name": parts.name, "arguments": "".join(parts.arguments)},
+            }
+            for _, parts in sorted(self._tool_calls.items())
+        ]
@@ -0,0 +1,457 @@
+"""
+Phase-level latency profile of agent tasks.
+
+``execute_agent_task`` runs a long, sequential list of phases (ticket claim,
+project load, lock, agent resolution, MCP context, context build, message
+creation, the agent loop, finalisation, ...). Each task gets a
+:class:`TaskProfile`: the worker marks phase boundaries with
+:meth:`TaskProfile.phase`, and model and tool calls made while the task runs
+are recorded as spans through :data:`current_task_profile`
+(``model_traffic.record_model_call`` and ``tool_memo.execute_memoized`` feed
+it, so every adapter and registry path is covered).
+
+When the task ends:
+
+- the profile is stored in the assistant ``Message`` metadata under
+  ``"profile"`` (phases up to finalisation; later phases only reach the
+  histograms),
+- every phase, model and tool duration, the task total and the time to first
+  model token are added to fixed-bucket histograms, flushed to Redis so the
+  admin endpoint on any API replica sees what the workers recorded,
+- a one-line summary is kept in a short recent-tasks list.
+
+``GET /api/admin/metrics/agent-phases`` serves the histograms and recent
+tasks; ``GET /api/admin/agent-profiles/{message_id}`` renders a stored
+profile as a waterfall.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from .redis_batch import RedisBatchWriter
+
+logger = logging.getLogger(__name__)
+
+_REDIS_HIST_KEY = "agent_profile:hist"
+_REDIS_RECENT_KEY = "agent_profile:recent"
+
+# Histogram bucket upper bounds in milliseconds (plus an implicit +Inf).
+BUCKETS_MS: tuple[int, ...] = (
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    60000,
+    120000,
+    300000,
+)
+
+
+# =============================================================================
+# Profile
+# =============================================================================
+
+
+@dataclass
+class Span:
+    """One timed interval, as an offset from the start of the task."""
+
+    kind: str  # "phase", "model", "tool" or "checkpoint"
+    name: str
+    start_ms: float
+    duration_ms: float | None = None  # None while a phase is still running
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {
+            "kind": self.kind,
+            "name": self.name,
+            "start_ms": self.start_ms,
+            "duration_ms": self.duration_ms,
+        }
+        if self.attrs:
+            data["attrs"] = self.attrs
+        return data
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class TaskProfile:
+    """Phase and call timings of one agent task."""
+
+    def __init__(self, task_id: str, *, agent: str | None = None, max_spans: int = 500) -> None:
+        self.task_id = task_id
+        self.agent = agent
+        self.message_id: str | None = None
+        self.max_spans = max_spans
+        self.started = time.monotonic()
+        self.ended: float | None = None
+        self.first_token_ms: float | None = None
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self._phase: Span | None = None
+
+    def _offset(self, at: float) -> float:
+        return _ms(at - self.started)
+
+    def _add(self, span: Span) -> Span | None:
+        # Phases are few and always kept; calls beyond the cap are counted only.
+        if span.kind != "phase" and len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return None
+        self.spans.append(span)
+        return span
+
+    def phase(self, name: str) -> None:
+        """End the running phase and start ``name``."""
+        now = time.monotonic()
+        self.end_phase(now)
+        self._phase = self._add(Span("phase", name, self._offset(now)))
+
+    def end_phase(self, now: float | None = None) -> None:
+        """End the running phase, if any."""
+        if self._phase is not None:
+            now = time.monotonic() if now is None else now
+            self._phase.duration_ms = round(self._offset(now) - self._phase.start_ms, 1)
+            self._phase = None
+
+    def record(self, kind: str, name: str, started: float, **attrs: Any) -> None:
+        """Record a call that started at ``started`` (``time.monotonic()``) and ends now."""
+        start_ms = self._offset(started)
+        attrs = {k: v for k, v in attrs.items() if v is not None}
+        ttft = attrs.get("ttft_ms")
+        if kind == "model" and ttft is not None and self.first_token_ms is None:
+            self.first_token_ms = round(start_ms + ttft, 1)
+        self._add(Span(kind, name, start_ms, _ms(time.monotonic() - started), attrs))
+
+    def finish(self) -> None:
+        """End the running phase and stop the task clock."""
+        if self.ended is None:
+            self.ended = time.monotonic()
+            self.end_phase(self.ended)
+
+    @property
+    def total_ms(self) -> float:
+        return self._offset(self.ended if self.ended is not None else time.monotonic())
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-safe snapshot; a phase still running is reported up to now."""
+        total = self.total_ms
+        spans = []
+        for span in self.spans:
+            data = span.to_dict()
+            if span.duration_ms is None:
+                data["duration_ms"] = round(total - span.start_ms, 1)
+                data["open"] = True
+            spans.append(data)
+        return {
+            "task_id": self.task_id,
+            "total_ms": total,
+            "first_token_ms": self.first_token_ms,
+            "spans": spans,
+            "dropped_spans": self.dropped,
+        }
+
+    def summary(self) -> dict[str, Any]:
+        """One line for the recent-tasks list: totals and the slowest phase."""
+        phases = [s for s in self.spans if s.kind == "phase" and s.duration_ms is not None]
+        slowest = max(phases, key=lambda s: s.duration_ms, default=None)
+        by_kind: dict[str, float] = {}
+        for span in self.spans:
+            if span.kind != "phase" and span.duration_ms is not None:
+                by_kind[span.kind] = round(by_kind.get(span.kind, 0.0) + span.duration_ms, 1)
+        return {
+            "task_id": self.task_id,
+            "message_id": self.message_id,
+            "agent": self.agent,
+            "total_ms": self.total_ms,
+            "first_token_ms": self.first_token_ms,
+            "slowest_phase": (
+                {"name": slowest.name, "duration_ms": slowest.duration_ms} if slowest else None
+            ),
+            "call_ms": by_kind,
+            "at": time.time(),
+        }
+
+
+# Set by the worker for the duration of an agent task; model and tool calls
+# made outside a task are not profiled.
+current_task_profile: ContextVar[TaskProfile | None] = ContextVar(
+    "current_task_profile", default=None
+)
+
+
+def record_task_span(kind: str, name: str, started: float, **attrs: Any) -> None:
+    """Record a call into the current task's profile; never raises."""
+    profile = current_task_profile.get()
+    if profile is None:
+        return
+    try:
+        profile.record(kind, name, started, **attrs)
+    except Exception as e:  # profiling must never break a task
+        logger.debug("[TASK-PROFILE] record failed: %s", e)
+
+
+@contextmanager
+def task_span(kind: str, name: str, **attrs: Any) -> Iterator[None]:
+    """Time the enclosed block as a span of the current task (no-op outside a task)."""
+    if current_task_profile.get() is None:
+        yield
+        return
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        record_task_span(kind, name, started, **attrs)
+
+
+# =============================================================================
+# Histograms
+# =============================================================================
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.sum_ms = 0
+        self.count = 0
+
+    def observe(self, ms: float) -> None:
+        index = next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))
+        self.counts[index] += 1
+        self.sum_ms += round(ms)
+        self.count += 1
+
+    def add(self, other: _Histogram) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts, strict=True)]
+        self.sum_ms += other.sum_ms
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate by linear interpolation inside the bucket (like Prometheus)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS_MS[i - 1] if i else 0
+                if i == len(BUCKETS_MS):
+                    return float(lower)
+                return round(lower + (BUCKETS_MS[i] - lower) * (rank - seen) / n, 1)
+            seen += n
+        return float(BUCKETS_MS[-1])
+
+    def to_dict(self) -> dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, n in zip([*map(str, BUCKETS_MS), "+Inf"], self.counts, strict=True):
+            cumulative += n
+            buckets[bound] = cumulative
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "mean_ms": round(self.sum_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": buckets,
+        }
+
+
+def _observations(profile: TaskProfile) -> list[tuple[tuple[str, str], float]]:
+    samples = [(("task", "total"), profile.total_ms)]
+    if profile.first_token_ms is not None:
+        samples.append((("task", "first_token"), profile.first_token_ms))
+    for span in profile.spans:
+        if span.duration_ms is not None:
+            samples.append(((span.kind, span.name), span.duration_ms))
+    return samples
+
+
+class TaskProfileStats(RedisBatchWriter):
+    """Latency histograms by (kind, name) and the most recent task summaries."""
+
+    log_prefix = "[TASK-PROFILE]"
+
+    def __init__(self, *, max_recent: int = 50) -> None:
+        super().__init__()
+        self._hist: dict[tuple[str, str], _Histogram] = {}
+        self._unflushed: dict[tuple[str, str], _Histogram] = {}
+        self._recent: deque[dict[str, Any]] = deque(maxlen=max_recent)
+        self._unflushed_recent: list[dict[str, Any]] = []
+
+    def observe(self, profile: TaskProfile) -> None:
+        """Add a finished task's timings."""
+        for key, ms in _observations(profile):
+            for target in (self._hist, self._unflushed):
+                target.setdefault(key, _Histogram()).observe(ms)
+        summary = profile.summary()
+        self._recent.append(summary)
+        self._unflushed_recent.append(summary)
+        self._schedule_flush()
+
+    def _has_unflushed(self) -> bool:
+        return bool(self._unflushed or self._unflushed_recent)
+
+    def _take_unflushed(self) -> tuple[dict, list]:
+        batch = (self._unflushed, self._unflushed_recent)
+        self._unflushed, self._unflushed_recent = {}, []
+        return batch
+
+    def _queue_writes(self, pipe: Any, batch: tuple[dict, list]) -> None:
+        hist, recent = batch
+        for (kind, name), h in hist.items():
+            for i, n in enumerate(h.counts):
+                if n:
+                    pipe.hincrby(_REDIS_HIST_KEY, f"{kind}|{name}|{i}", n)
+            pipe.hincrby(_REDIS_HIST_KEY, f"{kind}|{name}|sum", h.sum_ms)
+        for summary in recent:
+            pipe.lpush(_REDIS_RECENT_KEY, json.dumps(summary))
+        if recent:
+            pipe.ltrim(_REDIS_RECENT_KEY, 0, self._recent.maxlen - 1)
+
+    def local_stats(self) -> dict[str, Any]:
+        """Histograms and recent tasks from this process only."""
+        return self._build_stats(self._hist, list(reversed(self._recent)))
+
+    @staticmethod
+    def _build_stats(
+        hist: dict[tuple[str, str], _Histogram], recent: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        grouped: dict[str, dict[str, Any]] = {}
+        for (kind, name), h in sorted(hist.items()):
+            grouped.setdefault(kind, {})[name] = h.to_dict()
+        return {
+            "buckets_ms": list(BUCKETS_MS),
+            "task": grouped.pop("task", {}),
+            "phases": grouped.pop("phase", {}),
+            "models": grouped.pop("model", {}),
+            "tools": grouped.pop("tool", {}),
+            **grouped,
+            "recent": recent,
+        }
+
+    async def stats(self) -> dict[str, Any]:
+        """Histograms and recent tasks from every process (this one without Redis)."""
+
+        def _reads(pipe: Any) -> None:
+            pipe.hgetall(_REDIS_HIST_KEY)
+            pipe.lrange(_REDIS_RECENT_KEY, 0, -1)
+
+        rows = await self._read_redis(_reads)
+        if rows is None:
+            return self.local_stats()
+        raw_hist, raw_recent = rows
+
+        hist: dict[tuple[str, str], _Histogram] = {}
+        for field_name, value in (raw_hist or {}).items():
+            kind, _, rest = field_name.partition("|")
+            name, _, slot = rest.rpartition("|")
+            h = hist.setdefault((kind, name), _Histogram())
+            if slot == "sum":
+                h.sum_ms += int(value)
+            elif slot.isdigit() and int(slot) < len(h.counts):
+                h.counts[int(slot)] += int(value)
+                h.count += int(value)
+        recent = []
+        for raw in raw_recent or []:
+            try:
+                recent.append(json.loads(raw))
+            except ValueError:
+                continue
+        return self._build_stats(hist, recent)
+
+
+# =============================================================================
+# Waterfall
+# =============================================================================
+
+
+def render_waterfall(profile: dict[str, Any], width: int = 60) -> dict[str, Any]:
+    """Lay out a stored profile as waterfall rows with a text bar per span.
+
+    Phases are at depth 0 and the model/tool calls made during them at
+    depth 1, ordered by start time.
+    """
+    spans = profile.get("spans") or []
+    total = profile.get("total_ms") or max(
+        (s["start_ms"] + (s.get("duration_ms") or 0) for s in spans), default=0
+    )
+    scale = width / total if total else 0
+    rows = []
+    for span in sorted(spans, key=lambda s: (s["start_ms"], s["kind"] != "phase")):
+        duration = span.get("duration_ms") or 0
+        lo = min(int(span["start_ms"] * scale), width - 1)
+        hi = max(lo + 1, min(round((span["start_ms"] + duration) * scale), width))
+        rows.append(
+            {
+                **span,
+                "depth": 0 if span["kind"] == "phase" else 1,
+                "share": round(duration / total, 3) if total else 0.0,
+                "bar": (" " * lo + "█" * (hi - lo)).ljust(width),
+            }
+        )
+    return {
+        "task_id": profile.get("task_id"),
+        "total_ms": total,
+        "first_token_ms": profile.get("first_token_ms"),
+        "dropped_spans": profile.get("dropped_spans", 0),
+        "rows": rows,
+    }
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_instance: TaskProfileStats | None = None
+
+
+def get_task_profile_stats() -> TaskProfileStats:
+    """Get the process-wide task profile histograms."""
+    global _instance
+    if _instance is None:
+        _instance = TaskProfileStats()
+    return _instance
+
+
+def start_task_profile(task_id: str) -> TaskProfile:
+    """Create the profile of an agent task."""
+    from ..config import get_settings
+
+    return TaskProfile(task_id, max_spans=get_settings().agent_task_profile_max_spans)
+
+
+def finish_task_profile(profile: TaskProfile) -> None:
+    """Stop the profile's clock and add it to the histograms; never raises."""
+    try:
+        profile.finish()
+        get_task_profile_stats().observe(profile)
+        logger.info(
+            "[TASK-PROFILE] task %s: %.0fms total, first token at %s, phases: %s",
+            profile.task_id,
+            profile.total_ms,
+            f"{profile.first_token_ms:.0f}ms" if profile.first_token_ms is not None else "-",
+            ", ".join(
+                f"{s.name}={s.duration_ms:.0f}ms" for s in profile.spans if s.kind == "phase"
+            ),
+        )
+    except Exception as e:
+        logger.debug("[TASK-PROFILE] finish failed: %s", e)
@@ -10,14 +10,16 @@ No local state machine, no node selection, no S3 interaction.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from ..config import get_settings
 from .hub_client import HubClient
 
 if TYPE_CHECKING:
-    from .fileops_client import FileOpsClient
+    from .fileops_client import FileOpsChannelPool, FileOpsClient
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +48,13 @@ class VolumeManager:
     def __init__(self) -> None:
         settings = get_settings()
         self._hub = HubClient(settings.volume_hub_address)
+        # volume_id → (fileops_address, expires_at). Lets FileOps calls skip
+        # the Hub round-trip; dropped whenever the route is known to be stale.
+        self._route_ttl = settings.fileops_route_cache_ttl_seconds
+        self._routes: dict[str, tuple[str, float]] = {}
+        self._route_inflight: dict[str, asyncio.Future[str]] = {}
+        self._channel_pool_size = settings.fileops_channel_pool_size
+        self._channels: FileOpsChannelPool | None = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -92,6 +101,7 @@ class VolumeManager:
 
     async def delete_volume(self, volume_id: str) -> None:
         """Delete from Hub + S3 + all node caches. Idempotent."""
+        self.invalidate_fileops_route(volume_id)
         await self._hub.delete_volume(volume_id)
         logger.info("[VOLUME] Deleted volume %s", volume_id)
 
@@ -113,6 +123,7 @@ class VolumeManager:
             budget_cpu=budget_cpu,
             budget_mem=budget_mem,
         )
+        self.invalidate_fileops_route(volume_id)
         logger.info(
             "[VOLUME] Volume %s cached on node %s (candidates=%s)",
             volume_id,
@@ -128,6 +139,7 @@ class VolumeManager:
         volume is cached there before transferring.
         """
         await self._hub.transfer_ownership(volume_id, new_node)
+        self.invalidate_fileops_route(volume_id)
         logger.info("[VOLUME] Ownership transferred: volume %s → node %s", volume_id, new_node)
 
     async def trigger_sync(self, volume_id: str) -> None:
@@ -277,6 +289,8 @@ class VolumeManager:
         if state == "cached":
             return resp
 
+        self.invalidate_fileops_route(volume_id)
+
         if state == "restoring":
             raise VolumeRestoringError(volume_id)
 
@@ -288,17 +302,81 @@ class VolumeManager:
     async def get_fileops_client(self, volume_id: str) -> FileOpsClient:
         """Get a ready-to-use FileOps client routed via the Hub.
 
+        The route is cached for ``fileops_route_cache_ttl_seconds`` and the
+        client borrows a pooled channel, so a warm call costs one RPC. Closing
+        the client (``async with``) leaves the pooled channel open.
+
         Raises:
             VolumeRestoringError: If volume is being restored from S3.
             VolumeUnavailableError: If restore failed or no CAS data.
         """
         from .fileops_client import FileOpsClient
 
+        address = self._cached_route(volume_id)
+        if address is None:
+            address = await self._resolve_fileops_address(volume_id)
+        return FileOpsClient(address, channel=self._channel_pool().get(address))
+
+    def has_fileops_route(self, volume_id: str) -> bool:
+        """True if the next get_fileops_client() will skip the Hub."""
+        return self._cached_route(volume_id) is not None
+
+    def invalidate_fileops_route(self, volume_id: str, *, drop_channel: bool = False) -> None:
+        """Forget the cached route; ``drop_channel`` also closes its node's channel."""
+        route = self._routes.pop(volume_id, None)
+        if route and drop_channel and self._channels is not None:
+            self._channels.discard(route[0])
+
+    async def close(self) -> None:
+        """Close pooled FileOps channels (app shutdown)."""
+        self._routes.clear()
+        if self._channels is not None:
+            await self._channels.close()
+            self._channels = None
+
+    def _channel_pool(self) -> FileOpsChannelPool:
+        if self._channels is None:
+            from .fileops_client import FileOpsChannelPool
+
+            self._channels = FileOpsChannelPool(max_channels=self._channel_pool_size)
+        return self._channels
+
+    def _cached_route(self, volume_id: str) -> str | None:
+        route = self._routes.get(volume_id)
+        if route is None:
+            return None
+        if time.monotonic() >= route[1]:
+            del self._routes[volume_id]
+            return None
+        return route[0]
+
+    async def _resolve_fileops_address(self, volume_id: str) -> str:
+        """Resolve via the Hub, sharing one in-flight lookup per volume."""
+        pending = self._route_inflight.get(volume_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_fileops_address(volume_id))
+            self._route_inflight[volume_id] = pending
+            pending.add_done_callback(lambda _: self._route_inflight.pop(volume_id, None))
+        # Shield so one cancelled caller doesn't cancel the lookup for the rest.
+        return await asyncio.shield(pending)
+
+    async def _fetch_fileops_address(self, volume_id: str) -> str:
         resp = await self.resolve_volume(volume_id)
         address = resp.get("fileops_address", "")
         if not address:
             raise VolumeUnavailableError(f"No fileops address for {volume_id}")
-        return FileOpsClient(address)
+        if self._route_ttl > 0:
+            self._routes[volume_id] = (address, time.monotonic() + self._route_ttl)
+        return address
+
+    async def get_volume_owner(self, volume_id: str) -> str:
+        """Owner node of a volume in the Hub registry ('' if it has none).
+
+        Read-only lookup; unlike :meth:`get_volume_node` it does not raise
+        while the owner is unreachable or a restore is running.
+        """
+        resp = await self._hub.resolve_volume(volume_id)
+        return resp.get("node_name", "")
 
     async def get_volume_node(self, volume_id: str) -> str:
         """Get the live node where a volume is cached.
@@ -327,3 +405,9 @@ def get_volume_manager() -> VolumeManager:
     if _instance is None:
         _instance = VolumeManager()
     return _instance
+
+
+async def shutdown_volume_manager() -> None:
+    """Close pooled FileOps channels on app shutdown."""
+    if _instance is not None:
+        await _instance.close()
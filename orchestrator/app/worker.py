@@ -17,6 +17,7 @@ import asyncio
 import contextlib
 import logging
 import os
+from collections import OrderedDict
 from datetime import UTC, datetime
 from uuid import UUID
 
@@ -243,15 +244,43 @@ async def _contract_gate_hook(tool_name, parameters, context, tool):
     Returns ``None`` for non-automation invocations (no contract in
     context) so chat sessions are unaffected, or a tool-result envelope
     when the gate denies the call (same shape as the in-tree path).
+
+    Calls the gate lets through also take the run's lazy file checkpoint
+    first when the tool can change files (see ``LazyCheckpoint``).
     """
     from .agent.tools.registry import check_contract_gate
+    from .services.checkpoint_manager import checkpoint_before_mutation
 
-    return await check_contract_gate(
+    denied = await check_contract_gate(
         tool_name=tool_name,
         parameters=parameters,
         context=context,
         tool=tool,
     )
+    if denied is None:
+        await checkpoint_before_mutation(tool, context)
+    return denied
+
+
+# Memoized tool wrappers per tool set, keyed by the identity of the wrapped
+# Tool objects (kept alive by the cached wrappers, so ids stay unique).
+_MEMOIZED_TOOLS_CACHE_SIZE = 32
+_memoized_tools_cache: OrderedDict[tuple[int, ...], list] = OrderedDict()
+
+
+def _memoized_tools(tools: list) -> list:
+    """``memoized_tool`` wrappers for ``tools``, reused for an identical tool set."""
+    from .agent.tools.tool_memo import memoized_tool
+
+    key = tuple(id(t) for t in tools)
+    wrapped = _memoized_tools_cache.get(key)
+    if wrapped is None:
+        wrapped = _memoized_tools_cache[key] = [memoized_tool(t) for t in tools]
+        while len(_memoized_tools_cache) > _MEMOIZED_TOOLS_CACHE_SIZE:
+            _memoized_tools_cache.popitem(last=False)
+    else:
+        _memoized_tools_cache.move_to_end(key)
+    return wrapped
 
 
 def _build_submodule_registry(in_tree_registry, approval_handler=None):
@@ -271,6 +300,12 @@ def _build_submodule_registry(in_tree_registry, approval_handler=None):
     ``allowed_mcps`` / ``allowed_skills`` / ``max_compute_tier`` /
     ``max_spend_per_run_usd`` — without this the in-tree ContractGate is
     dead code on every automation dispatch (TC-04 Bug #22).
+
+    Tools are registered wrapped by ``memoized_tool`` so the run-scoped
+    read-only tool memo applies on this path too (the submodule registry
+    calls ``tool.executor`` directly). The wrappers hold no per-run state and
+    are reused across tasks for the same tool set (see
+    ``_memoized_tools``), together with their rendered prompt text.
     """
     try:
         from tesslate_agent.agent.tools.registry import ToolRegistry as SubmoduleRegistry
@@ -279,7 +314,7 @@ def _build_submodule_registry(in_tree_registry, approval_handler=None):
             approval_handler=approval_handler,
             pre_execute_hook=_contract_gate_hook,
         )
-        for tool in in_tree_registry._tools.values():
+        for tool in _memoized_tools(list(in_tree_registry._tools.values())):
             sub.register(tool)
         return sub
     except Exception as exc:
@@ -524,8 +559,13 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
         _resolve_container_name,
     )
     from .services.agent_task import AgentTaskPayload
-    from .services.model_adapters import create_model_adapter
+    from .services.model_adapters import create_model_adapter, create_routed_model_adapter
     from .services.pubsub import get_pubsub
+    from .services.task_profile import (
+        current_task_profile,
+        finish_task_profile,
+        start_task_profile,
+    )
 
     settings = get_settings()
     payload = AgentTaskPayload.from_dict(payload_dict)
@@ -545,6 +585,12 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
         UUID(payload.automation_run_id) if payload.automation_run_id else None
     )
     auto_run_hb_task: asyncio.Task | None = None
+    # Prompt-cache metrics label for this task's LLM calls (reset on exit so
+    # the in-process queue's worker loop doesn't carry it into the next job).
+    cache_scope_token = None
+    # Phase-level latency profile; model and tool calls made during the task
+    # are recorded into it through ``current_task_profile``.
+    profile = start_task_profile(task_id)
     # Counters captured during the agent loop and consumed by the
     # success-path finalize. Defaults are conservative so the early-return
     # branches (project-missing, ticket-already-claimed, etc.) still produce
@@ -580,8 +626,10 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
     if auto_run_id is not None:
         auto_run_hb_task = asyncio.create_task(_heartbeat_automation_run(auto_run_id))
 
+    profile_token = current_task_profile.set(profile)
     async with AsyncSessionLocal() as db:
         try:
+            profile.phase("ticket_claim")
             # 0. Atomic ticket checkout (desktop multi-agent orchestration)
             # If payload carries a ticket ID, claim it from "queued" → "running".
             # If the claim fails (another worker already picked it up), skip silently.
@@ -602,6 +650,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                 claimed_ticket_id = UUID(payload.agent_task_id)
 
             # 1. Load project (optional for standalone chats)
+            profile.phase("project_load")
             project = None
             if project_id:
                 result = await db.execute(select(Project).where(Project.id == UUID(project_id)))
@@ -611,6 +660,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                     return
 
             # 2. Acquire per-chat lock (allows concurrent agents across sessions)
+            profile.phase("lock")
             project_settings = (project.settings or {}) if project else {}
             agent_lock_enabled = project_settings.get("agent_lock_enabled", True)
             chat_id = payload.chat_id
@@ -632,6 +682,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                 heartbeat_task = asyncio.create_task(_heartbeat_lock(pubsub, chat_id, task_id))
 
             # 3. Load agent model
+            profile.phase("agent_resolve")
             #
             # Resolution rules:
             #   * Automation-driven runs (``auto_run_id`` set by the
@@ -848,14 +899,39 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                     else agent_model.model or settings.litellm_default_models.split(",")[0]
                 )
 
-            # 5. Create model adapter
-            model_adapter = await create_model_adapter(
-                model_name=model_name,
-                user_id=UUID(payload.user_id),
-                db=db,
+            # 5. Create model adapter (routed across the agent's equivalent
+            # models when its config lists any)
+            profile.phase("model_adapter")
+            routing_config = getattr(agent_model, "config", None) or {}
+            if routing_config.get("equivalent_models"):
+                model_adapter = await create_routed_model_adapter(
+                    model_name,
+                    list(routing_config["equivalent_models"]),
+                    user_id=UUID(payload.user_id),
+                    db=db,
+                    mode=routing_config.get("model_routing", "fallback"),
+                    hedge_delay=routing_config.get("model_hedge_delay_seconds"),
+                )
+            else:
+                model_adapter = await create_model_adapter(
+                    model_name=model_name,
+                    user_id=UUID(payload.user_id),
+                    db=db,
+                )
+
+            # Label this task's LLM calls for prompt-cache metrics.
+            from .services.prompt_cache_stats import (
+                PromptCacheScope,
+                current_prompt_cache_scope,
+            )
+
+            profile.agent = getattr(agent_model, "slug", None) or str(agent_model.id)
+            cache_scope_token = current_prompt_cache_scope.set(
+                PromptCacheScope(agent=profile.agent, session=payload.chat_id)
             )
 
             # 6. Create view-scoped tool registry if needed
+            profile.phase("runner_create")
             tools_override = None
             if payload.view_context:
                 from .agent.tools.view_context import ViewContext
@@ -954,6 +1030,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                         )
 
             # 7b. Load MCP tools for this user/agent and inject into tool registry
+            profile.phase("mcp_context")
             mcp_context: dict | None = None
             try:
                 from .services.mcp.manager import get_mcp_manager
@@ -1108,6 +1185,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                         agent_err,
                     )
 
+            profile.phase("skills")
             container_id = UUID(payload.container_id) if payload.container_id else None
             container_name = payload.container_name
             container_directory = payload.container_directory
@@ -1125,21 +1203,40 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                     if container.directory and container.directory != ".":
                         container_directory = container.directory
 
+            # Startup context blocks (skills, TESSLATE.md, data overview, tier
+            # containers) are cached per project and reused until something
+            # they depend on changes (services/project_context_cache.py).
+            # Blocks read from the container also depend on ``containers``:
+            # one built while it was stopped or starting (no file skills,
+            # no TESSLATE.md) is dropped when its status changes.
+            from .services.project_context_cache import get_project_context_cache
+
+            context_blocks = await get_project_context_cache().session(project_id)
+
             # Discover available skills for this agent (progressive disclosure)
             from .services.skill_discovery import discover_skills
 
-            available_skills = await discover_skills(
-                agent_id=agent_model.id if agent_model else None,
-                user_id=UUID(payload.user_id),
-                project_id=project_id if project_id else None,
-                container_name=container_name,
-                db=db,
+            skills_agent_id = agent_model.id if agent_model else None
+            available_skills = await context_blocks.get(
+                "skills",
+                (str(skills_agent_id), payload.user_id, container_name),
+                ("skills", "files:skills", "containers"),
+                lambda: discover_skills(
+                    agent_id=skills_agent_id,
+                    user_id=UUID(payload.user_id),
+                    project_id=project_id if project_id else None,
+                    container_name=container_name,
+                    db=db,
+                ),
             )
 
+            profile.phase("history")
             chat_history = payload.chat_history or await _get_chat_history(
                 UUID(payload.chat_id), db, limit=10
             )
 
+            profile.phase("context_build")
+
             if project:
                 project_context = payload.project_context or {
                     "project_name": project.name,
@@ -1163,12 +1260,17 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
             # Guard prevents a double-read when chat.py already populated it
             # for inline (non-queued) execution paths.
             if project and not project_context.get("tesslate_context"):
-                tesslate_ctx = await _build_tesslate_context(
-                    project,
-                    UUID(payload.user_id),
-                    db,
-                    container_name=container_name,
-                    container_directory=container_directory,
+                tesslate_ctx = await context_blocks.get(
+                    "tesslate_context",
+                    (container_name, container_directory),
+                    ("files:tesslate", "containers"),
+                    lambda: _build_tesslate_context(
+                        project,
+                        UUID(payload.user_id),
+                        db,
+                        container_name=container_name,
+                        container_directory=container_directory,
+                    ),
                 )
                 if tesslate_ctx:
                     project_context["tesslate_context"] = tesslate_ctx
@@ -1192,6 +1294,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                         data_collection_refs=payload.mention_data_collection_refs,
                         project_ids=payload.mention_project_ids,
                     ),
+                    context_blocks=context_blocks,
                 )
                 _run_ctx.apply(project_context)
 
@@ -1205,9 +1308,30 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
             active_plan = await PlanManager.get_plan(payload_context)
 
             # Tier snapshot for agent context (compute_tier-aware tools read these).
-            from .services.agent_context import build_tier_snapshot
+            from .services.agent_context import build_tier_snapshot, load_tier_containers
 
-            _tier_snapshot = await build_tier_snapshot(project, db)
+            _tier_snapshot = await build_tier_snapshot(
+                project,
+                db,
+                containers=(
+                    await context_blocks.get(
+                        "tier_containers",
+                        (),
+                        ("containers",),
+                        lambda: load_tier_containers(project, db),
+                    )
+                    if project
+                    else None
+                ),
+            )
+            logger.info(
+                "[WORKER] Context blocks for task %s: %s",
+                task_id,
+                ", ".join(
+                    f"{name}={'hit' if r['cached'] else 'built'} {r['ms']}ms"
+                    for name, r in context_blocks.report.items()
+                ),
+            )
             _tier_containers = _tier_snapshot.get("containers", [])
 
             # 8. Build execution context (same structure as chat.py)
@@ -1314,6 +1438,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                     project_context["cross_platform_context"] = cross_platform
 
             # 9. Create placeholder Message before agent loop (crash-safe)
+            profile.phase("message_create")
             assistant_message = Message(
                 chat_id=UUID(payload.chat_id),
                 role="assistant",
@@ -1330,6 +1455,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
             await db.commit()
             await db.refresh(assistant_message)
             message_id = assistant_message.id
+            profile.message_id = str(message_id)
 
             # Back-fill ticket → message FK so the AgentTask row points to
             # the assistant Message created above.
@@ -1341,28 +1467,29 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                         db, ticket_id=claimed_ticket_id, message_id=message_id
                     )
 
-            # Create file checkpoint before agent execution (for /undo file revert).
-            # Uses git ghost commits when a container is running, or a btrfs
-            # volume fork for K8s tier-0 projects (no pod).
-            checkpoint_hash = None
+            profile.phase("checkpoint")
+            # File checkpoint for /undo file revert. Taken lazily, right before
+            # the run's first file-mutating tool call, so read-only turns pay
+            # nothing and it stays off the path to the first model call (see
+            # LazyCheckpoint). Uses git ghost commits when a container is
+            # running, or a btrfs volume fork for K8s tier-0 projects (no pod).
+            checkpoint = None
             if project_id:
-                try:
-                    from .services.checkpoint_manager import CheckpointManager
+                from .services.checkpoint_manager import (
+                    CheckpointManager,
+                    attach_lazy_checkpoint,
+                )
 
-                    ckpt_mgr = CheckpointManager(
+                checkpoint = attach_lazy_checkpoint(
+                    context,
+                    CheckpointManager(
                         user_id=UUID(payload.user_id),
                         project_id=project_id,
                         volume_id=project.volume_id if project else None,
-                    )
-                    checkpoint_hash = await ckpt_mgr.create_checkpoint()
-                    if checkpoint_hash:
-                        logger.info(
-                            "[WORKER] Checkpoint %s for task %s",
-                            checkpoint_hash[:12],
-                            task_id,
-                        )
-                except Exception as ckpt_err:
-                    logger.warning("[WORKER] Checkpoint failed (non-fatal): %s", ckpt_err)
+                    ),
+                )
+                if settings.agent_checkpoint_mode == "background":
+                    checkpoint.start()
 
             # Update chat status to running
             chat_result = await db.execute(select(Chat).where(Chat.id == UUID(payload.chat_id)))
@@ -1400,14 +1527,20 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                 await db.commit()
                 _step_idx += 1
 
+            from .agent.tools.tool_memo import get_tool_memo
             from .services.tesslate_agent_adapter import AgentAdapterContext
 
+            # Create the run's tool memo up front: the adapter copies
+            # ``context`` into the submodule's own dict, and the memo object
+            # must be shared so its stats are visible when finalizing below.
+            get_tool_memo(context)
             adapter_ctx = AgentAdapterContext(
                 project_id=str(project_id) if project_id else "",
                 user_id=payload.user_id,
                 extra=context,
             )
 
+            profile.phase("mentions")
             # @-mention hint block — appended to the END of the user message
             # (turn-unique content) so the system-prompt cache breakpoint
             # stays intact for non-mention turns. The block resolves the
@@ -1666,6 +1799,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                         mention_err,
                     )
 
+            profile.phase("agent_loop")
             try:
                 async for event in agent_run_obj.run_turn(
                     effective_message, adapter_ctx, event_sink=_step_sink
@@ -1731,6 +1865,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
 
             finally:
                 # Finalize Message regardless of how we exit the loop
+                profile.phase("finalize")
                 logger.info(
                     f"[WORKER] Agent finished: task={task_id}, events={event_count}, "
                     f"iterations={iterations}, tool_calls={tool_calls_made}"
@@ -1760,6 +1895,9 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                         task_id,
                     )
                 else:
+                    # The checkpoint was taken only if a tool changed files
+                    # (or is still being taken in background mode).
+                    checkpoint_hash = await checkpoint.result() if checkpoint else None
                     stale_msg.content = final_response or "Agent task completed."
                     stale_msg.message_metadata = {
                         "agent_mode": True,
@@ -1779,6 +1917,16 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                         # Steps are now in agent_steps table, not here
                         "steps_table": True,
                     }
+                    from .agent.tools.tool_memo import tool_memo_stats
+
+                    memo_stats = tool_memo_stats(context)
+                    if memo_stats is not None:
+                        stale_msg.message_metadata["tool_memo"] = memo_stats
+                    if context_blocks.report:
+                        stale_msg.message_metadata["context_blocks"] = context_blocks.report
+                    # Phases up to here; title / delivery / cleanup only
+                    # reach the histograms (services/task_profile.py).
+                    stale_msg.message_metadata["profile"] = profile.to_dict()
                     db.add(stale_msg)
 
                 # Update chat status — but skip if our lock was stolen.
@@ -1807,6 +1955,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                         )
 
             # 13. Auto-generate chat title on first message (non-blocking)
+            profile.phase("title")
             # Skip if our lock was stolen — the live owner will handle titling.
             if completion_reason != "cancelled" and not lock_stolen:
                 await _auto_title_chat(
@@ -1831,6 +1980,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                     )
 
             # 14. Publish done event
+            profile.phase("delivery")
             if pubsub:
                 await pubsub.publish_agent_event(
                     task_id, {"type": "done", "data": {"task_id": task_id}}
@@ -1899,6 +2049,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                     logger.warning(f"[WORKER] Failed to enqueue webhook callback: {wh_err}")
 
             # 15. Cleanup bash session
+            profile.phase("cleanup")
             if context.get("_bash_session_id"):
                 try:
                     from .services.shell_session_manager import get_shell_session_manager
@@ -1996,6 +2147,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                 # until the operator approves and re-queues it.
                 return
 
+            profile.phase("error")
             error_traceback = traceback.format_exc()
             logger.error(f"[WORKER] Agent task {task_id} failed: {e}")
             logger.error(f"[WORKER] Traceback:\n{error_traceback}")
@@ -2043,6 +2195,7 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                             **(stale_msg.message_metadata or {}),
                             "completion_reason": "error",
                             "error": str(e)[:500],
+                            "profile": profile.to_dict(),
                         }
                         db.add(stale_msg)
 
@@ -2063,6 +2216,12 @@ async def execute_agent_task(ctx: dict, payload_dict: dict):
                 )
 
         finally:
+            if cache_scope_token is not None:
+                from .services.prompt_cache_stats import current_prompt_cache_scope
+
+                current_prompt_cache_scope.reset(cache_scope_token)
+            current_task_profile.reset(profile_token)
+            finish_task_profile(profile)
             # Always release chat lock, concurrency slot, and heartbeat
             if heartbeat_task:
                 heartbeat_task.cancel()
@@ -2634,11 +2793,20 @@ async def startup(ctx: dict):
 
     await refresh_eligible_models()
 
+    # Tag bumps for the project context cache from ORM changes made here.
+    from .services.project_context_cache import register_context_cache_listeners
+
+    register_context_cache_listeners()
+
 
 async def shutdown(ctx: dict):
     """Worker shutdown hook — cleanup."""
     logger.info("[WORKER] ARQ worker shutting down")
 
+    from .services.llm_client_pool import shutdown_llm_client_pool
+
+    await shutdown_llm_client_pool()
+
 
 def _get_redis_settings() -> RedisSettings:
     """Build ARQ RedisSettings from REDIS_URL environment variable."""
@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Entry point for the namespace-reaper CronJob."""
+"""Manual namespace reaper run.
+
+Stuck proj-* namespaces are reaped by the backend's orphan sweep
+(app/services/orphan_sweep.py); this script is for a one-off run, e.g.
+``kubectl exec deploy/tesslate-backend -- python namespace_reaper.py``.
+"""
 
 import logging
 import sys
@@ -0,0 +1,166 @@
+"""
+Tests for the fuzzy strategy's matching engine.
+
+The fuzzy strategy only scores windows near exact needle pieces and uses a
+bit-parallel, early-terminating distance. These tests pin it to the plain
+definition -- Levenshtein distance of every window, unique best under the
+threshold -- and include a microbenchmark (``-m slow``) over representative
+edits that reports the speed-up over scoring every window with the DP.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+
+from app.agent.tools.file_ops import fuzzy_editor
+from app.agent.tools.file_ops.fuzzy_editor import (
+    FUZZY_MATCH_THRESHOLD,
+    FUZZY_MIN_NEEDLE_LEN,
+    _bounded_distance,
+    _char_masks,
+    _levenshtein,
+    _strategy_fuzzy,
+)
+
+
+def _reference_fuzzy(content: str, old_str: str, new_str: str) -> tuple[str | None, int]:
+    """Score every window with the DP, as the strategy is specified."""
+    needle_len = len(old_str)
+    if needle_len < FUZZY_MIN_NEEDLE_LEN:
+        return None, 0
+    best_score = float("inf")
+    best_idx = -1
+    ties = 0
+    for i in range(len(content) - needle_len + 1):
+        score = _levenshtein(content[i : i + needle_len], old_str) / needle_len
+        if score < best_score:
+            best_score, best_idx, ties = score, i, 1
+        elif score == best_score:
+            ties += 1
+    if best_idx < 0 or best_score > FUZZY_MATCH_THRESHOLD:
+        return None, 0
+    if ties > 1:
+        return None, ties
+    return content[:best_idx] + new_str + content[best_idx + needle_len :], 1
+
+
+def _mutate(rng: random.Random, text: str, edits: int, alphabet: str) -> str:
+    chars = list(text)
+    for _ in range(edits):
+        op = rng.randrange(3)
+        pos = rng.randrange(len(chars) + (op == 1))
+        if op == 0 and chars:
+            chars[pos] = rng.choice(alphabet)
+        elif op == 1:
+            chars.insert(pos, rng.choice(alphabet))
+        elif chars:
+            del chars[pos]
+    return "".join(chars)
+
+
+class TestBoundedDistance:
+    def test_matches_dp(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            a = "".join(rng.choice("abc \n") for _ in range(rng.randint(1, 80)))
+            b = "".join(rng.choice("abc \n") for _ in range(rng.randint(0, 80)))
+            exact = _levenshtein(a, b)
+            assert _bounded_distance(_char_masks(a), len(a), b, len(a) + len(b)) == exact
+            bound = rng.randint(0, 10)
+            got = _bounded_distance(_char_masks(a), len(a), b, bound)
+            assert got == exact if exact <= bound else got > bound
+
+    def test_needle_wider_than_a_machine_word(self):
+        a = "x" * 70 + "needle" + "y" * 70
+        b = "x" * 69 + "nedle!" + "y" * 71
+        assert _bounded_distance(_char_masks(a), len(a), b, 50) == _levenshtein(a, b)
+
+
+class TestStrategyEquivalence:
+    @pytest.mark.parametrize("alphabet", ["ab", "abcd \n", "abcdefghijklmnop(){}; \n"])
+    def test_random_edits_agree_with_reference(self, alphabet):
+        rng = random.Random(alphabet)
+        for _ in range(60):
+            content = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 160)))
+            if content and rng.random() < 0.7:
+                start = rng.randrange(len(content))
+                needle = content[start : start + rng.randint(10, 40)]
+                needle = _mutate(rng, needle, rng.randint(0, 4), alphabet)
+            else:
+                needle = "".join(rng.choice(alphabet) for _ in range(rng.randint(10, 30)))
+            assert _strategy_fuzzy(content, needle, "NEW") == _reference_fuzzy(
+                content, needle, "NEW"
+            ), (content, needle)
+
+    def test_large_file_typo(self):
+        # ~250KB: far past what a full DP scan over every window could do.
+        lines = [f"    result_{i} = compute(value_{i}, factor={i % 7})\n" for i in range(5_000)]
+        content = "".join(lines)
+        typo = "    result_1234 = compute(valeu_1234, factor=2)\n"
+        new_content, count = _strategy_fuzzy(content, typo, "    result_1234 = 0\n")
+        assert count == 1
+        assert "    result_1234 = 0\n    result_1235" in new_content
+
+    def test_gives_up_when_candidates_exceed_budget(self, monkeypatch):
+        monkeypatch.setattr(fuzzy_editor, "_FUZZY_MAX_STEPS", 100)
+        content = "abcdefghijk " * 50
+        assert _strategy_fuzzy(content, "abcdefghiXk", "x") == (None, 0)
+
+
+# =============================================================================
+# Microbenchmark
+# =============================================================================
+
+
+def _source_file(lines: int) -> str:
+    rng = random.Random(lines)
+    names = ["user", "project", "session", "container", "volume", "message", "agent"]
+    out = []
+    for i in range(lines):
+        a, b = rng.choice(names), rng.choice(names)
+        out.append(f"    {a}_{i} = await load_{b}(db, {a}_id={i}, refresh={i % 2 == 0})\n")
+    return "".join(out)
+
+
+def _bench_cases() -> list[tuple[str, str, str]]:
+    # Kept small enough for the full DP scan to finish in a few seconds.
+    block = _source_file(6)
+    small = _source_file(20)
+    medium = _source_file(40)
+    return [
+        ("one-line typo, 20 lines", small, small.splitlines(True)[17].replace("await", "awiat")),
+        (
+            "three-line block, 6 lines",
+            block,
+            "".join(block.splitlines(True)[2:5]).replace("refresh", "refrsh", 1),
+        ),
+        ("no match, 40 lines", medium, "    definitely_not_here = compute_something(x)\n"),
+    ]
+
+
+def _best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("case", _bench_cases(), ids=lambda c: c[0])
+def test_benchmark_against_full_scan(case):
+    name, content, needle = case
+    started = time.perf_counter()
+    expected = _reference_fuzzy(content, needle, "NEW")
+    slow = time.perf_counter() - started
+    assert _strategy_fuzzy(content, needle, "NEW") == expected
+
+    fast = _best_of(lambda: _strategy_fuzzy(content, needle, "NEW"))
+    print(
+        f"\n[fuzzy bench] {name}: {slow * 1000:.1f}ms -> {fast * 1000:.2f}ms ({slow / fast:.0f}x)"
+    )
+    assert fast * 10 < slow
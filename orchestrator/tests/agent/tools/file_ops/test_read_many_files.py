@@ -173,6 +173,23 @@ async def test_max_total_bytes_halts_enumeration(bound_orchestrator, tool_contex
     assert len(result["skipped"]) >= 1
 
 
+async def test_backend_read_error_reason_passed_through(
+    bound_orchestrator, tool_context, monkeypatch
+):
+    read_files_stream = bound_orchestrator.read_files_stream
+
+    async def _failing_readme(**kwargs):
+        async for rec in read_files_stream(**kwargs):
+            yield (
+                {"path": rec["path"], "error": "read failed"} if rec["path"] == "README.md" else rec
+            )
+
+    monkeypatch.setattr(bound_orchestrator, "read_files_stream", _failing_readme)
+    result = await read_many_files_tool({"include": ["**/*.md"]}, tool_context)
+    assert {"path": "README.md", "reason": "read failed"} in result["skipped"]
+    assert "docs/guide.md" in [f["path"] for f in result["files"]]
+
+
 async def test_missing_include_errors(bound_orchestrator, tool_context):
     result = await read_many_files_tool({}, tool_context)
     assert result["success"] is False
@@ -140,14 +140,60 @@ async def test_scrub_tool_result_walks_output_fields(monkeypatch: pytest.MonkeyP
         "stdout": "super-secret-value-1234 in stdout",
         "stderr": "super-secret-value-1234 in stderr",
         "message": "message with super-secret-value-1234",
+        # write_stdin returns drained PTY output under new_output.
+        "new_output": "printenv: super-secret-value-1234",
         "details": {
             "stdout": "nested super-secret-value-1234",
             "stderr": "also super-secret-value-1234",
+            "new_output": "drained super-secret-value-1234",
         },
     }
     out = await _secret_scrubber.scrub_tool_result(result, {})
-    for value in (out["output"], out["stdout"], out["stderr"], out["message"]):
+    for value in (out["output"], out["stdout"], out["stderr"], out["message"], out["new_output"]):
         assert "super-secret-value-1234" not in value
         assert "«secret:API_KEY»" in value
     assert "«secret:API_KEY»" in out["details"]["stdout"]
     assert "«secret:API_KEY»" in out["details"]["stderr"]
+    assert "«secret:API_KEY»" in out["details"]["new_output"]
+
+
+def test_compiled_scrubber_is_shared_between_equal_maps() -> None:
+    from app.agent.tools._secret_scrubber import get_scrubber
+
+    first = get_scrubber({"abcdef123456": "API_KEY"})
+    assert get_scrubber({"abcdef123456": "API_KEY"}) is first
+    assert get_scrubber({"abcdef123456": "OTHER"}) is not first
+
+
+@pytest.mark.asyncio
+async def test_project_map_reused_until_ciphertexts_change(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+    from uuid import uuid4
+
+    from app.agent.tools import _secret_scrubber
+    from app.services import deployment_encryption
+
+    rows = [(uuid4(), {"API_KEY": "token-1"})]
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=lambda _q: SimpleNamespace(all=lambda: list(rows)))
+    decrypt = MagicMock(side_effect=lambda token: f"plaintext-for-{token}")
+    monkeypatch.setattr(
+        deployment_encryption,
+        "get_deployment_encryption_service",
+        lambda: SimpleNamespace(decrypt=decrypt),
+    )
+    monkeypatch.setattr(_secret_scrubber, "_project_maps", type(_secret_scrubber._project_maps)())
+    project_id = uuid4()
+
+    first = await _secret_scrubber.get_scrub_map({"project_id": project_id, "db": db})
+    again = await _secret_scrubber.get_scrub_map({"project_id": project_id, "db": db})
+    assert first == again == {"plaintext-for-token-1": "API_KEY"}
+    assert decrypt.call_count == 1
+
+    rows[0] = (rows[0][0], {"API_KEY": "token-2"})
+    changed = await _secret_scrubber.get_scrub_map({"project_id": project_id, "db": db})
+    assert changed == {"plaintext-for-token-2": "API_KEY"}
+    assert decrypt.call_count == 2
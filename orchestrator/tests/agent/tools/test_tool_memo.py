@@ -0,0 +1,115 @@
+"""Unit tests for ``app.agent.tools.tool_memo``.
+
+Read-only tools are answered from a per-run memo keyed by tool and
+canonical parameters; any other tool clears it. Covers hits through
+``ToolRegistry.execute``, invalidation, failed results, the optional
+"unchanged" stub, the TTL and the ``memoized_tool`` wrapper used by the
+worker's submodule registry.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.agent.tools import tool_memo
+from app.agent.tools.registry import Tool, ToolCategory, ToolRegistry
+from app.agent.tools.tool_memo import ToolMemo, memoized_tool, tool_memo_stats
+
+
+def _tool(name: str, *, read_only: bool, result=None) -> Tool:
+    return Tool(
+        name=name,
+        description=name,
+        parameters={"type": "object", "properties": {}},
+        executor=AsyncMock(return_value=result or {"success": True, "content": name}),
+        category=ToolCategory.FILE_OPS,
+        state_serializable=True,
+        holds_external_state=False,
+        read_only=read_only,
+    )
+
+
+@pytest.fixture
+def registry() -> ToolRegistry:
+    reg = ToolRegistry()
+    reg.register(_tool("read_file", read_only=True))
+    reg.register(_tool("write_file", read_only=False))
+    return reg
+
+
+@pytest.fixture
+def context() -> dict:
+    # Explicit memo so the tests don't depend on settings defaults.
+    return {"edit_mode": "allow", "_tool_memo": ToolMemo(ttl_seconds=60)}
+
+
+@pytest.mark.asyncio
+async def test_repeat_read_is_answered_from_memo(registry, context) -> None:
+    read = registry.get("read_file").executor
+    first = await registry.execute("read_file", {"file_path": "a.py", "x": 1}, context)
+    second = await registry.execute("read_file", {"x": 1, "file_path": "a.py"}, context)
+
+    assert first == second
+    assert read.await_count == 1
+    assert tool_memo_stats(context) == {
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5,
+        "invalidations": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_mutating_tool_clears_memo(registry, context) -> None:
+    read = registry.get("read_file").executor
+    await registry.execute("read_file", {"file_path": "a.py"}, context)
+    await registry.execute("write_file", {"file_path": "a.py", "content": "x"}, context)
+    await registry.execute("read_file", {"file_path": "a.py"}, context)
+
+    assert read.await_count == 2
+    assert context["_tool_memo"].invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_results_are_not_memoized(context) -> None:
+    tool = _tool("grep", read_only=True, result={"success": False, "message": "boom"})
+    run = memoized_tool(tool).executor
+    await run({"pattern": "x"}, context)
+    await run({"pattern": "x"}, context)
+    assert tool.executor.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stub_and_ttl(monkeypatch, context) -> None:
+    memo = context["_tool_memo"]
+    memo.stub = True
+    tool = _tool("glob", read_only=True)
+    run = memoized_tool(tool).executor
+
+    await run({"pattern": "*.py"}, context)
+    stub = await run({"pattern": "*.py"}, context)
+    assert stub["unchanged"] is True and "call #1" in stub["message"]
+
+    clock = [1000.0]
+    monkeypatch.setattr(tool_memo.time, "monotonic", lambda: clock[0])
+    memo.store(ToolMemo.key("glob", {"pattern": "*.ts"}), {"success": True}, 3)
+    clock[0] += 61
+    await run({"pattern": "*.ts"}, context)
+    assert tool.executor.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_memo_runs_every_call(monkeypatch) -> None:
+    monkeypatch.setattr(
+        "app.config.get_settings",
+        lambda: type("S", (), {"agent_tool_memo_enabled": False})(),
+    )
+    tool = _tool("read_file", read_only=True)
+    run = memoized_tool(tool).executor
+    context: dict = {}
+    await run({"file_path": "a"}, context)
+    await run({"file_path": "a"}, context)
+    assert tool.executor.await_count == 2
+    assert tool_memo_stats(context) is None
@@ -390,6 +390,99 @@ class TestScopedToolRegistry:
         # Scoped registry should only have one
         assert len(scoped._tools) == 1
 
+    def test_scoped_registry_reuses_filtered_tools(self, populated_registry, monkeypatch):
+        """Test that deriving the same scope again shares tools and rendered output."""
+        from app.agent.tools import registry as registry_module
+
+        monkeypatch.setattr(registry_module, "get_tool_registry", lambda: populated_registry)
+        configs = {"read_file": {"description": "Read a file from the project"}}
+
+        first = create_scoped_tool_registry(["read_file", "bash_exec"], configs)
+        second = create_scoped_tool_registry(["read_file", "bash_exec"], configs)
+
+        assert first is not second
+        assert first.get("read_file") is second.get("read_file")
+        assert first.get("read_file").description == "Read a file from the project"
+        assert first.get_system_prompt_section() is second.get_system_prompt_section()
+
+        # Registering into one scoped registry does not leak into the other
+        first.register(populated_registry.get("write_file"))
+        assert second.get("write_file") is None
+        assert "write_file" not in second.get_system_prompt_section()
+
+    def test_scoped_registry_follows_global_version(self, populated_registry, monkeypatch):
+        """Test that a changed global registry yields a fresh scoped tool set."""
+        from app.agent.tools import registry as registry_module
+
+        monkeypatch.setattr(registry_module, "get_tool_registry", lambda: populated_registry)
+
+        before = create_scoped_tool_registry(["read_file"])
+        populated_registry.register(
+            Tool(
+                "read_file",
+                "Read file (v2)",
+                {},
+                populated_registry.get("read_file").executor,
+                ToolCategory.FILE_OPS,
+                state_serializable=True,
+                holds_external_state=False,
+            )
+        )
+        after = create_scoped_tool_registry(["read_file"])
+
+        assert before.get("read_file").description == "Read file"
+        assert after.get("read_file").description == "Read file (v2)"
+
+
+@pytest.mark.unit
+class TestRenderedOutputCache:
+    """Test suite for memoised prompt sections."""
+
+    @pytest.fixture
+    def tool(self):
+        async def executor(params, context):
+            return {"success": True}
+
+        return Tool(
+            name="read_file",
+            description="Read a file",
+            parameters={
+                "type": "object",
+                "properties": {"path": {"type": "string", "description": "File path"}},
+                "required": ["path"],
+            },
+            executor=executor,
+            category=ToolCategory.FILE_OPS,
+            state_serializable=True,
+            holds_external_state=False,
+        )
+
+    def test_prompt_section_memoised_until_register(self, tool):
+        """Test that the section is rendered once per registry version."""
+        from dataclasses import replace
+
+        registry = ToolRegistry()
+        registry.register(tool)
+        version = registry.version
+
+        section = registry.get_system_prompt_section()
+        assert registry.get_system_prompt_section() is section
+
+        registry.register(replace(tool, name="read_file_2"))
+        assert registry.version == version + 1
+        assert "read_file_2" in registry.get_system_prompt_section()
+
+    def test_replaced_tool_renders_its_own_prompt(self, tool):
+        """Test that a customised copy does not reuse the original's cached text."""
+        from dataclasses import replace
+
+        original = tool.to_prompt_format()
+        custom = replace(tool, description="Read one project file")
+
+        assert "Read a file" in original
+        assert "Read one project file" in custom.to_prompt_format()
+        assert tool.to_prompt_format() is original
+
 
 @pytest.mark.unit
 class TestToolDataclass:
@@ -0,0 +1 @@
+"""Agent pipeline benchmarks against a deterministic local LLM stand-in."""
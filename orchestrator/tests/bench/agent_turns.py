@@ -0,0 +1,476 @@
+"""
+Agent-turn benchmark — the real worker pipeline against a scripted LLM.
+
+Runs ``execute_agent_task`` end to end (agent load, context build, agent
+loop, step persistence, events, finalize) through the desktop
+``LocalTaskQueue`` + ``LocalPubSub`` on a migrated SQLite database, with
+every model call answered by :class:`tests.bench.fake_llm.FakeLLMServer`.
+Because the model is deterministic and local, the numbers measure the
+orchestrator, not a provider:
+
+- ``first_event_ms``   enqueue → first event on the task's stream
+- ``task_ms``          enqueue → ``done``
+- ``step_overhead_ms`` agent-loop time not spent waiting on the model,
+                       per step (from the task's phase profile)
+- ``db_statements``    SQL statements per task
+- ``throughput``       tasks per second at the given concurrency
+
+Each concurrency level runs ``--tasks`` fresh chats. With ``--baseline``
+the run is compared against a previous ``--json`` output and exits 1 when
+a latency metric grows (or throughput drops) by more than ``--tolerance``.
+
+Needs the ``tesslate_agent`` package (the agent loop lives there).
+
+Usage:
+    python3 -u -m tests.bench.agent_turns                              # 20 tasks, concurrency 1 and 8
+    python3 -u -m tests.bench.agent_turns --tasks 50 --concurrency 1,4,16
+    python3 -u -m tests.bench.agent_turns --json bench.json --baseline main.json --tolerance 0.2
+    python3 -u -m tests.bench.agent_turns --latency-ms 300 --tokens-per-second 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from .fake_llm import DEFAULT_SCRIPT, FakeLLMScript, FakeLLMServer
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger("bench")
+logger.setLevel(logging.INFO)
+
+ORCHESTRATOR_DIR = Path(__file__).resolve().parents[2]
+BENCH_MODEL = "bench-model"
+
+# Metrics compared against a baseline; True = higher is better.
+COMPARED_METRICS = {
+    "first_event_ms.p50": False,
+    "first_event_ms.p95": False,
+    "task_ms.p50": False,
+    "task_ms.p95": False,
+    "step_overhead_ms.p50": False,
+    "db_statements": False,
+    "throughput": True,
+}
+
+
+# =============================================================================
+# Environment
+# =============================================================================
+
+
+def configure_environment(workdir: Path, llm_base_url: str) -> None:
+    """
+    Point the orchestrator at a fresh SQLite DB and the fake LLM.
+
+    Must run before anything under ``app`` is imported: the engine and the
+    settings are built from the environment at import time.
+    """
+    db_path = workdir / "bench.db"
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}",
+            "DEPLOYMENT_MODE": "desktop",
+            "REDIS_URL": "",
+            "SECRET_KEY": "bench-secret-key",
+            "OPENSAIL_HOME": str(workdir / "home"),
+            # Users without a provisioned LiteLLM key use the master key
+            # against LITELLM_API_BASE, so unprefixed models hit the fake.
+            "LITELLM_API_BASE": llm_base_url,
+            "LITELLM_MASTER_KEY": "sk-bench",
+        }
+    )
+
+    from alembic import command
+    from alembic.config import Config
+
+    # No ini file: env.py would apply its logging config and silence ours.
+    cfg = Config()
+    cfg.set_main_option("script_location", str(ORCHESTRATOR_DIR / "alembic"))
+    original_cwd = os.getcwd()
+    os.chdir(ORCHESTRATOR_DIR)
+    try:
+        command.upgrade(cfg, "head")
+    finally:
+        os.chdir(original_cwd)
+
+
+async def seed(session_maker) -> tuple[uuid.UUID, uuid.UUID]:
+    """Create the benchmark user and agent; returns ``(user_id, agent_id)``."""
+    from app.models import MarketplaceAgent, User
+    from app.services.marketplace_agent_scope import RUNNABLE_AGENT_ITEM_TYPE
+    from app.services.marketplace_constants import LOCAL_SOURCE_ID
+
+    user_id = uuid.uuid4()
+    agent_id = uuid.uuid4()
+    async with session_maker() as db:
+        db.add(
+            User(
+                id=user_id,
+                name="Bench User",
+                username=f"bench-{user_id.hex[:8]}",
+                slug=f"bench-{user_id.hex[:8]}",
+                email=f"bench-{user_id.hex[:8]}@example.com",
+                hashed_password="x",
+                is_active=True,
+            )
+        )
+        db.add(
+            MarketplaceAgent(
+                id=agent_id,
+                name="Bench Agent",
+                slug=f"bench-agent-{agent_id.hex[:8]}",
+                description="Agent-turn benchmark agent",
+                category="builder",
+                pricing_type="free",
+                agent_type="IterativeAgent",
+                item_type=RUNNABLE_AGENT_ITEM_TYPE,
+                is_active=True,
+                model=BENCH_MODEL,
+                system_prompt="You are a benchmark agent. Follow the plan, then answer.",
+                source_id=LOCAL_SOURCE_ID,
+            )
+        )
+        await db.commit()
+    return user_id, agent_id
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+
+def _quantiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    p95_index = min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))
+    return {
+        "p50": round(statistics.median(ordered), 2),
+        "p95": round(ordered[p95_index], 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def _step_overhead_ms(profile: dict[str, Any], steps: int) -> float | None:
+    """Agent-loop time outside model calls, per step."""
+    spans = profile.get("spans") or []
+    loop = next(
+        (s for s in spans if s["kind"] == "phase" and s["name"] == "agent_loop"),
+        None,
+    )
+    if loop is None or not loop.get("duration_ms"):
+        return None
+    model_ms = sum(s.get("duration_ms") or 0.0 for s in spans if s["kind"] == "model")
+    return max(0.0, loop["duration_ms"] - model_ms) / max(1, steps)
+
+
+class _StatementCounter:
+    """Counts SQL statements on the app engine."""
+
+    def __init__(self, engine) -> None:
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+
+async def _watch(pubsub, task_id: str, enqueued_at: float) -> dict[str, Any]:
+    first_event_at = None
+    steps = 0
+    error = None
+    async for event in pubsub.subscribe_agent_events(task_id):
+        if first_event_at is None:
+            first_event_at = time.monotonic()
+        kind = event.get("type")
+        if kind == "agent_step":
+            steps += 1
+        elif kind == "error":
+            error = (event.get("data") or {}).get("message")
+        elif kind == "done":
+            error = error or (event.get("data") or {}).get("error")
+            break
+    finished_at = time.monotonic()
+    return {
+        "first_event_ms": ((first_event_at or finished_at) - enqueued_at) * 1000,
+        "task_ms": (finished_at - enqueued_at) * 1000,
+        "steps": steps,
+        "error": error,
+    }
+
+
+async def _profile_for(session_maker, chat_id: uuid.UUID) -> dict[str, Any]:
+    from sqlalchemy import select
+
+    from app.models import Message
+
+    async with session_maker() as db:
+        result = await db.execute(
+            select(Message.message_metadata).where(
+                Message.chat_id == chat_id, Message.role == "assistant"
+            )
+        )
+        for metadata in result.scalars():
+            if metadata and metadata.get("profile"):
+                return metadata["profile"]
+    return {}
+
+
+async def run_level(
+    *,
+    tasks: int,
+    concurrency: int,
+    user_id: uuid.UUID,
+    agent_id: uuid.UUID,
+    session_maker,
+    counter: _StatementCounter,
+    server: FakeLLMServer,
+) -> dict[str, Any]:
+    """Run ``tasks`` fresh chats through a queue with ``concurrency`` workers."""
+    from app.models import Chat
+    from app.services.agent_task import AgentTaskPayload
+    from app.services.pubsub import get_pubsub
+    from app.services.task_queue.local_queue import LocalTaskQueue
+    from app.worker import execute_agent_task
+
+    pubsub = get_pubsub()
+    queue = LocalTaskQueue(max_workers=concurrency)
+
+    # Titled up front so auto-titling doesn't add a model call per task.
+    chat_ids = [uuid.uuid4() for _ in range(tasks)]
+    async with session_maker() as db:
+        db.add_all(
+            Chat(id=chat_id, user_id=user_id, title=f"Bench {i}")
+            for i, chat_id in enumerate(chat_ids)
+        )
+        await db.commit()
+
+    # ``done`` is published before the worker's cleanup (locks, sessions);
+    # wait for the handlers themselves so no task is cancelled mid-cleanup
+    # when the queue stops, and so throughput covers the whole task.
+    loop = asyncio.get_running_loop()
+    handled: dict[str, asyncio.Future] = {}
+
+    async def _handler(ctx: dict, payload_dict: dict) -> None:
+        try:
+            await execute_agent_task(ctx, payload_dict)
+        finally:
+            handled[payload_dict["task_id"]].set_result(None)
+
+    queue.register("execute_agent_task", _handler)
+
+    statements_before = counter.count
+    requests_before = server.requests
+    started = time.monotonic()
+    watchers = []
+    for chat_id in chat_ids:
+        payload = AgentTaskPayload(
+            task_id=str(uuid.uuid4()),
+            user_id=str(user_id),
+            chat_id=str(chat_id),
+            message="Plan the change, then answer.",
+            agent_id=str(agent_id),
+            model_name=BENCH_MODEL,
+        )
+        handled[payload.task_id] = loop.create_future()
+        watchers.append(asyncio.create_task(_watch(pubsub, payload.task_id, time.monotonic())))
+        await queue.enqueue("execute_agent_task", payload.to_dict())
+    try:
+        results = await asyncio.gather(*watchers)
+        await asyncio.gather(*handled.values())
+    finally:
+        await queue.stop()
+    wall_s = time.monotonic() - started
+
+    overheads = []
+    for chat_id, result in zip(chat_ids, results, strict=True):
+        overhead = _step_overhead_ms(await _profile_for(session_maker, chat_id), result["steps"])
+        if overhead is not None:
+            overheads.append(overhead)
+
+    errors = [r["error"] for r in results if r["error"]]
+    return {
+        "tasks": tasks,
+        "concurrency": concurrency,
+        "wall_s": round(wall_s, 3),
+        "throughput": round(tasks / wall_s, 3) if wall_s else 0.0,
+        "first_event_ms": _quantiles([r["first_event_ms"] for r in results]),
+        "task_ms": _quantiles([r["task_ms"] for r in results]),
+        "step_overhead_ms": _quantiles(overheads),
+        "steps_per_task": round(sum(r["steps"] for r in results) / tasks, 2),
+        "db_statements": round((counter.count - statements_before) / tasks, 1),
+        "llm_requests": server.requests - requests_before,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+async def run(
+    tasks: int = 20,
+    concurrency: list[int] | None = None,
+    script: FakeLLMScript | None = None,
+    workdir: Path | None = None,
+    warmup: int = 2,
+) -> dict[str, Any]:
+    """Run the benchmark at each concurrency level; returns the report."""
+    concurrency = concurrency or [1, 8]
+    script = script or DEFAULT_SCRIPT
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        async with FakeLLMServer(script) as server:
+            # Off the loop: alembic's env.py runs its own ``asyncio.run``.
+            await asyncio.to_thread(configure_environment, workdir, server.base_url)
+
+            from app.database import AsyncSessionLocal, engine
+
+            counter = _StatementCounter(engine)
+            user_id, agent_id = await seed(AsyncSessionLocal)
+            common = {
+                "user_id": user_id,
+                "agent_id": agent_id,
+                "session_maker": AsyncSessionLocal,
+                "counter": counter,
+                "server": server,
+            }
+            if warmup:
+                # Lazy imports and first-use caches land here, not in c=1.
+                await run_level(tasks=warmup, concurrency=1, **common)
+            levels = []
+            for workers in concurrency:
+                level = await run_level(tasks=tasks, concurrency=workers, **common)
+                logger.info(
+                    "[BENCH] c=%d tasks=%d %.1f tasks/s first_event p50=%.0fms "
+                    "task p50=%.0fms p95=%.0fms step_overhead p50=%.1fms db=%.0f/task errors=%d",
+                    workers,
+                    tasks,
+                    level["throughput"],
+                    level["first_event_ms"]["p50"],
+                    level["task_ms"]["p50"],
+                    level["task_ms"]["p95"],
+                    level["step_overhead_ms"]["p50"],
+                    level["db_statements"],
+                    level["errors"],
+                )
+                levels.append(level)
+            await engine.dispose()
+
+    return {
+        "script": {
+            "turns": len(script.turns),
+            "latency_ms": script.latency_ms,
+            "tokens_per_second": script.tokens_per_second,
+        },
+        "levels": levels,
+    }
+
+
+# =============================================================================
+# Baseline comparison
+# =============================================================================
+
+
+def _metric(level: dict[str, Any], path: str) -> float | None:
+    value: Any = level
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return float(value)
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.2) -> list[str]:
+    """Regressions of ``report`` against ``baseline`` beyond ``tolerance``."""
+    regressions = []
+    baseline_levels = {lvl["concurrency"]: lvl for lvl in baseline.get("levels", [])}
+    for level in report["levels"]:
+        base = baseline_levels.get(level["concurrency"])
+        if base is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS.items():
+            current, previous = _metric(level, path), _metric(base, path)
+            if current is None or not previous:
+                continue
+            change = (current - previous) / previous
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(
+                    f"c={level['concurrency']} {path}: {previous:g} -> {current:g} "
+                    f"({change:+.0%}, tolerance {tolerance:.0%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Agent-turn benchmark against a fake LLM")
+    parser.add_argument("--tasks", type=int, default=20, help="Tasks per concurrency level")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured tasks run first")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated worker counts")
+    parser.add_argument("--script", help="Fake LLM script JSON (see tests.bench.fake_llm)")
+    parser.add_argument(
+        "--latency-ms", type=float, help="Override the script's first-token latency"
+    )
+    parser.add_argument("--tokens-per-second", type=float, help="Override the script's token rate")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--baseline", help="Previous --json report to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed regression (0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+
+    script = DEFAULT_SCRIPT
+    if args.script:
+        script = FakeLLMScript.from_dict(json.loads(Path(args.script).read_text()))
+    if args.latency_ms is not None:
+        script.latency_ms = args.latency_ms
+    if args.tokens_per_second is not None:
+        script.tokens_per_second = args.tokens_per_second
+
+    report = asyncio.run(
+        run(
+            tasks=args.tasks,
+            concurrency=[int(c) for c in args.concurrency.split(",") if c.strip()],
+            script=script,
+            warmup=args.warmup,
+        )
+    )
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    failed = [level for level in report["levels"] if level["errors"]]
+    if failed:
+        logger.error(
+            "[BENCH] %d task(s) failed: %s",
+            sum(level["errors"] for level in failed),
+            failed[0]["first_error"],
+        )
+        return 1
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for regression in regressions:
+            logger.error("[BENCH] regression: %s", regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Deterministic OpenAI-compatible LLM stand-in for benchmarks.
+
+Serves ``POST /v1/chat/completions`` (streaming and non-streaming) and
+``GET /v1/models`` from a script instead of a model:
+
+- A script is a list of turns, each with optional ``text`` and
+  ``tool_calls`` (``{"name": ..., "arguments": {...}}``). The turn for a
+  request is picked by the number of assistant messages already in it, so
+  every conversation walks the script from the start, concurrent
+  conversations don't interfere, and the same conversation always gets the
+  same reply. Requests past the end repeat the last turn, which should
+  therefore be a plain text answer.
+- ``latency_ms`` is waited before the first chunk (time to first token),
+  then output is streamed at ``tokens_per_second`` (0 = no delay). A token
+  is one word of text or one chunk of tool-call arguments.
+
+The orchestrator is pointed at it through the base-URL overrides that
+``app.services.model_adapters`` already reads:
+
+- ``LITELLM_API_BASE`` + ``LITELLM_MASTER_KEY`` for the DB-backed path
+  (worker, chat) with an unprefixed model name,
+- ``OPENAI_API_BASE`` + ``OPENAI_API_KEY`` for ``gpt-*`` models on the
+  DB-less path and the desktop env-var fallback.
+
+Standalone::
+
+    python -m tests.bench.fake_llm --port 8911 --latency-ms 300 --tokens-per-second 80
+    python -m tests.bench.fake_llm --script scenario.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+_WORD = re.compile(r"\S+\s*|\s+")
+_ARGUMENT_CHUNK_CHARS = 16
+
+
+@dataclass
+class ScriptedTurn:
+    """One model reply: text, tool calls, or both."""
+
+    text: str = ""
+    tool_calls: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ScriptedTurn:
+        return cls(text=data.get("text", ""), tool_calls=list(data.get("tool_calls") or []))
+
+
+@dataclass
+class FakeLLMScript:
+    """Replies and timing served by :class:`FakeLLMServer`."""
+
+    turns: list[ScriptedTurn]
+    latency_ms: float = 0.0
+    tokens_per_second: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FakeLLMScript:
+        return cls(
+            turns=[ScriptedTurn.from_dict(t) for t in data.get("turns", [])] or [ScriptedTurn()],
+            latency_ms=float(data.get("latency_ms", 0.0)),
+            tokens_per_second=float(data.get("tokens_per_second", 0.0)),
+        )
+
+    def turn_for(self, messages: list[dict[str, Any]]) -> tuple[int, ScriptedTurn]:
+        index = sum(1 for m in messages if m.get("role") == "assistant")
+        index = min(index, len(self.turns) - 1)
+        return index, self.turns[index]
+
+
+# Plan with the todo tools, read the plan back, then answer. The todo tools
+# run without a project container, so the orchestrator path (dispatch, step
+# persistence, events) is exercised without any compute.
+DEFAULT_SCRIPT = FakeLLMScript(
+    turns=[
+        ScriptedTurn(
+            text="I'll plan this first.",
+            tool_calls=[
+                {
+                    "name": "todo_write",
+                    "arguments": {
+                        "todos": [
+                            {"content": "Inspect the request", "status": "completed"},
+                            {"content": "Write the answer", "status": "in_progress"},
+                        ]
+                    },
+                }
+            ],
+        ),
+        ScriptedTurn(tool_calls=[{"name": "todo_read", "arguments": {}}]),
+        ScriptedTurn(text="Done: the plan is recorded and the answer is written."),
+    ],
+)
+
+
+def _tokens(turn: ScriptedTurn) -> list[tuple[str, Any]]:
+    """The turn's output as ("text", word) and ("tool", (index, name, args_chunk)) tokens."""
+    tokens: list[tuple[str, Any]] = [("text", w) for w in _WORD.findall(turn.text)]
+    for i, call in enumerate(turn.tool_calls):
+        arguments = call.get("arguments", {})
+        if not isinstance(arguments, str):
+            arguments = json.dumps(arguments)
+        chunks = [
+            arguments[j : j + _ARGUMENT_CHUNK_CHARS]
+            for j in range(0, len(arguments), _ARGUMENT_CHUNK_CHARS)
+        ] or [""]
+        tokens.append(("tool", (i, call["name"], chunks[0], True)))
+        tokens.extend(("tool", (i, call["name"], chunk, False)) for chunk in chunks[1:])
+    return tokens
+
+
+def _prompt_tokens(messages: list[dict[str, Any]]) -> int:
+    return max(1, len(json.dumps(messages)) // 4)
+
+
+class FakeLLMServer:
+    """In-process HTTP server speaking the OpenAI chat-completions API."""
+
+    def __init__(
+        self, script: FakeLLMScript | None = None, *, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self.script = script or DEFAULT_SCRIPT
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> str:
+        """Start listening; returns the base URL (``.../v1``)."""
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat_completions)
+        app.router.add_get("/v1/models", self._models)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # resolve port=0
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> FakeLLMServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    # -------------------------------------------------------------------------
+    # Handlers
+    # -------------------------------------------------------------------------
+
+    async def _models(self, request: web.Request) -> web.Response:
+        return web.json_response({"object": "list", "data": [{"id": "fake", "object": "model"}]})
+
+    async def _pace(self, token_index: int) -> None:
+        if token_index == 0:
+            if self.script.latency_ms:
+                await asyncio.sleep(self.script.latency_ms / 1000)
+        elif self.script.tokens_per_second:
+            await asyncio.sleep(1 / self.script.tokens_per_second)
+
+    async def _chat_completions(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        body = await request.json()
+        messages = body.get("messages") or []
+        index, turn = self.script.turn_for(messages)
+        tokens = _tokens(turn)
+        model = body.get("model", "fake")
+        usage = {
+            "prompt_tokens": _prompt_tokens(messages),
+            "completion_tokens": len(tokens),
+            "total_tokens": _prompt_tokens(messages) + len(tokens),
+        }
+        finish_reason = "tool_calls" if turn.tool_calls else "stop"
+        completion_id = f"chatcmpl-fake-{self.requests}"
+
+        if not body.get("stream"):
+            for i in range(len(tokens)):
+                await self._pace(i)
+            if not tokens:
+                await self._pace(0)
+            message: dict[str, Any] = {"role": "assistant", "content": turn.text or None}
+            if turn.tool_calls:
+                message["tool_calls"] = [
+                    {
+                        "id": f"call_{index}_{i}",
+                        "type": "function",
+                        "function": {
+                            "name": call["name"],
+                            "arguments": (
+                                call.get("arguments")
+                                if isinstance(call.get("arguments"), str)
+                                else json.dumps(call.get("arguments", {}))
+                            ),
+                        },
+                    }
+                    for i, call in enumerate(turn.tool_calls)
+                ]
+            return web.json_response(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                    "usage": usage,
+                }
+            )
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def send(choices: list[dict[str, Any]], **extra: Any) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        def delta(content: dict[str, Any], finish: str | None = None) -> list[dict[str, Any]]:
+            return [{"index": 0, "delta": content, "finish_reason": finish}]
+
+        await self._pace(0)
+        await send(delta({"role": "assistant", "content": ""}))
+        for i, (kind, value) in enumerate(tokens):
+            if i:
+                await self._pace(i)
+            if kind == "text":
+                await send(delta({"content": value}))
+                continue
+            call_index, name, arguments, first = value
+            call: dict[str, Any] = {"index": call_index, "function": {"arguments": arguments}}
+            if first:
+                call.update(id=f"call_{index}_{call_index}", type="function")
+                call["function"]["name"] = name
+            await send(delta({"tool_calls": [call]}))
+        await send(delta({}, finish_reason))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            await send([], usage=usage)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    script = DEFAULT_SCRIPT
+    if args.script:
+        with open(args.script) as f:
+            script = FakeLLMScript.from_dict(json.load(f))
+    if args.latency_ms is not None:
+        script.latency_ms = args.latency_ms
+    if args.tokens_per_second is not None:
+        script.tokens_per_second = args.tokens_per_second
+    server = FakeLLMServer(script, host=args.host, port=args.port)
+    print(f"Fake LLM listening on {await server.start()} ({len(script.turns)} scripted turns)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8911)
+    parser.add_argument("--script", help="JSON file: {turns, latency_ms, tokens_per_second}")
+    parser.add_argument("--latency-ms", type=float)
+    parser.add_argument("--tokens-per-second", type=float)
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
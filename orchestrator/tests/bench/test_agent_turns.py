@@ -0,0 +1,91 @@
+"""
+Agent-turn benchmark in CI.
+
+Tests cover:
+- Baseline comparison flagging latency growth and throughput drops
+- An end-to-end run (subprocess: the benchmark owns its env and DB) that
+  must finish every task and stay inside fixed budgets; set
+  ``AGENT_BENCH_BASELINE`` to a previous ``--json`` report to also gate
+  on regressions against it
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from .agent_turns import DEFAULT_SCRIPT, ORCHESTRATOR_DIR, compare
+
+# Generous ceilings: they catch order-of-magnitude regressions (a blocking
+# call in the loop, an N+1 query per step) on a shared CI runner, while
+# --baseline does the fine-grained comparison.
+BUDGETS = {
+    "first_event_ms.p95": 2000.0,
+    "step_overhead_ms.p50": 250.0,
+    "db_statements": 400.0,
+}
+
+
+def _level(concurrency=1, **metrics):
+    level = {
+        "concurrency": concurrency,
+        "first_event_ms": {"p50": 50.0, "p95": 80.0},
+        "task_ms": {"p50": 400.0, "p95": 600.0},
+        "step_overhead_ms": {"p50": 20.0},
+        "db_statements": 60.0,
+        "throughput": 10.0,
+    }
+    level.update(metrics)
+    return level
+
+
+@pytest.mark.unit
+class TestCompare:
+    def test_within_tolerance(self):
+        report = {"levels": [_level(task_ms={"p50": 450.0, "p95": 650.0})]}
+        assert compare(report, {"levels": [_level()]}, tolerance=0.2) == []
+
+    def test_flags_latency_growth_and_throughput_drop(self):
+        report = {"levels": [_level(db_statements=90.0, throughput=7.0)]}
+        regressions = compare(report, {"levels": [_level()]}, tolerance=0.2)
+        assert len(regressions) == 2
+        assert regressions[0].startswith("c=1 db_statements: 60 -> 90")
+        assert "throughput: 10 -> 7" in regressions[1]
+
+    def test_ignores_levels_missing_from_baseline(self):
+        report = {"levels": [_level(concurrency=8, throughput=1.0)]}
+        assert compare(report, {"levels": [_level(concurrency=1)]}) == []
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+def test_agent_turn_benchmark(tmp_path: Path):
+    pytest.importorskip("tesslate_agent")
+
+    out = tmp_path / "bench.json"
+    args = [sys.executable, "-m", "tests.bench.agent_turns", "--tasks", "5"]
+    args += ["--concurrency", "1,4", "--json", str(out)]
+    baseline = os.environ.get("AGENT_BENCH_BASELINE")
+    if baseline:
+        args += ["--baseline", baseline]
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    proc = subprocess.run(
+        args, cwd=ORCHESTRATOR_DIR, env=env, capture_output=True, text=True, timeout=600
+    )
+    assert proc.returncode == 0, proc.stderr[-4000:]
+
+    report = json.loads(out.read_text())
+    for level in report["levels"]:
+        assert level["errors"] == 0, level["first_error"]
+        # One model request per scripted turn; the final turn ends the loop.
+        assert level["llm_requests"] == level["tasks"] * len(DEFAULT_SCRIPT.turns)
+        for path, budget in BUDGETS.items():
+            value = level
+            for key in path.split("."):
+                value = value[key]
+            assert value <= budget, f"c={level['concurrency']} {path}={value} > {budget}"
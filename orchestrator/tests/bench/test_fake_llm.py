@@ -0,0 +1,124 @@
+"""
+Unit tests for the deterministic LLM stand-in used by the agent benchmarks.
+
+Tests cover:
+- Streaming text and tool calls through OpenAIAdapter, reached via the
+  OPENAI_API_BASE override
+- Picking the scripted turn from the conversation (no server-side state)
+- First-token latency and token pacing
+- The desktop env-var fallback honouring <PROVIDER>_API_BASE
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import llm_client_pool
+from app.services.model_adapters import create_model_adapter, get_llm_client
+
+from .fake_llm import DEFAULT_SCRIPT, FakeLLMScript, FakeLLMServer, ScriptedTurn
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool(monkeypatch):
+    monkeypatch.setattr(llm_client_pool, "_instance", None)
+    yield
+
+
+def _point_openai_at(server, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-fake")
+    monkeypatch.setenv("OPENAI_API_BASE", server.base_url)
+
+
+async def _stream(adapter, messages):
+    events = []
+    async for event in await adapter.chat_with_tools(messages, tools=[], stream=True):
+        events.append(event)
+    return events
+
+
+async def test_streams_scripted_turns(monkeypatch):
+    async with FakeLLMServer() as server:
+        _point_openai_at(server, monkeypatch)
+        await _check_scripted_turns(server)
+
+
+async def _check_scripted_turns(server):
+    adapter = await create_model_adapter("gpt-bench", db=None)
+    messages = [{"role": "user", "content": "Plan and answer"}]
+
+    events = await _stream(adapter, messages)
+    text = "".join(e["content"] for e in events if e["type"] == "text_delta")
+    (complete,) = [e for e in events if e["type"] == "tool_calls_complete"]
+    call = complete["tool_calls"][0]
+    assert text == DEFAULT_SCRIPT.turns[0].text
+    assert call["function"]["name"] == "todo_write"
+    assert (
+        json.loads(call["function"]["arguments"])
+        == DEFAULT_SCRIPT.turns[0].tool_calls[0]["arguments"]
+    )
+    assert events[-1]["finish_reason"] == "tool_calls"
+    assert events[-1]["usage"]["completion_tokens"] > 0
+
+    # Each assistant message in the history advances the script.
+    messages += [
+        {"role": "assistant", "content": text, "tool_calls": complete["tool_calls"]},
+        {"role": "tool", "tool_call_id": call["id"], "content": "{}"},
+        {"role": "assistant", "content": None},
+    ]
+    result = await adapter.chat_with_tools(messages, tools=[])
+    assert result["content"] == DEFAULT_SCRIPT.turns[2].text
+    assert result["tool_calls"] == []
+    assert server.requests == 2
+
+
+async def test_latency_and_token_rate():
+    script = FakeLLMScript(
+        turns=[ScriptedTurn(text="one two three four five")],
+        latency_ms=50,
+        tokens_per_second=100,
+    )
+    async with FakeLLMServer(script) as server:
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(api_key="sk", base_url=server.base_url)
+        started = time.monotonic()
+        stream = await client.chat.completions.create(
+            model="fake", messages=[{"role": "user", "content": "hi"}], stream=True
+        )
+        first_text_at = None
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content and first_text_at is None:
+                first_text_at = time.monotonic()
+        finished = time.monotonic()
+        await client.close()
+
+    assert first_text_at - started >= 0.05
+    # 50ms to the first word, then four more words at 100 tokens/s.
+    assert finished - started >= 0.09
+
+
+async def test_desktop_env_fallback_uses_api_base_override(monkeypatch):
+    import app.config
+
+    settings = app.config.get_settings().model_copy(
+        update={"litellm_api_base": "", "litellm_master_key": ""}
+    )
+    monkeypatch.setattr(app.config, "get_settings", lambda: settings)
+    user = SimpleNamespace(litellm_api_key=None)
+
+    class _DB:
+        async def execute(self, _statement):
+            return SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    server = FakeLLMServer(port=8911)
+    _point_openai_at(server, monkeypatch)
+    client = await get_llm_client(user_id=uuid4(), model_name="bench-model", db=_DB())
+    assert str(client.base_url).rstrip("/") == server.base_url
@@ -372,11 +372,16 @@ def mock_snapshot_manager():
     sm.create_snapshot = AsyncMock(
         return_value=(Mock(id=uuid4(), snapshot_name="snap-abc123"), None)
     )
+    sm.create_snapshots = AsyncMock(
+        return_value=([Mock(id=uuid4(), snapshot_name="snap-abc123")], None)
+    )
     sm.wait_for_snapshot_ready = AsyncMock(return_value=(True, None))
+    sm.wait_for_snapshots_ready = AsyncMock(return_value=(True, None))
     sm.has_existing_snapshot = AsyncMock(return_value=True)
     sm.get_latest_ready_snapshot = AsyncMock(return_value=None)
     sm.get_latest_ready_snapshots_by_pvc = AsyncMock(return_value={})
     sm.restore_from_snapshot = AsyncMock(return_value=(True, None))
+    sm.restore_from_snapshots = AsyncMock(return_value={})
     sm.soft_delete_project_snapshots = AsyncMock(return_value=0)
     return sm
 
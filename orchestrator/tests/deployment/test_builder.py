@@ -11,6 +11,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from app.services.deployment.builder import BuildError, DeploymentBuilder, get_deployment_builder
+from app.services.fileops_client import FileBlob, FileInfo
 
 
 class TestDeploymentBuilder:
@@ -199,6 +200,40 @@ class TestDeploymentBuilder:
                 assert len(files) == 1
                 assert files[0].path == "index.html"
 
+    @pytest.mark.asyncio
+    async def test_fileops_failed_batch_is_retried_file_by_file(self):
+        """A batch stream that dies mid-way only loses the files that fail on retry."""
+        builder = DeploymentBuilder()
+        entries = [
+            FileInfo(name=n, path=f"dist/{n}", size=1, is_dir=False, mod_time=0, mode=0o644)
+            for n in ("a.js", "b.js", "c.js")
+        ]
+        requests = []
+
+        async def iter_files(volume_id, paths, *, max_file_size, timeout):
+            requests.append(list(paths))
+            if len(paths) > 1:
+                yield FileBlob(path=paths[0], data=b"A", size=1)
+                raise RuntimeError("stream reset")
+            if paths == ["dist/c.js"]:
+                raise RuntimeError("still broken")
+            yield FileBlob(path=paths[0], data=b"B", size=1)
+
+        client = AsyncMock()
+        client.stat_path.return_value = FileInfo(
+            name="dist", path="dist", size=0, is_dir=True, mod_time=0, mode=0o755
+        )
+        client.list_tree.return_value = entries
+        client.iter_files = iter_files
+        vm = AsyncMock()
+        vm.get_fileops_client.return_value = client
+
+        with patch("app.services.volume_manager.get_volume_manager", return_value=vm):
+            files = await builder._collect_files_via_fileops("vol-1", "dist")
+
+        assert [(f.path, f.content) for f in files] == [("a.js", b"A"), ("b.js", b"B")]
+        assert requests == [["dist/a.js", "dist/b.js", "dist/c.js"], ["dist/b.js"], ["dist/c.js"]]
+
 
 def test_get_deployment_builder_singleton():
     """Test that get_deployment_builder returns a singleton."""
@@ -285,6 +285,22 @@ class TestComputeManagerTier1:
 
         volume = manifest.spec.volumes[0]
         assert volume.persistent_volume_claim.claim_name == "compute-pvc-t1-test-abcdef"
+        assert manifest.spec.affinity is None
+
+    async def test_build_pod_manifest_preferred_node_is_soft_affinity(self, cm, mock_settings):
+        """preferred_node from the placement engine becomes a soft node affinity."""
+        manifest = cm._build_pod_manifest(
+            pod_name="t1-test-abcdef",
+            namespace="tesslate-compute-pool",
+            command=["/bin/sh", "-c", "echo hello"],
+            image="tesslate-devserver:latest",
+            preferred_node="node-2",
+        )
+
+        node_affinity = manifest.spec.affinity.node_affinity
+        assert node_affinity.required_during_scheduling_ignored_during_execution is None
+        term = node_affinity.preferred_during_scheduling_ignored_during_execution[0]
+        assert term.preference.match_expressions[0].values == ["node-2"]
 
     async def test_reap_orphaned_pods_deletes_old(self, cm, mock_v1, mock_settings):
         """reap_orphaned_pods deletes pods older than max_age_seconds (no PV/PVC cleanup)."""
@@ -428,6 +444,32 @@ class TestComputeManagerTier1:
         # Pod should still be cleaned up in finally block
         mock_v1.delete_namespaced_pod.assert_called_once()
 
+    @staticmethod
+    def _engine(schedulable, best):
+        engine = MagicMock()
+        engine.schedulable_nodes = AsyncMock(return_value=schedulable)
+        engine.pick = AsyncMock(return_value=best)
+        return engine
+
+    async def test_ephemeral_pod_targets_cache_node(self, cm):
+        """The cache node wins even when another node packs tighter."""
+        engine = self._engine(["node-1", "node-2"], best="node-2")
+        with patch("app.services.placement.get_placement_engine", return_value=engine):
+            node = await cm._place_ephemeral_pod("node-1")
+
+        assert node == "node-1"
+        engine.pick.assert_not_awaited()
+        assert engine.reserve.call_args[0][0] == "node-1"
+
+    async def test_ephemeral_pod_falls_back_without_schedulable_cache_node(self, cm):
+        """Only a missing or unschedulable cache node falls back to the best node."""
+        engine = self._engine(["node-2"], best="node-2")
+        with patch("app.services.placement.get_placement_engine", return_value=engine):
+            assert await cm._place_ephemeral_pod("node-gone") == "node-2"
+            assert await cm._place_ephemeral_pod(None) == "node-2"
+
+        assert [c[0][0] for c in engine.reserve.call_args_list] == ["node-2", "node-2"]
+
 
 # ===========================================================================
 # ComputeManager — _ensure_compute_pv_pvc
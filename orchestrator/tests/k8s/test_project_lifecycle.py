@@ -478,9 +478,9 @@ class TestHibernationViaVolumeSnapshots:
         mock_db = AsyncMock()
 
         mock_sm = AsyncMock()
-        mock_snapshot = Mock(id=uuid4(), snapshot_name="snap-123")
-        mock_sm.create_snapshot = AsyncMock(return_value=(mock_snapshot, None))
-        mock_sm.wait_for_snapshot_ready = AsyncMock(return_value=(True, None))
+        mock_snapshot = Mock(id=uuid4(), snapshot_name="snap-123", pvc_name="project-storage")
+        mock_sm.create_snapshots = AsyncMock(return_value=([mock_snapshot], None))
+        mock_sm.wait_for_snapshots_ready = AsyncMock(return_value=(True, None))
 
         # Mock PVC listing to return project-storage
         mock_pvc = Mock()
@@ -504,8 +504,9 @@ class TestHibernationViaVolumeSnapshots:
             result = await orchestrator._save_to_snapshot(project_id, user_id, namespace, mock_db)
 
         assert result is True
-        mock_sm.create_snapshot.assert_awaited_once()
-        mock_sm.wait_for_snapshot_ready.assert_awaited_once()
+        mock_sm.create_snapshots.assert_awaited_once()
+        assert mock_sm.create_snapshots.await_args.kwargs["pvc_names"] == ["project-storage"]
+        mock_sm.wait_for_snapshots_ready.assert_awaited_once()
 
     async def test_save_to_snapshot_skips_uninitialized(self, orchestrator):
         """If project is not initialized (no files), skip snapshot, return True."""
@@ -539,19 +540,25 @@ class TestHibernationViaVolumeSnapshots:
 
         # Returns True so namespace can be cleaned up (no data to preserve)
         assert result is True
-        mock_sm.create_snapshot.assert_not_awaited()
+        mock_sm.create_snapshots.assert_not_awaited()
 
     async def test_restore_from_snapshot_delegates(self, orchestrator):
-        """Restore should delegate to snapshot_manager.restore_from_snapshot."""
+        """Restore should delegate to snapshot_manager.restore_from_snapshots."""
         project_id = uuid4()
         user_id = uuid4()
         namespace = f"proj-{project_id}"
         mock_db = AsyncMock()
 
+        project_snap = Mock(snapshot_name="snap-123")
+        service_snap = Mock(snapshot_name="snap-123-postgres-data")
         mock_sm = AsyncMock()
-        mock_sm.has_existing_snapshot = AsyncMock(return_value=True)
-        mock_sm.restore_from_snapshot = AsyncMock(return_value=(True, None))
-        mock_sm.get_latest_ready_snapshots_by_pvc = AsyncMock(return_value={})
+        mock_sm.get_latest_ready_snapshots_by_pvc = AsyncMock(
+            return_value={"project-storage": project_snap, "postgres-data": service_snap}
+        )
+        mock_sm.get_latest_ready_snapshot = AsyncMock(return_value=project_snap)
+        mock_sm.restore_from_snapshots = AsyncMock(
+            return_value={"project-storage": (True, None), "postgres-data": (True, None)}
+        )
 
         with patch(
             "app.services.orchestration.kubernetes_orchestrator.get_snapshot_manager",
@@ -562,7 +569,11 @@ class TestHibernationViaVolumeSnapshots:
             )
 
         assert result is True
-        mock_sm.restore_from_snapshot.assert_awaited_once()
+        mock_sm.restore_from_snapshots.assert_awaited_once()
+        assert set(mock_sm.restore_from_snapshots.await_args.kwargs["snapshots"]) == {
+            "project-storage",
+            "postgres-data",
+        }
 
 
 # ===========================================================================
@@ -0,0 +1,226 @@
+"""
+Unit tests for the orchestrator file content cache.
+
+Tests cover:
+- FileContentCache: stamp validation, byte-bounded LRU eviction, entry size
+  cap, invalidation, per-project hit-rate metrics
+- LocalOrchestrator: re-reads served from cache, external edits detected,
+  own writes/deletes invalidate
+- KubernetesOrchestrator.read_files_batch: unchanged files served from cache,
+  only misses streamed from FileOps, repeated paths read once, no caching on
+  whole-second stamps
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.fileops_client import FileBlob
+from app.services.orchestration import LocalOrchestrator, file_cache
+from app.services.orchestration.file_cache import FileContentCache, get_file_cache_metrics
+from app.services.orchestration.kubernetes_orchestrator import KubernetesOrchestrator
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    cache = FileContentCache(max_bytes=1024, max_entry_bytes=512)
+    file_cache.reset_file_cache_metrics()
+    with patch.object(file_cache, "_instance", cache):
+        yield cache
+    file_cache.reset_file_cache_metrics()
+
+
+class TestFileContentCache:
+    def test_hit_requires_matching_stamp(self, fresh_cache):
+        fresh_cache.put("p1", "a.txt", (1, 5), "hello")
+
+        assert fresh_cache.get("p1", "a.txt", (1, 5)) == "hello"
+        assert fresh_cache.get("p1", "a.txt", (2, 5)) is None
+        # A stale entry is dropped, not kept around.
+        assert len(fresh_cache) == 0
+
+    def test_evicts_least_recently_used_by_bytes(self, fresh_cache):
+        fresh_cache.put("p1", "a", (1, 400), "a")
+        fresh_cache.put("p1", "b", (1, 400), "b")
+        fresh_cache.get("p1", "a", (1, 400))  # a is now most recent
+        fresh_cache.put("p1", "c", (1, 400), "c")
+
+        assert fresh_cache.total_bytes == 800
+        assert fresh_cache.get("p1", "a", (1, 400)) == "a"
+        assert fresh_cache.get("p1", "b", (1, 400)) is None
+
+    def test_large_files_and_disabled_cache_are_not_stored(self, fresh_cache):
+        fresh_cache.put("p1", "big", (1, 513), "x")
+        assert len(fresh_cache) == 0
+
+        disabled = FileContentCache(max_bytes=0, max_entry_bytes=512)
+        disabled.put("p1", "a", (1, 1), "x")
+        assert disabled.get("p1", "a", (1, 1)) is None
+
+    def test_invalidate_and_per_project_metrics(self, fresh_cache):
+        fresh_cache.put("p1", "a", (1, 1), "x")
+        fresh_cache.get("p1", "a", (1, 1))
+        fresh_cache.invalidate("p1", "a")
+        fresh_cache.get("p1", "a", (1, 1))
+        fresh_cache.get("p2", "a", (1, 1))
+
+        assert get_file_cache_metrics("p1") == {
+            "hits": 1,
+            "misses": 1,
+            "total_requests": 2,
+            "hit_rate_percent": 50.0,
+        }
+        overall = get_file_cache_metrics()
+        assert overall["misses"] == 2
+        assert set(overall["projects"]) == {"p1", "p2"}
+
+
+@pytest.mark.asyncio
+class TestLocalOrchestratorCache:
+    @pytest.fixture
+    def orchestrator(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalOrchestrator:
+        monkeypatch.setenv("PROJECT_ROOT", str(tmp_path))
+        return LocalOrchestrator()
+
+    async def test_reread_is_served_from_cache(self, orchestrator, tmp_path):
+        project_id = uuid4()
+        (tmp_path / "a.txt").write_text("one")
+
+        assert await orchestrator.read_file(uuid4(), project_id, "main", "a.txt") == "one"
+        with patch.object(Path, "read_text", side_effect=AssertionError("disk read")):
+            assert await orchestrator.read_file(uuid4(), project_id, "main", "a.txt") == "one"
+        assert get_file_cache_metrics(str(project_id))["hits"] == 1
+
+    async def test_external_edit_is_detected(self, orchestrator, tmp_path):
+        project_id = uuid4()
+        target = tmp_path / "a.txt"
+        target.write_text("one")
+        await orchestrator.read_file(uuid4(), project_id, "main", "a.txt")
+
+        # Same size, newer mtime.
+        target.write_text("two")
+        st = target.stat()
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert await orchestrator.read_file(uuid4(), project_id, "main", "a.txt") == "two"
+
+    async def test_own_writes_and_deletes_invalidate(self, orchestrator, tmp_path, fresh_cache):
+        user_id, project_id = uuid4(), uuid4()
+        (tmp_path / "a.txt").write_text("one")
+        await orchestrator.read_file(user_id, project_id, "main", "a.txt")
+        assert len(fresh_cache) == 1
+
+        await orchestrator.write_file(user_id, project_id, "main", "a.txt", "two")
+        assert len(fresh_cache) == 0
+        assert await orchestrator.read_file(user_id, project_id, "main", "a.txt") == "two"
+
+        await orchestrator.delete_file(user_id, project_id, "main", "a.txt")
+        assert len(fresh_cache) == 0
+        assert await orchestrator.read_file(user_id, project_id, "main", "a.txt") is None
+
+
+def _info(size, mod_time_ns=1, is_dir=False):
+    return SimpleNamespace(size=size, mod_time=0, mod_time_ns=mod_time_ns, is_dir=is_dir)
+
+
+@pytest.mark.asyncio
+class TestKubernetesBatchCache:
+    @pytest.fixture
+    def orchestrator(self):
+        orch = KubernetesOrchestrator.__new__(KubernetesOrchestrator)
+        client = SimpleNamespace(stat_paths=AsyncMock(), iter_files=None)
+
+        async def _fileops_call(volume_id, fn):
+            return await fn(client)
+
+        orch._fileops_call = _fileops_call
+        orch._client = client
+        return orch
+
+    @staticmethod
+    def _serve(client, contents):
+        streamed = []
+
+        async def _iter_files(volume_id, paths, *, max_file_size):
+            streamed.append(list(paths))
+            for p in paths:
+                if p in contents:
+                    yield FileBlob(path=p, data=contents[p], size=len(contents[p]))
+                else:
+                    yield FileBlob(path=p, data=b"", size=0, error="missing")
+
+        client.iter_files = _iter_files
+        return streamed
+
+    async def test_second_batch_only_streams_changed_files(self, orchestrator):
+        client = orchestrator._client
+        project_id = uuid4()
+        stats = {"app/a.txt": _info(1), "app/b.txt": _info(1)}
+        client.stat_paths.side_effect = lambda vid, paths: {p: stats[p] for p in paths}
+        streamed = self._serve(client, {"app/a.txt": b"A", "app/b.txt": b"B"})
+
+        files, errors = await orchestrator.read_files_batch(
+            uuid4(), project_id, "main", ["a.txt", "b.txt"], subdir="app", volume_id="vol-1"
+        )
+        assert [f["content"] for f in files] == ["A", "B"] and errors == []
+
+        stats["app/b.txt"] = _info(1, mod_time_ns=2)
+        files, errors = await orchestrator.read_files_batch(
+            uuid4(), project_id, "main", ["a.txt", "b.txt"], subdir="app", volume_id="vol-1"
+        )
+
+        assert [(f["path"], f["content"]) for f in files] == [("a.txt", "A"), ("b.txt", "B")]
+        assert streamed == [["app/a.txt", "app/b.txt"], ["app/b.txt"]]
+
+    async def test_whole_second_stamps_are_not_cached(self, orchestrator):
+        client = orchestrator._client
+        project_id = uuid4()
+        # A driver without mod_time_ns: same-second, same-size edits are invisible.
+        client.stat_paths.side_effect = lambda vid, paths: {p: _info(1, 0) for p in paths}
+        streamed = self._serve(client, {"a.txt": b"A"})
+
+        for _ in range(2):
+            files, _ = await orchestrator.read_files_batch(
+                uuid4(), project_id, "main", ["a.txt"], volume_id="vol-1"
+            )
+            assert files[0]["content"] == "A"
+        assert streamed == [["a.txt"], ["a.txt"]]
+
+    async def test_repeated_paths_keep_their_names(self, orchestrator):
+        client = orchestrator._client
+        client.stat_paths.side_effect = lambda vid, paths: {p: _info(1) for p in paths}
+        streamed = self._serve(client, {"a.txt": b"A", "b.txt": b"B"})
+
+        files, errors = await orchestrator.read_files_batch(
+            uuid4(), uuid4(), "main", ["a.txt", "b.txt", "./a.txt"], volume_id="vol-1"
+        )
+
+        assert [(f["path"], f["content"]) for f in files] == [
+            ("a.txt", "A"),
+            ("b.txt", "B"),
+            ("./a.txt", "A"),
+        ]
+        assert errors == []
+        assert streamed == [["a.txt", "b.txt"]]
+
+    async def test_missing_paths_are_reported_in_order(self, orchestrator):
+        client = orchestrator._client
+
+        # Paths the node can't stat are left out of the StatPaths result.
+        client.stat_paths.side_effect = lambda vid, paths: {
+            p: _info(1) for p in paths if p == "a.txt"
+        }
+        self._serve(client, {"a.txt": b"A"})
+
+        files, errors = await orchestrator.read_files_batch(
+            uuid4(), uuid4(), "main", ["gone.txt", "a.txt"], volume_id="vol-1"
+        )
+
+        assert [f["path"] for f in files] == ["a.txt"]
+        assert errors == ["gone.txt"]
@@ -0,0 +1,178 @@
+"""
+Unit tests for versioned file-tree snapshots.
+
+Tests cover:
+- Delta responses: added / modified / removed since a cursor
+- Unusable cursors (unknown epoch, future or expired versions) fall back to
+  the full tree
+- Rescans are throttled until the orchestrator marks the project dirty
+- LocalOrchestrator writes and commands mark the snapshot dirty
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.orchestration import LocalOrchestrator, file_tree
+from app.services.orchestration.file_tree import FileTreeService
+
+
+def _entry(path, size=1, mod_time=1.0, is_dir=False):
+    return {
+        "path": path,
+        "name": path.rsplit("/", 1)[-1],
+        "is_dir": is_dir,
+        "size": size,
+        "mod_time": mod_time,
+    }
+
+
+class FakeOrchestrator:
+    def __init__(self, entries):
+        self.entries = entries
+        self.calls = 0
+
+    async def list_tree(self, user_id, project_id, container_name, subdir=None):
+        self.calls += 1
+        return list(self.entries)
+
+
+async def _changes(service, orch, project_id, since=None):
+    return await service.get_changes(orch, uuid4(), project_id, None, since=since)
+
+
+@pytest.mark.asyncio
+class TestDeltas:
+    async def test_delta_since_cursor(self):
+        service = FileTreeService(rescan_interval=0)
+        orch = FakeOrchestrator([_entry("a.txt"), _entry("b.txt"), _entry("src", is_dir=True)])
+        first = await _changes(service, orch, "p1")
+        assert first["delta"] is False and len(first["files"]) == 3
+
+        orch.entries = [_entry("a.txt", size=2), _entry("src", is_dir=True), _entry("c.txt")]
+        second = await _changes(service, orch, "p1", since=first["version"])
+
+        assert second["delta"] is True
+        assert [e["path"] for e in second["added"]] == ["c.txt"]
+        assert [e["path"] for e in second["modified"]] == ["a.txt"]
+        assert second["removed"] == ["b.txt"]
+
+        third = await _changes(service, orch, "p1", since=second["version"])
+        assert third == {
+            "delta": True,
+            "added": [],
+            "modified": [],
+            "removed": [],
+            "version": second["version"],
+        }
+
+    async def test_readded_path_is_not_reported_removed(self):
+        service = FileTreeService(rescan_interval=0)
+        orch = FakeOrchestrator([_entry("a.txt")])
+        first = await _changes(service, orch, "p1")
+        orch.entries = []
+        await _changes(service, orch, "p1")
+        orch.entries = [_entry("a.txt", mod_time=2.0)]
+
+        delta = await _changes(service, orch, "p1", since=first["version"])
+
+        assert [e["path"] for e in delta["added"]] == ["a.txt"]
+        assert delta["removed"] == []
+
+    @pytest.mark.parametrize("since", ["garbage", "deadbeef:1", "", None])
+    async def test_unusable_cursor_returns_full_tree(self, since):
+        service = FileTreeService(rescan_interval=0)
+        orch = FakeOrchestrator([_entry("a.txt")])
+        await _changes(service, orch, "p1")
+
+        result = await _changes(service, orch, "p1", since=since)
+
+        assert result["delta"] is False
+        assert [e["path"] for e in result["files"]] == ["a.txt"]
+
+    async def test_cursor_older_than_tombstones_returns_full_tree(self):
+        service = FileTreeService(rescan_interval=0)
+        orch = FakeOrchestrator([_entry("a.txt"), _entry("b.txt")])
+        first = await _changes(service, orch, "p1")
+
+        with patch.object(file_tree, "_MAX_TOMBSTONES", 1):
+            orch.entries = [_entry("b.txt")]
+            await _changes(service, orch, "p1")
+            orch.entries = []
+            await _changes(service, orch, "p1")
+
+        assert (await _changes(service, orch, "p1", since=first["version"]))["delta"] is False
+
+
+@pytest.mark.asyncio
+class TestRefresh:
+    async def test_rescan_is_throttled_until_marked_dirty(self):
+        service = FileTreeService(rescan_interval=60)
+        orch = FakeOrchestrator([_entry("a.txt")])
+
+        await service.list_tree(orch, uuid4(), "p1", None)
+        await service.list_tree(orch, uuid4(), "p1", None)
+        assert orch.calls == 1
+
+        service.mark_dirty("p2")
+        await service.list_tree(orch, uuid4(), "p1", None)
+        assert orch.calls == 1
+
+        service.mark_dirty("p1")
+        await service.list_tree(orch, uuid4(), "p1", None)
+        assert orch.calls == 2
+
+    async def test_failed_listing_keeps_snapshot_dirty(self):
+        service = FileTreeService(rescan_interval=60)
+        orch = FakeOrchestrator([])
+
+        async def _boom(**kwargs):
+            raise RuntimeError("volume unavailable")
+
+        with patch.object(orch, "list_tree", _boom), pytest.raises(RuntimeError):
+            await service.list_tree(orch, uuid4(), "p1", None)
+
+        await service.list_tree(orch, uuid4(), "p1", None)
+        assert orch.calls == 1
+
+    async def test_snapshots_are_bounded(self):
+        service = FileTreeService(rescan_interval=60, max_snapshots=2)
+        orch = FakeOrchestrator([])
+        for project in ("p1", "p2", "p3"):
+            await service.list_tree(orch, uuid4(), project, None)
+        assert len(service) == 2
+
+
+@pytest.mark.asyncio
+class TestLocalOrchestratorHooks:
+    @pytest.fixture
+    def service(self):
+        service = FileTreeService(rescan_interval=60)
+        with patch.object(file_tree, "_instance", service):
+            yield service
+
+    @pytest.fixture
+    def orchestrator(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalOrchestrator:
+        monkeypatch.setenv("PROJECT_ROOT", str(tmp_path))
+        return LocalOrchestrator()
+
+    async def test_writes_and_commands_are_visible_immediately(self, service, orchestrator):
+        user_id, project_id = uuid4(), uuid4()
+        first = await service.get_changes(orchestrator, user_id, project_id, None)
+        assert first["files"] == []
+
+        await orchestrator.write_file(user_id, project_id, "main", "a.txt", "x")
+        delta = await service.get_changes(
+            orchestrator, user_id, project_id, None, since=first["version"]
+        )
+        assert [e["path"] for e in delta["added"]] == ["a.txt"]
+
+        await orchestrator.execute_command(user_id, project_id, "main", ["rm", "a.txt"])
+        delta = await service.get_changes(
+            orchestrator, user_id, project_id, None, since=delta["version"]
+        )
+        assert delta["removed"] == ["a.txt"]
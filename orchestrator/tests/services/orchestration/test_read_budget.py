@@ -0,0 +1,186 @@
+"""
+Unit tests for budgeted streaming batch reads.
+
+Tests cover:
+- UTF-8 safe cutting of head and tail ranges
+- LocalOrchestrator.read_files_stream: per-file head/tail truncation, the
+  extension filter, and stopping once the total budget is spent
+- KubernetesOrchestrator.read_files_stream: budgets pushed down to FileOps,
+  cache hits counted against the total, blobs matched to repeated paths
+- FileOpsClient budget enforcement for nodes that ignore the budgets
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.fileops_client import FileBlob, _apply_read_budget
+from app.services.orchestration import LocalOrchestrator, file_cache
+from app.services.orchestration.file_cache import FileContentCache
+from app.services.orchestration.kubernetes_orchestrator import KubernetesOrchestrator
+from app.services.orchestration.read_budget import ReadBudget, clip_text, decode_range
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+class TestCutting:
+    def test_head_cut_drops_partial_sequence(self):
+        data = "ab€".encode()  # € is 3 bytes
+        assert decode_range(data[:4], truncated=True, tail=False) == "ab"
+
+    def test_tail_cut_skips_continuation_bytes(self):
+        data = "€cd".encode()
+        assert decode_range(data[1:], truncated=True, tail=True) == "cd"
+
+    def test_clip_text_reports_bytes_and_truncation(self):
+        assert clip_text("hello", 10, tail=False) == ("hello", 5, False)
+        assert clip_text("hello", 3, tail=True) == ("llo", 3, True)
+
+
+class TestLocalStream:
+    @pytest.fixture
+    def orchestrator(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalOrchestrator:
+        monkeypatch.setenv("PROJECT_ROOT", str(tmp_path))
+        (tmp_path / "a.txt").write_text("0123456789")
+        (tmp_path / "b.txt").write_text("abcdef")
+        (tmp_path / "c.txt").write_text("never read")
+        (tmp_path / "logo.png").write_bytes(b"\x89PNG")
+        return LocalOrchestrator()
+
+    async def test_head_budgets(self, orchestrator):
+        budget = ReadBudget(
+            max_bytes_per_file=4, max_total_bytes=6, skip_extensions=frozenset({".png"})
+        )
+        records = await _collect(
+            orchestrator.read_files_stream(
+                uuid4(),
+                uuid4(),
+                "main",
+                ["logo.png", "a.txt", "missing.txt", "b.txt", "c.txt"],
+                budget,
+            )
+        )
+
+        assert records[0] == {"path": "logo.png", "error": "binary file extension"}
+        assert records[1] == {"path": "a.txt", "content": "0123", "size": 10, "truncated": True}
+        assert records[2]["path"] == "missing.txt" and "error" in records[2]
+        assert records[3] == {"path": "b.txt", "content": "ab", "size": 6, "truncated": True}
+        assert len(records) == 4  # c.txt: total budget spent
+
+    async def test_tail_reads_end_of_file(self, orchestrator):
+        budget = ReadBudget(max_bytes_per_file=3, max_total_bytes=100, tail=True)
+        records = await _collect(
+            orchestrator.read_files_stream(uuid4(), uuid4(), "main", ["a.txt", "b.txt"], budget)
+        )
+        assert [r["content"] for r in records] == ["789", "def"]
+
+
+def _info(size, mod_time_ns=1):
+    return SimpleNamespace(size=size, mod_time=0, mod_time_ns=mod_time_ns, is_dir=False)
+
+
+class TestKubernetesStream:
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        with patch.object(
+            file_cache, "_instance", FileContentCache(max_bytes=1024, max_entry_bytes=512)
+        ):
+            yield
+
+    @pytest.fixture
+    def orchestrator(self):
+        orch = KubernetesOrchestrator.__new__(KubernetesOrchestrator)
+        client = SimpleNamespace(stat_paths=AsyncMock(), requests=[])
+        contents = {"a.txt": b"AAAA", "b.txt": b"0123456789", "c.txt": b"CC"}
+        client.stat_paths.side_effect = lambda vid, paths: {
+            p: _info(len(contents[p])) for p in paths
+        }
+
+        async def _iter_files(volume_id, paths, **budget):
+            client.requests.append((list(paths), budget))
+            remaining = budget["max_total_bytes"]
+            for p in paths:
+                if remaining <= 0:
+                    return
+                data = contents[p][: min(budget["max_read_bytes"], remaining)]
+                remaining -= len(data)
+                yield FileBlob(path=p, data=data, size=len(contents[p]))
+
+        client.iter_files = _iter_files
+
+        async def _fileops_call(volume_id, fn, *args):
+            return await fn(client, *args)
+
+        orch._fileops_call = _fileops_call
+        orch._client = client
+        return orch
+
+    async def test_budgets_are_pushed_down_and_cache_hits_count(self, orchestrator):
+        project_id = uuid4()
+        read = orchestrator.read_files_stream
+        paths = ["a.txt", "b.txt", "c.txt"]
+
+        first = await _collect(
+            read(uuid4(), project_id, "main", paths, ReadBudget(5, 100), volume_id="vol-1")
+        )
+        assert [(r["content"], r["truncated"]) for r in first] == [
+            ("AAAA", False),
+            ("01234", True),
+            ("CC", False),
+        ]
+        assert orchestrator._client.requests[0][1]["max_read_bytes"] == 5
+
+        # a.txt and c.txt are now cached; only b.txt goes to the node, and
+        # its total budget is what the cache hits before it left over.
+        second = await _collect(
+            read(uuid4(), project_id, "main", paths, ReadBudget(5, 7), volume_id="vol-1")
+        )
+        assert [(r["path"], r["content"]) for r in second] == [("a.txt", "AAAA"), ("b.txt", "012")]
+        assert orchestrator._client.requests[1][0] == ["b.txt"]
+
+    async def test_repeated_paths_get_their_own_content(self, orchestrator):
+        paths = ["a.txt", "c.txt", "./a.txt", "b.txt"]
+        records = await _collect(
+            orchestrator.read_files_stream(
+                uuid4(), uuid4(), "main", paths, ReadBudget(20, 100), volume_id="vol-1"
+            )
+        )
+
+        assert [(r["path"], r["content"]) for r in records] == [
+            ("a.txt", "AAAA"),
+            ("c.txt", "CC"),
+            ("./a.txt", "AAAA"),
+            ("b.txt", "0123456789"),
+        ]
+        assert orchestrator._client.requests[0][0] == ["a.txt", "c.txt", "b.txt"]
+
+
+class TestClientBudgetFallback:
+    async def test_old_node_output_is_cut_client_side(self):
+        async def _blobs():
+            yield FileBlob(path="img.PNG", data=b"\x89PNG", size=4)
+            yield FileBlob(path="a.log", data=b"0123456789", size=10)
+            yield FileBlob(path="b.log", data=b"abcdef", size=6)
+            yield FileBlob(path="c.log", data=b"zz", size=2)
+
+        request = {
+            "max_read_bytes": 4,
+            "max_total_bytes": 6,
+            "tail": True,
+            "skip_extensions": ["png"],
+        }
+        blobs = await _collect(_apply_read_budget(_blobs(), request))
+
+        assert [(b.path, b.data, b.error) for b in blobs] == [
+            ("img.PNG", b"", "binary file extension"),
+            ("a.log", b"6789", None),
+            ("b.log", b"ef", None),
+        ]
+        assert blobs[1].size == 10
@@ -0,0 +1,220 @@
+"""
+Unit tests for the indexed code search behind the grep tool.
+
+Tests cover:
+- Literal planning from regexes (runs, alternations, optional parts)
+- Trigram candidate selection and compaction of retired ids
+- Verification output for each grep mode, including context lines
+- Incremental sync against a real LocalOrchestrator project tree
+- Absolute and unknown path prefixes, per-container indexes
+- Patterns Python's re cannot compile left to ripgrep
+- The per-process memory budget across project indexes
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.code_search import (
+    CodeSearchService,
+    SearchRequest,
+    TrigramIndex,
+    plan_literals,
+)
+from app.services.code_search import index as index_module
+from app.services.code_search.query import search, supports
+from app.services.orchestration import LocalOrchestrator, file_tree
+from app.services.orchestration.file_tree import FileTreeService
+
+
+class TestPlanLiterals:
+    def test_literal_runs_split_on_wildcards(self):
+        assert plan_literals(r"def \w+_handler\(") == [["def "], ["_handler("]]
+
+    def test_alternation_becomes_or_clause(self):
+        assert plan_literals(r"(fetchUser|loadProject)\(") == [["fetchUser", "loadProject"]]
+        # sre factors out common prefixes; both halves still constrain candidates.
+        assert plan_literals(r"(useState|useEffect)") == [["use"], ["State", "Effect"]]
+
+    def test_optional_parts_and_short_runs_are_dropped(self):
+        assert plan_literals(r"colou?r") == [["colo"]]
+        assert plan_literals(r"a.b") == []
+        assert plan_literals(r"(foo|.*)bar") == [["bar"]]
+
+    def test_invalid_pattern_scans_everything(self):
+        assert plan_literals("(unclosed") == []
+
+    def test_rust_only_syntax_is_left_to_ripgrep(self):
+        assert supports(SearchRequest(r"def \w+"))
+        assert not supports(SearchRequest(r"\p{Greek}+"))
+        assert not supports(SearchRequest(r"end\z"))
+
+
+class TestTrigramIndex:
+    def test_candidates_require_every_clause(self):
+        idx = TrigramIndex()
+        idx.add("a.py", "import os\nprint('hello')\n", (1, 1))
+        idx.add("b.py", "print('HELLO world')\n", (1, 1))
+        idx.add("c.py", "nothing here\n", (1, 1))
+
+        assert [d.path for d in idx.candidates([["hello"]])] == ["a.py", "b.py"]
+        assert [d.path for d in idx.candidates([["hello"], ["world"]])] == ["b.py"]
+        assert [d.path for d in idx.candidates([["import", "nothing"]])] == ["a.py", "c.py"]
+        assert len(idx.candidates([])) == 3
+
+    def test_replace_and_remove_update_bytes_and_candidates(self):
+        idx = TrigramIndex()
+        idx.add("a.py", "alpha", (1, 1))
+        idx.add("a.py", "beta", (2, 2))
+        assert idx.total_bytes == 4
+        assert idx.candidates([["alpha"]]) == []
+        idx.remove("a.py")
+        assert idx.total_bytes == 0 and len(idx) == 0
+
+    def test_memory_estimate_counts_postings(self):
+        idx = TrigramIndex()
+        idx.add("a.py", "abcd", (1, 1))
+        # 4 bytes of text, 2 postings entries, 2 distinct trigrams.
+        assert idx.memory_bytes == 4 + 2 * 4 + 2 * index_module._TRIGRAM_OVERHEAD
+
+    def test_compaction_drops_retired_ids(self):
+        with patch.object(index_module, "_MIN_DEAD_FOR_COMPACTION", 2):
+            idx = TrigramIndex()
+            for i in range(3):
+                idx.add("a.py", f"version {i}", (i, i))
+            assert len(idx._docs) == 1
+            assert [d.text for d in idx.candidates([["version"]])] == ["version 2"]
+
+
+class TestVerification:
+    @pytest.fixture
+    def docs(self):
+        idx = TrigramIndex()
+        idx.add("src/app.py", "import os\n\ndef main():\n    os.exit(0)\n", (1, 1))
+        idx.add("src/util.ts", "export const exit = () => {}\n", (1, 1))
+        idx.add(".hidden/x.py", "os.exit\n", (1, 1))
+        return idx.candidates([])
+
+    def test_files_and_counts(self, docs):
+        result = search(docs, SearchRequest(pattern="exit"))
+        assert result.files == ["src/app.py", "src/util.ts"]
+        assert result.counts == {"src/app.py": 1, "src/util.ts": 1}
+
+        assert search(docs, SearchRequest(pattern="exit", file_type="py")).files == ["src/app.py"]
+        assert search(docs, SearchRequest(pattern="EXIT", ignore_case=True, glob="*.ts")).files == [
+            "src/util.ts"
+        ]
+
+    def test_content_with_context(self, docs):
+        result = search(
+            docs,
+            SearchRequest(pattern=r"os", output_mode="content", before=1, after=1, path="src"),
+        )
+        first, second = result.matches
+        assert first == {
+            "path": "src/app.py",
+            "line_number": 1,
+            "line_text": "import os",
+            "after_context": [{"line_number": 2, "line_text": ""}],
+        }
+        assert second["line_number"] == 4
+        assert second["before_context"] == [{"line_number": 3, "line_text": "def main():"}]
+        assert "after_context" not in second
+
+    def test_multiline_match_spans_lines(self, docs):
+        result = search(
+            docs, SearchRequest(pattern=r"main\(\):.*exit", output_mode="content", multiline=True)
+        )
+        assert result.matches == [
+            {
+                "path": "src/app.py",
+                "line_number": 3,
+                "line_text": "def main():\n    os.exit(0)",
+            }
+        ]
+
+
+class TestIncrementalSync:
+    @pytest.fixture
+    def orchestrator(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("PROJECT_ROOT", str(tmp_path))
+        with patch.object(file_tree, "_instance", FileTreeService(rescan_interval=0)):
+            yield LocalOrchestrator()
+
+    async def test_index_follows_writes(self, orchestrator, tmp_path: Path):
+        user_id, project_id = uuid4(), uuid4()
+        (tmp_path / "a.py").write_text("needle = 1\n")
+        (tmp_path / "b.py").write_text("haystack\n")
+        service = CodeSearchService(max_bytes=1 << 20, max_file_bytes=1 << 16, max_projects=2)
+        request = SearchRequest(pattern="needle")
+
+        assert await service.warm(orchestrator, user_id, project_id, "main") is True
+        result = await service.search(orchestrator, user_id, project_id, "main", request)
+        assert result.files == ["a.py"]
+        assert result.candidates == 1
+
+        await orchestrator.write_file(user_id, project_id, "main", "b.py", "needle = 2\n")
+        await orchestrator.delete_file(user_id, project_id, "main", "a.py")
+        result = await service.search(orchestrator, user_id, project_id, "main", request)
+        assert result.files == ["b.py"]
+
+    async def test_oversized_project_falls_back(self, orchestrator, tmp_path: Path):
+        (tmp_path / "big.txt").write_text("x" * 100)
+        service = CodeSearchService(max_bytes=10, max_file_bytes=1 << 16, max_projects=2)
+
+        assert await service.warm(orchestrator, uuid4(), uuid4(), "main") is False
+
+    async def test_memory_budget_drops_least_recent_index(self, orchestrator, tmp_path: Path):
+        user_id, project_id = uuid4(), uuid4()
+        (tmp_path / "a.py").write_text("needle = 1\n")
+        one = TrigramIndex()
+        one.add("a.py", "needle = 1\n", (1, 1))
+        service = CodeSearchService(
+            max_bytes=1 << 20,
+            max_file_bytes=1 << 16,
+            max_projects=4,
+            max_memory_bytes=one.memory_bytes + one.memory_bytes // 2,
+        )
+
+        assert await service.warm(orchestrator, user_id, project_id, "web") is True
+        assert await service.warm(orchestrator, user_id, project_id, "api") is True
+        assert list(service._projects) == [(str(project_id), "api")]
+
+    async def test_project_over_memory_budget_falls_back(self, orchestrator, tmp_path: Path):
+        (tmp_path / "a.py").write_text("needle = 1\n")
+        service = CodeSearchService(
+            max_bytes=1 << 20, max_file_bytes=1 << 16, max_projects=2, max_memory_bytes=64
+        )
+
+        assert await service.warm(orchestrator, uuid4(), uuid4(), "main") is False
+
+    async def test_absolute_paths_and_unknown_prefixes(self, orchestrator, tmp_path: Path):
+        user_id, project_id = uuid4(), uuid4()
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.py").write_text("needle = 1\n")
+        service = CodeSearchService(max_bytes=1 << 20, max_file_bytes=1 << 16, max_projects=2)
+        assert await service.warm(orchestrator, user_id, project_id, "main") is True
+
+        result = await service.search(
+            orchestrator, user_id, project_id, "main", SearchRequest("needle", path="/app/src")
+        )
+        assert result.files == ["src/a.py"]
+        # Paths the index can't resolve go to ripgrep instead of "no matches".
+        for path in ("/srv/other", "lib"):
+            request = SearchRequest("needle", path=path)
+            assert await service.search(orchestrator, user_id, project_id, "main", request) is None
+
+    async def test_indexes_are_per_container(self, orchestrator, tmp_path: Path):
+        user_id, project_id = uuid4(), uuid4()
+        (tmp_path / "a.py").write_text("needle\n")
+        service = CodeSearchService(max_bytes=1 << 20, max_file_bytes=1 << 16, max_projects=4)
+
+        assert await service.warm(orchestrator, user_id, project_id, "web") is True
+        assert await service.warm(orchestrator, user_id, project_id, "api") is True
+        assert len(service._projects) == 2
+        service.drop(project_id)
+        assert not service._projects
@@ -0,0 +1,154 @@
+"""
+Unit tests for pushed file change notifications.
+
+Tests cover:
+- Debouncing: bursts are coalesced per path into one batch, long bursts are
+  still flushed every max_delay, oversized bursts degrade to a rescan hint
+- Orchestrator writes/deletes record project-relative paths
+- The filesystem watcher on the local backend reports external edits
+- Redis fanout skips batches published by this process
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services import file_events
+from app.services.file_events import INSTANCE_ID, FileChangeNotifier
+from app.services.orchestration import LocalOrchestrator
+from app.services.pubsub.redis_pubsub import RedisPubSub
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def notifier():
+    notifier = FileChangeNotifier(debounce=0.05, max_delay=1.0, max_paths=10)
+    batches: list[dict] = []
+
+    async def _capture(project_id, payload):
+        batches.append(payload)
+
+    with (
+        patch.object(notifier, "dispatch_local", side_effect=_capture),
+        patch.object(file_events, "_instance", notifier),
+        patch("app.services.pubsub.get_pubsub", return_value=None),
+    ):
+        notifier.batches = batches
+        yield notifier
+
+
+async def _wait_for(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("timed out waiting for condition")
+        await asyncio.sleep(0.02)
+
+
+class TestDebounce:
+    async def test_burst_is_coalesced_per_path(self, notifier):
+        notifier.record("p1", "a.txt")
+        notifier.record("p1", "b.txt")
+        notifier.record("p1", "a.txt", deleted=True)
+        notifier.record("p2", "c.txt")
+
+        await _wait_for(lambda: len(notifier.batches) == 2)
+        await asyncio.sleep(0.1)
+
+        by_project = {b["project_id"]: b for b in notifier.batches}
+        assert len(notifier.batches) == 2
+        assert by_project["p1"]["changes"] == [
+            {"path": "a.txt", "kind": "deleted"},
+            {"path": "b.txt", "kind": "changed"},
+        ]
+        assert by_project["p1"]["rescan"] is False
+
+    async def test_continuous_changes_flush_every_max_delay(self, notifier):
+        notifier._max_delay = 0.15
+        for i in range(12):
+            notifier.record("p1", f"f{i}.txt")
+            await asyncio.sleep(0.03)
+        await _wait_for(lambda: sum(len(b["changes"]) for b in notifier.batches) == 12)
+
+        assert len(notifier.batches) >= 2
+
+    async def test_oversized_burst_becomes_rescan_hint(self, notifier):
+        for i in range(11):
+            notifier.record("p1", f"node_modules/x/{i}.js")
+        notifier.record_rescan("p2")
+
+        await _wait_for(lambda: len(notifier.batches) == 2)
+
+        for batch in notifier.batches:
+            assert batch["changes"] == [] and batch["rescan"] is True
+
+
+class TestOrchestratorFeeds:
+    @pytest.fixture
+    def orchestrator(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalOrchestrator:
+        monkeypatch.setenv("PROJECT_ROOT", str(tmp_path))
+        return LocalOrchestrator()
+
+    async def test_writes_and_deletes_are_recorded(self, notifier, orchestrator):
+        user_id, project_id = uuid4(), uuid4()
+        await orchestrator.write_file(user_id, project_id, "main", "App.tsx", "x", subdir="web")
+        await orchestrator.write_file(user_id, project_id, "main", "b.txt", "x")
+        await orchestrator.delete_file(user_id, project_id, "main", "b.txt")
+        await notifier.flush(project_id)
+
+        assert notifier.batches[0]["changes"] == [
+            {"path": "web/App.tsx", "kind": "changed"},
+            {"path": "b.txt", "kind": "deleted"},
+        ]
+
+    async def test_watcher_reports_external_edits(self, notifier, orchestrator, tmp_path):
+        pytest.importorskip("watchfiles")
+        project_id = uuid4()
+
+        await notifier.watch(project_id, orchestrator)
+        try:
+            await asyncio.sleep(0.3)  # let the watcher start
+            (tmp_path / "external.txt").write_text("hi")
+            await _wait_for(
+                lambda: any(
+                    c["path"] == "external.txt" for b in notifier.batches for c in b["changes"]
+                )
+            )
+        finally:
+            notifier.unwatch(project_id)
+        assert notifier._watchers == {}
+
+    async def test_watch_is_reference_counted(self, notifier):
+        orchestrator = AsyncMock()
+        orchestrator.get_watch_root.return_value = None
+        project_id = str(uuid4())
+
+        await notifier.watch(project_id, orchestrator)
+        await notifier.watch(project_id, orchestrator)
+        notifier.unwatch(project_id)
+        assert project_id in notifier._watchers
+        notifier.unwatch(project_id)
+        assert project_id not in notifier._watchers
+        orchestrator.get_watch_root.assert_awaited_once()
+
+
+class TestRedisFanout:
+    @staticmethod
+    def _message(origin):
+        data = {"type": "file_changes", "origin": origin, "project_id": "p1", "payload": {"x": 1}}
+        return {"data": json.dumps(data)}
+
+    async def test_forwards_batches_from_other_replicas_only(self, notifier):
+        pubsub = RedisPubSub()
+
+        await pubsub._handle_pubsub_message(self._message(INSTANCE_ID))
+        await pubsub._handle_pubsub_message(self._message("other-replica"))
+
+        assert notifier.batches == [{"x": 1}]
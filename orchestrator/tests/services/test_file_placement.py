@@ -2,9 +2,9 @@
 Unit tests for file placement — tar-based volume upload.
 
 Tests cover:
-- _build_source_tar: tar creation from source directory with SKIP_DIRS filtering
-- _build_source_tar: config injection into tar archive
-- _place_kubernetes: wires tar_extract instead of per-file writes
+- _write_source_tar: tar creation from source directory with SKIP_DIRS filtering
+- _write_source_tar: config injection into tar archive
+- _place_kubernetes: streams one tar_extract_stream upload instead of per-file writes
 """
 
 import importlib
@@ -40,13 +40,18 @@ _spec.loader.exec_module(_mod)
 sys.modules.pop("app.services.base_config_parser", None)
 sys.modules.pop("app.services.project_setup.file_placement", None)
 
-_build_source_tar = _mod._build_source_tar
 SKIP_DIRS = _mod.SKIP_DIRS
 PlacedFiles = _mod.PlacedFiles
 
 
+def _build_source_tar(source_path, config=None):
+    buf = io.BytesIO()
+    count = _mod._write_source_tar(buf, source_path, config)
+    return buf.getvalue(), count
+
+
 # ---------------------------------------------------------------------------
-# _build_source_tar
+# _write_source_tar
 # ---------------------------------------------------------------------------
 
 
@@ -155,14 +160,25 @@ class TestBuildSourceTar:
 
 @pytest.mark.asyncio
 class TestPlaceKubernetes:
-    """Verify _place_kubernetes uses tar_extract instead of per-file writes."""
+    """Verify _place_kubernetes streams one tar upload instead of per-file writes."""
+
+    @staticmethod
+    def _capture_upload(mock_client):
+        uploads = []
+
+        async def _extract(volume_id, path, chunks, **kwargs):
+            uploads.append((volume_id, path, b"".join([c async for c in chunks])))
+
+        mock_client.tar_extract_stream.side_effect = _extract
+        return uploads
 
-    async def test_calls_tar_extract_once(self, tmp_path):
-        """File placement sends a single tar_extract call, not N write_file calls."""
+    async def test_streams_one_tar_upload(self, tmp_path):
+        """File placement sends a single streamed tar upload, not N write_file calls."""
         (tmp_path / "index.ts").write_text("console.log('hi');")
         (tmp_path / "package.json").write_text('{"name":"test"}')
 
         mock_client = AsyncMock()
+        uploads = self._capture_upload(mock_client)
         mock_vm = MagicMock()
         mock_vm.create_empty_volume = AsyncMock(return_value=("vol-test", "node-1"))
         mock_discovery = MagicMock()
@@ -191,14 +207,13 @@ class TestPlaceKubernetes:
             # Re-exec the function so it picks up our mocked modules
             result = await _mod._place_kubernetes(str(tmp_path), config, "test-slug")
 
-        # Should call tar_extract exactly once
-        mock_client.tar_extract.assert_awaited_once()
-        call_args = mock_client.tar_extract.call_args
-        assert call_args[0][0] == "vol-test"  # volume_id
-        assert call_args[0][1] == "."  # extract to root
+        # Should upload exactly one archive
+        assert len(uploads) == 1
+        volume_id, path, tar_data = uploads[0]
+        assert volume_id == "vol-test"
+        assert path == "."  # extract to root
 
         # Tar data should be valid and contain our files + config
-        tar_data = call_args[0][2]
         with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r") as tar:
             names = tar.getnames()
             assert "index.ts" in names
@@ -217,6 +232,7 @@ class TestPlaceKubernetes:
         (tmp_path / "app.js").write_text("// app")
 
         mock_client = AsyncMock()
+        uploads = self._capture_upload(mock_client)
         mock_vm = MagicMock()
         mock_vm.create_empty_volume = AsyncMock(return_value=("vol-test", "node-1"))
         mock_discovery = MagicMock()
@@ -244,7 +260,7 @@ class TestPlaceKubernetes:
         ):
             await _mod._place_kubernetes(str(tmp_path), config, "test-slug", write_config=False)
 
-        tar_data = mock_client.tar_extract.call_args[0][2]
+        (_, _, tar_data) = uploads[0]
         with tarfile.open(fileobj=io.BytesIO(tar_data), mode="r") as tar:
             names = tar.getnames()
             assert "app.js" in names
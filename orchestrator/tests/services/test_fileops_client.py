@@ -8,6 +8,10 @@ Tests cover:
 - FileInfo dataclass population from response dicts
 - Convenience wrappers (read_file_text, write_file_text)
 - Lifecycle: close(), async context manager, channel reuse
+- FileOpsChannelPool: per-address reuse, LRU eviction, pooled clients
+- Streaming RPCs: binary frame codec, chunk reassembly, UNIMPLEMENTED fallback
+- StatPaths batching, with bounded StatPath calls on nodes without it
+- Per-node negotiation memo: bounded, and expiring so upgraded nodes are re-probed
 """
 
 import base64
@@ -16,6 +20,8 @@ import sys
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import grpc
+import grpc.aio
 import pytest
 
 # Import fileops_client directly to avoid triggering app/services/__init__.py
@@ -30,6 +36,9 @@ _spec.loader.exec_module(_mod)
 FileContent = _mod.FileContent
 FileInfo = _mod.FileInfo
 FileOpsClient = _mod.FileOpsClient
+FileOpsChannelPool = _mod.FileOpsChannelPool
+_decode_frame = _mod._decode_frame
+_encode_frame = _mod._encode_frame
 _serialize = _mod._serialize
 _deserialize = _mod._deserialize
 
@@ -468,6 +477,58 @@ class TestStatPath:
         assert result.is_dir is False
 
 
+@pytest.mark.asyncio
+class TestStatPaths:
+    """StatPaths RPC — metadata for many paths, StatPath fallback on old nodes."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_fallback(self):
+        with patch.object(_mod, "_no_stat_paths_addresses", set()):
+            yield
+
+    async def test_one_call_keyed_by_path(self):
+        channel, rpc_callable = _make_mock_channel()
+        rpc_callable.return_value = {
+            "entries": [{"name": "a", "path": "app/a", "size": 3, "mod_time_ns": 7}],
+            "errors": ["app/gone"],
+        }
+        client = FileOpsClient("addr:1234")
+        client._channel = channel
+
+        infos = await client.stat_paths("vol-1", ["app/a", "app/gone"])
+
+        assert channel.unary_unary.call_args[0][0] == "/fileops.FileOps/StatPaths"
+        assert rpc_callable.call_args[0][0] == {
+            "volume_id": "vol-1",
+            "paths": ["app/a", "app/gone"],
+        }
+        assert list(infos) == ["app/a"]
+        assert infos["app/a"].size == 3 and infos["app/a"].mod_time_ns == 7
+
+    async def test_unimplemented_falls_back_to_stat_path(self):
+        channel, rpc_callable = _make_mock_channel()
+        calls = []
+
+        async def _rpc(request, **kwargs):
+            calls.append(request)
+            if "paths" in request:
+                raise _rpc_error(grpc.StatusCode.UNIMPLEMENTED)
+            if request["path"] == "gone":
+                raise _rpc_error(grpc.StatusCode.NOT_FOUND)
+            return {"info": {"name": request["path"], "path": request["path"], "size": 1}}
+
+        rpc_callable.side_effect = _rpc
+        client = FileOpsClient("addr:1234")
+        client._channel = channel
+
+        infos = await client.stat_paths("vol-1", ["a", "gone"])
+        assert list(infos) == ["a"]
+
+        # The node is remembered: no second StatPaths probe.
+        await client.stat_paths("vol-1", ["a"])
+        assert sum("paths" in r for r in calls) == 1
+
+
 @pytest.mark.asyncio
 class TestDeletePath:
     """DeletePath RPC."""
@@ -817,6 +878,306 @@ class TestLifecycle:
             assert mock_channel.unary_unary.call_count == 3
 
 
+@pytest.mark.asyncio
+class TestChannelPool:
+    """FileOpsChannelPool shares one long-lived channel per node address."""
+
+    @pytest.fixture
+    def insecure(self):
+        with patch("app.services.fileops_client.grpc.aio.insecure_channel") as mock_insecure:
+            mock_insecure.side_effect = lambda address, options: AsyncMock(name=address)
+            yield mock_insecure
+
+    async def test_reuses_channel_per_address_with_keepalive(self, insecure):
+        pool = FileOpsChannelPool()
+        assert pool.get("node-1:9742") is pool.get("node-1:9742")
+        assert pool.get("node-2:9742") is not pool.get("node-1:9742")
+        assert insecure.call_count == 2
+        options = dict(insecure.call_args.kwargs["options"])
+        assert options["grpc.keepalive_time_ms"] >= 300_000
+        assert options["grpc.max_receive_message_length"] == _MAX_MSG
+
+    async def test_evicts_least_recently_used(self, insecure):
+        pool = FileOpsChannelPool(max_channels=2)
+        a = pool.get("a:1")
+        pool.get("b:1")
+        pool.get("a:1")  # a is now most recent
+        pool.get("c:1")
+
+        assert len(pool) == 2
+        assert pool.get("a:1") is a
+        await pool.close()
+        a.close.assert_awaited()
+
+    async def test_discard_closes_with_grace(self, insecure):
+        pool = FileOpsChannelPool()
+        channel = pool.get("a:1")
+        pool.discard("a:1")
+        await pool.close()
+
+        channel.close.assert_awaited_once_with(grace=_mod._EVICT_GRACE_SECONDS)
+        assert len(pool) == 0
+
+    async def test_pooled_client_does_not_close_channel(self, insecure):
+        pool = FileOpsChannelPool()
+        channel = pool.get("a:1")
+        async with FileOpsClient("a:1", channel=channel) as client:
+            assert client.address == "a:1"
+
+        channel.close.assert_not_awaited()
+        assert client._channel is channel
+
+
+# ---------------------------------------------------------------------------
+# Streaming RPCs
+# ---------------------------------------------------------------------------
+
+
+class _FakeStreamCall:
+    """Async-iterable stand-in for a grpc.aio unary-stream call."""
+
+    def __init__(self, frames=(), error=None):
+        self._frames = frames
+        self._error = error
+        self.cancel = MagicMock()
+
+    async def _iterate(self):
+        for header, data in self._frames:
+            yield _decode_frame(_encode_frame((header, data)))
+        if self._error is not None:
+            raise self._error
+
+    def __aiter__(self):
+        return self._iterate()
+
+
+def _rpc_error(code):
+    return grpc.aio.AioRpcError(code, grpc.aio.Metadata(), grpc.aio.Metadata())
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+class TestAddressMemo:
+    """Process-wide memo of per-node fallbacks stays bounded and expires."""
+
+    def test_keeps_most_recent_addresses(self):
+        memo = _mod._AddressMemo(maxsize=2)
+        for addr in ("a:1", "b:1", "c:1"):
+            memo.add(addr)
+
+        assert len(memo) == 2
+        assert "a:1" not in memo
+        assert "b:1" in memo and "c:1" in memo
+
+    def test_entries_expire(self):
+        memo = _mod._AddressMemo(ttl=10.0)
+        with patch.object(_mod.time, "monotonic", return_value=100.0):
+            memo.add("a:1")
+        with patch.object(_mod.time, "monotonic", return_value=105.0):
+            assert "a:1" in memo
+        with patch.object(_mod.time, "monotonic", return_value=110.0):
+            assert "a:1" not in memo
+        assert len(memo) == 0
+
+
+class TestFrameCodec:
+    """Binary frames used by the streaming RPCs."""
+
+    def test_frame_round_trip_keeps_raw_bytes(self):
+        raw = _encode_frame(({"path": "a.bin", "size": 3}, b"\x00\xff\x10"))
+        assert raw.endswith(b"\x00\xff\x10")
+
+        header, payload = _decode_frame(raw)
+        assert header == {"path": "a.bin", "size": 3}
+        assert bytes(payload) == b"\x00\xff\x10"
+        assert _decode_frame(_encode_frame(({}, b"xy")))[0] == {}
+
+    def test_truncated_frame_rejected(self):
+        with pytest.raises(ValueError):
+            _decode_frame(b"\x00\x00\x00\x09{}")
+
+
+@pytest.mark.asyncio
+class TestStreaming:
+    """Binary-framed streaming RPCs and the unary fallback for older nodes."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_negotiation(self):
+        _mod._unary_only_addresses.clear()
+        _mod._streaming_addresses.clear()
+        yield
+        _mod._unary_only_addresses.clear()
+        _mod._streaming_addresses.clear()
+
+    def _client(self, stream_call):
+        channel, rpc_callable = _make_mock_channel()
+        channel.unary_stream = MagicMock(return_value=MagicMock(return_value=stream_call))
+        client = FileOpsClient("addr:1234")
+        client._channel = channel
+        return client, channel, rpc_callable
+
+    async def test_iter_files_reassembles_chunks_and_reports_errors(self):
+        call = _FakeStreamCall(
+            [
+                ({"path": "big.txt", "size": 6}, b"abc"),
+                ({"path": "big.txt", "size": 6, "offset": 3}, b"def"),
+                ({"path": "missing.txt", "error": "no such file"}, b""),
+                ({"path": "empty.txt"}, b""),
+            ]
+        )
+        client, channel, _ = self._client(call)
+
+        blobs = [
+            b async for b in client.iter_files("vol-1", ["big.txt", "missing.txt", "empty.txt"])
+        ]
+
+        assert [(b.path, b.data, b.error) for b in blobs] == [
+            ("big.txt", b"abcdef", None),
+            ("missing.txt", b"", "no such file"),
+            ("empty.txt", b"", None),
+        ]
+        assert channel.unary_stream.call_args[0][0] == "/fileops.FileOps/ReadFilesStream"
+        assert channel.unary_stream.call_args[1]["response_deserializer"] is _decode_frame
+
+    async def test_iter_files_drops_partial_file_on_error(self):
+        call = _FakeStreamCall(
+            [
+                ({"path": "a.txt", "size": 10}, b"abc"),
+                ({"path": "a.txt", "error": "read failed"}, b""),
+            ]
+        )
+        client, _, _ = self._client(call)
+
+        blobs = [b async for b in client.iter_files("vol-1", ["a.txt"])]
+
+        assert [(b.path, b.error) for b in blobs] == [("a.txt", "read failed")]
+
+    async def test_iter_files_sends_budgets_and_reassembles_ranges(self):
+        call = _FakeStreamCall(
+            [
+                ({"path": "a.log", "size": 10, "offset": 6, "length": 4}, b"67"),
+                ({"path": "a.log", "size": 10, "offset": 8, "length": 4}, b"89"),
+                ({"path": "b.log", "size": 2}, b"ok"),
+            ]
+        )
+        client, channel, _ = self._client(call)
+
+        blobs = [
+            b
+            async for b in client.iter_files(
+                "vol-1", ["a.log", "b.log"], max_read_bytes=4, tail=True, skip_extensions={".PNG"}
+            )
+        ]
+
+        assert [(b.path, b.data, b.size) for b in blobs] == [
+            ("a.log", b"6789", 10),
+            ("b.log", b"ok", 2),
+        ]
+        request = channel.unary_stream.return_value.call_args[0][0]
+        assert request["max_read_bytes"] == 4 and request["tail"] is True
+        assert request["skip_extensions"] == ["png"]
+
+    async def test_unimplemented_falls_back_to_unary_once(self):
+        call = _FakeStreamCall(error=_rpc_error(grpc.StatusCode.UNIMPLEMENTED))
+        client, channel, rpc_callable = self._client(call)
+        rpc_callable.return_value = {
+            "files": [{"path": "a.txt", "data": base64.b64encode(b"hi").decode(), "size": 2}],
+            "errors": ["b.txt"],
+        }
+
+        blobs = [b async for b in client.iter_files("vol-1", ["a.txt", "b.txt"])]
+        assert [(b.path, b.data, b.error is None) for b in blobs] == [
+            ("a.txt", b"hi", True),
+            ("b.txt", b"", False),
+        ]
+        assert channel.unary_unary.call_args[0][0] == "/fileops.FileOps/ReadFiles"
+
+        # The node is remembered as unary-only: no second probe.
+        [b async for b in client.iter_files("vol-1", ["a.txt"])]
+        assert channel.unary_stream.call_count == 1
+
+    async def test_other_stream_errors_propagate(self):
+        call = _FakeStreamCall(error=_rpc_error(grpc.StatusCode.UNAVAILABLE))
+        client, _, rpc_callable = self._client(call)
+
+        with pytest.raises(grpc.aio.AioRpcError):
+            [b async for b in client.iter_files("vol-1", ["a.txt"])]
+        rpc_callable.assert_not_awaited()
+
+    async def test_tar_extract_stream_sends_chunked_frames(self):
+        channel, _ = _make_mock_channel()
+        stream_callable = AsyncMock(return_value={})
+        channel.stream_unary = MagicMock(return_value=stream_callable)
+        client = FileOpsClient("addr:1234")
+        client._channel = channel
+
+        frames = []
+
+        async def _consume(request_iterator, **kwargs):
+            frames.extend([_decode_frame(_encode_frame(f)) async for f in request_iterator])
+            return {}
+
+        stream_callable.side_effect = _consume
+        data = b"x" * (_mod._STREAM_CHUNK_SIZE + 5)
+        await client.tar_extract_stream("vol-1", "/app", _chunks(data[:3], data[3:]), uid=1001)
+
+        assert frames[0][0] == {"volume_id": "vol-1", "path": "/app", "uid": 1001, "gid": 1000}
+        assert [len(payload) for _, payload in frames] == [3, _mod._STREAM_CHUNK_SIZE, 2]
+        assert b"".join(payload for _, payload in frames) == data
+        channel.unary_unary.assert_not_called()
+
+    async def test_tar_extract_stream_of_empty_archive_names_the_target(self):
+        channel, _ = _make_mock_channel()
+        frames = []
+
+        async def _consume(request_iterator, **kwargs):
+            frames.extend([f async for f in request_iterator])
+            return {}
+
+        channel.stream_unary = MagicMock(return_value=AsyncMock(side_effect=_consume))
+        client = FileOpsClient("addr:1234")
+        client._channel = channel
+
+        await client.tar_extract_stream("vol-1", "/app", _chunks())
+
+        assert [(h["volume_id"], bytes(p)) for h, p in frames] == [("vol-1", b"")]
+
+    async def test_tar_extract_stream_falls_back_to_unary(self):
+        channel, rpc_callable = _make_mock_channel()
+        rpc_callable.return_value = {}
+        client = FileOpsClient("addr:1234")
+        client._channel = channel
+
+        async def _reject(request_iterator, **kwargs):
+            # The node reads one frame before answering UNIMPLEMENTED.
+            await anext(request_iterator)
+            raise _rpc_error(grpc.StatusCode.UNIMPLEMENTED)
+
+        channel.stream_unary = MagicMock(return_value=AsyncMock(side_effect=_reject))
+        await client.tar_extract_stream("vol-1", "/app", _chunks(b"ta", b"r"))
+
+        assert channel.unary_unary.call_args[0][0] == "/fileops.FileOps/TarExtract"
+        sent = rpc_callable.call_args[0][0]
+        assert base64.b64decode(sent["data"]) == b"tar"
+
+    async def test_tar_extract_stream_errors_propagate_on_known_streaming_node(self):
+        channel, rpc_callable = _make_mock_channel()
+        channel.stream_unary = MagicMock(
+            return_value=AsyncMock(side_effect=_rpc_error(grpc.StatusCode.UNIMPLEMENTED))
+        )
+        client = FileOpsClient("addr:1234")
+        client._channel = channel
+
+        with patch.object(_mod, "_streaming_addresses", {"addr:1234"}):
+            # Nothing was kept for a retry, so there is nothing to fall back with.
+            with pytest.raises(grpc.aio.AioRpcError):
+                await client.tar_extract_stream("vol-1", "/app", _chunks(b"tar"))
+        rpc_callable.assert_not_awaited()
+
+
 # ---------------------------------------------------------------------------
 # Serializer / deserializer wiring
 # ---------------------------------------------------------------------------
@@ -0,0 +1,166 @@
+"""
+Unit tests for lazy, first-mutation file checkpoints of agent runs.
+
+Tests cover:
+- No checkpoint for runs whose tools only read
+- One checkpoint, before the first file-mutating tool runs
+- Plan mode and tools declaring mutates_files=False not counting as mutations
+- Writers outside the file categories (apply_setup_config) counting
+- Background start and failures staying non-fatal
+- ToolRegistry.execute taking the checkpoint before mutating tools
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.agent.tools.registry import Tool, ToolCategory, ToolRegistry
+from app.services.checkpoint_manager import (
+    LazyCheckpoint,
+    attach_lazy_checkpoint,
+    checkpoint_before_mutation,
+    mutates_files,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _tool(name, category=ToolCategory.FILE_OPS, read_only=False, executor=None, mutates_files=True):
+    async def _noop(params, context):
+        return {"success": True}
+
+    return Tool(
+        name,
+        f"{name} tool",
+        {},
+        executor or _noop,
+        category,
+        state_serializable=True,
+        holds_external_state=False,
+        read_only=read_only,
+        mutates_files=mutates_files,
+    )
+
+
+class _Manager:
+    def __init__(self, ref="git:" + "a" * 40, error=None):
+        self.project_id = "p1"
+        self.ref = ref
+        self.error = error
+        self.calls = 0
+
+    async def create_checkpoint(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.error:
+            raise self.error
+        return self.ref
+
+
+class TestMutatesFiles:
+    def test_classification(self):
+        ctx = {"edit_mode": "allow"}
+        assert mutates_files(_tool("write_file"), ctx)
+        assert mutates_files(_tool("bash_exec", ToolCategory.SHELL), ctx)
+        assert not mutates_files(_tool("read_file", read_only=True), ctx)
+        assert not mutates_files(
+            _tool("todo_write", ToolCategory.PLANNING, mutates_files=False), ctx
+        )
+        assert not mutates_files(_tool("web_search", ToolCategory.WEB, mutates_files=False), ctx)
+        # Undeclared tools are assumed to write, whatever their category.
+        assert mutates_files(_tool("new_tool", ToolCategory.PROJECT), ctx)
+
+    def test_registered_declarations(self):
+        from app.agent.tools.planning_ops.todos import register_planning_tools
+        from app.agent.tools.project_ops.setup_config import register_setup_config_tool
+
+        registry = ToolRegistry()
+        register_setup_config_tool(registry)
+        register_planning_tools(registry)
+        ctx = {"edit_mode": "allow"}
+        # A PROJECT-category tool that writes .tesslate/config.json.
+        assert mutates_files(registry.get("apply_setup_config"), ctx)
+        assert not mutates_files(registry.get("todo_write"), ctx)
+
+    def test_plan_mode_shell_is_read_only(self):
+        assert not mutates_files(_tool("bash_exec", ToolCategory.SHELL), {"edit_mode": "plan"})
+
+
+class TestLazyCheckpoint:
+    async def test_read_only_run_takes_no_checkpoint(self):
+        manager = _Manager()
+        context = {"edit_mode": "allow"}
+        checkpoint = attach_lazy_checkpoint(context, manager)
+
+        await checkpoint_before_mutation(_tool("read_file", read_only=True), context)
+        await checkpoint_before_mutation(
+            _tool("todo_write", ToolCategory.PLANNING, mutates_files=False), context
+        )
+
+        assert manager.calls == 0
+        assert await checkpoint.result() is None
+
+    async def test_first_mutation_creates_it_once(self):
+        manager = _Manager()
+        context = {"edit_mode": "allow"}
+        checkpoint = attach_lazy_checkpoint(context, manager)
+        write = _tool("write_file")
+
+        await asyncio.gather(
+            checkpoint_before_mutation(write, context),
+            checkpoint_before_mutation(write, context),
+        )
+        await checkpoint_before_mutation(write, context)
+
+        assert manager.calls == 1
+        assert await checkpoint.result() == manager.ref
+
+    async def test_background_start_is_reused(self):
+        manager = _Manager()
+        checkpoint = LazyCheckpoint(manager)
+        checkpoint.start()
+        assert checkpoint.started
+
+        assert await checkpoint.ensure() == manager.ref
+        assert manager.calls == 1
+
+    async def test_failure_is_non_fatal(self):
+        checkpoint = LazyCheckpoint(_Manager(error=RuntimeError("exec failed")))
+        assert await checkpoint.ensure() is None
+        assert await checkpoint.result() is None
+
+    async def test_no_checkpoint_in_context_is_a_noop(self):
+        await checkpoint_before_mutation(_tool("write_file"), {"edit_mode": "allow"})
+
+
+async def test_registry_checkpoints_before_mutating_tool(monkeypatch):
+    events = []
+    manager = _Manager()
+    original = manager.create_checkpoint
+
+    async def _create():
+        events.append("checkpoint")
+        return await original()
+
+    monkeypatch.setattr(manager, "create_checkpoint", _create)
+
+    def _recording(name):
+        async def executor(params, context):
+            events.append(name)
+            return {"success": True}
+
+        return executor
+
+    registry = ToolRegistry()
+    registry.register(_tool("read_file", read_only=True, executor=_recording("read_file")))
+    registry.register(_tool("patch_file", executor=_recording("patch_file")))
+    context = {"edit_mode": "allow"}
+    attach_lazy_checkpoint(context, manager)
+
+    await registry.execute("read_file", {}, context)
+    await registry.execute("patch_file", {}, context)
+    await registry.execute("patch_file", {}, context)
+
+    assert events == ["read_file", "checkpoint", "patch_file", "patch_file"]
@@ -0,0 +1,195 @@
+"""
+Unit tests for the hibernate/restore LifecycleScheduler.
+
+Tests cover:
+- Global and per-node concurrency caps
+- Priority ordering (prewarm restore > hibernate)
+- De-duplication on (kind, project_id)
+- Retry with back-off and the on_give_up callback
+- Queue metrics
+"""
+
+import asyncio
+import contextlib
+import uuid
+
+import pytest
+
+from app.services.lifecycle_scheduler import (
+    PRIORITY_HIBERNATE,
+    PRIORITY_PREWARM_RESTORE,
+    LifecycleScheduler,
+)
+
+
+@contextlib.asynccontextmanager
+async def _running(scheduler: LifecycleScheduler):
+    task = asyncio.create_task(scheduler.run())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.unit
+class TestConcurrency:
+    async def test_global_limit(self):
+        scheduler = LifecycleScheduler(max_concurrency=2, max_per_node=10, max_attempts=1)
+        release = asyncio.Event()
+        active = 0
+        peak = 0
+
+        async def job():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await release.wait()
+            active -= 1
+
+        for i in range(5):
+            scheduler.submit("hibernate", uuid.uuid4(), job, priority=2, node=f"n{i}")
+
+        async with _running(scheduler):
+            await _until(lambda: scheduler.get_metrics()["running"] == 2)
+            assert scheduler.get_metrics()["queued"] == 3
+            release.set()
+            await _until(lambda: scheduler.get_metrics()["completed"] == 5)
+
+        assert peak == 2
+
+    async def test_per_node_limit(self):
+        scheduler = LifecycleScheduler(max_concurrency=10, max_per_node=1, max_attempts=1)
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+
+        for _ in range(3):
+            scheduler.submit("hibernate", uuid.uuid4(), job, priority=2, node="node-a")
+        scheduler.submit("hibernate", uuid.uuid4(), job, priority=2, node="node-b")
+
+        async with _running(scheduler):
+            await _until(lambda: scheduler.get_metrics()["running"] == 2)
+            assert scheduler.get_metrics()["running_by_node"] == {"node-a": 1, "node-b": 1}
+            release.set()
+            await _until(lambda: scheduler.get_metrics()["completed"] == 4)
+
+
+@pytest.mark.unit
+class TestPriority:
+    async def test_restore_runs_before_queued_hibernations(self):
+        scheduler = LifecycleScheduler(max_concurrency=1, max_per_node=1, max_attempts=1)
+        order: list[str] = []
+
+        def _job(name):
+            async def run():
+                order.append(name)
+
+            return run
+
+        scheduler.submit("hibernate", uuid.uuid4(), _job("h1"), priority=PRIORITY_HIBERNATE)
+        scheduler.submit("hibernate", uuid.uuid4(), _job("h2"), priority=PRIORITY_HIBERNATE)
+        scheduler.submit("restore", uuid.uuid4(), _job("r1"), priority=PRIORITY_PREWARM_RESTORE)
+
+        async with _running(scheduler):
+            await _until(lambda: len(order) == 3)
+
+        assert order == ["r1", "h1", "h2"]
+
+
+@pytest.mark.unit
+class TestDedup:
+    def test_same_kind_and_project_is_deduplicated(self):
+        scheduler = LifecycleScheduler(1, 1, 1, 0)
+        pid = uuid.uuid4()
+
+        async def job():
+            return None
+
+        assert scheduler.submit("hibernate", pid, job, priority=2) is True
+        assert scheduler.submit("hibernate", pid, job, priority=2) is False
+        assert scheduler.submit("restore", pid, job, priority=0) is True
+        assert scheduler.get_metrics()["deduplicated"] == 1
+        assert scheduler.is_pending("hibernate", pid)
+
+
+@pytest.mark.unit
+class TestRetry:
+    async def test_retries_then_succeeds(self):
+        scheduler = LifecycleScheduler(1, 1, max_attempts=3, retry_base_seconds=0)
+        calls = 0
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise RuntimeError("csi busy")
+
+        pid = uuid.uuid4()
+        scheduler.submit("hibernate", pid, flaky, priority=2)
+
+        async with _running(scheduler):
+            await _until(lambda: scheduler.get_metrics()["completed"] == 1)
+
+        metrics = scheduler.get_metrics()
+        assert calls == 3
+        assert metrics["retried"] == 2
+        assert metrics["failed"] == 0
+        assert not scheduler.is_pending("hibernate", pid)
+
+    async def test_gives_up_and_calls_callback(self):
+        scheduler = LifecycleScheduler(1, 1, max_attempts=2, retry_base_seconds=0)
+        gave_up: list[BaseException] = []
+
+        async def always_fails():
+            raise RuntimeError("api server down")
+
+        async def on_give_up(exc):
+            gave_up.append(exc)
+
+        pid = uuid.uuid4()
+        scheduler.submit("hibernate", pid, always_fails, priority=2, on_give_up=on_give_up)
+
+        async with _running(scheduler):
+            await _until(lambda: bool(gave_up))
+
+        metrics = scheduler.get_metrics()
+        assert metrics["failed"] == 1
+        assert metrics["retried"] == 1
+        assert isinstance(gave_up[0], RuntimeError)
+        assert not scheduler.is_pending("hibernate", pid)
+
+    def test_backoff_grows_and_caps(self):
+        scheduler = LifecycleScheduler(1, 1, 5, retry_base_seconds=10)
+        assert 8 <= scheduler._backoff_seconds(1) <= 12
+        assert 16 <= scheduler._backoff_seconds(2) <= 24
+        assert scheduler._backoff_seconds(20) <= 300 * 1.2
+
+
+@pytest.mark.unit
+class TestMetrics:
+    def test_queued_by_kind(self):
+        scheduler = LifecycleScheduler(1, 1, 1, 0)
+
+        async def job():
+            return None
+
+        scheduler.submit("hibernate", uuid.uuid4(), job, priority=2)
+        scheduler.submit("hibernate", uuid.uuid4(), job, priority=2)
+        scheduler.submit("restore", uuid.uuid4(), job, priority=1)
+
+        metrics = scheduler.get_metrics()
+        assert metrics["queued"] == 3
+        assert metrics["queued_by_kind"] == {"hibernate": 2, "restore": 1}
+        assert metrics["submitted"] == 3
+        assert metrics["avg_wait_seconds"] == 0
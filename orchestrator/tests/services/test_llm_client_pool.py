@@ -0,0 +1,283 @@
+"""
+Unit tests for the process-wide LLM client pool.
+
+Tests cover:
+- Reuse per (base_url, credential, headers, max_retries)
+- LRU eviction of user-credential clients, pinned system clients, and
+  deferred closing of evicted clients
+- Rebuilding clients created on a different event loop
+- Connection reuse counters against a local keep-alive HTTP server
+- Failing fast, and counting it, when every pooled connection is busy
+- get_llm_client handing out the shared client across calls
+- Stats summed across processes through Redis, stale process gauges dropped
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import openai
+import pytest
+
+from app.services import llm_client_pool
+from app.services.llm_client_pool import LLMClientPool
+from app.services.model_adapters import get_llm_client
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool(monkeypatch):
+    monkeypatch.setattr(llm_client_pool, "_instance", None)
+    yield
+
+
+class TestReuse:
+    async def test_same_endpoint_and_key_share_a_client(self):
+        pool = LLMClientPool()
+        a = pool.get(api_key="sk-1", base_url="https://api.example.com/v1")
+        b = pool.get(api_key="sk-1", base_url="https://api.example.com/v1/")
+        assert a is b
+        assert pool.get(api_key="sk-2", base_url="https://api.example.com/v1") is not a
+        assert (
+            pool.get(
+                api_key="sk-1",
+                base_url="https://api.example.com/v1",
+                default_headers={"X-Title": "t"},
+            )
+            is not a
+        )
+        assert (
+            pool.get(api_key="sk-1", base_url="https://api.example.com/v1", max_retries=1) is not a
+        )
+        assert pool.local_stats()["hits"] == 1 and pool.local_stats()["misses"] == 4
+
+    async def test_keys_are_not_stored_in_plain_text(self):
+        pool = LLMClientPool()
+        pool.get(api_key="sk-secret-value", base_url="https://api.example.com/v1")
+        assert "sk-secret-value" not in repr(list(pool._lru))
+
+
+class TestEviction:
+    async def test_user_clients_are_evicted_lru_and_closed_later(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(llm_client_pool.time, "monotonic", lambda: clock[0])
+        pool = LLMClientPool(max_clients=2, retire_seconds=60)
+        system = pool.get(api_key="master", base_url="http://litellm:4000", pinned=True)
+        first = pool.get(api_key="byok-1", base_url="https://openrouter.ai/api/v1")
+        pool.get(api_key="byok-2", base_url="https://openrouter.ai/api/v1")
+        pool.get(api_key="byok-1", base_url="https://openrouter.ai/api/v1")  # refresh
+        pool.get(api_key="byok-3", base_url="https://openrouter.ai/api/v1")
+
+        stats = pool.local_stats()
+        assert stats["evictions"] == 1 and stats["retired_clients"] == 1
+        assert stats["clients"] == 3 and stats["pinned_clients"] == 1
+        assert pool.get(api_key="master", base_url="http://litellm:4000", pinned=True) is system
+        assert pool.get(api_key="byok-1", base_url="https://openrouter.ai/api/v1") is first
+
+        # Still within the grace period: an in-flight stream may be using it.
+        evicted = pool._retired[0][1].client
+        assert not evicted.is_closed()
+        clock[0] += 61
+        pool.get(api_key="master", base_url="http://litellm:4000", pinned=True)
+        await asyncio.sleep(0)
+        assert evicted.is_closed()
+        assert pool.local_stats()["closed"] == 1 and pool.local_stats()["retired_clients"] == 0
+
+    async def test_aclose_closes_everything(self):
+        pool = LLMClientPool(max_clients=1, retire_seconds=60)
+        clients = [
+            pool.get(api_key=key, base_url="https://api.example.com/v1") for key in ("a", "b")
+        ]
+        await pool.aclose()
+        assert all(c.is_closed() for c in clients)
+        assert pool.local_stats()["clients"] == 0
+
+
+def test_client_from_another_loop_is_rebuilt():
+    pool = LLMClientPool()
+
+    async def _get():
+        return pool.get(api_key="sk", base_url="https://api.example.com/v1")
+
+    first = asyncio.run(_get())
+    second = asyncio.run(_get())
+    assert first is not second
+    assert pool.local_stats()["misses"] == 2
+
+
+# =============================================================================
+# Connection reuse against a local server
+# =============================================================================
+
+
+async def _serve_models(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    body = json.dumps({"object": "list", "data": []}).encode()
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode().split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def test_requests_reuse_one_connection():
+    server = await asyncio.start_server(_serve_models, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    pool = LLMClientPool()
+    try:
+        for _ in range(3):
+            client = pool.get(api_key="sk", base_url=f"http://127.0.0.1:{port}/v1")
+            await client.models.list()
+        stats = pool.local_stats()
+        assert stats["requests"] == 3
+        assert stats["connects"] == 1
+        assert stats["connection_reuse_rate"] == 0.667
+        assert stats["open_connections"] == 1 and stats["idle_connections"] == 1
+    finally:
+        await pool.aclose()
+        server.close()
+        await server.wait_closed()
+
+
+async def _stall(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        await asyncio.sleep(30)
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def test_exhausted_pool_fails_fast():
+    server = await asyncio.start_server(_stall, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    pool = LLMClientPool(max_connections=1, pool_timeout_seconds=0.1)
+    client = pool.get(api_key="sk", base_url=f"http://127.0.0.1:{port}/v1", max_retries=0)
+
+    async def _list():
+        return await client.models.list()
+
+    busy = asyncio.create_task(_list())
+    try:
+        await asyncio.sleep(0.05)
+        with pytest.raises(openai.APITimeoutError):
+            await asyncio.wait_for(_list(), timeout=5)
+        stats = pool.local_stats()
+        assert stats["pool_timeouts"] == 1 and stats["max_connections"] == 1
+    finally:
+        busy.cancel()
+        await asyncio.gather(busy, return_exceptions=True)
+        await pool.aclose()
+        server.close()
+        await server.wait_closed()
+
+
+async def test_get_llm_client_returns_shared_client(monkeypatch):
+    for var in ("OPENAI_API_KEY", "OPENAI_API_BASE"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-shared")
+
+    first = await get_llm_client(user_id=None, model_name="openai/gpt-4o", db=None)
+    second = await get_llm_client(user_id=None, model_name="openai/gpt-4o-mini", db=None)
+    assert first is second
+    metrics = await llm_client_pool.get_llm_client_pool_metrics()
+    assert metrics["pinned_clients"] == 1
+
+
+class _Pipe:
+    def __init__(self, redis: _Redis) -> None:
+        self.redis = redis
+        self.ops: list[tuple] = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.ops.append((name, args))
+
+    async def execute(self):
+        return [getattr(self.redis, name)(*args) for name, args in self.ops]
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    def hash(self, key):
+        return self.hashes.setdefault(key, {})
+
+    def hincrby(self, key, field, value):
+        self.hash(key)[field] = str(int(self.hash(key).get(field, 0)) + value)
+
+    def hset(self, key, field, value):
+        self.hash(key)[field] = value
+
+    def hgetall(self, key):
+        return dict(self.hash(key))
+
+    def hdel(self, key, *fields):
+        return sum(self.hash(key).pop(f, None) is not None for f in fields)
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+
+class TestSharedStats:
+    async def test_counters_and_gauges_are_summed_across_processes(self, monkeypatch):
+        redis = _Redis()
+        with patch("app.services.cache_service.get_redis_client", AsyncMock(return_value=redis)):
+            for process in ("api-1:1", "worker-1:1"):
+                monkeypatch.setattr(llm_client_pool, "_PROCESS_ID", process)
+                pool = LLMClientPool()
+                pool.get(api_key="sk-1", base_url="https://api.example.com/v1")
+                pool.get(api_key="sk-1", base_url="https://api.example.com/v1")
+                await pool.flush()
+
+            stats = await LLMClientPool().stats()
+
+        assert stats["processes"] == 2
+        assert stats["hits"] == 2 and stats["misses"] == 2
+        assert stats["clients"] == 2
+
+    async def test_flush_adds_only_the_new_counts(self):
+        redis = _Redis()
+        pool = LLMClientPool()
+        with patch("app.services.cache_service.get_redis_client", AsyncMock(return_value=redis)):
+            pool.get(api_key="sk-1", base_url="https://api.example.com/v1")
+            await pool.flush()
+            pool.get(api_key="sk-1", base_url="https://api.example.com/v1")
+            stats = await pool.stats()
+
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    async def test_stale_process_gauges_are_dropped(self):
+        redis = _Redis()
+        stale = json.dumps({"clients": 5, "at": time.time() - 3600})
+        redis.hash(llm_client_pool._REDIS_GAUGES_KEY)["gone:1"] = stale
+        with patch("app.services.cache_service.get_redis_client", AsyncMock(return_value=redis)):
+            stats = await LLMClientPool().stats()
+
+        assert stats["clients"] == 0 and stats["processes"] == 0
+        assert "gone:1" not in redis.hash(llm_client_pool._REDIS_GAUGES_KEY)
+
+    async def test_without_redis_reports_this_process(self):
+        pool = LLMClientPool()
+        pool.get(api_key="sk-1", base_url="https://api.example.com/v1")
+        with patch("app.services.cache_service.get_redis_client", AsyncMock(return_value=None)):
+            stats = await pool.stats()
+        assert stats["processes"] == 1 and stats["misses"] == 1
@@ -0,0 +1,246 @@
+"""
+Unit tests for passive model health and latency-aware routing.
+
+Tests cover:
+- Window summaries (TTFT, latency, tokens/s, error rate) and statuses
+- BYOK calls kept out of the shared stats; adapters told apart by proxy URL
+- Combining traffic stats with active probe results
+- Ranking equivalent models by status and latency
+- Health-check loop results built from traffic instead of probes
+- RoutedModelAdapter fallback on upstream errors and hedging slow models
+- create_routed_model_adapter skipping unreachable equivalents
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import openai
+import pytest
+
+from app.services import model_adapters, model_traffic
+from app.services.model_adapters import RoutedModelAdapter, create_routed_model_adapter
+from app.services.model_health import _results_from_traffic
+from app.services.model_traffic import ModelTrafficStats, model_status, rank_models
+
+pytestmark = pytest.mark.unit
+
+
+def _connection_error() -> RuntimeError:
+    request = httpx.Request("POST", "http://litellm:4000/v1/chat/completions")
+    cause = openai.APIConnectionError(request=request)
+    error = RuntimeError(f"Model API error: {cause}")
+    error.__cause__ = cause
+    return error
+
+
+class TestStats:
+    def test_summary(self):
+        stats = ModelTrafficStats()
+        stats.record("a", latency=2.0, ttft=0.5, output_tokens=300)
+        stats.record("a", latency=1.0, ttft=0.3, output_tokens=100)
+        stats.record("a", latency=30.0, error=True)
+        summary = stats.local_snapshot()["a"]
+        assert summary["requests"] == 3 and summary["errors"] == 1
+        assert summary["error_rate"] == 0.333
+        assert summary["ttft_ms"] == 400
+        assert summary["latency_ms"] == 1500
+        assert summary["tokens_per_second"] == round(400 / 2.2, 1)
+        assert summary["status"] == "healthy"
+
+    def test_statuses(self):
+        stats = ModelTrafficStats(degraded_error_rate=0.5)
+        for _ in range(3):
+            stats.record("down", latency=1.0, error=True)
+        stats.record("flaky", latency=1.0)
+        stats.record("flaky", latency=1.0, error=True)
+        stats.record("flaky", latency=1.0, error=True)
+        stats.record("new", latency=1.0, error=True)
+        snapshot = stats.local_snapshot()
+        assert snapshot["down"]["status"] == "down"
+        assert snapshot["flaky"]["status"] == "degraded"
+        assert snapshot["new"]["status"] == "unknown"
+
+    def test_old_buckets_leave_the_window(self, monkeypatch):
+        clock = [1_000_000.0]
+        monkeypatch.setattr(model_traffic.time, "time", lambda: clock[0])
+        stats = ModelTrafficStats(window_seconds=120, bucket_seconds=60)
+        stats.record("a", latency=1.0)
+        clock[0] += 180
+        stats.record("b", latency=1.0)
+        assert set(stats.local_snapshot()) == {"b"}
+
+    async def test_snapshot_without_redis_is_local(self):
+        stats = ModelTrafficStats()
+        stats.record("a", latency=1.0)
+        with patch("app.services.cache_service.get_redis_client", AsyncMock(return_value=None)):
+            snapshot = await stats.snapshot()
+        assert snapshot["a"]["requests"] == 1
+
+    def test_byok_calls_are_not_recorded(self, monkeypatch):
+        stats = ModelTrafficStats()
+        monkeypatch.setattr(model_traffic, "_instance", stats)
+        started = model_traffic.time.monotonic()
+        model_traffic.record_model_call("a", started=started, error=True, system_credentials=False)
+        model_traffic.record_model_call("a", started=started)
+        assert stats.local_snapshot()["a"]["requests"] == 1
+        assert stats.local_snapshot()["a"]["errors"] == 0
+
+    def test_adapter_credential_source(self, monkeypatch):
+        monkeypatch.setenv(model_adapters.LITELLM_API_BASE_ENV_VAR, "http://litellm:4000/v1")
+        proxy = openai.AsyncOpenAI(api_key="sk-x", base_url="http://litellm:4000/v1")
+        byok = openai.AsyncOpenAI(api_key="sk-x", base_url="https://openrouter.ai/api/v1")
+        assert model_adapters.OpenAIAdapter("gpt-4o", proxy).system_credentials
+        assert not model_adapters.OpenAIAdapter("gpt-4o", byok).system_credentials
+
+
+class TestStatusAndRanking:
+    def test_traffic_overrides_probe_once_there_is_enough(self):
+        busy = {"status": "down", "requests": 5}
+        quiet = {"status": "healthy", "requests": 1}
+        assert model_status(busy, {"status": "healthy"}) == "down"
+        assert model_status(quiet, {"status": "unhealthy"}) == "down"
+        assert model_status(quiet, None) == "healthy"
+        assert model_status(None, {"status": "timeout"}) == "degraded"
+        assert model_status(None, None) == "unknown"
+
+    def test_rank_by_status_then_latency(self):
+        models = ["slow", "broken", "fast", "unseen"]
+        traffic = {
+            "slow": {"status": "healthy", "requests": 10, "ttft_ms": 900},
+            "broken": {"status": "down", "requests": 10, "ttft_ms": 100},
+            "fast": {"status": "healthy", "requests": 10, "ttft_ms": 200},
+        }
+        order = rank_models(models, traffic, {"unseen": {"status": "healthy"}})
+        assert [models[i] for i in order] == ["fast", "slow", "unseen", "broken"]
+
+    def test_health_results_from_traffic(self):
+        traffic = {
+            "a": {"status": "healthy", "error_rate": 0.0, "ttft_ms": None, "latency_ms": 800},
+            "b": {"status": "down", "error_rate": 1.0, "ttft_ms": None, "latency_ms": None},
+            "c": {"status": "unknown", "error_rate": 1.0, "ttft_ms": None, "latency_ms": None},
+        }
+        results = _results_from_traffic(traffic, ["a", "b", "c", "d"])
+        assert set(results) == {"a", "b"}
+        assert results["a"]["status"] == "healthy" and results["a"]["source"] == "traffic"
+        assert results["a"]["latency"] == 0.8
+        assert results["b"]["status"] == "unhealthy" and "100%" in results["b"]["error"]
+
+
+# =============================================================================
+# Routing
+# =============================================================================
+
+
+class _FakeAdapter:
+    def __init__(self, name, delay=0.0, error=None, events=("a", "b")):
+        self.model_name = name
+        self.client = None
+        self.delay = delay
+        self.error = error
+        self.events = events
+        self.calls = 0
+        self.closed = False
+
+    async def chat_with_tools(self, messages, tools=None, tool_choice="auto", stream=False):
+        self.calls += 1
+        if not stream:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            return {"model": self.model_name}
+
+        async def _events():
+            try:
+                await asyncio.sleep(self.delay)
+                if self.error:
+                    raise self.error
+                for e in self.events:
+                    yield {"type": "text_delta", "content": e, "model": self.model_name}
+            finally:
+                self.closed = True
+
+        return _events()
+
+
+@pytest.fixture
+def configured_order(monkeypatch):
+    async def _rank(models):
+        return list(range(len(models)))
+
+    monkeypatch.setattr(model_traffic, "rank_equivalent_models", _rank)
+
+
+@pytest.mark.usefixtures("configured_order")
+class TestRoutedAdapter:
+    async def test_falls_back_on_upstream_error(self):
+        primary = _FakeAdapter("primary", error=_connection_error())
+        backup = _FakeAdapter("backup")
+        router = RoutedModelAdapter([primary, backup])
+        assert await router.chat_with_tools([{"role": "user", "content": "x"}]) == {
+            "model": "backup"
+        }
+
+    async def test_request_errors_are_not_retried(self):
+        primary = _FakeAdapter("primary", error=RuntimeError("Model API error: 400"))
+        backup = _FakeAdapter("backup")
+        router = RoutedModelAdapter([primary, backup])
+        with pytest.raises(RuntimeError, match="400"):
+            await router.chat_with_tools([{"role": "user", "content": "x"}])
+        assert backup.calls == 0
+
+    async def test_all_candidates_failing_raises_last_error(self):
+        router = RoutedModelAdapter(
+            [
+                _FakeAdapter("a", error=_connection_error()),
+                _FakeAdapter("b", error=_connection_error()),
+            ]
+        )
+        with pytest.raises(RuntimeError, match="Model API error"):
+            await router.chat_with_tools([{"role": "user", "content": "x"}])
+
+    async def test_hedge_streams_from_the_first_responder(self):
+        slow = _FakeAdapter("slow", delay=5.0)
+        fast = _FakeAdapter("fast", events=("x", "y", "z"))
+        router = RoutedModelAdapter([slow, fast], mode="hedge", hedge_delay=0.01)
+        stream = await router.chat_with_tools([{"role": "user", "content": "x"}], stream=True)
+        events = [e async for e in stream]
+        assert [e["content"] for e in events] == ["x", "y", "z"]
+        assert {e["model"] for e in events} == {"fast"}
+        assert slow.calls == 1 and slow.closed
+
+    async def test_fallback_mode_waits_for_slow_model(self):
+        slow = _FakeAdapter("slow", delay=0.05)
+        other = _FakeAdapter("other")
+        router = RoutedModelAdapter([slow, other], hedge_delay=0.01)
+        assert await router.chat_with_tools([]) == {"model": "slow"}
+        assert other.calls == 0
+
+    async def test_uses_ranked_order(self, monkeypatch):
+        async def _reversed(models):
+            return list(reversed(range(len(models))))
+
+        monkeypatch.setattr(model_traffic, "rank_equivalent_models", _reversed)
+        router = RoutedModelAdapter([_FakeAdapter("a"), _FakeAdapter("b")])
+        assert await router.chat_with_tools([]) == {"model": "b"}
+        assert router.model_name == "a"
+
+
+async def test_create_routed_adapter_skips_unreachable(monkeypatch):
+    async def _create(name, user_id=None, db=None, **kwargs):
+        if name == "missing/model":
+            raise ValueError("no key")
+        return _FakeAdapter(name)
+
+    monkeypatch.setattr(model_adapters, "create_model_adapter", _create)
+    routed = await create_routed_model_adapter(
+        "a", ["a", "missing/model", "b"], mode="hedge", hedge_delay=2.0
+    )
+    assert isinstance(routed, RoutedModelAdapter)
+    assert [a.model_name for a in routed.adapters] == ["a", "b"]
+    assert routed.hedge_delay == 2.0
+
+    single = await create_routed_model_adapter("a", ["missing/model"])
+    assert isinstance(single, _FakeAdapter)
@@ -0,0 +1,243 @@
+"""
+Unit tests for the consolidated orphan sweep.
+
+Tests cover:
+- plan_sweep decisions: pod age, PVC grace / active claims / DB ownership,
+  released PVs, stuck namespaces, failed listings
+- OrphanSweep.run: one list per kind, UID-preconditioned deletes,
+  bounded concurrency, per-kind stats and metrics
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from app.services import orphan_sweep
+from app.services.orphan_sweep import OrphanSweep, get_sweep_metrics, plan_sweep
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def _obj(name, age_seconds=3600, spec=None, **attrs):
+    # ``spec`` is set after construction — as a Mock kwarg it would mean "spec"
+    obj = Mock(**attrs)
+    obj.spec = spec
+    obj.metadata = Mock(uid=f"uid-{name}", creation_timestamp=NOW - timedelta(seconds=age_seconds))
+    obj.metadata.name = name
+    return obj
+
+
+def _pod(name, age_seconds=60, phase="Running", claims=()):
+    volumes = [Mock(persistent_volume_claim=Mock(claim_name=c)) for c in claims]
+    return _obj(name, age_seconds, status=Mock(phase=phase), spec=Mock(volumes=volumes))
+
+
+def _pvc(volume_id, age_seconds=3600):
+    return _obj(f"vol-pvc-{volume_id}", age_seconds, spec=Mock(volume_name=f"vol-pv-{volume_id}"))
+
+
+def _pv(name, phase="Bound"):
+    return _obj(name, status=Mock(phase=phase))
+
+
+def _ns(name, phase="Terminating", finalizers=("kubernetes",)):
+    return _obj(name, status=Mock(phase=phase), spec=Mock(finalizers=list(finalizers)))
+
+
+def _plan(**overrides):
+    kwargs = {
+        "pods": [],
+        "pvcs": [],
+        "pvs": [],
+        "namespaces": [],
+        "live_volume_ids": None,
+        "now": NOW,
+        "pod_max_age_seconds": 900,
+        "pvc_grace_seconds": 900,
+    }
+    kwargs.update(overrides)
+    return plan_sweep(**kwargs)
+
+
+@pytest.mark.unit
+class TestPlanSweep:
+    def test_reaps_only_pods_past_max_age(self):
+        plan = _plan(pods=[_pod("old", age_seconds=1000), _pod("young", age_seconds=100)])
+        assert [r.name for r in plan.pods] == ["old"]
+        assert plan.pods[0].uid == "uid-old"
+
+    def test_pvc_held_by_active_pod_is_kept(self):
+        plan = _plan(
+            pods=[_pod("p1", claims=["vol-pvc-a"])],
+            pvcs=[_pvc("a"), _pvc("b")],
+        )
+        assert [r.name for r in plan.pvcs] == ["vol-pvc-b"]
+        assert plan.pvcs[0].pv_name == "vol-pv-b"
+
+    def test_claim_of_pod_reaped_this_cycle_is_released(self):
+        plan = _plan(pods=[_pod("p1", age_seconds=1000, claims=["vol-pvc-a"])], pvcs=[_pvc("a")])
+        assert [r.name for r in plan.pvcs] == ["vol-pvc-a"]
+
+    def test_pvc_within_grace_kept_unless_project_is_gone(self):
+        pvcs = [_pvc("live", age_seconds=60), _pvc("gone", age_seconds=60)]
+        assert _plan(pvcs=pvcs).pvcs == []
+
+        plan = _plan(pvcs=pvcs, live_volume_ids={"live"})
+        assert [r.name for r in plan.pvcs] == ["vol-pvc-gone"]
+
+    def test_pvcs_skipped_when_pod_list_failed(self):
+        assert _plan(pods=None, pvcs=[_pvc("a")]).pvcs == []
+
+    def test_released_pv_without_claim_is_reaped(self):
+        plan = _plan(
+            pvcs=[_pvc("a", age_seconds=60)],
+            pvs=[
+                _pv("vol-pv-a", phase="Released"),
+                _pv("vol-pv-b", phase="Released"),
+                _pv("vol-pv-c"),
+            ],
+        )
+        assert [r.name for r in plan.pvs] == ["vol-pv-b"]
+
+    def test_pv_deleted_with_its_pvc_is_not_planned_twice(self):
+        plan = _plan(pvcs=[_pvc("a")], pvs=[_pv("vol-pv-a", phase="Released")])
+        assert plan.pvcs[0].pv_uid == "uid-vol-pv-a"
+        assert plan.pvs == []
+
+    def test_only_stuck_project_namespaces(self):
+        plan = _plan(
+            namespaces=[_ns("proj-a"), _ns("proj-b", phase="Active"), _ns("tesslate")],
+        )
+        assert [ns.metadata.name for ns in plan.namespaces] == ["proj-a"]
+
+
+@pytest.mark.unit
+class TestOrphanSweepRun:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        orphan_sweep.reset_sweep_metrics()
+        with patch.object(orphan_sweep, "_publish_metrics", new=AsyncMock()):
+            yield
+        orphan_sweep.reset_sweep_metrics()
+
+    @pytest.fixture
+    def v1(self):
+        v1 = MagicMock()
+        v1.list_namespaced_pod.return_value = Mock(items=[])
+        v1.list_namespaced_persistent_volume_claim.return_value = Mock(items=[])
+        v1.list_persistent_volume.return_value = Mock(items=[])
+        v1.list_namespace.return_value = Mock(items=[])
+        return v1
+
+    @pytest.fixture
+    def sweep(self, v1):
+        settings = Mock(compute_pool_namespace="tesslate-compute-pool", orphan_sweep_concurrency=2)
+        with patch("app.config.get_settings", return_value=settings):
+            sweep = OrphanSweep(core_v1=v1)
+        sweep._load_live_volume_ids = AsyncMock(return_value=None)
+        return sweep
+
+    @staticmethod
+    async def _sync_to_thread(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    async def _run(self, sweep, **kwargs):
+        with patch("asyncio.to_thread", side_effect=self._sync_to_thread):
+            return await sweep.run(
+                pod_max_age_seconds=900, pvc_grace_seconds=900, now=NOW, **kwargs
+            )
+
+    async def test_lists_each_kind_once_with_selectors(self, sweep, v1):
+        await self._run(sweep)
+
+        v1.list_namespaced_pod.assert_called_once_with(
+            "tesslate-compute-pool", label_selector="tesslate.io/tier=1"
+        )
+        v1.list_namespaced_persistent_volume_claim.assert_called_once()
+        v1.list_persistent_volume.assert_called_once_with(label_selector="tesslate.io/tier=1")
+        v1.list_namespace.assert_called_once_with(label_selector="managed-by=tesslate-backend")
+
+    async def test_namespaces_can_be_excluded(self, sweep, v1):
+        await self._run(sweep, include_namespaces=False)
+        v1.list_namespace.assert_not_called()
+
+    async def test_deletes_carry_uid_preconditions(self, sweep, v1):
+        v1.list_namespaced_pod.return_value = Mock(items=[_pod("old", age_seconds=1000)])
+        v1.list_namespaced_persistent_volume_claim.return_value = Mock(items=[_pvc("a")])
+
+        result = await self._run(sweep)
+
+        assert result.reaped("pods") == 1
+        assert result.reaped("pvcs") == 1
+        pod_body = v1.delete_namespaced_pod.call_args.kwargs["body"]
+        assert pod_body.preconditions.uid == "uid-old"
+        pvc_body = v1.delete_namespaced_persistent_volume_claim.call_args.kwargs["body"]
+        assert pvc_body.preconditions.uid == "uid-vol-pvc-a"
+        v1.delete_persistent_volume.assert_called_once()
+
+    async def test_conflict_counts_as_skip_not_error(self, sweep, v1):
+        v1.list_namespaced_persistent_volume_claim.return_value = Mock(items=[_pvc("a")])
+        v1.delete_namespaced_persistent_volume_claim.side_effect = ApiException(status=409)
+
+        result = await self._run(sweep)
+
+        assert result.kinds["pvcs"].failed == 1
+        assert result.errors == []
+        v1.delete_persistent_volume.assert_not_called()
+
+    async def test_failed_list_is_reported_and_dependents_skipped(self, sweep, v1):
+        v1.list_namespaced_pod.side_effect = ApiException(status=500, reason="boom")
+        v1.list_namespaced_persistent_volume_claim.return_value = Mock(items=[_pvc("a")])
+
+        result = await self._run(sweep)
+
+        assert result.errors == ["list pods: boom"]
+        v1.delete_namespaced_persistent_volume_claim.assert_not_called()
+
+    async def test_stuck_namespace_pods_and_finalizers(self, sweep, v1):
+        v1.list_namespace.return_value = Mock(items=[_ns("proj-a")])
+        v1.list_namespaced_pod.side_effect = lambda ns, **kw: Mock(
+            items=[] if kw else [_pod("web"), _pod("db")]
+        )
+
+        result = await self._run(sweep)
+
+        assert result.reaped("namespaces") == 1
+        assert result.namespace_pods_deleted == 2
+        v1.replace_namespace_finalize.assert_called_once()
+        v1.read_namespace.assert_not_called()
+
+    async def test_deletes_are_bounded(self, sweep, v1):
+        v1.list_namespaced_pod.return_value = Mock(
+            items=[_pod(f"p{i}", age_seconds=1000) for i in range(6)]
+        )
+        in_flight = peak = 0
+
+        async def _slow_to_thread(func, *args, **kwargs):
+            nonlocal in_flight, peak
+            if func is v1.delete_namespaced_pod:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+            return func(*args, **kwargs)
+
+        with patch("asyncio.to_thread", side_effect=_slow_to_thread):
+            result = await sweep.run(pod_max_age_seconds=900, pvc_grace_seconds=900, now=NOW)
+
+        assert result.reaped("pods") == 6
+        assert peak == 2
+
+    async def test_metrics_accumulate_per_kind(self, sweep, v1):
+        v1.list_namespaced_pod.return_value = Mock(items=[_pod("old", age_seconds=1000)])
+
+        await self._run(sweep)
+        await self._run(sweep)
+
+        metrics = get_sweep_metrics()
+        assert metrics["cycles"] == 2
+        assert metrics["reaped"]["pods"] == 2
+        assert metrics["last"]["kinds"]["pods"]["listed"] == 1
@@ -0,0 +1,202 @@
+"""
+Unit tests for the node-aware PlacementEngine.
+
+Tests cover:
+- score_nodes fit, locality, bin-packing and spread-cap ordering
+- Pod request accounting (init containers vs regular containers)
+- Cached node view: TTL, forced refresh, stale view on API failure
+- candidate_nodes soft fallback and limit, local reservations
+- candidate_nodes keeping the volume owner when trimming to the limit
+"""
+
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from app.services.compute_manager import PlacementBudget
+from app.services.placement import (
+    NodeCapacity,
+    PlacementEngine,
+    _pod_requests,
+    score_nodes,
+)
+
+BUDGET = PlacementBudget(cpu_millicores=500, memory_mib=1024)
+
+
+def _node(name, cpu=4000, mem=8192, cpu_req=0, mem_req=0, envs=0):
+    return NodeCapacity(
+        name=name,
+        cpu_allocatable=cpu,
+        mem_allocatable_mib=mem,
+        cpu_requested=cpu_req,
+        mem_requested_mib=mem_req,
+        environments=envs,
+    )
+
+
+def _k8s_node(name, cpu="4", memory="8Gi", ready=True, unschedulable=False):
+    node = Mock()
+    node.metadata.name = name
+    node.spec.unschedulable = unschedulable
+    node.status.allocatable = {"cpu": cpu, "memory": memory}
+    node.status.conditions = [Mock(type="Ready", status="True" if ready else "False")]
+    return node
+
+
+def _k8s_pod(node_name, cpu="500m", memory="1Gi", labels=None, init=None):
+    pod = Mock()
+    pod.spec.node_name = node_name
+    pod.metadata.labels = labels or {}
+    pod.spec.containers = [Mock(resources=Mock(requests={"cpu": cpu, "memory": memory}))]
+    pod.spec.init_containers = [
+        Mock(resources=Mock(requests={"cpu": c, "memory": m})) for c, m in (init or [])
+    ]
+    return pod
+
+
+@pytest.fixture
+def engine():
+    settings = Mock(
+        compute_placement_cache_ttl_seconds=15,
+        compute_placement_max_environments_per_node=0,
+    )
+    with patch("app.config.get_settings", return_value=settings):
+        eng = PlacementEngine()
+    eng._v1 = MagicMock()
+    return eng
+
+
+@pytest.mark.unit
+class TestScoreNodes:
+    def test_fitting_nodes_rank_first(self):
+        ranked = score_nodes([_node("full", cpu_req=3800), _node("free")], BUDGET)
+        assert [s.node for s in ranked] == ["free", "full"]
+        assert ranked[0].fits and not ranked[1].fits
+
+    def test_locality_beats_packing(self):
+        busy = _node("busy", cpu_req=3000, mem_req=6000)
+        idle = _node("idle")
+        ranked = score_nodes([busy, idle], BUDGET, cached_on={"idle"})
+        assert ranked[0].node == "idle"
+        assert ranked[0].cached
+
+    def test_tighter_fit_wins_without_locality(self):
+        busy = _node("busy", cpu_req=3000, mem_req=6000)
+        idle = _node("idle")
+        assert score_nodes([idle, busy], BUDGET)[0].node == "busy"
+
+    def test_cached_node_without_room_does_not_win(self):
+        ranked = score_nodes(
+            [_node("cached", cpu_req=3900), _node("other")], BUDGET, cached_on={"cached"}
+        )
+        assert ranked[0].node == "other"
+
+    def test_spread_cap_treats_node_as_full(self):
+        ranked = score_nodes(
+            [_node("crowded", envs=3), _node("quiet", envs=1)],
+            BUDGET,
+            cached_on={"crowded"},
+            max_environments_per_node=3,
+        )
+        assert ranked[0].node == "quiet"
+        assert not ranked[1].fits
+
+
+@pytest.mark.unit
+class TestPodRequests:
+    def test_sums_regular_containers_and_maxes_init(self):
+        pod = _k8s_pod("n1", cpu="250m", memory="512Mi", init=[("1", "256Mi")])
+        pod.spec.containers.append(Mock(resources=Mock(requests={"cpu": "250m"})))
+        assert _pod_requests(pod) == (1000, 512)
+
+    def test_no_resources(self):
+        pod = _k8s_pod("n1")
+        pod.spec.containers = [Mock(resources=None)]
+        assert _pod_requests(pod) == (0, 0)
+
+
+@pytest.mark.unit
+class TestPlacementEngine:
+    async def _sync_to_thread(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    def _cluster(self, engine, nodes, pods):
+        engine._v1.list_node.return_value = Mock(items=nodes)
+        engine._v1.list_pod_for_all_namespaces.return_value = Mock(items=pods)
+
+    async def test_snapshot_skips_cordoned_and_not_ready(self, engine):
+        self._cluster(
+            engine,
+            [
+                _k8s_node("ok"),
+                _k8s_node("cordoned", unschedulable=True),
+                _k8s_node("down", ready=False),
+            ],
+            [
+                _k8s_pod("ok", labels={"tesslate.io/component": "dev-container"}),
+                _k8s_pod("down"),
+                _k8s_pod(None),
+            ],
+        )
+        with patch("asyncio.to_thread", side_effect=self._sync_to_thread):
+            assert await engine.schedulable_nodes() == ["ok"]
+
+        node = engine._nodes["ok"]
+        assert (node.cpu_requested, node.mem_requested_mib, node.environments) == (500, 1024, 1)
+
+    async def test_view_is_cached_until_ttl(self, engine):
+        self._cluster(engine, [_k8s_node("n1")], [])
+        with patch("asyncio.to_thread", side_effect=self._sync_to_thread):
+            await engine.schedulable_nodes()
+            await engine.schedulable_nodes()
+            assert engine._v1.list_node.call_count == 1
+
+            engine.invalidate()
+            await engine.schedulable_nodes()
+            assert engine._v1.list_node.call_count == 2
+
+    async def test_refresh_failure_keeps_previous_view(self, engine):
+        self._cluster(engine, [_k8s_node("n1")], [])
+        with patch("asyncio.to_thread", side_effect=self._sync_to_thread):
+            await engine.refresh()
+            engine._v1.list_node.side_effect = RuntimeError("apiserver down")
+            await engine.refresh(force=True)
+            assert await engine.schedulable_nodes() == ["n1"]
+
+    async def test_candidates_fall_back_to_all_nodes_when_none_fit(self, engine):
+        self._cluster(engine, [_k8s_node("a", cpu="100m"), _k8s_node("b", cpu="200m")], [])
+        with patch("asyncio.to_thread", side_effect=self._sync_to_thread):
+            candidates = await engine.candidate_nodes(BUDGET)
+        assert sorted(candidates) == ["a", "b"]
+
+    async def test_candidates_limit_and_locality(self, engine):
+        self._cluster(engine, [_k8s_node(f"n{i}") for i in range(5)], [])
+        with patch("asyncio.to_thread", side_effect=self._sync_to_thread):
+            candidates = await engine.candidate_nodes(BUDGET, cached_on=["n3"], limit=2)
+        assert len(candidates) == 2
+        assert candidates[0] == "n3"
+
+    async def test_candidates_keep_owner_past_limit(self, engine):
+        nodes = [_k8s_node(f"n{i}") for i in range(4)] + [_k8s_node("owner", cpu="200m")]
+        self._cluster(engine, nodes, [])
+        with patch("asyncio.to_thread", side_effect=self._sync_to_thread):
+            candidates = await engine.candidate_nodes(
+                BUDGET, cached_on=["owner"], owner="owner", limit=3
+            )
+            unlimited = await engine.candidate_nodes(BUDGET, owner="owner")
+            gone = await engine.candidate_nodes(BUDGET, owner="deleted-node", limit=3)
+        # The owner has no room here, so it ranks last but still replaces the third pick.
+        assert candidates == ["n0", "n1", "owner"]
+        assert unlimited[-1] == "owner"
+        assert "deleted-node" not in gone
+
+    async def test_reserve_steers_next_pick(self, engine):
+        self._cluster(engine, [_k8s_node("a", cpu="1"), _k8s_node("b", cpu="1")], [])
+        with patch("asyncio.to_thread", side_effect=self._sync_to_thread):
+            first = await engine.pick(BUDGET)
+            engine.reserve(first, BUDGET, environment=True)
+            engine.reserve(first, BUDGET, environment=True)
+            second = await engine.pick(BUDGET)
+        assert second != first
+        assert engine._nodes[first].environments == 2
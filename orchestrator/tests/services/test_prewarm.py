@@ -0,0 +1,250 @@
+"""
+Unit tests for the predictive environment prewarm scheduler.
+
+Tests cover:
+- usage_score time-of-day windowing, midnight wrap and recency decay
+- select_candidates ranking, automation priority and limits
+- Outstanding prewarm hit/miss classification
+- Restore submission to the lifecycle scheduler and give-up bookkeeping
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import prewarm
+from app.services.lifecycle_scheduler import LifecycleScheduler
+from app.services.prewarm import (
+    PrewarmCandidate,
+    get_prewarm_metrics,
+    reset_prewarm_metrics,
+    select_candidates,
+    usage_score,
+)
+
+NOW = datetime(2026, 10, 18, 8, 30, tzinfo=UTC)
+HOUR = timedelta(hours=1)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    reset_prewarm_metrics()
+    yield
+    reset_prewarm_metrics()
+
+
+@pytest.mark.unit
+class TestUsageScore:
+    def test_no_samples(self):
+        assert usage_score([], NOW, HOUR, 14) == 0.0
+
+    def test_yesterday_same_window_scores(self):
+        yesterday_morning = NOW - timedelta(days=1) + timedelta(minutes=10)
+        score = usage_score([yesterday_morning], NOW, HOUR, 14)
+        assert score > 0.25
+
+    def test_outside_window_ignored(self):
+        yesterday_evening = NOW - timedelta(days=1) + timedelta(hours=10)
+        assert usage_score([yesterday_evening], NOW, HOUR, 14) == 0.0
+
+    def test_today_ignored(self):
+        # Today's samples are the present, not a pattern.
+        assert usage_score([NOW - timedelta(minutes=5)], NOW, HOUR, 14) == 0.0
+
+    def test_recency_decay(self):
+        recent = usage_score([NOW - timedelta(days=1)], NOW, HOUR, 14)
+        old = usage_score([NOW - timedelta(days=10)], NOW, HOUR, 14)
+        assert recent > old > 0
+
+    def test_every_day_is_one(self):
+        samples = [NOW - timedelta(days=d) for d in range(1, 15)]
+        assert usage_score(samples, NOW, HOUR, 14) == pytest.approx(1.0)
+
+    def test_midnight_wrap(self):
+        late = datetime(2026, 10, 18, 23, 45, tzinfo=UTC)
+        sample = datetime(2026, 10, 17, 0, 15, tzinfo=UTC)
+        assert usage_score([sample], late, HOUR, 14) > 0
+
+    def test_naive_timestamps_treated_as_utc(self):
+        naive = (NOW - timedelta(days=1)).replace(tzinfo=None)
+        assert usage_score([naive], NOW, HOUR, 14) > 0
+
+
+@pytest.mark.unit
+class TestSelectCandidates:
+    def test_automation_ranks_first(self):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        history = {a: [NOW - timedelta(days=d) for d in range(1, 15)]}
+        result = select_candidates(
+            history,
+            {a: "vol-a", b: "vol-b"},
+            {b},
+            NOW,
+            lookahead=HOUR,
+            history_days=14,
+            min_score=0.25,
+            limit=10,
+            cache_nodes={a: "node-1", b: None},
+        )
+        assert [c.project_id for c in result] == [b, a]
+        assert result[0].reason == "automation"
+        assert [c.cache_node for c in result] == [None, "node-1"]
+
+    def test_below_min_score_dropped(self):
+        a = uuid.uuid4()
+        history = {a: [NOW - timedelta(days=13)]}
+        result = select_candidates(
+            history,
+            {a: "vol-a"},
+            set(),
+            NOW,
+            lookahead=HOUR,
+            history_days=14,
+            min_score=0.25,
+            limit=10,
+        )
+        assert result == []
+
+    def test_limit(self):
+        ids = [uuid.uuid4() for _ in range(5)]
+        result = select_candidates(
+            {},
+            {pid: f"vol-{i}" for i, pid in enumerate(ids)},
+            set(ids),
+            NOW,
+            lookahead=HOUR,
+            history_days=14,
+            min_score=0.25,
+            limit=2,
+        )
+        assert len(result) == 2
+
+    def test_zero_limit(self):
+        a = uuid.uuid4()
+        assert (
+            select_candidates(
+                {},
+                {a: "vol"},
+                {a},
+                NOW,
+                lookahead=HOUR,
+                history_days=14,
+                min_score=0.0,
+                limit=0,
+            )
+            == []
+        )
+
+
+@pytest.mark.unit
+class TestOutstandingScoring:
+    async def _score(self, rows):
+        db = MagicMock()
+        result = MagicMock()
+        result.all.return_value = rows
+        db.execute = AsyncMock(return_value=result)
+        await prewarm._score_outstanding(db, NOW)
+
+    async def test_hit_when_activity_after_prewarm(self):
+        pid = uuid.uuid4()
+        prewarm._outstanding[pid] = prewarm._PrewarmRecord(
+            prewarmed_at=NOW - timedelta(minutes=20), expires_at=NOW + HOUR, reason="history"
+        )
+        await self._score([(pid, NOW - timedelta(minutes=5), "active")])
+
+        metrics = get_prewarm_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 0
+        assert metrics["avg_hit_lead_seconds"] == 900
+        assert pid not in prewarm._outstanding
+
+    async def test_miss_when_expired(self):
+        pid = uuid.uuid4()
+        prewarm._outstanding[pid] = prewarm._PrewarmRecord(
+            prewarmed_at=NOW - 2 * HOUR, expires_at=NOW - HOUR, reason="history"
+        )
+        await self._score([(pid, NOW - timedelta(days=1), "hibernated")])
+
+        assert get_prewarm_metrics()["misses"] == 1
+        assert pid not in prewarm._outstanding
+
+    async def test_pending_stays_outstanding(self):
+        pid = uuid.uuid4()
+        prewarm._outstanding[pid] = prewarm._PrewarmRecord(
+            prewarmed_at=NOW - timedelta(minutes=5), expires_at=NOW + HOUR, reason="history"
+        )
+        await self._score([(pid, NOW - timedelta(days=1), "hibernated")])
+
+        assert pid in prewarm._outstanding
+        assert get_prewarm_metrics()["hits"] == 0
+
+
+@pytest.mark.unit
+class TestPrewarm:
+    def test_submits_restores_to_scheduler(self):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        scheduler = LifecycleScheduler(1, 1, 1, 0)
+
+        with patch(
+            "app.services.lifecycle_scheduler.get_lifecycle_scheduler", return_value=scheduler
+        ):
+            prewarm._prewarm(
+                [
+                    PrewarmCandidate(a, "vol-a", 0.9, "history", "node-1"),
+                    PrewarmCandidate(b, "vol-b", 1.0, "automation"),
+                ],
+                NOW,
+                expires_at=NOW + HOUR,
+            )
+
+        assert scheduler.is_pending("restore", a)
+        assert scheduler.is_pending("restore", b)
+        # Queued under the volume's node so the per-node cap applies to it.
+        assert {job.project_id: job.node for job in scheduler._heap} == {
+            a: "node-1",
+            b: "unknown",
+        }
+        metrics = get_prewarm_metrics()
+        assert metrics["prewarmed"] == 2
+        assert metrics["automation_prewarms"] == 1
+        assert metrics["outstanding"] == 2
+
+    async def test_restore_job_records_cache_node(self):
+        pid = uuid.uuid4()
+        vm = MagicMock()
+        vm.ensure_cached = AsyncMock(return_value="node-1")
+        project = MagicMock()
+        db = MagicMock()
+        db.get = AsyncMock(return_value=project)
+        db.commit = AsyncMock()
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=db)
+        session.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch("app.services.volume_manager.get_volume_manager", return_value=vm),
+            patch("app.services.prewarm.AsyncSessionLocal", return_value=session),
+        ):
+            await prewarm._restore_volume(PrewarmCandidate(pid, "vol-a", 0.9, "history"))
+
+        vm.ensure_cached.assert_awaited_once_with("vol-a")
+        assert project.cache_node == "node-1"
+        db.commit.assert_awaited_once()
+
+    async def test_give_up_drops_record(self):
+        pid = uuid.uuid4()
+        candidate = PrewarmCandidate(pid, "vol-a", 0.9, "history")
+        scheduler = LifecycleScheduler(1, 1, 1, 0)
+        with patch(
+            "app.services.lifecycle_scheduler.get_lifecycle_scheduler", return_value=scheduler
+        ):
+            prewarm._prewarm([candidate], NOW, expires_at=NOW + HOUR)
+
+        await prewarm._restore_failed(candidate, RuntimeError("hub down"))
+
+        metrics = get_prewarm_metrics()
+        assert metrics["errors"] == 1
+        assert metrics["prewarmed"] == 0
+        assert metrics["outstanding"] == 0
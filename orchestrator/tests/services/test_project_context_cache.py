@@ -0,0 +1,205 @@
+"""
+Unit tests for the per-project agent context block cache.
+
+Tests cover:
+- Serving a built block until one of its tags is bumped
+- Project-scoped vs global tags, and versions bumped by other processes
+- File changes recorded by FileChangeNotifier invalidating file-backed blocks
+- Tag bumps staged on a DB session and applied after commit
+- TTL expiry, per-block timings and copies handed to callers
+- Failed (None) builds not being cached
+- enrich_project_context_for_run reusing the cached data overview
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import agent_context, project_context_cache
+from app.services.file_events import FileChangeNotifier
+from app.services.project_context_cache import ProjectContextCache, file_tags
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ProjectContextCache(ttl_seconds=300, max_entries=16)
+    monkeypatch.setattr(project_context_cache, "_instance", cache)
+    return cache
+
+
+def _builder(value):
+    calls = []
+
+    async def build():
+        calls.append(1)
+        return value
+
+    build.calls = calls
+    return build
+
+
+async def test_block_is_reused_until_its_tag_changes(cache):
+    build = _builder("=== Project Context (TESSLATE.md) ===")
+
+    for _ in range(2):
+        session = await cache.session("p1")
+        await session.get("tesslate_context", ("app",), ("files:tesslate",), build)
+    assert len(build.calls) == 1
+    assert session.report["tesslate_context"]["cached"] is True
+
+    cache.invalidate("p1", "containers")
+    session = await cache.session("p1")
+    await session.get("tesslate_context", ("app",), ("files:tesslate",), build)
+    assert len(build.calls) == 1
+
+    cache.invalidate("p1", "files:tesslate")
+    session = await cache.session("p1")
+    await session.get("tesslate_context", ("app",), ("files:tesslate",), build)
+    assert len(build.calls) == 2
+    assert session.report["tesslate_context"]["cached"] is False
+
+    stats = cache.local_stats()["blocks"]["tesslate_context"]
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+async def test_failed_build_is_not_cached(cache):
+    build = _builder(None)
+    for _ in range(2):
+        session = await cache.session("p1")
+        assert await session.get("tesslate_context", (), ("files:tesslate",), build) is None
+    assert len(build.calls) == 2
+
+
+async def test_project_and_global_scopes(cache):
+    build = _builder(["skill"])
+
+    async def lookup(project_id):
+        session = await cache.session(project_id)
+        await session.get("skills", ("agent",), ("skills", "files:skills"), build)
+
+    await lookup("p1")
+    await lookup("p2")
+    cache.invalidate("p2", "files:skills")  # other project
+    await lookup("p1")
+    assert len(build.calls) == 2
+
+    cache.invalidate("p2", "skills")  # global: skill assignments changed
+    await lookup("p1")
+    assert len(build.calls) == 3
+
+
+async def test_versions_bumped_by_other_processes(cache, monkeypatch):
+    shared = {"p1": {"workspace_data": 1}}
+
+    async def _shared_versions(scopes):
+        return shared
+
+    monkeypatch.setattr(cache, "_shared_versions", _shared_versions)
+    build = _builder("=== Workspace Data Store ===")
+
+    for _ in range(2):
+        session = await cache.session("p1")
+        await session.get("data_overview", (), ("workspace_data",), build)
+    shared["p1"]["workspace_data"] = 2
+    session = await cache.session("p1")
+    await session.get("data_overview", (), ("workspace_data",), build)
+
+    assert len(build.calls) == 2
+
+
+async def test_recorded_file_changes_invalidate(cache):
+    assert file_tags("web/TESSLATE.md") == ("files:tesslate",)
+    assert file_tags(".agents/skills/lint/SKILL.md") == ("files:skills",)
+    assert file_tags("src/App.tsx") == ()
+
+    build = _builder("ctx")
+
+    async def lookup():
+        session = await cache.session("p1")
+        await session.get("tesslate_context", (), ("files:tesslate",), build)
+
+    notifier = FileChangeNotifier(debounce=0.3, max_delay=2.0, max_paths=500)
+    await lookup()
+    notifier.record("p1", "src/App.tsx")
+    await lookup()
+    notifier.record("p1", "TESSLATE.md")
+    await lookup()
+    notifier.record_rescan("p1")
+    await lookup()
+    await notifier.stop()
+
+    assert len(build.calls) == 3
+
+
+async def test_session_changes_bump_after_commit(cache):
+    build = _builder([{"name": "web", "status": "running"}])
+
+    async def lookup():
+        session = await cache.session("p1")
+        return await session.get("tier_containers", (), ("containers",), build)
+
+    await lookup()
+    db_session = SimpleNamespace(info={})
+    project_context_cache._stage(db_session, "p1", "containers")
+    await lookup()
+    assert len(build.calls) == 1
+
+    project_context_cache._on_after_commit(db_session)
+    await lookup()
+    assert len(build.calls) == 2
+    assert db_session.info == {}
+
+
+async def test_ttl_and_copies(cache, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(project_context_cache.time, "monotonic", lambda: clock[0])
+    build = _builder([{"name": "web"}])
+
+    session = await cache.session("p1")
+    first = await session.get("tier_containers", (), ("containers",), build)
+    first.append({"name": "mutated"})
+    second = await session.get("tier_containers", (), ("containers",), build)
+    assert second == [{"name": "web"}]
+
+    clock[0] += 301
+    await session.get("tier_containers", (), ("containers",), build)
+    assert len(build.calls) == 2
+
+
+async def test_disabled_cache_always_builds(monkeypatch):
+    cache = ProjectContextCache(ttl_seconds=0)
+    build = _builder("x")
+    session = await cache.session("p1")
+    await session.get("tesslate_context", (), ("files:tesslate",), build)
+    await session.get("tesslate_context", (), ("files:tesslate",), build)
+    assert len(build.calls) == 2
+    assert session.report["tesslate_context"]["cached"] is False
+
+
+async def test_enrichment_reuses_data_overview(cache, monkeypatch):
+    build = _builder("=== Workspace Data Store ===\n- leads — 3 record(s)")
+
+    async def _overview(project, db):
+        return await build()
+
+    monkeypatch.setattr(agent_context, "_build_data_overview", _overview)
+    project = SimpleNamespace(id="p1")
+
+    for _ in range(2):
+        session = await cache.session("p1")
+        enrichment = await agent_context.enrich_project_context_for_run(
+            db=None, project=project, user_id=None, context_blocks=session
+        )
+    assert enrichment.data_overview.startswith("=== Workspace Data Store ===")
+    assert len(build.calls) == 1
+
+    cache.invalidate("p1", "workspace_data")
+    session = await cache.session("p1")
+    await agent_context.enrich_project_context_for_run(
+        db=None, project=project, user_id=None, context_blocks=session
+    )
+    assert len(build.calls) == 2
@@ -0,0 +1,163 @@
+"""
+Unit tests for prompt-cache hit-rate metrics and the prefix stability check.
+
+Tests cover:
+- Per-agent / per-model hit rates from Anthropic and OpenAI usage fields
+- Splitting the system prompt into ``=== Header ===`` sections
+- Diffs and hints (timestamp, reordered, added) for changed sections
+- Requests outside an agent task scope skipping the stability check
+- OpenAIAdapter feeding both from chat_with_tools
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services import prompt_cache_stats
+from app.services.model_adapters import OpenAIAdapter
+from app.services.prompt_cache_stats import (
+    PromptCacheMonitor,
+    PromptCacheScope,
+    current_prompt_cache_scope,
+    prefix_sections,
+)
+from app.services.stream_assembly import usage_from_chunk
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def scope():
+    token = current_prompt_cache_scope.set(PromptCacheScope(agent="builder", session="chat-1"))
+    yield
+    current_prompt_cache_scope.reset(token)
+
+
+def _system(*blocks: str) -> list[dict]:
+    return [{"role": "system", "content": "\n".join(blocks)}, {"role": "user", "content": "hi"}]
+
+
+_TOOL_A = {"type": "function", "function": {"name": "read_file", "parameters": {}}}
+_TOOL_B = {"type": "function", "function": {"name": "write_file", "parameters": {}}}
+
+
+class TestHitRate:
+    def test_per_agent_and_model(self, scope):
+        monitor = PromptCacheMonitor()
+        monitor.record_usage("claude", {"prompt_tokens": 1000, "cache_creation_input_tokens": 900})
+        monitor.record_usage("claude", {"prompt_tokens": 1100, "cache_read_input_tokens": 900})
+        monitor.record_usage("gpt-4o", {"prompt_tokens": 2000, "cached_tokens": 1536})
+        token = current_prompt_cache_scope.set(None)
+        monitor.record_usage("gpt-4o", {"prompt_tokens": 500})
+        current_prompt_cache_scope.reset(token)
+
+        stats = monitor.local_stats()
+        claude = stats["by_model"]["claude"]
+        assert claude["requests"] == 2 and claude["hit_requests"] == 1
+        assert claude["token_hit_rate"] == round(900 / 2100, 3)
+        assert claude["request_hit_rate"] == 0.5
+        assert stats["by_agent"]["builder"]["requests"] == 3
+        assert stats["by_agent"]["unscoped"]["requests"] == 1
+        assert stats["total"]["cache_read_tokens"] == 2436
+
+    def test_openai_cached_tokens_from_details(self):
+        raw = SimpleNamespace(
+            prompt_tokens=2000,
+            completion_tokens=5,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+        )
+        assert usage_from_chunk(raw)["cached_tokens"] == 1024
+
+
+class TestPrefixStability:
+    def test_sections(self):
+        sections = prefix_sections(
+            _system("You are a coder.", "=== Skills ===", "- a", "=== Workspace Data Store ==="),
+            [_TOOL_A],
+        )
+        assert list(sections) == [
+            "system",
+            "system: Skills",
+            "system: Workspace Data Store",
+            "tools",
+        ]
+        assert sections["system"] == "You are a coder."
+        assert sections["system: Skills"] == "\n=== Skills ===\n- a"
+
+    def test_unchanged_prefix_is_silent(self, scope):
+        monitor = PromptCacheMonitor()
+        messages = _system("You are a coder.", "=== Skills ===", "- a")
+        assert monitor.check_prefix("claude", messages, [_TOOL_A]) == []
+        # Later turns append messages; only the prefix matters.
+        messages = [*messages, {"role": "assistant", "content": "ok"}]
+        assert monitor.check_prefix("claude", messages, [_TOOL_A]) == []
+        assert monitor.local_stats()["prefix_checks"] == 2
+
+    def test_timestamp_change_is_reported_with_diff(self, scope):
+        monitor = PromptCacheMonitor()
+        monitor.check_prefix(
+            "claude", _system("Base.", "=== Status ===", "at 2026-01-01T10:00"), None
+        )
+        changes = monitor.check_prefix(
+            "claude", _system("Base.", "=== Status ===", "at 2026-01-01T10:05"), None
+        )
+        assert [(c.section, c.hint) for c in changes] == [("system: Status", "timestamp")]
+        assert "-at 2026-01-01T10:00" in changes[0].diff
+        assert "+at 2026-01-01T10:05" in changes[0].diff
+        stats = monitor.local_stats()
+        assert stats["prefix_invalidations"] == {"system: Status": 1}
+        assert stats["recent_prefix_changes"][0]["agent"] == "builder"
+
+    def test_reordered_tools_and_new_sections(self, scope):
+        monitor = PromptCacheMonitor()
+        monitor.check_prefix("claude", _system("Base."), [_TOOL_A, _TOOL_B])
+        changes = monitor.check_prefix(
+            "claude", _system("Base.", "=== MCP Prompts ===", "- p"), [_TOOL_B, _TOOL_A]
+        )
+        assert {c.section: c.hint for c in changes} == {
+            "system: MCP Prompts": "added",
+            "tools": "reordered",
+        }
+
+    def test_sessions_and_models_are_separate(self, scope):
+        monitor = PromptCacheMonitor()
+        monitor.check_prefix("claude", _system("A"), None)
+        assert monitor.check_prefix("gpt-4o", _system("B"), None) == []
+        token = current_prompt_cache_scope.set(PromptCacheScope(agent="builder", session="chat-2"))
+        assert monitor.check_prefix("claude", _system("C"), None) == []
+        current_prompt_cache_scope.reset(token)
+
+    def test_unscoped_requests_are_not_checked(self):
+        monitor = PromptCacheMonitor()
+        monitor.check_prefix("claude", _system("A"), None)
+        assert monitor.check_prefix("claude", _system("B"), None) == []
+        assert monitor.local_stats()["prefix_checks"] == 0
+
+
+async def test_adapter_records_usage_and_checks_prefix(scope, monkeypatch):
+    monitor = PromptCacheMonitor()
+    monkeypatch.setattr(prompt_cache_stats, "_instance", monitor)
+    response = SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                message=SimpleNamespace(content="done", tool_calls=None), finish_reason="stop"
+            )
+        ],
+        usage=SimpleNamespace(
+            prompt_tokens=1200, completion_tokens=3, total_tokens=1203, cache_read_input_tokens=1000
+        ),
+    )
+    client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=AsyncMock(return_value=response)))
+    )
+    adapter = OpenAIAdapter(model_name="gpt-4o", client=client)
+
+    await adapter.chat_with_tools(_system("Base.", "=== Clock ===", "12:00"), [_TOOL_A])
+    await adapter.chat_with_tools(_system("Base.", "=== Clock ===", "12:01"), [_TOOL_A])
+
+    stats = monitor.local_stats()
+    assert stats["by_agent"]["builder"]["cache_read_tokens"] == 2000
+    assert stats["prefix_invalidations"] == {"system: Clock": 1}
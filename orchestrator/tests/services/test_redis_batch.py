@@ -0,0 +1,125 @@
+"""
+Unit tests for batched Redis writes of per-process stats.
+
+Tests cover:
+- The first record flushing right away
+- A record inside the flush interval flushing at the end of it, not being
+  held until the next record
+- Records made while a flush is running getting their own flush
+- The shared read flushing first and returning None without Redis
+- Subclasses missing a batch hook failing at construction
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.redis_batch import RedisBatchWriter
+
+pytestmark = pytest.mark.unit
+
+
+class _Pipe:
+    def __init__(self, redis: _Redis) -> None:
+        self.redis = redis
+        self.ops: list[tuple] = []
+
+    def rpush(self, key, *values):
+        self.ops.append(("rpush", key, values))
+
+    def lrange(self, key, start, end):
+        self.ops.append(("lrange", key))
+
+    async def execute(self):
+        await asyncio.sleep(self.redis.latency)
+        results = []
+        for op in self.ops:
+            if op[0] == "rpush":
+                self.redis.items.extend(op[2])
+                results.append(len(self.redis.items))
+            else:
+                results.append(list(self.redis.items))
+        return results
+
+
+class _Redis:
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.items: list[str] = []
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+
+class _Writer(RedisBatchWriter):
+    def __init__(self, flush_interval: float) -> None:
+        super().__init__(flush_interval=flush_interval)
+        self._pending: list[str] = []
+
+    def record(self, value: str) -> None:
+        self._pending.append(value)
+        self._schedule_flush()
+
+    def _has_unflushed(self) -> bool:
+        return bool(self._pending)
+
+    def _take_unflushed(self) -> list[str]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _queue_writes(self, pipe, batch: list[str]) -> None:
+        pipe.rpush("items", *batch)
+
+
+def _redis(redis):
+    return patch("app.services.cache_service.get_redis_client", AsyncMock(return_value=redis))
+
+
+async def test_record_inside_interval_is_flushed_when_it_ends():
+    redis = _Redis()
+    writer = _Writer(flush_interval=0.1)
+    with _redis(redis):
+        writer.record("a")
+        await asyncio.sleep(0.01)
+        assert redis.items == ["a"]
+
+        writer.record("b")
+        writer.record("c")
+        await asyncio.sleep(0.01)
+        assert redis.items == ["a"]
+        await asyncio.sleep(0.15)
+        assert redis.items == ["a", "b", "c"]
+
+
+async def test_record_during_flush_gets_its_own_flush():
+    redis = _Redis(latency=0.05)
+    writer = _Writer(flush_interval=0.05)
+    with _redis(redis):
+        writer.record("a")
+        await asyncio.sleep(0.01)
+        writer.record("b")
+        await asyncio.sleep(0.2)
+        assert redis.items == ["a", "b"]
+
+
+async def test_shared_read_flushes_first():
+    redis = _Redis()
+    writer = _Writer(flush_interval=60)
+    with _redis(redis):
+        writer._pending.append("a")
+        rows = await writer._read_redis(lambda pipe: pipe.lrange("items", 0, -1))
+        assert rows == [["a"]]
+    with _redis(None):
+        assert await writer._read_redis(lambda pipe: pipe.lrange("items", 0, -1)) is None
+
+
+def test_subclass_must_supply_the_batch_hooks():
+    class _Partial(RedisBatchWriter):
+        def _has_unflushed(self) -> bool:
+            return False
+
+    with pytest.raises(TypeError):
+        _Partial()
@@ -12,6 +12,9 @@ Unit tests for SnapshotManager — covering the three bugs fixed in issue #250:
       snapshots to evict (len − max + 1) so the final count after insertion
       equals max, not max + 1.
 
+It also covers the batch pipeline (create_snapshots / wait_for_snapshots_ready /
+restore_from_snapshots): concurrent Kubernetes calls and per-phase timings.
+
 Mocking strategy mirrors tests/k8s/test_project_lifecycle.py:
   - asyncio.to_thread is patched to execute synchronously.
   - The real kubernetes package is never imported; ApiException is stubbed.
@@ -424,3 +427,151 @@ class TestCleanupExpiredSnapshots:
 
         assert count == 1
         assert expired.status == "deleted"
+
+
+# ---------------------------------------------------------------------------
+# Batch pipeline — concurrent create / wait / restore with phase timings
+# ---------------------------------------------------------------------------
+
+
+class TestBatchSnapshotPipeline:
+    """
+    create_snapshots / wait_for_snapshots_ready / restore_from_snapshots issue
+    their Kubernetes calls concurrently and record per-phase timings.
+    """
+
+    def _empty_rotation(self, db):
+        result = Mock()
+        result.scalars.return_value.all.return_value = []
+        db.execute.return_value = result
+
+    @pytest.mark.asyncio
+    async def test_create_snapshots_names_each_pvc_uniquely(self, snapshot_manager):
+        db = _make_db()
+        db.add = Mock()
+        self._empty_rotation(db)
+
+        records, error = await snapshot_manager.create_snapshots(
+            uuid4(), uuid4(), db, pvc_names=["project-storage", "postgres-data"]
+        )
+
+        assert error is None
+        assert [r.pvc_name for r in records] == ["project-storage", "postgres-data"]
+        names = [r.snapshot_name for r in records]
+        assert len(set(names)) == 2
+        assert names[1] == f"{names[0]}-postgres-data"
+        assert all("create_ms" in r.phase_timings for r in records)
+        assert snapshot_manager._mock_custom_api.create_namespaced_custom_object.call_count == 2
+        db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_create_snapshots_records_partial_success(self, snapshot_manager):
+        db = _make_db()
+        db.add = Mock()
+        self._empty_rotation(db)
+
+        def _create(**kwargs):
+            if kwargs["body"]["spec"]["source"]["persistentVolumeClaimName"] == "postgres-data":
+                raise MockApiException(status=500, reason="Internal Error")
+            return {}
+
+        snapshot_manager._mock_custom_api.create_namespaced_custom_object.side_effect = _create
+        with patch("app.services.snapshot_manager.ApiException", MockApiException):
+            records, error = await snapshot_manager.create_snapshots(
+                uuid4(), uuid4(), db, pvc_names=["project-storage", "postgres-data"]
+            )
+
+        assert "postgres-data" in error
+        assert [r.pvc_name for r in records] == ["project-storage"]
+
+    @pytest.mark.asyncio
+    async def test_wait_polls_snapshots_concurrently(self, snapshot_manager, monkeypatch):
+        """Total wait is the slowest snapshot, not the sum of all of them."""
+        import asyncio
+
+        in_flight = 0
+        peak = 0
+
+        async def _poll(name, namespace, timeout):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True, None, 10
+
+        monkeypatch.setattr(snapshot_manager, "_poll_until_ready", _poll)
+        db = _make_db()
+        project = Mock()
+        db.get = AsyncMock(return_value=project)
+        snaps = [_make_snapshot(), _make_snapshot()]
+        for snap in snaps:
+            snap.phase_timings = {"create_ms": 5}
+
+        ok, error = await snapshot_manager.wait_for_snapshots_ready(snaps, db, timeout_seconds=5)
+
+        assert ok is True and error is None
+        assert peak == 2
+        assert all(s.status == "ready" for s in snaps)
+        assert snaps[0].phase_timings == {"create_ms": 5, "ready_ms": 10}
+        assert project.latest_snapshot_id == snaps[-1].id
+        db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_wait_marks_failed_snapshot_as_error(self, snapshot_manager):
+        db = _make_db()
+        db.get = AsyncMock(return_value=Mock())
+        snap = _make_snapshot()
+        snap.phase_timings = None
+        snapshot_manager._mock_custom_api.get_namespaced_custom_object.side_effect = (
+            MockApiException(status=404)
+        )
+
+        with patch("app.services.snapshot_manager.ApiException", MockApiException):
+            ok, error = await snapshot_manager.wait_for_snapshots_ready([snap], db, 5)
+
+        assert ok is False
+        assert "not found" in error
+        assert snap.status == "error"
+        assert "ready_ms" in snap.phase_timings
+
+    @pytest.mark.asyncio
+    async def test_restore_from_snapshots_records_restore_timing(
+        self, snapshot_manager, monkeypatch
+    ):
+        restored: list[str] = []
+
+        async def _restore(project_id, user_id, namespace, snapshot, pvc_name):
+            restored.append(pvc_name)
+            return pvc_name == "project-storage", None
+
+        monkeypatch.setattr(snapshot_manager, "_restore_pvc", _restore)
+        db = _make_db()
+        snaps = {"project-storage": _make_snapshot(), "postgres-data": _make_snapshot()}
+        for snap in snaps.values():
+            snap.phase_timings = {}
+
+        results = await snapshot_manager.restore_from_snapshots(uuid4(), uuid4(), db, snaps)
+
+        assert sorted(restored) == ["postgres-data", "project-storage"]
+        assert results["project-storage"] == (True, None)
+        assert results["postgres-data"] == (False, None)
+        assert all("restore_ms" in s.phase_timings for s in snaps.values())
+        db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_rotation_deletes_k8s_objects_before_rows(self, snapshot_manager):
+        """K8s deletes are issued as one batch, then each row commits on its own."""
+        db = _make_db()
+        project_id = uuid4()
+        existing = [_make_snapshot(project_id=project_id) for _ in range(6)]
+        result = Mock()
+        result.scalars.return_value.all.return_value = existing
+        db.execute.return_value = result
+        snapshot_manager._mock_custom_api.get_namespaced_custom_object.return_value = {"status": {}}
+
+        await snapshot_manager._rotate_snapshots(project_id, db)
+
+        assert snapshot_manager._mock_custom_api.delete_namespaced_custom_object.call_count == 2
+        assert [c.args[0] for c in db.delete.call_args_list] == existing[:2]
+        assert db.commit.call_count == 2
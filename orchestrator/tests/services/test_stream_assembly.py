@@ -0,0 +1,176 @@
+"""
+Unit tests for streamed completion assembly.
+
+Tests cover:
+- Text and tool-call argument fragments joined once, in index order
+- Finish reason and usage (with cache counters) captured from chunks
+- Optional text delta coalescing, flushed before tool calls and done
+- OpenAIAdapter's streaming chat_with_tools events
+- A microbenchmark (``-m slow``) on a 100 KB tool-argument stream against
+  per-chunk string concatenation
+"""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.model_adapters import OpenAIAdapter
+from app.services.stream_assembly import StreamAssembler
+
+pytestmark = pytest.mark.unit
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    if content is None and tool_calls is None and finish_reason is None:
+        return SimpleNamespace(choices=[], usage=usage)
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)], usage=usage
+    )
+
+
+def _tc(index, arguments=None, id=None, name=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return SimpleNamespace(index=index, id=id, function=function)
+
+
+def _tool_call_stream(arguments: str, piece: int = 8) -> list:
+    chunks = [_chunk(tool_calls=[_tc(0, id="call_1", name="write_file")])]
+    chunks += [
+        _chunk(tool_calls=[_tc(0, arguments=arguments[i : i + piece])])
+        for i in range(0, len(arguments), piece)
+    ]
+    chunks.append(_chunk(finish_reason="tool_calls"))
+    return chunks
+
+
+class TestAssembler:
+    def test_joins_text_and_interleaved_tool_calls(self):
+        asm = StreamAssembler()
+        emitted = [
+            asm.feed(_chunk(content="Hel")),
+            asm.feed(_chunk(content="lo")),
+            asm.feed(_chunk(tool_calls=[_tc(1, id="b", name="glob"), _tc(0, id="a", name="read")])),
+            asm.feed(_chunk(tool_calls=[_tc(0, arguments='{"p"'), _tc(1, arguments='{"q"')])),
+            asm.feed(_chunk(tool_calls=[_tc(0, arguments=":1}"), _tc(1, arguments=":2}")])),
+            asm.feed(_chunk(finish_reason="tool_calls")),
+            asm.feed(
+                _chunk(
+                    usage=SimpleNamespace(prompt_tokens=10, completion_tokens=3, cached_tokens=8)
+                )
+            ),
+        ]
+        assert emitted == ["Hel", "lo", None, None, None, None, None]
+        assert asm.content == "Hello" and asm.content_chars == 5
+        assert asm.tool_calls() == [
+            {"id": "a", "function": {"name": "read", "arguments": '{"p":1}'}},
+            {"id": "b", "function": {"name": "glob", "arguments": '{"q":2}'}},
+        ]
+        assert asm.finish_reason == "tool_calls"
+        assert asm.usage == {"prompt_tokens": 10, "completion_tokens": 3, "cached_tokens": 8}
+
+    def test_coalesces_text_by_size_and_age(self, monkeypatch):
+        clock = [0.0]
+        monkeypatch.setattr("app.services.stream_assembly.time.monotonic", lambda: clock[0])
+        asm = StreamAssembler(coalesce_chars=6, coalesce_seconds=0.05)
+
+        assert asm.feed(_chunk(content="ab")) is None
+        assert asm.feed(_chunk(content="cd")) is None
+        assert asm.feed(_chunk(content="ef")) == "abcdef"
+        assert asm.feed(_chunk(content="g")) is None
+        clock[0] += 0.06
+        assert asm.feed(_chunk(content="h")) == "gh"
+        assert asm.feed(_chunk(content="i")) is None
+        assert asm.drain() == "i" and asm.drain() is None
+        assert asm.content == "abcdefghi"
+
+
+class TestAdapterStream:
+    async def _events(self, chunks, coalesce_chars=0):
+        async def _stream():
+            for c in chunks:
+                yield c
+
+        client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=AsyncMock()))
+        )
+        client.chat.completions.create.return_value = _stream()
+        adapter = OpenAIAdapter(model_name="gpt-4o", client=client)
+        settings = SimpleNamespace(
+            llm_stream_coalesce_chars=coalesce_chars, llm_stream_coalesce_ms=50.0
+        )
+        with patch("app.config.get_settings", return_value=settings):
+            stream = await adapter.chat_with_tools([{"role": "user", "content": "x"}], stream=True)
+            return [e async for e in stream]
+
+    async def test_events(self):
+        chunks = [_chunk(content="Writing"), _chunk(content=" it")]
+        chunks += _tool_call_stream('{"file_path": "a.py", "content": "print(1)"}')
+        events = await self._events(chunks)
+
+        assert [e["type"] for e in events] == [
+            "text_delta",
+            "text_delta",
+            "tool_calls_complete",
+            "done",
+        ]
+        call = events[2]["tool_calls"][0]
+        assert call["function"]["arguments"] == '{"file_path": "a.py", "content": "print(1)"}'
+        assert events[3]["finish_reason"] == "tool_calls"
+
+    async def test_coalesced_text_is_flushed_before_done(self):
+        chunks = [_chunk(content=c) for c in "abcdefg"] + [_chunk(finish_reason="stop")]
+        events = await self._events(chunks, coalesce_chars=4)
+        assert [e.get("content") for e in events] == ["abcd", "efg", None]
+
+
+# =============================================================================
+# Microbenchmark
+# =============================================================================
+
+
+def _concat_baseline(chunks) -> str:
+    """The previous assembly: append every fragment onto the dict-held string."""
+    calls = {}
+    for chunk in chunks:
+        if not chunk.choices:
+            continue
+        for tc in chunk.choices[0].delta.tool_calls or []:
+            call = calls.setdefault(tc.index, {"function": {"arguments": ""}})
+            if tc.function.arguments:
+                call["function"]["arguments"] += tc.function.arguments
+    return calls[0]["function"]["arguments"]
+
+
+def _assemble(chunks) -> str:
+    asm = StreamAssembler()
+    for chunk in chunks:
+        asm.feed(chunk)
+    return asm.tool_calls()[0]["function"]["arguments"]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("size_kb", [100, 400])
+def test_benchmark_large_tool_arguments(size_kb):
+    body = ("x = compute(value)  # line\n" * (size_kb * 1024 // 27 + 1))[: size_kb * 1024]
+    chunks = _tool_call_stream(body, piece=4)
+    assert _assemble(chunks) == _concat_baseline(chunks) == body
+
+    def _best(fn) -> float:
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            fn(chunks)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    slow, fast = _best(_concat_baseline), _best(_assemble)
+    print(
+        f"\n[stream bench] {size_kb} KB in {len(chunks)} chunks: "
+        f"{slow * 1000:.1f}ms -> {fast * 1000:.1f}ms ({slow / fast:.1f}x)"
+    )
+    assert fast < slow
@@ -0,0 +1,159 @@
+"""
+Unit tests for the phase-level latency profile of agent tasks.
+
+Tests cover:
+- Sequential phases, and open phases reported up to now
+- Model calls (via record_model_call) setting the time to first token
+- Tool calls (via execute_memoized) recorded only inside a task
+- The span cap never dropping phases
+- Histogram buckets, quantiles and recent-task summaries
+- Waterfall rows for a stored profile
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.agent.tools.registry import Tool, ToolCategory
+from app.agent.tools.tool_memo import execute_memoized
+from app.services.model_traffic import record_model_call
+from app.services.task_profile import (
+    BUCKETS_MS,
+    TaskProfile,
+    TaskProfileStats,
+    _Histogram,
+    current_task_profile,
+    render_waterfall,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def profile():
+    profile = TaskProfile("task-1", agent="builder")
+    token = current_task_profile.set(profile)
+    yield profile
+    current_task_profile.reset(token)
+
+
+def _tool(name="read_file"):
+    async def _run(params, context):
+        return {"success": True}
+
+    return Tool(
+        name,
+        f"{name} tool",
+        {},
+        _run,
+        ToolCategory.FILE_OPS,
+        state_serializable=True,
+        holds_external_state=False,
+        read_only=True,
+    )
+
+
+class TestTaskProfile:
+    def test_sequential_phases(self, profile):
+        profile.phase("project_load")
+        profile.phase("lock")
+        snapshot = profile.to_dict()
+        assert [s["name"] for s in snapshot["spans"]] == ["project_load", "lock"]
+        assert snapshot["spans"][0]["duration_ms"] is not None
+        assert snapshot["spans"][1]["open"] is True
+
+        profile.finish()
+        spans = profile.to_dict()["spans"]
+        assert all("open" not in s for s in spans)
+        assert spans[1]["start_ms"] >= spans[0]["start_ms"] + spans[0]["duration_ms"] - 0.1
+
+    async def test_model_and_tool_calls_are_recorded(self, profile):
+        profile.phase("agent_loop")
+        started = time.monotonic()
+        record_model_call("gpt-4o", started=started, first_token_at=started + 0.2)
+        record_model_call("gpt-4o", started=started, first_token_at=started + 0.5)
+        await execute_memoized(_tool(), {"path": "a.py"}, {})
+
+        calls = [(s.kind, s.name) for s in profile.spans if s.kind != "phase"]
+        assert calls == [("model", "gpt-4o"), ("model", "gpt-4o"), ("tool", "read_file")]
+        assert profile.spans[1].attrs["ttft_ms"] == 200.0
+        # First token of the first model call, as an offset from the task start.
+        assert profile.first_token_ms == pytest.approx(profile.spans[1].start_ms + 200.0, abs=0.2)
+
+    async def test_calls_outside_a_task_are_ignored(self):
+        assert current_task_profile.get() is None
+        await execute_memoized(_tool(), {}, {})
+        record_model_call("gpt-4o", started=time.monotonic())
+
+    def test_span_cap_keeps_phases(self):
+        profile = TaskProfile("task-1", max_spans=2)
+        profile.phase("agent_loop")
+        for _ in range(3):
+            profile.record("tool", "grep", time.monotonic())
+        profile.phase("finalize")
+        assert [s.name for s in profile.spans] == ["agent_loop", "grep", "finalize"]
+        assert profile.to_dict()["dropped_spans"] == 2
+
+
+class TestStats:
+    def test_histogram_buckets_and_quantiles(self):
+        h = _Histogram()
+        for ms in (5, 40, 40, 40, 700):
+            h.observe(ms)
+        data = h.to_dict()
+        assert data["count"] == 5
+        assert data["buckets"]["10"] == 1
+        assert data["buckets"]["50"] == 4
+        assert data["buckets"]["+Inf"] == 5
+        assert 25 < data["p50_ms"] <= 50
+        assert 500 < data["p95_ms"] <= 1000
+        assert len(data["buckets"]) == len(BUCKETS_MS) + 1
+
+    def test_observe_groups_by_kind(self, profile):
+        stats = TaskProfileStats()
+        profile.phase("context_build")
+        profile.record("model", "claude", time.monotonic() - 0.3, ttft_ms=120.0)
+        profile.record("tool", "read_file", time.monotonic())
+        profile.message_id = "m-1"
+        profile.finish()
+        stats.observe(profile)
+
+        data = stats.local_stats()
+        assert data["phases"]["context_build"]["count"] == 1
+        assert data["models"]["claude"]["count"] == 1
+        assert data["tools"]["read_file"]["count"] == 1
+        assert data["task"]["total"]["count"] == 1
+        assert data["task"]["first_token"]["count"] == 1
+        recent = data["recent"][0]
+        assert (recent["task_id"], recent["message_id"], recent["agent"]) == (
+            "task-1",
+            "m-1",
+            "builder",
+        )
+        assert recent["slowest_phase"]["name"] == "context_build"
+
+
+def test_render_waterfall():
+    stored = {
+        "task_id": "task-1",
+        "total_ms": 1000.0,
+        "first_token_ms": 450.0,
+        "spans": [
+            {"kind": "phase", "name": "context_build", "start_ms": 0.0, "duration_ms": 400.0},
+            {"kind": "model", "name": "claude", "start_ms": 400.0, "duration_ms": 500.0},
+            {"kind": "phase", "name": "agent_loop", "start_ms": 400.0, "duration_ms": 600.0},
+        ],
+    }
+    waterfall = render_waterfall(stored, width=10)
+    rows = waterfall["rows"]
+    assert [(r["name"], r["depth"]) for r in rows] == [
+        ("context_build", 0),
+        ("agent_loop", 0),
+        ("claude", 1),
+    ]
+    assert rows[0]["bar"] == "████      "
+    assert rows[2]["bar"] == "    █████ "
+    assert rows[1]["share"] == 0.6
+    assert waterfall["first_token_ms"] == 450.0
@@ -2,8 +2,8 @@
 Unit tests for VolumeManager — thin client for the Volume Hub.
 
 Tests cover: create_volume, create_empty_volume, delete_volume,
-ensure_cached, trigger_sync, create_service_volume, and the singleton
-accessor.
+ensure_cached, get_volume_owner, trigger_sync, create_service_volume, the FileOps route
+cache / channel pool, and the singleton accessor.
 
 The HubClient is fully mocked since it's the only external dependency.
 """
@@ -59,6 +59,8 @@ def mock_settings(monkeypatch):
 
     settings = Mock()
     settings.volume_hub_address = "tesslate-volume-hub.kube-system.svc:9750"
+    settings.fileops_route_cache_ttl_seconds = 30
+    settings.fileops_channel_pool_size = 4
     monkeypatch.setattr("app.services.volume_manager.get_settings", lambda: settings)
     return settings
 
@@ -184,6 +186,28 @@ class TestEnsureCached:
         assert result == "node-7"
 
 
+# ===========================================================================
+# get_volume_owner
+# ===========================================================================
+
+
+@pytest.mark.asyncio
+class TestGetVolumeOwner:
+    """VolumeManager.get_volume_owner()."""
+
+    async def test_returns_owner_even_when_unreachable(self, vm, mock_hub):
+        mock_hub.resolve_volume = AsyncMock(
+            return_value={"node_name": "node-4", "state": "owner_unreachable"}
+        )
+
+        assert await vm.get_volume_owner("vol-abc123def456") == "node-4"
+
+    async def test_no_owner(self, vm, mock_hub):
+        mock_hub.resolve_volume = AsyncMock(return_value={"state": "unavailable"})
+
+        assert await vm.get_volume_owner("vol-abc123def456") == ""
+
+
 # ===========================================================================
 # trigger_sync
 # ===========================================================================
@@ -228,6 +252,78 @@ class TestCreateServiceVolume:
         assert result == "vol-abc123def456-redis"
 
 
+# ===========================================================================
+# get_fileops_client — route cache + pooled channels
+# ===========================================================================
+
+
+@pytest.mark.asyncio
+class TestFileOpsRouting:
+    """get_fileops_client() caches the Hub route and borrows pooled channels."""
+
+    @pytest.fixture(autouse=True)
+    def fake_channels(self):
+        with patch("app.services.fileops_client.grpc.aio.insecure_channel") as insecure:
+            insecure.side_effect = lambda address, options: AsyncMock(name=address)
+            yield insecure
+
+    @pytest.fixture
+    def resolved(self, mock_hub):
+        mock_hub.resolve_volume = AsyncMock(
+            return_value={"state": "cached", "fileops_address": "node-1:9742"}
+        )
+        return mock_hub.resolve_volume
+
+    async def test_second_call_skips_hub_and_reuses_channel(self, vm, resolved, fake_channels):
+        first = await vm.get_fileops_client("vol-1")
+        async with first:
+            pass
+        second = await vm.get_fileops_client("vol-1")
+
+        assert resolved.await_count == 1
+        assert fake_channels.call_count == 1
+        assert second._channel is first._channel
+        first._channel.close.assert_not_awaited()
+        assert vm.has_fileops_route("vol-1")
+
+    async def test_concurrent_misses_share_one_hub_lookup(self, vm, resolved):
+        import asyncio
+
+        await asyncio.gather(*(vm.get_fileops_client("vol-1") for _ in range(5)))
+        assert resolved.await_count == 1
+
+    async def test_invalidate_forces_reresolve(self, vm, resolved, fake_channels):
+        await vm.get_fileops_client("vol-1")
+        vm.invalidate_fileops_route("vol-1", drop_channel=True)
+
+        assert not vm.has_fileops_route("vol-1")
+        await vm.get_fileops_client("vol-1")
+        assert resolved.await_count == 2
+        assert fake_channels.call_count == 2
+
+    async def test_owner_unreachable_drops_route(self, vm, resolved):
+        from app.services.volume_manager import VolumeOwnerUnreachableError
+
+        await vm.get_fileops_client("vol-1")
+        vm._routes["vol-1"] = ("node-1:9742", 0.0)  # expired
+        resolved.return_value = {"state": "owner_unreachable"}
+
+        with pytest.raises(VolumeOwnerUnreachableError):
+            await vm.get_fileops_client("vol-1")
+        assert not vm.has_fileops_route("vol-1")
+
+    async def test_ensure_cached_invalidates_route(self, vm, resolved):
+        await vm.get_fileops_client("vol-1")
+        await vm.ensure_cached("vol-1")
+        assert not vm.has_fileops_route("vol-1")
+
+    async def test_zero_ttl_disables_cache(self, vm, resolved, mock_settings):
+        vm._route_ttl = 0
+        await vm.get_fileops_client("vol-1")
+        await vm.get_fileops_client("vol-1")
+        assert resolved.await_count == 2
+
+
 # ===========================================================================
 # Singleton
 # ===========================================================================
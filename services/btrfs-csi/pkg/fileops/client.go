@@ -3,6 +3,7 @@ package fileops
 import (
 	"context"
 	"fmt"
+	"io"
 
 	"google.golang.org/grpc"
 	"k8s.io/klog/v2"
@@ -98,6 +99,14 @@ func (c *Client) StatPath(ctx context.Context, volumeID, path string) (*FileInfo
 	return &resp.Info, nil
 }
 
+func (c *Client) StatPaths(ctx context.Context, volumeID string, paths []string) ([]FileInfo, []string, error) {
+	var resp StatPathsResponse
+	if err := c.invoke(ctx, "StatPaths", &StatPathsRequest{VolumeID: volumeID, Paths: paths}, &resp); err != nil {
+		return nil, nil, err
+	}
+	return resp.Entries, resp.Errors, nil
+}
+
 func (c *Client) DeletePath(ctx context.Context, volumeID, path string) error {
 	return c.invoke(ctx, "DeletePath", &DeletePathRequest{VolumeID: volumeID, Path: path}, &Empty{})
 }
@@ -117,3 +126,30 @@ func (c *Client) TarCreate(ctx context.Context, volumeID, path string) ([]byte,
 func (c *Client) TarExtract(ctx context.Context, volumeID, path string, data []byte) error {
 	return c.invoke(ctx, "TarExtract", &TarRequest{VolumeID: volumeID, Path: path, Data: data}, &Empty{})
 }
+
+// TarCreateStream writes a tar archive of path to w as the server produces
+// it, so neither side holds the whole archive in memory.
+func (c *Client) TarCreateStream(ctx context.Context, volumeID, path string, w io.Writer) error {
+	desc := &grpc.StreamDesc{StreamName: "TarCreateStream", ServerStreams: true}
+	stream, err := c.conn.NewStream(ctx, desc, "/fileops.FileOps/TarCreateStream")
+	if err != nil {
+		return err
+	}
+	if err := stream.SendMsg(&TarRequest{VolumeID: volumeID, Path: path}); err != nil {
+		return err
+	}
+	if err := stream.CloseSend(); err != nil {
+		return err
+	}
+	for {
+		var f Frame
+		if err := stream.RecvMsg(&f); err == io.EOF {
+			return nil
+		} else if err != nil {
+			return err
+		}
+		if _, err := w.Write(f.Data); err != nil {
+			return err
+		}
+	}
+}
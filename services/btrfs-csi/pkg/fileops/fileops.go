@@ -10,12 +10,13 @@ import (
 
 // FileInfo represents metadata about a file or directory.
 type FileInfo struct {
-	Name    string `json:"name"`
-	Path    string `json:"path"`
-	Size    int64  `json:"size"`
-	IsDir   bool   `json:"is_dir"`
-	ModTime int64  `json:"mod_time"` // Unix timestamp
-	Mode    uint32 `json:"mode"`     // File permission bits
+	Name      string `json:"name"`
+	Path      string `json:"path"`
+	Size      int64  `json:"size"`
+	IsDir     bool   `json:"is_dir"`
+	ModTime   int64  `json:"mod_time"`              // Unix timestamp
+	ModTimeNs int64  `json:"mod_time_ns,omitempty"` // Unix nanoseconds (StatPath/StatPaths only), for change detection
+	Mode      uint32 `json:"mode"`                  // File permission bits
 }
 
 // FileContent holds a file's path, data and size for batch reads.
@@ -42,6 +43,10 @@ type FileOps interface {
 	// StatPath returns metadata about a file or directory.
 	StatPath(ctx context.Context, volumeID, path string) (*FileInfo, error)
 
+	// StatPaths returns metadata for several paths in one call. Paths that
+	// are missing or invalid are returned in the error list.
+	StatPaths(ctx context.Context, volumeID string, paths []string) ([]FileInfo, []string, error)
+
 	// DeletePath removes a file or directory.
 	DeletePath(ctx context.Context, volumeID, path string) error
 
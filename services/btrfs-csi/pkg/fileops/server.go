@@ -187,6 +187,14 @@ type (
 		VolumeID string `json:"volume_id"`
 		Path     string `json:"path"`
 	}
+	StatPathsRequest struct {
+		VolumeID string   `json:"volume_id"`
+		Paths    []string `json:"paths"`
+	}
+	StatPathsResponse struct {
+		Entries []FileInfo `json:"entries"`
+		Errors  []string   `json:"errors"`
+	}
 
 	DeletePathRequest struct {
 		VolumeID string `json:"volume_id"`
@@ -232,6 +240,17 @@ type (
 		VolumeID    string   `json:"volume_id"`
 		Paths       []string `json:"paths"`
 		MaxFileSize int64    `json:"max_file_size"`
+
+		// Read budgets, honoured by ReadFilesStream only. MaxReadBytes caps
+		// the bytes sent per file (the head, or the tail when Tail is set)
+		// and replaces the MaxFileSize rejection; MaxTotalBytes ends the
+		// stream once that many content bytes were sent. Paths whose
+		// extension (lowercase, without the dot) is in SkipExtensions get
+		// an error frame without being opened.
+		MaxReadBytes   int64    `json:"max_read_bytes,omitempty"`
+		MaxTotalBytes  int64    `json:"max_total_bytes,omitempty"`
+		Tail           bool     `json:"tail,omitempty"`
+		SkipExtensions []string `json:"skip_extensions,omitempty"`
 	}
 	ReadFilesResponse struct {
 		Files  []FileContent `json:"files"`
@@ -262,9 +281,25 @@ func chownNewParents(dir, root string, uid, gid int) {
 
 type jsonCodec struct{}
 
-func (jsonCodec) Marshal(v interface{}) ([]byte, error)     { return json.Marshal(v) }
-func (jsonCodec) Unmarshal(data []byte, v interface{}) error { return json.Unmarshal(data, v) }
-func (jsonCodec) Name() string                              { return "json" }
+// Marshal and Unmarshal pass *Frame messages (the streaming RPCs) through
+// the binary frame encoding; everything else is plain JSON. There is no
+// separate frame codec: the server forces this one for every RPC, so the
+// streaming RPCs share the "json" name and content-type with the unary ones.
+func (jsonCodec) Marshal(v interface{}) ([]byte, error) {
+	if f, ok := v.(*Frame); ok {
+		return f.marshal(), nil
+	}
+	return json.Marshal(v)
+}
+
+func (jsonCodec) Unmarshal(data []byte, v interface{}) error {
+	if f, ok := v.(*Frame); ok {
+		return f.unmarshal(data)
+	}
+	return json.Unmarshal(data, v)
+}
+
+func (jsonCodec) Name() string { return "json" }
 
 // fileOpsServiceServer is the interface type required by gRPC's RegisterService.
 type fileOpsServiceServer interface{}
@@ -279,13 +314,18 @@ func registerFileOpsServer(srv *grpc.Server, s *Server) {
 			{MethodName: "ListDir", Handler: s.handleListDir},
 			{MethodName: "ListTree", Handler: s.handleListTree},
 			{MethodName: "StatPath", Handler: s.handleStatPath},
+			{MethodName: "StatPaths", Handler: s.handleStatPaths},
 			{MethodName: "DeletePath", Handler: s.handleDeletePath},
 			{MethodName: "MkdirAll", Handler: s.handleMkdirAll},
 			{MethodName: "ReadFiles", Handler: s.handleReadFiles},
 			{MethodName: "TarCreate", Handler: s.handleTarCreate},
 			{MethodName: "TarExtract", Handler: s.handleTarExtract},
 		},
-		Streams: []grpc.StreamDesc{},
+		Streams: []grpc.StreamDesc{
+			{StreamName: "ReadFilesStream", Handler: s.handleReadFilesStream, ServerStreams: true},
+			{StreamName: "TarCreateStream", Handler: s.handleTarCreateStream, ServerStreams: true},
+			{StreamName: "TarExtractStream", Handler: s.handleTarExtractStream, ClientStreams: true},
+		},
 	}, s)
 }
 
@@ -462,15 +502,55 @@ func (s *Server) handleStatPath(_ interface{}, ctx context.Context, dec func(int
 	}
 
 	return &FileInfoResponse{Info: FileInfo{
-		Name:    info.Name(),
-		Path:    req.Path,
-		Size:    info.Size(),
-		IsDir:   info.IsDir(),
-		ModTime: info.ModTime().Unix(),
-		Mode:    uint32(info.Mode()),
+		Name:      info.Name(),
+		Path:      req.Path,
+		Size:      info.Size(),
+		IsDir:     info.IsDir(),
+		ModTime:   info.ModTime().Unix(),
+		ModTimeNs: info.ModTime().UnixNano(),
+		Mode:      uint32(info.Mode()),
 	}}, nil
 }
 
+func (s *Server) handleStatPaths(_ interface{}, ctx context.Context, dec func(interface{}) error, _ grpc.UnaryServerInterceptor) (interface{}, error) {
+	var req StatPathsRequest
+	if err := dec(&req); err != nil {
+		return nil, status.Errorf(codes.InvalidArgument, "decode: %v", err)
+	}
+	if req.VolumeID == "" {
+		return nil, status.Error(codes.InvalidArgument, "volume_id is required")
+	}
+	if err := s.checkVolumeExists(req.VolumeID); err != nil {
+		return nil, err
+	}
+
+	entries := make([]FileInfo, 0, len(req.Paths))
+	var errors []string
+	for _, p := range req.Paths {
+		fullPath, err := s.volumePath(req.VolumeID, p)
+		if err != nil {
+			errors = append(errors, p)
+			continue
+		}
+		info, err := os.Stat(fullPath)
+		if err != nil {
+			errors = append(errors, p)
+			continue
+		}
+		entries = append(entries, FileInfo{
+			Name:      info.Name(),
+			Path:      p,
+			Size:      info.Size(),
+			IsDir:     info.IsDir(),
+			ModTime:   info.ModTime().Unix(),
+			ModTimeNs: info.ModTime().UnixNano(),
+			Mode:      uint32(info.Mode()),
+		})
+	}
+
+	return &StatPathsResponse{Entries: entries, Errors: errors}, nil
+}
+
 func (s *Server) handleDeletePath(_ interface{}, ctx context.Context, dec func(interface{}) error, _ grpc.UnaryServerInterceptor) (interface{}, error) {
 	var req DeletePathRequest
 	if err := dec(&req); err != nil {
@@ -691,7 +771,49 @@ func (s *Server) handleTarCreate(_ interface{}, ctx context.Context, dec func(in
 	var buf bytes.Buffer
 	tw := tar.NewWriter(&buf)
 
-	err = filepath.WalkDir(fullPath, func(path string, d fs.DirEntry, walkErr error) error {
+	if err := writeTarTree(tw, fullPath); err != nil {
+		return nil, status.Errorf(codes.Internal, "create tar: %v", err)
+	}
+
+	if err := tw.Close(); err != nil {
+		return nil, status.Errorf(codes.Internal, "finalize tar: %v", err)
+	}
+
+	return &TarResponse{Data: buf.Bytes()}, nil
+}
+
+func (s *Server) handleTarExtract(_ interface{}, ctx context.Context, dec func(interface{}) error, _ grpc.UnaryServerInterceptor) (interface{}, error) {
+	var req TarRequest
+	if err := dec(&req); err != nil {
+		return nil, status.Errorf(codes.InvalidArgument, "decode: %v", err)
+	}
+	if req.VolumeID == "" || req.Path == "" {
+		return nil, status.Error(codes.InvalidArgument, "volume_id and path are required")
+	}
+	if err := s.checkVolumeExists(req.VolumeID); err != nil {
+		return nil, err
+	}
+	if len(req.Data) == 0 {
+		return nil, status.Error(codes.InvalidArgument, "tar data is required")
+	}
+
+	destPath, err := s.volumePath(req.VolumeID, req.Path)
+	if err != nil {
+		return nil, status.Errorf(codes.InvalidArgument, "%v", err)
+	}
+
+	if err := extractTar(tar.NewReader(bytes.NewReader(req.Data)), destPath, req.Uid, req.Gid); err != nil {
+		return nil, err
+	}
+
+	s.markDirty(req.VolumeID)
+	return &Empty{}, nil
+}
+
+// writeTarTree writes every entry under root to tw, named relative to root.
+// Unreadable entries are skipped; the caller closes tw.
+func writeTarTree(tw *tar.Writer, root string) error {
+	return filepath.WalkDir(root, func(path string, d fs.DirEntry, walkErr error) error {
 		if walkErr != nil {
 			return nil
 		}
@@ -700,7 +822,7 @@ func (s *Server) handleTarCreate(_ interface{}, ctx context.Context, dec func(in
 			return nil
 		}
 
-		relPath, _ := filepath.Rel(fullPath, path)
+		relPath, _ := filepath.Rel(root, path)
 		if relPath == "." {
 			return nil
 		}
@@ -727,50 +849,23 @@ func (s *Server) handleTarCreate(_ interface{}, ctx context.Context, dec func(in
 		}
 		return nil
 	})
-
-	if err != nil {
-		return nil, status.Errorf(codes.Internal, "create tar: %v", err)
-	}
-
-	if err := tw.Close(); err != nil {
-		return nil, status.Errorf(codes.Internal, "finalize tar: %v", err)
-	}
-
-	return &TarResponse{Data: buf.Bytes()}, nil
 }
 
-func (s *Server) handleTarExtract(_ interface{}, ctx context.Context, dec func(interface{}) error, _ grpc.UnaryServerInterceptor) (interface{}, error) {
-	var req TarRequest
-	if err := dec(&req); err != nil {
-		return nil, status.Errorf(codes.InvalidArgument, "decode: %v", err)
-	}
-	if req.VolumeID == "" || req.Path == "" {
-		return nil, status.Error(codes.InvalidArgument, "volume_id and path are required")
-	}
-	if err := s.checkVolumeExists(req.VolumeID); err != nil {
-		return nil, err
-	}
-	if len(req.Data) == 0 {
-		return nil, status.Error(codes.InvalidArgument, "tar data is required")
-	}
-
-	destPath, err := s.volumePath(req.VolumeID, req.Path)
-	if err != nil {
-		return nil, status.Errorf(codes.InvalidArgument, "%v", err)
-	}
-
+// extractTar unpacks tr into destPath, creating it first. Entries that
+// escape destPath are skipped and regular files are capped at 1GB. Returns
+// gRPC status errors.
+func extractTar(tr *tar.Reader, destPath string, uid, gid int) error {
 	if err := os.MkdirAll(destPath, 0755); err != nil {
-		return nil, status.Errorf(codes.Internal, "mkdir dest: %v", err)
+		return status.Errorf(codes.Internal, "mkdir dest: %v", err)
 	}
 
-	tr := tar.NewReader(bytes.NewReader(req.Data))
 	for {
 		header, err := tr.Next()
 		if err == io.EOF {
 			break
 		}
 		if err != nil {
-			return nil, status.Errorf(codes.Internal, "read tar: %v", err)
+			return status.Errorf(codes.Internal, "read tar: %v", err)
 		}
 
 		targetPath := filepath.Join(destPath, header.Name)
@@ -785,33 +880,31 @@ func (s *Server) handleTarExtract(_ interface{}, ctx context.Context, dec func(i
 		switch header.Typeflag {
 		case tar.TypeDir:
 			if err := os.MkdirAll(cleanTarget, os.FileMode(header.Mode)); err != nil {
-				return nil, status.Errorf(codes.Internal, "mkdir tar entry: %v", err)
+				return status.Errorf(codes.Internal, "mkdir tar entry: %v", err)
 			}
 		case tar.TypeReg:
 			// Limit individual file extraction to 1GB to prevent zip bomb attacks.
 			const maxFileSize int64 = 1 << 30
 			if header.Size > maxFileSize {
-				return nil, status.Errorf(codes.InvalidArgument, "tar entry %q exceeds max size (%d > %d)", header.Name, header.Size, maxFileSize)
+				return status.Errorf(codes.InvalidArgument, "tar entry %q exceeds max size (%d > %d)", header.Name, header.Size, maxFileSize)
 			}
 			if err := os.MkdirAll(filepath.Dir(cleanTarget), 0755); err != nil {
-				return nil, status.Errorf(codes.Internal, "mkdir parent: %v", err)
+				return status.Errorf(codes.Internal, "mkdir parent: %v", err)
 			}
 			file, createErr := os.OpenFile(cleanTarget, os.O_CREATE|os.O_WRONLY|os.O_TRUNC, os.FileMode(header.Mode))
 			if createErr != nil {
-				return nil, status.Errorf(codes.Internal, "create file: %v", createErr)
+				return status.Errorf(codes.Internal, "create file: %v", createErr)
 			}
 			if _, copyErr := io.CopyN(file, tr, maxFileSize); copyErr != nil && copyErr != io.EOF {
 				file.Close()
-				return nil, status.Errorf(codes.Internal, "write file: %v", copyErr)
+				return status.Errorf(codes.Internal, "write file: %v", copyErr)
 			}
 			file.Close()
 		}
 
-		if req.Uid > 0 || req.Gid > 0 {
-			os.Chown(cleanTarget, req.Uid, req.Gid)
+		if uid > 0 || gid > 0 {
+			os.Chown(cleanTarget, uid, gid)
 		}
 	}
-
-	s.markDirty(req.VolumeID)
-	return &Empty{}, nil
+	return nil
 }
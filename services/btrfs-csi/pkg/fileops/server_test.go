@@ -431,6 +431,9 @@ func TestStatPath_File(t *testing.T) {
 	if fi.Path != "info.txt" {
 		t.Errorf("Path = %q, want %q", fi.Path, "info.txt")
 	}
+	if fi.ModTimeNs/1e9 != fi.ModTime {
+		t.Errorf("ModTimeNs = %d does not match ModTime = %d", fi.ModTimeNs, fi.ModTime)
+	}
 }
 
 func TestStatPath_Directory(t *testing.T) {
@@ -465,6 +468,47 @@ func TestStatPath_NotFound(t *testing.T) {
 	requireCode(t, err, codes.NotFound)
 }
 
+func TestStatPaths_Mixed(t *testing.T) {
+	pool := t.TempDir()
+	s := NewServer(pool, nil)
+	volDir := setupVolume(t, pool, "v1")
+
+	if err := os.WriteFile(filepath.Join(volDir, "a.txt"), []byte("aaa"), 0644); err != nil {
+		t.Fatal(err)
+	}
+	if err := os.MkdirAll(filepath.Join(volDir, "dir"), 0755); err != nil {
+		t.Fatal(err)
+	}
+
+	req := StatPathsRequest{VolumeID: "v1", Paths: []string{"a.txt", "ghost", "dir", "../escape"}}
+	resp, err := s.handleStatPaths(nil, ctx, makeDec(req), nilInterceptor)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	r := resp.(*StatPathsResponse)
+
+	if len(r.Entries) != 2 {
+		t.Fatalf("got %d entries, want 2", len(r.Entries))
+	}
+	if r.Entries[0].Path != "a.txt" || r.Entries[0].Size != 3 || r.Entries[0].ModTimeNs == 0 {
+		t.Errorf("unexpected entry for a.txt: %+v", r.Entries[0])
+	}
+	if r.Entries[1].Path != "dir" || !r.Entries[1].IsDir {
+		t.Errorf("unexpected entry for dir: %+v", r.Entries[1])
+	}
+	if len(r.Errors) != 2 || r.Errors[0] != "ghost" || r.Errors[1] != "../escape" {
+		t.Errorf("Errors = %v, want [ghost ../escape]", r.Errors)
+	}
+}
+
+func TestStatPaths_MissingVolume(t *testing.T) {
+	pool := t.TempDir()
+	s := NewServer(pool, nil)
+
+	_, err := s.handleStatPaths(nil, ctx, makeDec(StatPathsRequest{Paths: []string{"a"}}), nilInterceptor)
+	requireCode(t, err, codes.InvalidArgument)
+}
+
 // ---------------------------------------------------------------------------
 // DeletePath
 // ---------------------------------------------------------------------------
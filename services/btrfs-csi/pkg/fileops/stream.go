@@ -0,0 +1,386 @@
+package fileops
+
+import (
+	"archive/tar"
+	"bufio"
+	"encoding/binary"
+	"encoding/json"
+	"fmt"
+	"io"
+	"os"
+	"path/filepath"
+	"strings"
+
+	"google.golang.org/grpc"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/status"
+)
+
+// streamChunkSize bounds the payload of a single Frame. Large files and tar
+// archives are split across frames so neither side buffers a whole payload
+// and no message approaches the 64MB gRPC limit.
+const streamChunkSize = 1 << 20
+
+// Frame is the message type of the streaming RPCs (ReadFilesStream,
+// TarCreateStream, TarExtractStream). jsonCodec encodes it as
+//
+//	[4-byte big-endian header length][header JSON][raw payload]
+//
+// so file contents and tar data travel as raw bytes instead of the ~33%
+// larger base64 that json.Marshal produces for []byte.
+type Frame struct {
+	Header FrameHeader
+	Data   []byte
+}
+
+// FrameHeader carries the per-frame metadata. Which fields are set depends
+// on the RPC:
+//   - ReadFilesStream: Path, Size (total file size) and Offset (of Data
+//     within the file) on every frame; Length (bytes sent for the path)
+//     when a read budget cut the file short, in which case the range
+//     starts at Size-Length for tail reads and at 0 otherwise; Error
+//     instead of data for paths that were skipped or could not be read.
+//   - TarExtractStream: VolumeID, Path, Uid and Gid on the first frame.
+//   - TarCreateStream: no header, Data is the next slice of the archive.
+type FrameHeader struct {
+	VolumeID string `json:"volume_id,omitempty"`
+	Path     string `json:"path,omitempty"`
+	Size     int64  `json:"size,omitempty"`
+	Offset   int64  `json:"offset,omitempty"`
+	Length   int64  `json:"length,omitempty"`
+	Uid      int    `json:"uid,omitempty"`
+	Gid      int    `json:"gid,omitempty"`
+	Error    string `json:"error,omitempty"`
+}
+
+func (f *Frame) marshal() []byte {
+	// FrameHeader holds only strings and integers, so Marshal cannot fail.
+	hdr, _ := json.Marshal(&f.Header)
+	buf := make([]byte, 4+len(hdr)+len(f.Data))
+	binary.BigEndian.PutUint32(buf, uint32(len(hdr)))
+	copy(buf[4:], hdr)
+	copy(buf[4+len(hdr):], f.Data)
+	return buf
+}
+
+func (f *Frame) unmarshal(data []byte) error {
+	if len(data) < 4 {
+		return fmt.Errorf("frame too short: %d bytes", len(data))
+	}
+	n := int(binary.BigEndian.Uint32(data))
+	if n > len(data)-4 {
+		return fmt.Errorf("frame header length %d exceeds message size %d", n, len(data))
+	}
+	f.Header = FrameHeader{}
+	if n > 0 {
+		if err := json.Unmarshal(data[4:4+n], &f.Header); err != nil {
+			return fmt.Errorf("frame header: %w", err)
+		}
+	}
+	// Copy the payload: the codec must not retain gRPC's receive buffer.
+	f.Data = append([]byte(nil), data[4+n:]...)
+	return nil
+}
+
+// handleReadFilesStream is the streaming form of ReadFiles. Each readable
+// file is sent as one or more frames in request order; unreadable, missing,
+// oversized or skipped paths get a single frame with Error set. When the
+// request carries read budgets only the allowed bytes leave the node, and
+// the stream ends early once MaxTotalBytes is spent.
+func (s *Server) handleReadFilesStream(_ interface{}, stream grpc.ServerStream) error {
+	var req ReadFilesRequest
+	if err := stream.RecvMsg(&req); err != nil {
+		return status.Errorf(codes.InvalidArgument, "decode: %v", err)
+	}
+	if req.VolumeID == "" {
+		return status.Error(codes.InvalidArgument, "volume_id is required")
+	}
+	if err := s.checkVolumeExists(req.VolumeID); err != nil {
+		return err
+	}
+
+	budget := newReadBudget(&req)
+	for _, p := range req.Paths {
+		if err := stream.Context().Err(); err != nil {
+			return status.FromContextError(err).Err()
+		}
+		if budget.exhausted() {
+			return nil
+		}
+		if budget.skips(p) {
+			if err := stream.SendMsg(&Frame{Header: FrameHeader{Path: p, Error: "binary file extension"}}); err != nil {
+				return err
+			}
+			continue
+		}
+		if err := s.streamFile(stream, req.VolumeID, p, budget); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// readBudget tracks ReadFilesStream's per-request limits. Zero limits mean
+// whole files and no total cap.
+type readBudget struct {
+	maxFileSize int64
+	maxRead     int64
+	tail        bool
+	remaining   int64 // -1 when there is no total cap
+	skipExts    map[string]struct{}
+}
+
+func newReadBudget(req *ReadFilesRequest) *readBudget {
+	b := &readBudget{
+		maxFileSize: req.MaxFileSize,
+		maxRead:     req.MaxReadBytes,
+		tail:        req.Tail,
+		remaining:   -1,
+	}
+	if req.MaxTotalBytes > 0 {
+		b.remaining = req.MaxTotalBytes
+	}
+	if len(req.SkipExtensions) > 0 {
+		b.skipExts = make(map[string]struct{}, len(req.SkipExtensions))
+		for _, e := range req.SkipExtensions {
+			b.skipExts[strings.ToLower(strings.TrimPrefix(e, "."))] = struct{}{}
+		}
+	}
+	return b
+}
+
+func (b *readBudget) exhausted() bool { return b.remaining == 0 }
+
+func (b *readBudget) skips(p string) bool {
+	if b.skipExts == nil {
+		return false
+	}
+	name := filepath.Base(p)
+	idx := strings.LastIndex(name, ".")
+	if idx < 0 {
+		return false
+	}
+	_, ok := b.skipExts[strings.ToLower(name[idx+1:])]
+	return ok
+}
+
+// limit returns how many bytes of a file of the given size may be sent.
+func (b *readBudget) limit(size int64) int64 {
+	n := size
+	if b.maxRead > 0 && n > b.maxRead {
+		n = b.maxRead
+	}
+	if b.remaining >= 0 && n > b.remaining {
+		n = b.remaining
+	}
+	return n
+}
+
+func (b *readBudget) spend(n int64) {
+	if b.remaining >= 0 {
+		b.remaining -= n
+		if b.remaining < 0 {
+			b.remaining = 0
+		}
+	}
+}
+
+// streamFile sends one file as frames. Per-path failures become an error
+// frame; only a failed send is returned.
+func (s *Server) streamFile(stream grpc.ServerStream, volumeID, p string, budget *readBudget) error {
+	sendErr := func(msg string) error {
+		return stream.SendMsg(&Frame{Header: FrameHeader{Path: p, Error: msg}})
+	}
+
+	fullPath, err := s.volumePath(volumeID, p)
+	if err != nil {
+		return sendErr(err.Error())
+	}
+	file, err := os.Open(fullPath)
+	if err != nil {
+		return sendErr(err.Error())
+	}
+	defer file.Close()
+
+	info, err := file.Stat()
+	if err != nil {
+		return sendErr(err.Error())
+	}
+	if info.IsDir() {
+		return sendErr("is a directory")
+	}
+	size := info.Size()
+	if budget.maxRead == 0 && budget.maxFileSize > 0 && size > budget.maxFileSize {
+		return sendErr(fmt.Sprintf("file too large (%d > %d)", size, budget.maxFileSize))
+	}
+
+	// A ranged read sends exactly length bytes; otherwise the file is read
+	// to EOF so a file that grew since the stat is still sent whole.
+	var reader io.Reader = file
+	var offset, length int64
+	bufSize := streamChunkSize
+	if n := budget.limit(size); n < size {
+		length = n
+		if budget.tail {
+			offset = size - n
+			if _, err := file.Seek(offset, io.SeekStart); err != nil {
+				return sendErr(err.Error())
+			}
+		}
+		reader = io.LimitReader(file, n)
+		if n < int64(bufSize) {
+			bufSize = int(n)
+		}
+	}
+
+	var sent int64
+	for {
+		chunk := make([]byte, bufSize)
+		n, readErr := io.ReadFull(reader, chunk)
+		// Always send at least one frame so empty files are reported.
+		if n > 0 || sent == 0 {
+			frame := &Frame{
+				Header: FrameHeader{Path: p, Size: size, Offset: offset + sent, Length: length},
+				Data:   chunk[:n],
+			}
+			if err := stream.SendMsg(frame); err != nil {
+				return err
+			}
+			sent += int64(n)
+		}
+		if readErr == io.EOF || readErr == io.ErrUnexpectedEOF || (length > 0 && sent >= length) {
+			budget.spend(sent)
+			return nil
+		}
+		if readErr != nil {
+			// Frames already sent for p are discarded by the client.
+			return sendErr(readErr.Error())
+		}
+	}
+}
+
+// handleTarCreateStream is the streaming form of TarCreate: the archive is
+// written straight into frames of at most streamChunkSize bytes instead of
+// being buffered in memory.
+func (s *Server) handleTarCreateStream(_ interface{}, stream grpc.ServerStream) error {
+	var req TarRequest
+	if err := stream.RecvMsg(&req); err != nil {
+		return status.Errorf(codes.InvalidArgument, "decode: %v", err)
+	}
+	if req.VolumeID == "" || req.Path == "" {
+		return status.Error(codes.InvalidArgument, "volume_id and path are required")
+	}
+	if err := s.checkVolumeExists(req.VolumeID); err != nil {
+		return err
+	}
+
+	fullPath, err := s.volumePath(req.VolumeID, req.Path)
+	if err != nil {
+		return status.Errorf(codes.InvalidArgument, "%v", err)
+	}
+
+	bw := bufio.NewWriterSize(&frameWriter{stream: stream}, streamChunkSize)
+	tw := tar.NewWriter(bw)
+
+	if err := writeTarTree(tw, fullPath); err != nil {
+		return status.Errorf(codes.Internal, "create tar: %v", err)
+	}
+	if err := tw.Close(); err != nil {
+		return status.Errorf(codes.Internal, "finalize tar: %v", err)
+	}
+	if err := bw.Flush(); err != nil {
+		return status.Errorf(codes.Internal, "flush tar: %v", err)
+	}
+	return nil
+}
+
+// handleTarExtractStream is the client-streaming form of TarExtract. The
+// first frame carries volume_id/path/uid/gid in its header; the archive is
+// the concatenated frame payloads and is extracted as it arrives.
+func (s *Server) handleTarExtractStream(_ interface{}, stream grpc.ServerStream) error {
+	var first Frame
+	if err := stream.RecvMsg(&first); err != nil {
+		return status.Errorf(codes.InvalidArgument, "decode: %v", err)
+	}
+	req := first.Header
+	if req.VolumeID == "" || req.Path == "" {
+		return status.Error(codes.InvalidArgument, "volume_id and path are required")
+	}
+	if err := s.checkVolumeExists(req.VolumeID); err != nil {
+		return err
+	}
+
+	destPath, err := s.volumePath(req.VolumeID, req.Path)
+	if err != nil {
+		return status.Errorf(codes.InvalidArgument, "%v", err)
+	}
+
+	r := &frameReader{stream: stream, buf: first.Data}
+	if err := extractTar(tar.NewReader(r), destPath, req.Uid, req.Gid); err != nil {
+		return err
+	}
+	// Consume anything after the end-of-archive marker so the client's
+	// send side completes before the response.
+	if _, err := io.Copy(io.Discard, r); err != nil {
+		return status.Errorf(codes.Internal, "read tar: %v", err)
+	}
+	if r.total == 0 {
+		return status.Error(codes.InvalidArgument, "tar data is required")
+	}
+
+	s.markDirty(req.VolumeID)
+	return stream.SendMsg(&Empty{})
+}
+
+// frameWriter sends every Write as one or more data frames.
+type frameWriter struct {
+	stream grpc.ServerStream
+}
+
+func (w *frameWriter) Write(p []byte) (int, error) {
+	written := 0
+	for len(p) > 0 {
+		n := len(p)
+		if n > streamChunkSize {
+			n = streamChunkSize
+		}
+		// p may be bufio's internal buffer, which is reused after Write
+		// returns — the frame gets its own copy.
+		data := append([]byte(nil), p[:n]...)
+		if err := w.stream.SendMsg(&Frame{Data: data}); err != nil {
+			return written, err
+		}
+		written += n
+		p = p[n:]
+	}
+	return written, nil
+}
+
+// frameReader exposes the payloads of incoming frames as an io.Reader.
+type frameReader struct {
+	stream grpc.ServerStream
+	buf    []byte
+	total  int64
+	done   bool
+}
+
+func (r *frameReader) Read(p []byte) (int, error) {
+	for len(r.buf) == 0 {
+		if r.done {
+			return 0, io.EOF
+		}
+		var f Frame
+		if err := r.stream.RecvMsg(&f); err != nil {
+			if err == io.EOF {
+				r.done = true
+				return 0, io.EOF
+			}
+			return 0, err
+		}
+		r.buf = f.Data
+	}
+	n := copy(p, r.buf)
+	r.buf = r.buf[n:]
+	r.total += int64(n)
+	return n, nil
+}
@@ -0,0 +1,277 @@
+package fileops
+
+import (
+	"archive/tar"
+	"bytes"
+	"context"
+	"io"
+	"os"
+	"path/filepath"
+	"testing"
+
+	"google.golang.org/grpc"
+	"google.golang.org/grpc/codes"
+)
+
+// fakeStream is an in-memory grpc.ServerStream. Messages pass through
+// jsonCodec in both directions so the tests exercise the real wire encoding.
+type fakeStream struct {
+	grpc.ServerStream // unused methods; calling one panics
+	in                [][]byte
+	out               [][]byte
+}
+
+func newFakeStream(t *testing.T, msgs ...interface{}) *fakeStream {
+	t.Helper()
+	fs := &fakeStream{}
+	for _, m := range msgs {
+		data, err := jsonCodec{}.Marshal(m)
+		if err != nil {
+			t.Fatalf("marshal %T: %v", m, err)
+		}
+		fs.in = append(fs.in, data)
+	}
+	return fs
+}
+
+func (fs *fakeStream) Context() context.Context { return ctx }
+
+func (fs *fakeStream) RecvMsg(m interface{}) error {
+	if len(fs.in) == 0 {
+		return io.EOF
+	}
+	data := fs.in[0]
+	fs.in = fs.in[1:]
+	return jsonCodec{}.Unmarshal(data, m)
+}
+
+func (fs *fakeStream) SendMsg(m interface{}) error {
+	data, err := jsonCodec{}.Marshal(m)
+	if err != nil {
+		return err
+	}
+	fs.out = append(fs.out, data)
+	return nil
+}
+
+// frames decodes every message the handler sent as a Frame.
+func (fs *fakeStream) frames(t *testing.T) []Frame {
+	t.Helper()
+	frames := make([]Frame, len(fs.out))
+	for i, data := range fs.out {
+		if err := (jsonCodec{}).Unmarshal(data, &frames[i]); err != nil {
+			t.Fatalf("decode frame %d: %v", i, err)
+		}
+	}
+	return frames
+}
+
+// ---------------------------------------------------------------------------
+// Frame codec
+// ---------------------------------------------------------------------------
+
+func TestFrame_RoundTrip(t *testing.T) {
+	in := &Frame{Header: FrameHeader{Path: "a.bin", Size: 3, Offset: 7}, Data: []byte{0x00, 0xff, 0x10}}
+	data, err := jsonCodec{}.Marshal(in)
+	if err != nil {
+		t.Fatalf("marshal: %v", err)
+	}
+	// Raw payload, not base64.
+	if !bytes.HasSuffix(data, in.Data) {
+		t.Errorf("payload not appended raw: %q", data)
+	}
+
+	var out Frame
+	if err := (jsonCodec{}).Unmarshal(data, &out); err != nil {
+		t.Fatalf("unmarshal: %v", err)
+	}
+	if out.Header != in.Header || !bytes.Equal(out.Data, in.Data) {
+		t.Errorf("round trip mismatch: got %+v", out)
+	}
+}
+
+func TestFrame_Truncated(t *testing.T) {
+	var f Frame
+	if err := (jsonCodec{}).Unmarshal([]byte{0, 0}, &f); err == nil {
+		t.Error("expected error for short frame")
+	}
+	if err := (jsonCodec{}).Unmarshal([]byte{0, 0, 0, 9, '{', '}'}, &f); err == nil {
+		t.Error("expected error for header length past end")
+	}
+}
+
+// ---------------------------------------------------------------------------
+// ReadFilesStream
+// ---------------------------------------------------------------------------
+
+func TestReadFilesStream_ChunksAndErrors(t *testing.T) {
+	pool := t.TempDir()
+	s := NewServer(pool, nil)
+	volDir := setupVolume(t, pool, "v1")
+
+	big := bytes.Repeat([]byte("x"), streamChunkSize+10)
+	os.WriteFile(filepath.Join(volDir, "big.txt"), big, 0644)
+	os.WriteFile(filepath.Join(volDir, "empty.txt"), nil, 0644)
+
+	stream := newFakeStream(t, ReadFilesRequest{
+		VolumeID: "v1",
+		Paths:    []string{"big.txt", "missing.txt", "empty.txt"},
+	})
+	if err := s.handleReadFilesStream(nil, stream); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	frames := stream.frames(t)
+	if len(frames) != 4 {
+		t.Fatalf("expected 4 frames, got %d", len(frames))
+	}
+	if frames[0].Header.Offset != 0 || frames[1].Header.Offset != streamChunkSize {
+		t.Errorf("unexpected offsets: %d, %d", frames[0].Header.Offset, frames[1].Header.Offset)
+	}
+	got := append(append([]byte(nil), frames[0].Data...), frames[1].Data...)
+	if !bytes.Equal(got, big) || frames[1].Header.Size != int64(len(big)) {
+		t.Error("big.txt not reassembled from its frames")
+	}
+	if frames[2].Header.Path != "missing.txt" || frames[2].Header.Error == "" {
+		t.Errorf("expected error frame for missing.txt, got %+v", frames[2].Header)
+	}
+	if frames[3].Header.Path != "empty.txt" || len(frames[3].Data) != 0 || frames[3].Header.Error != "" {
+		t.Errorf("expected one empty frame for empty.txt, got %+v", frames[3].Header)
+	}
+}
+
+func TestReadFilesStream_MaxFileSize(t *testing.T) {
+	pool := t.TempDir()
+	s := NewServer(pool, nil)
+	volDir := setupVolume(t, pool, "v1")
+	os.WriteFile(filepath.Join(volDir, "a.txt"), []byte("0123456789"), 0644)
+
+	stream := newFakeStream(t, ReadFilesRequest{VolumeID: "v1", Paths: []string{"a.txt"}, MaxFileSize: 5})
+	if err := s.handleReadFilesStream(nil, stream); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	frames := stream.frames(t)
+	if len(frames) != 1 || frames[0].Header.Error == "" {
+		t.Errorf("expected a single error frame, got %+v", frames)
+	}
+}
+
+func TestReadFilesStream_Budgets(t *testing.T) {
+	pool := t.TempDir()
+	s := NewServer(pool, nil)
+	volDir := setupVolume(t, pool, "v1")
+	os.WriteFile(filepath.Join(volDir, "a.txt"), []byte("0123456789"), 0644)
+	os.WriteFile(filepath.Join(volDir, "b.txt"), []byte("abcdef"), 0644)
+	os.WriteFile(filepath.Join(volDir, "c.txt"), []byte("never sent"), 0644)
+	os.WriteFile(filepath.Join(volDir, "logo.PNG"), []byte{0x89, 'P', 'N', 'G'}, 0644)
+
+	stream := newFakeStream(t, ReadFilesRequest{
+		VolumeID:       "v1",
+		Paths:          []string{"logo.PNG", "a.txt", "b.txt", "c.txt"},
+		MaxFileSize:    5, // ignored once MaxReadBytes is set
+		MaxReadBytes:   4,
+		MaxTotalBytes:  6,
+		Tail:           true,
+		SkipExtensions: []string{"png"},
+	})
+	if err := s.handleReadFilesStream(nil, stream); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	frames := stream.frames(t)
+	if len(frames) != 3 {
+		t.Fatalf("expected 3 frames, got %d: %+v", len(frames), frames)
+	}
+	if frames[0].Header.Path != "logo.PNG" || frames[0].Header.Error == "" {
+		t.Errorf("expected skip frame for logo.PNG, got %+v", frames[0].Header)
+	}
+	if h := frames[1].Header; string(frames[1].Data) != "6789" || h.Offset != 6 || h.Length != 4 || h.Size != 10 {
+		t.Errorf("expected tail of a.txt, got %q %+v", frames[1].Data, h)
+	}
+	// Only 2 bytes of the total budget remain for b.txt; c.txt is never read.
+	if h := frames[2].Header; string(frames[2].Data) != "ef" || h.Offset != 4 || h.Length != 2 {
+		t.Errorf("expected last 2 bytes of b.txt, got %q %+v", frames[2].Data, h)
+	}
+}
+
+func TestReadFilesStream_MissingVolume(t *testing.T) {
+	s := NewServer(t.TempDir(), nil)
+	stream := newFakeStream(t, ReadFilesRequest{VolumeID: "nope", Paths: []string{"a"}})
+	requireCode(t, s.handleReadFilesStream(nil, stream), codes.FailedPrecondition)
+}
+
+// ---------------------------------------------------------------------------
+// TarCreateStream / TarExtractStream
+// ---------------------------------------------------------------------------
+
+func TestTarStream_RoundTrip(t *testing.T) {
+	pool := t.TempDir()
+	s := NewServer(pool, nil)
+	volDir := setupVolume(t, pool, "v1")
+	setupVolume(t, pool, "v2")
+
+	os.MkdirAll(filepath.Join(volDir, "proj", "sub"), 0755)
+	os.WriteFile(filepath.Join(volDir, "proj", "readme.txt"), []byte("hello"), 0644)
+	big := bytes.Repeat([]byte{0xab}, 2*streamChunkSize)
+	os.WriteFile(filepath.Join(volDir, "proj", "sub", "data.bin"), big, 0644)
+
+	create := newFakeStream(t, TarRequest{VolumeID: "v1", Path: "proj"})
+	if err := s.handleTarCreateStream(nil, create); err != nil {
+		t.Fatalf("create: %v", err)
+	}
+	frames := create.frames(t)
+	if len(frames) < 2 {
+		t.Fatalf("expected the archive to span several frames, got %d", len(frames))
+	}
+
+	// Replay the archive into TarExtractStream, with the target in the
+	// first frame's header.
+	msgs := []interface{}{&Frame{Header: FrameHeader{VolumeID: "v2", Path: "restored"}}}
+	for i := range frames {
+		if len(frames[i].Data) > streamChunkSize {
+			t.Errorf("frame %d exceeds chunk size: %d", i, len(frames[i].Data))
+		}
+		msgs = append(msgs, &frames[i])
+	}
+	extract := newFakeStream(t, msgs...)
+	if err := s.handleTarExtractStream(nil, extract); err != nil {
+		t.Fatalf("extract: %v", err)
+	}
+
+	restored := filepath.Join(pool, "volumes", "v2", "restored")
+	if got, _ := os.ReadFile(filepath.Join(restored, "readme.txt")); string(got) != "hello" {
+		t.Errorf("readme.txt = %q", got)
+	}
+	if got, _ := os.ReadFile(filepath.Join(restored, "sub", "data.bin")); !bytes.Equal(got, big) {
+		t.Errorf("data.bin mismatch: %d bytes", len(got))
+	}
+}
+
+func TestTarExtractStream_TraversalInEntries(t *testing.T) {
+	pool := t.TempDir()
+	s := NewServer(pool, nil)
+	setupVolume(t, pool, "v1")
+
+	var buf bytes.Buffer
+	tw := tar.NewWriter(&buf)
+	tw.WriteHeader(&tar.Header{Name: "../../escape.txt", Typeflag: tar.TypeReg, Mode: 0644, Size: 1})
+	tw.Write([]byte("x"))
+	tw.Close()
+
+	stream := newFakeStream(t, &Frame{Header: FrameHeader{VolumeID: "v1", Path: "dest"}, Data: buf.Bytes()})
+	if err := s.handleTarExtractStream(nil, stream); err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if _, err := os.Stat(filepath.Join(pool, "escape.txt")); !os.IsNotExist(err) {
+		t.Error("traversal entry was extracted outside the volume")
+	}
+}
+
+func TestTarExtractStream_EmptyData(t *testing.T) {
+	pool := t.TempDir()
+	s := NewServer(pool, nil)
+	setupVolume(t, pool, "v1")
+
+	stream := newFakeStream(t, &Frame{Header: FrameHeader{VolumeID: "v1", Path: "dest"}})
+	requireCode(t, s.handleTarExtractStream(nil, stream), codes.InvalidArgument)
+}